@@ -69,9 +69,8 @@ from packages.valory.skills.twitter_scoring_abci.rounds import (
     DBUpdateRound,
     PostMechRequestRound,
     PreMechRequestRound,
-    TwitterCampaignsCollectionRound,
+    TwitterCollectionRound,
     TwitterDecisionMakingRound,
-    TwitterMentionsCollectionRound,
     TwitterRandomnessRound,
     TwitterSelectKeepersRound,
 )
@@ -87,9 +86,7 @@ HAPPY_PATH: Tuple[RoundChecks, ...] = (
     RoundChecks(TwitterSelectKeepersRound.auto_round_id(), n_periods=2),
     # Twitter API
     RoundChecks(TwitterDecisionMakingRound.auto_round_id(), n_periods=2),
-    RoundChecks(TwitterMentionsCollectionRound.auto_round_id(), n_periods=2),
-    RoundChecks(TwitterDecisionMakingRound.auto_round_id(), n_periods=2),
-    RoundChecks(TwitterCampaignsCollectionRound.auto_round_id(), n_periods=2),
+    RoundChecks(TwitterCollectionRound.auto_round_id(), n_periods=2),
     # Mech evaluation
     RoundChecks(TwitterDecisionMakingRound.auto_round_id(), n_periods=2),
     RoundChecks(PreMechRequestRound.auto_round_id(), n_periods=2),
@@ -21,7 +21,9 @@
 """This module contains classes to interact with AgentDB."""
 
 import json
+import os
 from datetime import datetime, timezone
+from types import SimpleNamespace
 from typing import Any, Callable, Dict, List, Optional, Union
 
 from aea.skills.base import Model
@@ -36,6 +38,12 @@ from packages.valory.skills.agent_db_abci.agent_db_models import (
     AttributeInstance,
 )
 
+DEFINITION_CACHE_VERSION = 1
+DEFAULT_PAGE_SIZE = 100
+DEFAULT_MAX_PAGE_RETRIES = 3
+DEFAULT_MAX_CONCURRENT_PAGES = 4
+PAGE_RETRY_BASE_DELAY = 1  # seconds, doubled on every retry
+
 # Docs at:
 # https://axatbhardwaj.notion.site/MirrorDB-Agent-and-Attribute-Data-Flow-1eac8d38bc0b80edae04ff1017d80f58
 # https://afmdb.autonolas.tech/docs#/default/read_attribute_definitions_by_type_api_agent_types__type_id__attributes__get
@@ -44,10 +52,23 @@ from packages.valory.skills.agent_db_abci.agent_db_models import (
 class AgentDBClient(Model):
     """AgentDBClient"""
 
-    def __init__(self, base_url, **kwargs: Any):
+    def __init__(
+        self,
+        base_url,
+        definition_cache_path: Optional[str] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        max_page_retries: int = DEFAULT_MAX_PAGE_RETRIES,
+        max_concurrent_pages: int = DEFAULT_MAX_CONCURRENT_PAGES,
+        **kwargs: Any,
+    ):
         """Constructor"""
         super().__init__(**kwargs)
         self.base_url: str = base_url.rstrip("/")
+        self.definition_cache_path: Optional[str] = definition_cache_path
+        self.page_size: int = page_size
+        self.max_page_retries: int = max_page_retries
+        self.max_concurrent_pages: int = max_concurrent_pages
+        self._definitions_prefetched = False
         self._id_to_attribute_definition_cache: Dict[int, AttributeDefinition] = {}
         self._name_to_attribute_definition_cache: Dict[str, AttributeDefinition] = {}
         self.agent: AgentInstance = None
@@ -56,6 +77,7 @@ class AgentDBClient(Model):
         self.signing_func: Callable = None
         self.private_key: Optional[str] = None
         self.http_request_func: Callable = None
+        self.http_requests_func: Optional[Callable] = None
         self.logger: Callable = None
         self.sleep_func: Callable = None
 
@@ -66,10 +88,12 @@ class AgentDBClient(Model):
         signing_func_or_pkey: Union[Callable, str],
         logger: Callable,
         sleep_func: Callable,
+        http_requests_func: Optional[Callable] = None,
     ):
         """Inject external functions"""
         self.address = address
         self.http_request_func = http_request_func
+        self.http_requests_func = http_requests_func
         self.signing_func = (
             signing_func_or_pkey
             if isinstance(signing_func_or_pkey, Callable)
@@ -80,6 +104,8 @@ class AgentDBClient(Model):
         )
         self.logger = logger
         self.sleep_func = sleep_func
+        if not self._id_to_attribute_definition_cache:
+            self.load_definition_cache()
         self.ensure_agent_is_loaded()
 
     def sign_using_pkey(self, message_to_sign: str):
@@ -98,7 +124,7 @@ class AgentDBClient(Model):
         if self.agent is None:
             self.agent = yield from self.get_agent_instance_by_address(self.address)
             self.agent_type = (
-                self.get_agent_type_by_type_id(self.agent.type_id)
+                (yield from self.get_agent_type_by_type_id(self.agent.type_id))
                 if self.agent
                 else None
             )
@@ -179,6 +205,46 @@ class AgentDBClient(Model):
             f"Request failed: {response.status_code} - {getattr(response, 'text', None)}"
         )
 
+    def _request_many(self, method, endpoint, payload, params_list):
+        """Make several authenticated requests at once. Failed requests give None"""
+
+        url = f"{self.base_url}{endpoint}"
+        headers = {"Content-Type": "application/json"}
+        requests = []
+        for params in params_list:
+            auth = yield from self._sign_request(endpoint)
+            requests.append(
+                {
+                    "method": method,
+                    "url": url,
+                    "content": json.dumps({**payload, "auth": auth}).encode(),
+                    "headers": headers,
+                    "parameters": params,
+                }
+            )
+
+        try:
+            responses = yield from self.http_requests_func(requests)
+        except Exception as e:
+            raise ValueError(f"Request failed: {e}") from e
+
+        results = []
+        for params, response in zip(params_list, responses):
+            if response is None:
+                self.logger.error(
+                    f"Made {method} request to {url} with params: {params}\n\nNo response was received"
+                )
+                results.append(None)
+                continue
+            if response.status_code in [200, 201]:
+                results.append(json.loads(response.body))
+                continue
+            self.logger.error(
+                f"Made {method} request to {url} with params: {params}\n\nResponse was: {response.status_code}"
+            )
+            results.append(None)
+        return results
+
     # Agent Type Methods
 
     def create_agent_type(self, type_name, description) -> Optional[AgentType]:
@@ -286,7 +352,7 @@ class AgentDBClient(Model):
         result = yield from self._request("GET", endpoint)
         if result:
             definition = AttributeDefinition.model_validate(result)
-            self._name_to_attribute_definition_cache[attr_name] = definition
+            self._cache_attribute_definitions([definition])
             return definition
         return None
 
@@ -301,7 +367,7 @@ class AgentDBClient(Model):
         result = yield from self._request("GET", endpoint)
         if result:
             definition = AttributeDefinition.model_validate(result)
-            self._id_to_attribute_definition_cache[attr_id] = definition
+            self._cache_attribute_definitions([definition])
             return definition
         return None
 
@@ -315,6 +381,79 @@ class AgentDBClient(Model):
             else []
         )
 
+    def prefetch_attribute_definitions(self):
+        """Cache all the attribute definitions for this agent type in a single call"""
+        yield from self.ensure_agent_is_loaded()
+        if self.agent_type is None:
+            return
+
+        definitions = yield from self.get_attribute_definitions_by_agent_type(
+            self.agent_type
+        )
+        self._cache_attribute_definitions(definitions)
+        self._definitions_prefetched = True
+        self.logger.info(f"Prefetched {len(definitions)} attribute definitions")
+
+    def _cache_attribute_definitions(
+        self, definitions: List[AttributeDefinition], persist: bool = True
+    ):
+        """Add definitions to the caches and optionally persist them"""
+        for definition in definitions:
+            self._id_to_attribute_definition_cache[definition.attr_def_id] = definition
+            self._name_to_attribute_definition_cache[definition.attr_name] = definition
+        if definitions and persist:
+            self.save_definition_cache()
+
+    def load_definition_cache(self):
+        """Load the attribute definitions persisted by a previous run"""
+        if not self.definition_cache_path or not os.path.exists(
+            self.definition_cache_path
+        ):
+            return
+
+        try:
+            with open(self.definition_cache_path, "r", encoding="utf-8") as file:
+                cache = json.load(file)
+            if (
+                cache.get("version") != DEFINITION_CACHE_VERSION
+                or cache.get("base_url") != self.base_url
+            ):
+                self.logger.info("Ignoring stale attribute definition cache")
+                return
+            definitions = [
+                AttributeDefinition.model_validate(definition)
+                for definition in cache["definitions"]
+            ]
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            self.logger.warning(f"Could not load the attribute definition cache: {e}")
+            return
+
+        self._cache_attribute_definitions(definitions, persist=False)
+        self.logger.info(
+            f"Loaded {len(definitions)} attribute definitions from {self.definition_cache_path}"
+        )
+
+    def save_definition_cache(self):
+        """Persist the attribute definitions so restarts start warm"""
+        if not self.definition_cache_path:
+            return
+
+        cache = {
+            "version": DEFINITION_CACHE_VERSION,
+            "base_url": self.base_url,
+            "definitions": [
+                definition.model_dump(mode="json")
+                for definition in self._id_to_attribute_definition_cache.values()
+            ],
+        }
+        tmp_path = f"{self.definition_cache_path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as file:
+                json.dump(cache, file)
+            os.replace(tmp_path, self.definition_cache_path)
+        except OSError as e:
+            self.logger.warning(f"Could not save the attribute definition cache: {e}")
+
     def delete_attribute_definition(self, attr_def: AttributeDefinition):
         """Delete attribute definition"""
         endpoint = f"/api/attributes/{attr_def.attr_def_id}/"
@@ -383,6 +522,25 @@ class AgentDBClient(Model):
         )
         return AttributeInstance.model_validate(result) if result else None
 
+    def patch_attribute_instance(
+        self,
+        agent_instance: AgentInstance,
+        attribute_def: AttributeDefinition,
+        attribute_instance_id: int,
+        patch: List[Dict],
+    ) -> Optional[AttributeInstance]:
+        """Apply a JSON patch (RFC 6902) to a json attribute instance"""
+        endpoint = f"/api/agent-attributes/{attribute_instance_id}"
+        payload = {
+            "agent_id": agent_instance.agent_id,
+            "attr_def_id": attribute_def.attr_def_id,
+            "json_patch": patch,
+        }
+        result = yield from self._request(
+            "PATCH", endpoint, {"agent_attr": payload}, auth=True
+        )
+        return AttributeInstance.model_validate(result) if result else None
+
     def delete_attribute_instance(
         self, attribute_instance_id: int
     ) -> Optional[AttributeInstance]:
@@ -395,36 +553,95 @@ class AgentDBClient(Model):
 
     # Get all attributes of an agent instance
 
-    def get_all_agent_instance_attributes_raw(self, agent_instance: AgentInstance):
-        """Get all attributes of an agent by agent ID"""
-        endpoint = f"/api/agents/{agent_instance.agent_id}/attributes/"
-        payload = {
-            "agent_id": agent_instance.agent_id,
-        }
+    def get_all_agent_instance_attributes_raw(
+        self, agent_instance: AgentInstance, skip: int = 0
+    ):
+        """Get all attributes of an agent by agent ID, starting at the given offset"""
         raw_attributes = []
-        skip = 0
         while True:
-            params = {
-                "skip": skip,
-                "limit": 100,
-            }
-            result = yield from self._request(
-                method="GET",
-                endpoint=endpoint,
-                payload={"agent_attr": payload},
-                params=params,
-                auth=True,
+            pages = yield from self._get_agent_instance_attributes_pages(
+                agent_instance, skip
             )
+            for result in pages:
+                raw_attributes += result
+                skip += len(result)
 
-            if result is None:
-                self.logger.error("Error fetching agent attributes")
-                continue
+                if len(result) < self.page_size:
+                    return raw_attributes
 
-            raw_attributes += result
-            skip = len(raw_attributes)
+    def _get_agent_instance_attributes_pages(
+        self, agent_instance: AgentInstance, skip: int
+    ):
+        """Get the next pages of attributes, requesting up to max_concurrent_pages at once"""
+        if self.http_requests_func is None or self.max_concurrent_pages <= 1:
+            result = yield from self._get_agent_instance_attributes_page(
+                agent_instance, skip
+            )
+            return [result]
 
-            if len(result) < 100:
-                return raw_attributes
+        skips = [skip + i * self.page_size for i in range(self.max_concurrent_pages)]
+        try:
+            pages = yield from self._request_many(
+                method="GET",
+                endpoint=f"/api/agents/{agent_instance.agent_id}/attributes/",
+                payload={"agent_attr": {"agent_id": agent_instance.agent_id}},
+                params_list=[
+                    {"skip": page_skip, "limit": self.page_size} for page_skip in skips
+                ],
+            )
+        except Exception as e:  # pylint: disable=broad-except
+            self.logger.error(f"Error fetching agent attributes: {e}")
+            pages = [None] * len(skips)
+
+        # Failed pages are fetched again one at a time, with retries. Pages after
+        # the first short one are past the end and are dropped
+        for index, page_skip in enumerate(skips):
+            if pages[index] is None:
+                pages[index] = yield from self._get_agent_instance_attributes_page(
+                    agent_instance, page_skip
+                )
+            if len(pages[index]) < self.page_size:
+                return pages[: index + 1]
+        return pages
+
+    def _get_agent_instance_attributes_page(
+        self, agent_instance: AgentInstance, skip: int
+    ):
+        """Get a page of attributes, retrying with exponential backoff"""
+        endpoint = f"/api/agents/{agent_instance.agent_id}/attributes/"
+        payload = {
+            "agent_id": agent_instance.agent_id,
+        }
+        params = {
+            "skip": skip,
+            "limit": self.page_size,
+        }
+        for attempt in range(self.max_page_retries + 1):
+            try:
+                result = yield from self._request(
+                    method="GET",
+                    endpoint=endpoint,
+                    payload={"agent_attr": payload},
+                    params=params,
+                    auth=True,
+                )
+            except Exception as e:  # pylint: disable=broad-except
+                self.logger.error(f"Error fetching agent attributes: {e}")
+                result = None
+
+            if result is not None:
+                return result
+
+            if attempt < self.max_page_retries:
+                delay = PAGE_RETRY_BASE_DELAY * 2**attempt
+                self.logger.error(
+                    f"Error fetching agent attributes at skip={skip}. Retrying in {delay}s..."
+                )
+                yield from self.sleep_func(delay)
+
+        raise ValueError(
+            f"Could not fetch agent attributes at skip={skip} after {self.max_page_retries + 1} attempts"
+        )
 
     def parse_attribute_instance(self, attribute_instance: AttributeInstance):
         """Parse attribute instance"""
@@ -451,16 +668,31 @@ class AgentDBClient(Model):
             "attr_id": attribute_instance.attribute_id,
             "attr_name": attribute_definition.attr_name,
             "attr_value": attr_value,
+            "last_updated": attribute_instance.last_updated,
         }
         return parsed_attribute_instance
 
-    def get_all_agent_instance_attributes_parsed(self, agent_instance: AgentInstance):
-        """Get all attributes of an agent by agent ID"""
+    def get_all_agent_instance_attributes_parsed(
+        self, agent_instance: AgentInstance, skip: int = 0, trusted: bool = False
+    ):
+        """Get all attributes of an agent by agent ID, starting at the given offset"""
         attribute_instances = yield from self.get_all_agent_instance_attributes_raw(
-            agent_instance
+            agent_instance, skip
         )
+
+        # Fetch every definition at once instead of one request per unknown row
+        missing_definitions = {
+            attr["attr_def_id"] for attr in attribute_instances
+        } - self._id_to_attribute_definition_cache.keys()
+        if missing_definitions and not self._definitions_prefetched:
+            yield from self.prefetch_attribute_definitions()
+
         parsed_attributes = []
         for attr in attribute_instances:
-            result = yield from self.parse_attribute_instance(AttributeInstance(**attr))
+            # Trusted rows are read as they come, without building the model
+            attribute_instance = (
+                SimpleNamespace(**attr) if trusted else AttributeInstance(**attr)
+            )
+            result = yield from self.parse_attribute_instance(attribute_instance)
             parsed_attributes.append(result)
         return parsed_attributes
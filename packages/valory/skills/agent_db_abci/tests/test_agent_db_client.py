@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2026 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Test the AgentDBClient"""
+
+import json
+import logging
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Any, Dict, Generator, List, Optional
+
+import pytest
+from aea.skills.base import SkillContext
+
+from packages.valory.skills.agent_db_abci.agent_db_client import AgentDBClient
+from packages.valory.skills.agent_db_abci.agent_db_models import AgentInstance
+
+PAGE_SIZE = 10
+N_ROWS = 45
+
+
+def run(generator: Generator) -> Any:
+    """Drive a generator to completion and return its value"""
+    with pytest.raises(StopIteration) as exception_info:
+        while True:
+            next(generator)
+    return exception_info.value.value
+
+
+class DummyAgentDB:
+    """Serve the attribute pages of an agent from memory"""
+
+    def __init__(
+        self,
+        failing_skips: Optional[List[int]] = None,
+        lost_skips: Optional[List[int]] = None,
+    ) -> None:
+        """Init"""
+        self.rows = [{"attribute_id": i} for i in range(N_ROWS)]
+        self.failing_skips = set(failing_skips or [])
+        self.lost_skips = set(lost_skips or [])  # no response in a batch
+        self.batches: List[List[int]] = []  # skips sent together
+        self.single_requests: List[int] = []
+
+    def respond(self, parameters: Dict) -> SimpleNamespace:
+        """Get the response to a page request"""
+        skip = parameters["skip"]
+        if skip in self.failing_skips:
+            self.failing_skips.remove(skip)
+            return SimpleNamespace(status_code=500, body=b"")
+        page = self.rows[skip : skip + parameters["limit"]]
+        return SimpleNamespace(status_code=200, body=json.dumps(page).encode())
+
+    def http_request(self, **request: Any) -> Generator:
+        """Send a single request"""
+        yield
+        self.single_requests.append(request["parameters"]["skip"])
+        return self.respond(request["parameters"])
+
+    def http_requests(self, requests: List[Dict]) -> Generator:
+        """Send several requests at once"""
+        yield
+        skips = [request["parameters"]["skip"] for request in requests]
+        self.batches.append(skips)
+        responses = [self.respond(request["parameters"]) for request in requests]
+        return [
+            None if skip in self.lost_skips else response
+            for skip, response in zip(skips, responses)
+        ]
+
+
+def sleep(_seconds: float) -> Generator:
+    """Do not wait"""
+    yield
+
+
+def make_client(agent_db: DummyAgentDB, concurrent: bool = True) -> AgentDBClient:
+    """Get a client that talks to the dummy AgentDB"""
+    client = AgentDBClient(
+        base_url="http://localhost",
+        page_size=PAGE_SIZE,
+        max_concurrent_pages=3,
+        name="agent_db_client",
+        skill_context=SkillContext(),
+    )
+    client.agent = AgentInstance(
+        agent_id=1,
+        type_id=1,
+        agent_name="contribute",
+        eth_address="0x" + "0" * 40,
+        created_at=datetime.now(timezone.utc),
+    )
+    client.http_request_func = agent_db.http_request
+    client.http_requests_func = agent_db.http_requests if concurrent else None
+    client.signing_func = sleep
+    client.logger = logging.getLogger("agent_db")
+    client.sleep_func = sleep
+    return client
+
+
+class TestAttributePaging:
+    """Test fetching the attributes of an agent page by page"""
+
+    @pytest.mark.parametrize("concurrent", (False, True))
+    def test_all_rows_in_order(self, concurrent: bool) -> None:
+        """Test that every row is returned once and in order"""
+        agent_db = DummyAgentDB()
+        client = make_client(agent_db, concurrent)
+
+        rows = run(client.get_all_agent_instance_attributes_raw(client.agent, skip=5))
+
+        assert rows == agent_db.rows[5:]
+        if concurrent:
+            assert agent_db.batches == [[5, 15, 25], [35, 45, 55]]
+            assert not agent_db.single_requests
+        else:
+            assert agent_db.single_requests == [5, 15, 25, 35, 45]
+
+    def test_failed_pages_are_retried(self) -> None:
+        """Test that a failed page in a batch is fetched again on its own"""
+        agent_db = DummyAgentDB(failing_skips=[10])
+        client = make_client(agent_db)
+
+        rows = run(client.get_all_agent_instance_attributes_raw(client.agent))
+
+        assert rows == agent_db.rows
+        assert agent_db.batches == [[0, 10, 20], [30, 40, 50]]
+        assert agent_db.single_requests == [10]
+
+    def test_lost_responses_are_retried(self) -> None:
+        """Test that a page whose response timed out is fetched again on its own"""
+        agent_db = DummyAgentDB(lost_skips=[20])
+        client = make_client(agent_db)
+
+        rows = run(client.get_all_agent_instance_attributes_raw(client.agent))
+
+        assert rows == agent_db.rows
+        assert agent_db.single_requests == [20]
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 # ------------------------------------------------------------------------------
 #
-#   Copyright 2023-2025 Valory AG
+#   Copyright 2023-2026 Valory AG
 #
 #   Licensed under the Apache License, Version 2.0 (the "License");
 #   you may not use this file except in compliance with the License.
@@ -19,23 +19,34 @@
 
 """This package contains round behaviours of ContributeDBAbciApp."""
 
+import json
 from abc import ABC
-from typing import Any, Generator, Set, Type, cast
+from typing import Any, Dict, Generator, List, Optional, Set, Type, cast
 
+from aea.protocols.base import Message
 from eth_account import Account
 
+from packages.valory.protocols.http.message import HttpMessage
 from packages.valory.skills.abstract_round_abci.base import AbstractRound
+from packages.valory.skills.abstract_round_abci.behaviour_utils import TimeoutException
 from packages.valory.skills.abstract_round_abci.behaviours import (
     AbstractRoundBehaviour,
     BaseBehaviour,
 )
+from packages.valory.skills.abstract_round_abci.io_.store import SupportedFiletype
 from packages.valory.skills.contribute_db_abci.models import Params
 from packages.valory.skills.contribute_db_abci.rounds import (
     ContributeDBAbciApp,
     DBLoadPayload,
     DBLoadRound,
+    DBSnapshotPayload,
+    DBSnapshotRound,
+    SynchronizedData,
 )
 
+SNAPSHOT_FILENAME = "contribute_db_snapshot"
+SNAPSHOT_DELTA_FILENAME = "contribute_db_snapshot_delta"
+
 
 class ContributeDBBehaviour(BaseBehaviour, ABC):
     """Base behaviour for the common apps' skill."""
@@ -53,6 +64,7 @@ class ContributeDBBehaviour(BaseBehaviour, ABC):
             signing_func_or_pkey=self.params.contribute_db_pkey,
             logger=self.context.logger,
             sleep_func=self.sleep,
+            http_requests_func=self.get_http_responses,
         )
 
         self.context.contribute_db.initialize(
@@ -65,6 +77,141 @@ class ContributeDBBehaviour(BaseBehaviour, ABC):
         """Return the params."""
         return cast(Params, super().params)
 
+    @property
+    def synchronized_data(self) -> SynchronizedData:
+        """Return the synchronized data."""
+        return cast(SynchronizedData, super().synchronized_data)
+
+    def get_http_responses(
+        self, requests: List[Dict[str, Any]], timeout: Optional[float] = None
+    ) -> Generator[None, None, List[Optional[HttpMessage]]]:
+        """Send several HTTP requests at once and wait for their responses, None for the ones that time out"""
+        if timeout is None:
+            timeout = self.params.request_timeout
+
+        responses: Dict[str, HttpMessage] = {}
+        nonces = []
+        for request in requests:
+            http_message, http_dialogue = self._build_http_request_message(**request)
+            self.context.outbox.put_message(message=http_message)
+            nonce = self._get_request_nonce_from_dialogue(http_dialogue)
+
+            # wait_for_message only handles one response, so they are collected here
+            def store_response(
+                message: Message, _behaviour: BaseBehaviour, nonce: str = nonce
+            ) -> None:
+                """Keep a response until all of them have arrived"""
+                responses[nonce] = cast(HttpMessage, message)
+
+            self.context.requests.request_id_to_callback[nonce] = store_response
+            nonces.append(nonce)
+
+        try:
+            yield from self.wait_for_condition(
+                lambda: len(responses) == len(nonces), timeout=timeout
+            )
+        except TimeoutException:
+            missing = [nonce for nonce in nonces if nonce not in responses]
+            self.context.logger.warning(
+                f"Timed out waiting for {len(missing)} of {len(nonces)} HTTP responses"
+            )
+            # The handler pops the callback of a late response, which is then discarded
+            for nonce in missing:
+                self.context.requests.request_id_to_callback[nonce] = (
+                    self._discard_response
+                )
+
+        return [responses.get(nonce) for nonce in nonces]
+
+    def _discard_response(self, message: Message, _behaviour: BaseBehaviour) -> None:
+        """Drop a response that arrived after get_http_responses gave up on it"""
+        self.context.logger.info(f"Discarding a late HTTP response: {message}")
+
+
+class DBSnapshotBehaviour(ContributeDBBehaviour):
+    """DBSnapshotBehaviour"""
+
+    matching_round: Type[AbstractRound] = DBSnapshotRound
+
+    def async_act(self) -> Generator:
+        """Load AgentDB and share the snapshot if this agent is the loader."""
+        # Without snapshot sharing the round ends on its own
+        if not self.context.contribute_db.snapshot_sharing:
+            yield from self.wait_until_round_end()
+            self.set_done()
+            return
+
+        with self.context.benchmark_tool.measure(
+            self.behaviour_id,
+        ).local():
+            content = ""
+            if self.synchronized_data.db_loader == self.context.agent_address:
+                content = yield from self.share_snapshot()
+
+        with self.context.benchmark_tool.measure(
+            self.behaviour_id,
+        ).consensus():
+            payload = DBSnapshotPayload(
+                sender=self.context.agent_address,
+                content=content,
+            )
+            yield from self.send_a2a_transaction(payload)
+            yield from self.wait_until_round_end()
+
+        self.set_done()
+
+    def share_snapshot(self) -> Generator[None, None, str]:
+        """Load AgentDB and publish the changes since the last shared snapshot to IPFS"""
+        contribute_db = self.context.contribute_db
+        yield from contribute_db.load_from_remote_db()
+
+        delta = contribute_db.export_snapshot_delta()
+        if delta is not None:
+            delta_ipfs_hash = yield from self.send_to_ipfs(
+                SNAPSHOT_DELTA_FILENAME,
+                delta,
+                multiple=True,
+                filetype=SupportedFiletype.JSON,
+            )
+            if delta_ipfs_hash is not None:
+                self.context.logger.info(
+                    f"Shared the DB delta in {len(delta)} chunks: {delta_ipfs_hash}"
+                )
+                return json.dumps(
+                    {
+                        "loader": self.context.agent_address,
+                        "ipfs_hash": contribute_db.shared_snapshot["ipfs_hash"],
+                        "base_root": contribute_db.shared_snapshot["content_root"],
+                        "delta_ipfs_hash": delta_ipfs_hash,
+                        "content_root": contribute_db.get_content_hash()["root"],
+                    },
+                    sort_keys=True,
+                )
+
+        chunks = contribute_db.export_snapshot_chunks()
+        if chunks is None:
+            self.context.logger.warning("No DB snapshot to share")
+            return ""
+
+        ipfs_hash = yield from self.send_to_ipfs(
+            SNAPSHOT_FILENAME, chunks, multiple=True, filetype=SupportedFiletype.JSON
+        )
+        if ipfs_hash is None:
+            return ""
+
+        contribute_db.mark_snapshot_shared(ipfs_hash)
+        self.context.logger.info(
+            f"Shared the DB snapshot in {len(chunks)} chunks: {ipfs_hash}"
+        )
+        return json.dumps(
+            {
+                "loader": self.context.agent_address,
+                "ipfs_hash": ipfs_hash,
+                "content_root": contribute_db.get_content_hash()["root"],
+            },
+            sort_keys=True,
+        )
+
 
 class DBLoadBehaviour(ContributeDBBehaviour):
     """DBLoadBehaviour"""
@@ -76,26 +223,83 @@ class DBLoadBehaviour(ContributeDBBehaviour):
         with self.context.benchmark_tool.measure(
             self.behaviour_id,
         ).local():
-            # Load AgentDB
-            yield from self.context.contribute_db.load_from_remote_db()
+            db_load_retries = self.synchronized_data.db_load_retries
+            db_snapshot = self.synchronized_data.db_snapshot
+            if db_snapshot is None:
+                # Load AgentDB
+                yield from self.context.contribute_db.load_from_remote_db()
+            elif db_snapshot["loader"] != self.context.agent_address:
+                loaded = yield from self.load_shared_snapshot(db_snapshot)
+                if not loaded:
+                    self.context.logger.warning(
+                        "Could not use the shared DB snapshot. Loading AgentDB..."
+                    )
+                    yield from self.context.contribute_db.load_from_remote_db()
 
         with self.context.benchmark_tool.measure(
             self.behaviour_id,
         ).consensus():
+            content_hash = self.context.contribute_db.get_content_hash()
             payload = DBLoadPayload(
                 sender=self.context.agent_address,
+                content_hash=json.dumps(content_hash, sort_keys=True),
             )
             yield from self.send_a2a_transaction(payload)
             yield from self.wait_until_round_end()
 
+        # The round only agrees on a content hash: each agent compares its own data
+        synchronized_data = self.synchronized_data
+        if synchronized_data.db_load_retries > db_load_retries:
+            # The agents could not agree on the DB content: reload it from scratch
+            self.context.contribute_db.force_full_reload()
+        elif synchronized_data.db_content_hash is not None:
+            # Diverged subtrees are reloaded in the repair pass, or on the next load
+            self.context.contribute_db.set_agreed_content_hash(
+                synchronized_data.db_content_hash
+            )
+
         self.set_done()
 
+    def load_shared_snapshot(self, db_snapshot: Dict) -> Generator[None, None, bool]:
+        """Fetch the loader's snapshot or delta from IPFS and verify it"""
+        contribute_db = self.context.contribute_db
+        delta_ipfs_hash = db_snapshot.get("delta_ipfs_hash")
+        if delta_ipfs_hash is None:
+            chunks = yield from self.get_from_ipfs(
+                db_snapshot["ipfs_hash"], filetype=SupportedFiletype.JSON
+            )
+            if not chunks:
+                return False
+            return contribute_db.import_snapshot_chunks(
+                chunks, db_snapshot["content_root"]
+            )
+
+        delta = yield from self.get_from_ipfs(
+            delta_ipfs_hash, filetype=SupportedFiletype.JSON
+        )
+        if not delta:
+            return False
+        if contribute_db.import_snapshot_delta(delta, db_snapshot["content_root"]):
+            return True
+
+        # The local data is not one the delta applies to: start from its base
+        self.context.logger.info("Loading the base of the shared DB delta...")
+        chunks = yield from self.get_from_ipfs(
+            db_snapshot["ipfs_hash"], filetype=SupportedFiletype.JSON
+        )
+        if not chunks or not contribute_db.import_snapshot_chunks(
+            chunks, db_snapshot["base_root"]
+        ):
+            return False
+        return contribute_db.import_snapshot_delta(delta, db_snapshot["content_root"])
+
 
 class ContributeDBRoundBehaviour(AbstractRoundBehaviour):
     """ContributeDBRoundBehaviour"""
 
-    initial_behaviour_cls = DBLoadBehaviour
+    initial_behaviour_cls = DBSnapshotBehaviour
     abci_app_cls = ContributeDBAbciApp  # type: ignore
     behaviours: Set[Type[BaseBehaviour]] = [
+        DBSnapshotBehaviour,
         DBLoadBehaviour,
     ]
@@ -19,37 +19,118 @@
 
 """This module contains classes to interact with Agents.Fun agent data on AgentDB."""
 
-from typing import Any, Optional, Tuple
-
+import base64
+import copy
+import hashlib
+import json
+import os
+import struct
+import time
+import zlib
+from datetime import datetime, timezone
+from typing import Any, Dict, Generator, List, Optional, Set, Tuple
+
+import jsonpatch
 from aea.skills.base import Model
 from pydantic import BaseModel
 from pydantic_core._pydantic_core import ValidationError
 
 from packages.valory.skills.agent_db_abci.agent_db_client import (
     AgentDBClient,
+    AttributeDefinition,
     AttributeInstance,
 )
 from packages.valory.skills.contribute_db_abci.contribute_models import (
+    AuthorTweets,
     ContributeData,
     ContributeUser,
+    ModuleArchive,
+    ModuleCache,
     ModuleConfigs,
     ModuleData,
+    ModuleStatusIndex,
+    TRUSTED_CONTEXT,
+    TweetStore,
+    USER_INDEXED_FIELDS,
+    UserIndex,
+    UserMetrics,
     UserTweet,
 )
 
 ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
 CONTRIBUTE = "contribute"
-NON_WRITER_WAIT = 3
+DEFAULT_FULL_RELOAD_INTERVAL = 3600  # seconds
+DEFAULT_TRUSTED_LOAD_SAMPLE_INTERVAL = 100
+TRUSTED_UNHASHED_ATTRIBUTES = ("tweet", "user")
+SNAPSHOT_MAGIC = b"CDBS"
+SNAPSHOT_VERSION = 2
+SNAPSHOT_HEADER = struct.Struct(">4sH32s")  # magic, version, sha256 of the body
+DEFAULT_SNAPSHOT_CHUNK_SIZE = 1024 * 1024  # bytes
+MAX_SNAPSHOT_DELTA_RATIO = 0.5  # changed rows over which a full snapshot is shared
+DEFAULT_ARCHIVE_RETENTION = 30 * 24 * 3600  # seconds
+DEFAULT_MAX_CONCURRENT_WRITES = 4
+# Content hash subtrees, by attribute name
+CONTENT_SUBTREES = {
+    "user": "users",
+    "tweet": "tweets",
+    "module_data": "module_data",
+    "module_configs": "module_configs",
+    "module_archive": "module_archive",
+    "module_cache": "module_cache",
+}
+CONTENT_HASH_MODULUS = 2**64
+
+
+class DeferredRequest:
+    """An HTTP request handed back to the flush instead of being sent"""
+
+    def __init__(self, request: Dict[str, Any]):
+        """Constructor"""
+        self.request = request
 
 
 class JsonAttributeInterface:
     """JsonAttributeInterface"""
 
     attribute_name: str = None
+    # Large documents that change a little at a time keep their last synced value
+    # so that updates can be sent as JSON patches
+    supports_json_patch: bool = False
 
-    def __init__(self, client: AgentDBClient):
+    def __init__(self, client: AgentDBClient, use_json_patch: bool = False):
         """Constructor"""
         self.client = client
+        self.use_json_patch = use_json_patch and self.supports_json_patch
+        # Hash of the last JSON value synced with AgentDB, by attribute_instance_id
+        self.synced_hashes: Dict[int, str] = {}
+        self.synced_values: Dict[int, Any] = {}
+        self.skipped_writes = 0
+
+    @staticmethod
+    def hash_value(value: Any) -> str:
+        """Hash a JSON value"""
+        return hashlib.sha256(json.dumps(value, sort_keys=True).encode()).hexdigest()
+
+    def mark_synced(
+        self, attribute_instance_id: int, value: Any, value_hash: Optional[str] = None
+    ):
+        """Record the value that AgentDB holds for an attribute instance"""
+        self.synced_hashes[attribute_instance_id] = value_hash or self.hash_value(value)
+        if self.supports_json_patch:
+            self.synced_values[attribute_instance_id] = copy.deepcopy(value)
+
+    def clear_synced(self):
+        """Forget all the synced values"""
+        self.synced_hashes = {}
+        self.synced_values = {}
+
+    def is_synced(self, model: BaseModel) -> bool:
+        """Check whether AgentDB already holds the current value of the model"""
+        if model.attribute_instance_id is None:
+            return False
+        return self.synced_hashes.get(model.attribute_instance_id) == self.hash_value(
+            model.model_dump(mode="json")
+        )
 
     def create_definition(self):
         """Create the attribute definition"""
@@ -81,12 +162,15 @@ class JsonAttributeInterface:
             raise ValueError(f"{self.attribute_name} attribute definition not found")
 
         # Create or update the tweet attribute instance
+        value = model.model_dump(mode="json")
         attr_instance = yield from self.client.create_attribute_instance(
             agent_instance=self.client.agent,
             attribute_def=attr_def,
-            value=model.model_dump(mode="json"),
+            value=value,
             value_type="json",
         )
+        if attr_instance:
+            self.mark_synced(attr_instance.attribute_id, value)
         return attr_instance
 
     def update_instance(self, model: BaseModel) -> Optional[AttributeInstance]:
@@ -102,16 +186,63 @@ class JsonAttributeInterface:
                 f"Attribute instance ID is required for updating {self.attribute_name}."
             )
 
-        # Update the attribute instance
-        updated_instance = yield from self.client.update_attribute_instance(
-            agent_instance=self.client.agent,
-            attribute_def=attr_def,
-            attribute_instance_id=model.attribute_instance_id,
-            value=model.model_dump(mode="json"),
-            value_type="json",
-        )
+        # Skip the request if AgentDB already holds this value
+        value = model.model_dump(mode="json")
+        value_hash = self.hash_value(value)
+        if self.synced_hashes.get(model.attribute_instance_id) == value_hash:
+            self.skipped_writes += 1
+            return None
+
+        updated_instance = None
+        if self.use_json_patch:
+            updated_instance = yield from self._patch_instance(
+                attr_def, model.attribute_instance_id, value
+            )
+
+        # Update the whole attribute instance
+        if updated_instance is None:
+            updated_instance = yield from self.client.update_attribute_instance(
+                agent_instance=self.client.agent,
+                attribute_def=attr_def,
+                attribute_instance_id=model.attribute_instance_id,
+                value=value,
+                value_type="json",
+            )
+        if updated_instance:
+            self.mark_synced(model.attribute_instance_id, value, value_hash)
         return updated_instance
 
+    def _patch_instance(
+        self, attr_def: AttributeDefinition, attribute_instance_id: int, value: Any
+    ) -> Generator[None, None, Optional[AttributeInstance]]:
+        """Send only the changes since the last sync. Returns None if a full write is needed."""
+        synced_value = self.synced_values.get(attribute_instance_id)
+        if synced_value is None:
+            return None
+
+        patch = jsonpatch.make_patch(synced_value, value).patch
+        if len(json.dumps(patch)) >= len(json.dumps(value)):
+            return None
+
+        try:
+            patched_instance = yield from self.client.patch_attribute_instance(
+                agent_instance=self.client.agent,
+                attribute_def=attr_def,
+                attribute_instance_id=attribute_instance_id,
+                patch=patch,
+            )
+        except Exception as e:  # pylint: disable=broad-except
+            self.client.logger.warning(f"JSON patch update failed: {e}")
+            patched_instance = None
+
+        if patched_instance is None:
+            # The backend does not support patches: stop trying
+            self.client.logger.warning(
+                f"Disabling JSON patch updates for {self.attribute_name}. Falling back to full writes."
+            )
+            self.use_json_patch = False
+        return patched_instance
+
 
 class TweetAttributeInterface(JsonAttributeInterface):
     """TweetAttribute"""
@@ -129,20 +260,139 @@ class ModuleConfigsAttributeInterface(JsonAttributeInterface):
     """ModuleConfigsAttribute"""
 
     attribute_name = "module_configs"
+    supports_json_patch = True
 
 
 class ModuleDataAttributeInterface(JsonAttributeInterface):
     """ModuleDataAttribute"""
 
     attribute_name = "module_data"
+    supports_json_patch = True
+
+
+class ModuleArchiveAttributeInterface(JsonAttributeInterface):
+    """ModuleArchiveAttribute"""
+
+    attribute_name = "module_archive"
+    supports_json_patch = True
+
+
+class ModuleCacheAttributeInterface(JsonAttributeInterface):
+    """ModuleCacheAttribute"""
+
+    attribute_name = "module_cache"
+    supports_json_patch = True
+
+
+class ContentHash:
+    """Hash of the DB content, split into one subtree per attribute type
+
+    Each subtree hash is the sum of the hashes of its records, so a record
+    change only costs rehashing that record. Records are marked dirty when
+    they are written or loaded and rehashed on the next digest.
+    """
+
+    def __init__(self) -> None:
+        """Init"""
+        self.leaves: Dict[str, Dict[Any, int]] = {}
+        self.sums: Dict[str, int] = {}
+        self.dirty: Dict[str, Set[Any]] = {}
+        self.reset()
+
+    def reset(self, subtree: Optional[str] = None) -> None:
+        """Forget the hashes of one subtree, or all of them"""
+        for name in [subtree] if subtree else CONTENT_SUBTREES.values():
+            self.leaves[name] = {}
+            self.sums[name] = 0
+            self.dirty[name] = set()
+
+    def mark(self, attr_name: str, key: Any) -> None:
+        """Mark a record as changed"""
+        self.dirty[CONTENT_SUBTREES[attr_name]].add(key)
+
+    @staticmethod
+    def hash_record(key: Any, model: BaseModel) -> int:
+        """Hash a record"""
+        # Attribute instance ids are only known by the writer, so they are not hashed
+        value = model.model_dump(mode="json")
+        value.pop("attribute_instance_id", None)
+        entry = json.dumps([key, value], sort_keys=True)
+        return int.from_bytes(hashlib.sha256(entry.encode()).digest()[:8], "big")
+
+    def digest(self, data: ContributeData) -> Dict[str, str]:
+        """Rehash the dirty records and get the subtree and root hashes"""
+        for subtree, keys in self.dirty.items():
+            leaves = self.leaves[subtree]
+            for key in keys:
+                self.sums[subtree] -= leaves.pop(key, 0)
+                model = self._get_record(data, subtree, key)
+                if model is not None:
+                    leaves[key] = self.hash_record(key, model)
+                    self.sums[subtree] += leaves[key]
+                self.sums[subtree] %= CONTENT_HASH_MODULUS
+            keys.clear()
+
+        hashes = {
+            subtree: f"{self.sums[subtree]:016x}:{len(self.leaves[subtree])}"
+            for subtree in CONTENT_SUBTREES.values()
+        }
+        hashes["root"] = hashlib.sha256(
+            json.dumps(hashes, sort_keys=True).encode()
+        ).hexdigest()
+        return hashes
+
+    @staticmethod
+    def _get_record(data: ContributeData, subtree: str, key: Any) -> Any:
+        """Get a record from the local data"""
+        if subtree == "users":
+            return data.users.get(key)
+        if subtree == "tweets":
+            return data.tweets.get(key)
+        return getattr(data, subtree)
 
 
 class ContributeDatabase(Model):
     """ContributeDatabase"""
 
-    def __init__(self, **kwargs: Any):
+    def __init__(
+        self,
+        incremental_sync: bool = True,
+        full_reload_interval: int = DEFAULT_FULL_RELOAD_INTERVAL,
+        json_patch_updates: bool = False,
+        snapshot_path: Optional[str] = None,
+        trusted_load: bool = False,
+        trusted_load_sample_interval: int = DEFAULT_TRUSTED_LOAD_SAMPLE_INTERVAL,
+        columnar_tweets: bool = False,
+        snapshot_sharing: bool = False,
+        snapshot_chunk_size: int = DEFAULT_SNAPSHOT_CHUNK_SIZE,
+        archive_retention: Optional[int] = DEFAULT_ARCHIVE_RETENTION,
+        max_concurrent_writes: int = DEFAULT_MAX_CONCURRENT_WRITES,
+        **kwargs: Any,
+    ):
         """Constructor"""
         super().__init__(**kwargs)
+        self.incremental_sync = incremental_sync
+        # Every full_reload_interval, every row is checked for in-place modifications
+        self.full_reload_interval = full_reload_interval
+        self.json_patch_updates = json_patch_updates
+        self.snapshot_path = snapshot_path
+        # Trusted loads build models without validation, except one row in every
+        # trusted_load_sample_interval, which is validated and compared
+        self.trusted_load = trusted_load
+        self.trusted_load_sample_interval = trusted_load_sample_interval
+        self.trusted_rows_loaded = 0
+        # Keep the tweets in a columnar TweetStore instead of one model per tweet
+        self.columnar_tweets = columnar_tweets
+        # One elected agent loads AgentDB and shares its snapshot through IPFS
+        self.snapshot_sharing = snapshot_sharing
+        self.snapshot_chunk_size = snapshot_chunk_size
+        # The loader's last published full snapshot, the base of its deltas
+        self.shared_snapshot: Optional[Dict[str, Any]] = None
+        self.exported_rows: Dict[int, int] = {}
+        # Closed scheduled tweets and campaigns older than this are archived
+        self.archive_retention = archive_retention
+        # The flush uploads up to max_concurrent_writes queued writes at once
+        self.max_concurrent_writes = max_concurrent_writes
         self.client = None
         self.agent_address = None
         self.logger = None
@@ -152,18 +402,74 @@ class ContributeDatabase(Model):
         self.user_interface = None
         self.module_configs_interface = None
         self.module_data_interface = None
-        self.data = ContributeData()
+        self.module_archive_interface = None
+        self.module_cache_interface = None
+        self.data = self._new_data()
+        self.user_index = UserIndex()
+        self.user_metrics = UserMetrics()
+        self.module_index = ModuleStatusIndex()
+        # Next free user id: above every loaded, created or reserved id
+        self.next_user_id = 0
+        # Content hash of the local data, the last one agreed by the service
+        # and the subtrees where this agent diverged from it
+        self.content_hash = ContentHash()
+        self.agreed_content_hash: Optional[Dict[str, str]] = None
+        self.divergent_subtrees: Set[str] = set()
         self.writer_addresses = []  # which addresses should write to the db
+        # Digests of the mutations since the last reset
+        self.write_batch: List[str] = []
+
+        # Write-behind unit of work: while active, the writer queues its uploads
+        # keyed by attribute so repeated writes to the same instance are coalesced
+        self.unit_of_work_active = False
+        self.pending_writes: Dict[Tuple[str, Any], Tuple[str, BaseModel]] = {}
+        self.flush_stats: Dict[str, Any] = {}
+
+        # Sync cursor: number of attribute instances already synced, the id of the
+        # last of them and the max attribute_id seen so far. New rows are appended
+        # after the cursor, rows modified in place are found by their last_updated
+        # marker, which is checked for every row each full_reload_interval.
+        self.synced_instance_count = 0
+        self.last_synced_attribute_id: Optional[int] = None
+        self.max_attribute_id: Optional[int] = None
+        self.synced_versions: Dict[int, str] = {}  # attr_id -> last_updated
+        self.last_full_check: Optional[datetime] = None
+        self.needs_full_reload = True
+
+    def _new_data(self) -> ContributeData:
+        """Get an empty ContributeData with the configured tweet storage"""
+        data = ContributeData()
+        if self.columnar_tweets:
+            data.tweets = TweetStore()
+        return data
+
+    def _attach_tweets(self, user: ContributeUser):
+        """Back a new user's tweets with their view on the tweet store"""
+        if isinstance(self.data.tweets, TweetStore) and user.twitter_id:
+            user.tweets = self.data.tweets.author_view(user.twitter_id)
 
     def initialize(self, client: AgentDBClient, agent_address: str):
         """Initialize agent"""
+        # Behaviours initialize us on every instantiation: keep the interfaces,
+        # and their synced hashes, as long as the client does not change
+        if self.client is not client or self.tweet_interface is None:
+            self.tweet_interface = TweetAttributeInterface(client)
+            self.user_interface = UserAttributeInterface(client)
+            self.module_configs_interface = ModuleConfigsAttributeInterface(
+                client, self.json_patch_updates
+            )
+            self.module_data_interface = ModuleDataAttributeInterface(
+                client, self.json_patch_updates
+            )
+            self.module_archive_interface = ModuleArchiveAttributeInterface(
+                client, self.json_patch_updates
+            )
+            self.module_cache_interface = ModuleCacheAttributeInterface(
+                client, self.json_patch_updates
+            )
         self.client = client
         self.agent_address = agent_address
         self.logger = self.client.logger
-        self.tweet_interface = TweetAttributeInterface(self.client)
-        self.user_interface = UserAttributeInterface(self.client)
-        self.module_configs_interface = ModuleConfigsAttributeInterface(self.client)
-        self.module_data_interface = ModuleDataAttributeInterface(self.client)
         self.agent = self.client.agent
         self.agent_type = self.client.agent_type
 
@@ -176,21 +482,242 @@ class ContributeDatabase(Model):
         if self.agent_address in self.writer_addresses:
             self.logger.info("I am the AgentDB writer")
             return True
+
+        # Non-writers only apply the changes locally. Rounds that need the writer
+        # to have finished wait for its write batch hash instead.
+        self.logger.info(
+            f"I am not the AgentDB writer. Writers are {self.writer_addresses}."
+        )
+        return False
+
+    def reset_write_batch(self):
+        """Start a new write batch"""
+        self.write_batch = []
+
+    def get_write_batch_hash(self) -> str:
+        """Get a hash of all the mutations applied since the last reset"""
+        return hashlib.sha256("".join(self.write_batch).encode()).hexdigest()
+
+    @property
+    def interfaces(self) -> Dict[str, JsonAttributeInterface]:
+        """Get the attribute interfaces by attribute name"""
+        return {
+            interface.attribute_name: interface
+            for interface in (
+                self.tweet_interface,
+                self.user_interface,
+                self.module_configs_interface,
+                self.module_data_interface,
+                self.module_archive_interface,
+                self.module_cache_interface,
+            )
+        }
+
+    @property
+    def skipped_writes(self) -> int:
+        """Number of updates skipped because AgentDB already held the value"""
+        return sum(interface.skipped_writes for interface in self.interfaces.values())
+
+    def _record_write(self, operation: str, attr_name: str, model: BaseModel):
+        """Add a mutation to the write batch"""
+        self.content_hash.mark(attr_name, self._content_key(attr_name, model))
+        # Attribute instance ids are only known by the writer, so they are not hashed
+        value = model.model_dump(mode="json")
+        value.pop("attribute_instance_id", None)
+        entry = json.dumps([operation, attr_name, value], sort_keys=True)
+        self.write_batch.append(hashlib.sha256(entry.encode()).hexdigest())
+
+    @staticmethod
+    def _content_key(attr_name: str, model: BaseModel) -> Any:
+        """Get the key of a record in its content hash subtree"""
+        if attr_name == "user":
+            return model.id
+        if attr_name == "tweet":
+            return model.tweet_id
+        return attr_name
+
+    def get_content_hash(self) -> Dict[str, str]:
+        """Get the subtree and root hashes of the local data"""
+        return self.content_hash.digest(self.data)
+
+    def set_agreed_content_hash(self, agreed: Dict[str, str]):
+        """Compare the local data with the content hash agreed by the service"""
+        local = self.get_content_hash()
+        self.agreed_content_hash = agreed
+        self.divergent_subtrees = {
+            subtree
+            for subtree in CONTENT_SUBTREES.values()
+            if local.get(subtree) != agreed.get(subtree)
+        }
+        if self.divergent_subtrees:
+            self.logger.warning(
+                f"Local data diverged from the agreed content hash in {sorted(self.divergent_subtrees)}. These will be reloaded."
+            )
+
+    def _mirror_write(self, interface: JsonAttributeInterface, model: BaseModel):
+        """Track an update that only the writer sends, so hashes stay in sync"""
+        if model.attribute_instance_id is not None:
+            interface.mark_synced(
+                model.attribute_instance_id, model.model_dump(mode="json")
+            )
+
+    def begin_unit_of_work(self):
+        """Queue the writer uploads until flush() is called"""
+        self.unit_of_work_active = True
+        self.pending_writes = {}
+        self.flush_stats = {
+            "writes_requested": 0,
+            "writes_coalesced": 0,
+            "writes_sent": 0,
+            "writes_failed": 0,
+            "writes_skipped": 0,
+            "wall_time": 0.0,
+        }
+
+    def flush(self) -> Generator[None, None, Dict[str, Any]]:
+        """Upload the queued writes and close the unit of work"""
+        self.unit_of_work_active = False
+        pending_writes, self.pending_writes = self.pending_writes, {}
+        if not pending_writes:
+            return self.flush_stats
+
+        start = time.time()
+        writes = list(pending_writes.values())
+        batch_size = max(1, self.max_concurrent_writes)
+        for i in range(0, len(writes), batch_size):
+            batch = writes[i : i + batch_size]
+            # No-op updates never reach AgentDB
+            skipped = [
+                operation != "create" and interface.is_synced(model)
+                for operation, interface, model in batch
+            ]
+            attr_instances = yield from self._upload_batch(batch)
+            for (_, interface, model), attr_instance, is_skipped in zip(
+                batch, attr_instances, skipped
+            ):
+                if is_skipped:
+                    self.flush_stats["writes_skipped"] += 1
+                    continue
+                self.flush_stats["writes_sent"] += 1
+                if attr_instance is None and not interface.is_synced(model):
+                    self.flush_stats["writes_failed"] += 1
+        self.flush_stats["wall_time"] = time.time() - start
+
+        self.logger.info(f"Flushed AgentDB writes: {self.flush_stats}")
+
+        # The local data no longer matches the remote one
+        if self.flush_stats["writes_failed"]:
+            self.logger.error(
+                f"{self.flush_stats['writes_failed']} AgentDB writes failed. Forcing a full reload on the next load."
+            )
+            self.force_full_reload()
         else:
-            self.logger.info(
-                f"I am not the AgentDB writer. Writers are {self.writer_addresses}.\nI'll wait for {NON_WRITER_WAIT} seconds."
+            self.save_snapshot()
+
+        return self.flush_stats
+
+    def _write(
+        self,
+        operation: str,
+        interface: JsonAttributeInterface,
+        key: Any,
+        model: BaseModel,
+    ) -> Generator[None, None, Optional[AttributeInstance]]:
+        """Upload a model, or queue it if a unit of work is active"""
+        if not self.unit_of_work_active:
+            attr_instance = yield from self._upload(operation, interface, model)
+            return attr_instance
+
+        self.flush_stats["writes_requested"] += 1
+        write_key = (interface.attribute_name, key)
+        if write_key in self.pending_writes:
+            self.flush_stats["writes_coalesced"] += 1
+            # A queued create will already upload the latest state of the model
+            if self.pending_writes[write_key][0] == "create":
+                operation = "create"
+        self.pending_writes[write_key] = (operation, interface, model)
+        return None
+
+    def _upload(
+        self, operation: str, interface: JsonAttributeInterface, model: BaseModel
+    ) -> Generator[None, None, Optional[AttributeInstance]]:
+        """Send a create or update request for a model"""
+        if operation == "create":
+            attr_instance = yield from interface.create_instance(model)
+            model.attribute_instance_id = (
+                attr_instance.attribute_id if attr_instance else None
             )
-            # Wait for a short time to allow the writer to do its thing
-            yield from self.client.sleep_func(NON_WRITER_WAIT)
-            self.logger.info("Done waiting")
-            return False
+        else:
+            attr_instance = yield from interface.update_instance(model)
+
+        # Our own writes are not modifications to merge on the next full check
+        if attr_instance is not None and attr_instance.attribute_id in (
+            self.synced_versions
+        ):
+            self.synced_versions[attr_instance.attribute_id] = self._get_row_version(
+                {"last_updated": attr_instance.last_updated}
+            )
+        return attr_instance
+
+    def _upload_batch(
+        self, batch: List[Tuple[str, JsonAttributeInterface, BaseModel]]
+    ) -> Generator[None, None, List[Optional[AttributeInstance]]]:
+        """Run several uploads side by side, sending their HTTP requests together"""
+        uploads = {
+            i: self._upload(operation, interface, model)
+            for i, (operation, interface, model) in enumerate(batch)
+        }
+        results: List[Optional[AttributeInstance]] = [None] * len(batch)
+        http_request_func = self.client.http_request_func
+        http_requests_func = self.client.http_requests_func
+        self.client.http_request_func = self._defer_http_request
+        try:
+            responses: Dict[int, Any] = {i: None for i in uploads}
+            while uploads:
+                # Advance every upload until it waits on a response or finishes
+                requests: Dict[int, Dict[str, Any]] = {}
+                for i, response in responses.items():
+                    try:
+                        value = uploads[i].send(response)
+                        while not isinstance(value, DeferredRequest):
+                            yield
+                            value = uploads[i].send(None)
+                        requests[i] = value.request
+                    except StopIteration as e:
+                        results[i] = e.value
+                        del uploads[i]
+                    except Exception as e:  # pylint: disable=broad-except
+                        self.logger.error(f"AgentDB write failed: {e}")
+                        del uploads[i]
+                if not requests:
+                    break
+
+                if http_requests_func is None:
+                    sent = []
+                    for request in requests.values():
+                        response = yield from http_request_func(**request)
+                        sent.append(response)
+                else:
+                    sent = yield from http_requests_func(list(requests.values()))
+                responses = dict(zip(requests, sent))
+        finally:
+            self.client.http_request_func = http_request_func
+        return results
+
+    @staticmethod
+    def _defer_http_request(**request: Any) -> Generator[Any, Any, Any]:
+        """Hand a request back to _upload_batch and wait for its response"""
+        response = yield DeferredRequest(request)
+        if response is None:
+            raise ValueError("No response was received")
+        return response
 
     def register(self):
         """Register agent and all definitions"""
         contribute_type = yield from self.client.get_agent_type_by_type_name(CONTRIBUTE)
 
         # Create Contribute agent
-        is_writer = yield from self.is_writer()
+        is_writer = self.is_writer()
         if not contribute_type and is_writer:
             contribute_type = yield from self.client.create_agent_type(
                 type_name="contribute",
@@ -226,6 +753,8 @@ class ContributeDatabase(Model):
         yield from self.user_interface.create_definition()
         yield from self.module_configs_interface.create_definition()
         yield from self.module_data_interface.create_definition()
+        yield from self.module_archive_interface.create_definition()
+        yield from self.module_cache_interface.create_definition()
 
     def get_user_by_attribute(self, key, value) -> Optional[ContributeUser]:
         """Get a user by one of its attributes"""
@@ -233,16 +762,37 @@ class ContributeDatabase(Model):
         if key not in ContributeUser.model_fields:
             raise ValueError(f"Invalid user attribute: {key}")
 
-        for user in self.data.users.values():
-            if getattr(user, key, None) == value:
+        if key in USER_INDEXED_FIELDS:
+            # Users added to data.users without going through this class
+            if len(self.user_index) != len(self.data.users):
+                self.reindex_users()
+            user = self.user_index.get(key, value)
+            if user:
                 return user
+        else:
+            for user in self.data.users.values():
+                if getattr(user, key, None) == value:
+                    return user
+
         self.logger.warning(f"User with {key}={value} not found in the database.")
         return None
 
+    def reindex_users(self):
+        """Rebuild the user indexes and metrics from the current users"""
+        self.user_index.rebuild(self.data.users.values())
+        self.user_metrics.rebuild(self.data.users.values())
+
+    def get_user_metrics(self) -> UserMetrics:
+        """Get the user metrics table"""
+        # Users added to data.users without going through this class
+        if len(self.user_metrics) != len(self.data.users):
+            self.reindex_users()
+        return self.user_metrics
+
     def create_tweet(self, tweet: UserTweet) -> Optional[AttributeInstance]:
         """Create a tweet attribute instance"""
 
-        is_writer = yield from self.is_writer()
+        is_writer = self.is_writer()
 
         # Check that the user exists
         user = self.get_user_by_attribute("twitter_id", tweet.twitter_user_id)
@@ -263,22 +813,19 @@ class ContributeDatabase(Model):
         )
 
         # Create the new tweet
+        self._record_write("create", "tweet", tweet)
         tweet_instance = None
         if is_writer:
-            tweet_instance = yield from self.tweet_interface.create_instance(tweet)
+            tweet_instance = yield from self._write(
+                "create", self.tweet_interface, tweet.tweet_id, tweet
+            )
 
-        tweet.attribute_instance_id = (
-            tweet_instance.attribute_id if tweet_instance else None
-        )
         self.data.tweets[tweet.tweet_id] = tweet
 
-        # Update the user
-        self.logger.info(f"Updating user {tweet.twitter_user_id} with new tweet")
-
-        user.tweets[tweet.tweet_id] = tweet
-
-        if is_writer:
-            yield from self.user_interface.update_instance(user)
+        # Link the tweet to the user. The user record does not store its tweets,
+        # so it does not need to be uploaded again.
+        user.add_tweet(tweet)
+        self.user_metrics.add_tweet(user, tweet)
 
         return tweet_instance
 
@@ -287,17 +834,21 @@ class ContributeDatabase(Model):
         tweet: UserTweet,
     ) -> Optional[AttributeInstance]:
         """Update a tweet attribute instance"""
-        is_writer = yield from self.is_writer()
+        self._record_write("update", "tweet", tweet)
+        is_writer = self.is_writer()
 
         if not is_writer:
+            self._mirror_write(self.tweet_interface, tweet)
             return None
 
-        attr_instance = yield from self.tweet_interface.update_instance(tweet)
+        attr_instance = yield from self._write(
+            "update", self.tweet_interface, tweet.tweet_id, tweet
+        )
         return attr_instance
 
     def create_user(self, user: ContributeUser) -> Optional[AttributeInstance]:
         """Create a user attribute instance"""
-        is_writer = yield from self.is_writer()
+        is_writer = self.is_writer()
 
         self.logger.info(
             f"Creating user: {user.id} with twitter_handle {user.twitter_handle}"
@@ -310,14 +861,26 @@ class ContributeDatabase(Model):
                 f"Trying to create a duplicated user:\n{user}\n\nUser already exists:\n{existing_user}"
             )
 
+        # Another creation took this id since it was allocated
+        if user.id in self.data.users:
+            new_id = self.get_next_user_id()
+            self.logger.warning(
+                f"User id {user.id} is already taken. Creating the user with id {new_id}"
+            )
+            user.id = new_id
+
+        self._record_write("create", "user", user)
         user_instance = None
         if is_writer:
-            user_instance = yield from self.user_interface.create_instance(user)
-            user.attribute_instance_id = (
-                user_instance.attribute_id if user_instance else None
+            user_instance = yield from self._write(
+                "create", self.user_interface, user.id, user
             )
 
+        self._attach_tweets(user)
         self.data.users[user.id] = user
+        self.user_index.add(user)
+        self.user_metrics.add(user)
+        self._track_user_id(user.id)
         self.logger.info(
             f"User {user.id} created [twitter_id={user.twitter_id}, twitter_handle={user.twitter_handle}]"
         )
@@ -328,6 +891,9 @@ class ContributeDatabase(Model):
     ) -> Tuple[bool, Optional[ContributeUser]]:
         """Does the user already exist"""
 
+        if len(self.user_index) != len(self.data.users):
+            self.reindex_users()
+
         UNIQUE_FIELDS = [
             "token_id",
             "discord_id",
@@ -341,8 +907,10 @@ class ContributeDatabase(Model):
 
         for field_name in UNIQUE_FIELDS:
             field_value = getattr(user, field_name, None)
-            existing_user = self.get_user_by_attribute(field_name, field_value)
-            if field_value is not None and existing_user:
+            if field_value is None:
+                continue
+            existing_user = self.user_index.get(field_name, field_value)
+            if existing_user:
                 self.logger.warning(
                     f"Found existing user with {field_name}={field_value}"
                 )
@@ -351,10 +919,15 @@ class ContributeDatabase(Model):
 
     def update_user(self, user: ContributeUser) -> Optional[AttributeInstance]:
         """Update a user attribute instance"""
-        is_writer = yield from self.is_writer()
+        if self.data.users.get(user.id) is user:
+            self.user_index.add(user)
+            self.user_metrics.add(user)
+        self._record_write("update", "user", user)
+        is_writer = self.is_writer()
         if not is_writer:
+            self._mirror_write(self.user_interface, user)
             return None
-        result = yield from self.user_interface.update_instance(user)
+        result = yield from self._write("update", self.user_interface, user.id, user)
         return result
 
     def create_or_update_user_by_key(self, key: str, value: Any, user: ContributeUser):
@@ -372,121 +945,914 @@ class ContributeDatabase(Model):
     ) -> Optional[AttributeInstance]:
         """Create a plugin config attribute instance"""
         self.logger.info("Creating module configs")
-        is_writer = yield from self.is_writer()
+        self._record_write("create", "module_configs", config)
+        is_writer = self.is_writer()
         module_configs_instance = None
         if is_writer:
-            module_configs_instance = (
-                yield from self.module_configs_interface.create_instance(config)
+            module_configs_instance = yield from self._write(
+                "create", self.module_configs_interface, None, config
             )
         self.data.module_configs = config
-        if module_configs_instance:
-            self.data.module_configs.attribute_instance_id = (
-                module_configs_instance.attribute_id
-            )
         return module_configs_instance
 
     def update_module_configs(
         self, configs: ModuleConfigs
     ) -> Optional[AttributeInstance]:
         """Update a plugin config attribute instance"""
-        is_writer = yield from self.is_writer()
+        self._record_write("update", "module_configs", configs)
+        is_writer = self.is_writer()
         if not is_writer:
+            self._mirror_write(self.module_configs_interface, configs)
             return None
-        attr_instance = yield from self.module_configs_interface.update_instance(
-            configs
+        attr_instance = yield from self._write(
+            "update", self.module_configs_interface, None, configs
         )
         return attr_instance
 
     def create_module_data(self, data: ModuleData) -> Optional[AttributeInstance]:
         """Create a plugin data attribute instance"""
-        is_writer = yield from self.is_writer()
+        is_writer = self.is_writer()
         self.logger.info("Creating module data")
+        self._record_write("create", "module_data", data)
         module_data_instance = None
         if is_writer:
-            module_data_instance = (
-                yield from self.module_data_interface.create_instance(data)
+            module_data_instance = yield from self._write(
+                "create", self.module_data_interface, None, data
             )
 
         self.data.module_data = data
-
-        if module_data_instance:
-            self.data.module_data.attribute_instance_id = (
-                module_data_instance.attribute_id
-            )
         return module_data_instance
 
     def update_module_data(self, data: ModuleData) -> Optional[AttributeInstance]:
         """Update a plugin data attribute instance"""
-        is_writer = yield from self.is_writer()
+        self._record_write("update", "module_data", data)
+        # Items may have been closed
+        self.module_index.module_data = None
+        is_writer = self.is_writer()
+        if not is_writer:
+            self._mirror_write(self.module_data_interface, data)
+            return None
+        attr_instance = yield from self._write(
+            "update", self.module_data_interface, None, data
+        )
+        return attr_instance
+
+    def create_module_archive(
+        self, archive: ModuleArchive
+    ) -> Optional[AttributeInstance]:
+        """Create the module archive attribute instance"""
+        is_writer = self.is_writer()
+        self.logger.info("Creating module archive")
+        self._record_write("create", "module_archive", archive)
+        module_archive_instance = None
+        if is_writer:
+            # The archive was added after the other definitions were registered
+            yield from self.module_archive_interface.create_definition()
+            module_archive_instance = yield from self._write(
+                "create", self.module_archive_interface, None, archive
+            )
+
+        self.data.module_archive = archive
+        return module_archive_instance
+
+    def update_module_archive(
+        self, archive: ModuleArchive
+    ) -> Optional[AttributeInstance]:
+        """Update the module archive attribute instance"""
+        self._record_write("update", "module_archive", archive)
+        is_writer = self.is_writer()
         if not is_writer:
+            self._mirror_write(self.module_archive_interface, archive)
             return None
-        attr_instance = yield from self.module_data_interface.update_instance(data)
+        attr_instance = yield from self._write(
+            "update", self.module_archive_interface, None, archive
+        )
         return attr_instance
 
+    def create_module_cache(self, cache: ModuleCache) -> Optional[AttributeInstance]:
+        """Create the module cache attribute instance"""
+        is_writer = self.is_writer()
+        self.logger.info("Creating module cache")
+        self._record_write("create", "module_cache", cache)
+        module_cache_instance = None
+        if is_writer:
+            # The cache was added after the other definitions were registered
+            yield from self.module_cache_interface.create_definition()
+            module_cache_instance = yield from self._write(
+                "create", self.module_cache_interface, None, cache
+            )
+
+        self.data.module_cache = cache
+        return module_cache_instance
+
+    def update_module_cache(self, cache: ModuleCache) -> Optional[AttributeInstance]:
+        """Update the module cache attribute instance"""
+        self._record_write("update", "module_cache", cache)
+        is_writer = self.is_writer()
+        if not is_writer:
+            self._mirror_write(self.module_cache_interface, cache)
+            return None
+        attr_instance = yield from self._write(
+            "update", self.module_cache_interface, None, cache
+        )
+        return attr_instance
+
+    def get_module_index(self) -> ModuleStatusIndex:
+        """Get the index of the open scheduled tweets and campaigns"""
+        if self.module_index.is_stale(self.data.module_data):
+            self.module_index.rebuild(self.data.module_data)
+        return self.module_index
+
+    def compact_module_data(self, now: datetime) -> Generator[None, None, int]:
+        """Move the closed scheduled tweets and campaigns older than the retention window to the archive"""
+        if self.archive_retention is None:
+            return 0
+
+        cutoff = now.timestamp() - self.archive_retention
+        module_data = self.data.module_data
+        tweets = module_data.scheduled_tweet.tweets
+        campaigns = module_data.twitter_campaigns.campaigns
+        archived_tweets = [
+            tweet
+            for tweet in tweets
+            if tweet.is_closed() and tweet.createdDate < cutoff
+        ]
+        archived_campaigns = [
+            campaign
+            for campaign in campaigns
+            if campaign.is_closed() and campaign.end_ts < cutoff
+        ]
+        if not archived_tweets and not archived_campaigns:
+            return 0
+
+        self.logger.info(
+            f"Archiving {len(archived_tweets)} scheduled tweets and {len(archived_campaigns)} campaigns"
+        )
+
+        # Write the archive first: an interrupted compaction duplicates items instead of losing them
+        archive = self.data.module_archive
+        if archive is None:
+            archive = ModuleArchive(
+                scheduled_tweets=archived_tweets, campaigns=archived_campaigns
+            )
+            yield from self.create_module_archive(archive)
+        else:
+            archive.scheduled_tweets.extend(archived_tweets)
+            archive.campaigns.extend(archived_campaigns)
+            yield from self.update_module_archive(archive)
+
+        archived_ids = {id(item) for item in archived_tweets + archived_campaigns}
+        module_data.scheduled_tweet.tweets = [
+            tweet for tweet in tweets if id(tweet) not in archived_ids
+        ]
+        module_data.twitter_campaigns.campaigns = [
+            campaign for campaign in campaigns if id(campaign) not in archived_ids
+        ]
+        yield from self.update_module_data(module_data)
+        return len(archived_ids)
+
+    def force_full_reload(self):
+        """Discard the sync cursor so the next load pages the whole DB again"""
+        self.needs_full_reload = True
+
+    def is_full_reload_needed(self) -> bool:
+        """Check whether the next load must be a full reload"""
+        return (
+            not self.incremental_sync
+            or self.needs_full_reload
+            or self.last_full_check is None
+        )
+
+    def is_full_check_needed(self) -> bool:
+        """Check whether the next load must check every row for modifications"""
+        elapsed = (datetime.now(timezone.utc) - self.last_full_check).total_seconds()
+        return elapsed >= self.full_reload_interval
+
     def load_from_remote_db(self):
         """Load data from the remote database."""
 
-        self.data = ContributeData()
-
         if self.client.agent is None:
             yield from self.client.ensure_agent_is_loaded()
 
+        # A unit of work that was never flushed leaves local-only changes behind
+        if self.unit_of_work_active:
+            self.logger.warning(
+                f"Discarding {len(self.pending_writes)} unflushed AgentDB writes"
+            )
+            self.unit_of_work_active = False
+            self.pending_writes = {}
+            self.force_full_reload()
+
+        # On a cold start, begin from the local snapshot and only fetch the delta
+        if self.last_full_check is None and self.incremental_sync:
+            self.load_snapshot()
+
+        if not self.is_full_reload_needed():
+            try:
+                if self.divergent_subtrees & {"users", "tweets"}:
+                    yield from self._load_subtrees_from_remote_db()
+                elif self.is_full_check_needed():
+                    yield from self._load_modified_from_remote_db()
+                elif self.divergent_subtrees or not self.is_content_agreed():
+                    yield from self._load_delta_from_remote_db()
+                else:
+                    self.logger.info(
+                        "Local data matches the agreed content hash. Skipping the reload..."
+                    )
+                    yield from self._refresh_modules()
+                self.save_snapshot()
+                return
+            except ValueError as e:
+                self.logger.error(
+                    f"Incremental sync failed: {e}. Falling back to a full reload..."
+                )
+
+        trusted_load = self.trusted_load
+        try:
+            yield from self._load_full_from_remote_db()
+        except ValueError:
+            # Trusted loads are disabled when a sampled row fails validation
+            if not trusted_load or self.trusted_load:
+                raise
+            self.logger.error("Trusted load failed. Retrying with full validation...")
+            yield from self._load_full_from_remote_db()
+        self.save_snapshot()
+
+    def is_content_agreed(self) -> bool:
+        """Check whether the local data still matches the last agreed content hash"""
+        if self.agreed_content_hash is None:
+            return False
+        return self.get_content_hash()["root"] == self.agreed_content_hash["root"]
+
+    def _load_full_from_remote_db(self):
+        """Page the whole remote database and rebuild the local data."""
+
+        self.logger.info("Performing a full load of the remote database")
+        self.needs_full_reload = True
+        self.data = self._new_data()
+        self.user_index.rebuild([])
+        self.user_metrics.rebuild([])
+        self.next_user_id = 0
+        self.content_hash.reset()
+        self.synced_versions = {}
+        for interface in self.interfaces.values():
+            interface.clear_synced()
+
         attributes = yield from self.client.get_all_agent_instance_attributes_parsed(
-            self.client.agent
+            self.client.agent, trusted=self.trusted_load
         )
 
         for attribute in attributes:
-            attr_name = attribute["attr_name"]
-            attr_data = attribute["attr_value"] | {
-                "attribute_instance_id": attribute["attr_id"]
-            }
+            self._load_attribute(attribute, allow_existing=False)
 
-            try:
-                if attr_name == "tweet":
-                    tweet = UserTweet(**attr_data)
-                    self.data.tweets[tweet.tweet_id] = tweet
+        self.data.sort()
+
+        for tweet in self.data.tweets.values():
+            self._link_tweet_to_user(tweet)
+        self.user_metrics.rebuild(self.data.users.values())
+
+        self._check_loaded_data()
+
+        self._set_sync_cursor(0, attributes)
+        self.last_full_check = datetime.now(timezone.utc)
+        self.needs_full_reload = False
+        self.divergent_subtrees = set()
+
+    def _load_delta_from_remote_db(self):
+        """Fetch only the attribute instances appended since the last sync and merge them."""
+
+        self.logger.info(
+            f"Performing an incremental load of the remote database [skip={self.synced_instance_count}, max_attribute_id={self.max_attribute_id}]"
+        )
+
+        # Until the merge finishes, the local data cannot be trusted
+        self.needs_full_reload = True
+
+        # Fetch the last synced row again: if it moved, rows below the cursor
+        # were deleted or reordered and the cursor is no longer valid
+        skip = max(self.synced_instance_count - 1, 0)
+        attributes = yield from self.client.get_all_agent_instance_attributes_parsed(
+            self.client.agent, skip, self.trusted_load
+        )
+        if self.last_synced_attribute_id is not None and (
+            not attributes or attributes[0]["attr_id"] != self.last_synced_attribute_id
+        ):
+            raise ValueError(
+                f"Attribute instance {self.last_synced_attribute_id} is no longer at the sync cursor"
+            )
+
+        changed = []
+        for attribute in attributes:
+            if attribute["attr_id"] in self.synced_versions:
+                if not self._is_row_modified(attribute):
                     continue
+            # New pages must only contain instances we have never seen
+            elif (
+                self.max_attribute_id is not None
+                and attribute["attr_id"] <= self.max_attribute_id
+            ):
+                raise ValueError(
+                    f"Attribute instance {attribute['attr_id']} is older than the sync cursor {self.max_attribute_id}"
+                )
+            changed.append(attribute)
+
+        self._merge_attributes(changed)
+        yield from self._refresh_modules()
+
+        self.data.sort()
+        self._check_loaded_data()
+
+        self._set_sync_cursor(skip, attributes)
+        self.needs_full_reload = False
+        self.divergent_subtrees = set()
+        self.logger.info(
+            f"Merged {len(changed)} new attribute instances from the remote database"
+        )
+
+    def _load_modified_from_remote_db(self):
+        """Page the whole remote database and merge only the rows that are new or were modified."""
+
+        self.logger.info("Checking every row of the remote database for modifications")
+        self.needs_full_reload = True
+
+        attributes = yield from self.client.get_all_agent_instance_attributes_parsed(
+            self.client.agent, trusted=self.trusted_load
+        )
+
+        deleted = self.synced_versions.keys() - {
+            attribute["attr_id"] for attribute in attributes
+        }
+        if deleted:
+            raise ValueError(
+                f"{len(deleted)} attribute instances were deleted from the remote database"
+            )
+
+        changed = [
+            attribute
+            for attribute in attributes
+            if attribute["attr_id"] not in self.synced_versions
+            or self._is_row_modified(attribute)
+        ]
+        self._merge_attributes(changed)
+        yield from self._refresh_modules()
+
+        self.data.sort()
+        self._check_loaded_data()
 
-                if attr_name == "user":
-                    attr_data["tweets"] = {}
-                    user = ContributeUser(**attr_data)
+        self._set_sync_cursor(0, attributes)
+        self.last_full_check = datetime.now(timezone.utc)
+        self.needs_full_reload = False
+        self.divergent_subtrees = set()
+        self.logger.info(
+            f"Merged {len(changed)} new or modified attribute instances out of {len(attributes)}"
+        )
+
+    def _merge_attributes(self, attributes: List[Dict]):
+        """Merge new or modified rows into the local data"""
+        tweets = []
+        for attribute in attributes:
+            model = self._load_attribute(attribute, allow_existing=True)
+            if isinstance(model, UserTweet):
+                tweets.append(model)
+
+        # Link after loading so that new authors are already present
+        authors = {}
+        for tweet in tweets:
+            user = self._link_tweet_to_user(tweet)
+            if user:
+                authors[user.id] = user
+        for user in authors.values():
+            self.user_metrics.update(user)
+
+    def _set_sync_cursor(self, skip: int, attributes: List[Dict]):
+        """Place the sync cursor after the rows of a load that started at skip"""
+        if not skip:
+            self.last_synced_attribute_id = None
+            self.max_attribute_id = None
+        self.synced_instance_count = skip + len(attributes)
+        if attributes:
+            self.last_synced_attribute_id = attributes[-1]["attr_id"]
+            self.max_attribute_id = max(
+                [attribute["attr_id"] for attribute in attributes]
+                + ([self.max_attribute_id] if self.max_attribute_id is not None else [])
+            )
+
+    @staticmethod
+    def _get_row_version(attribute: Dict) -> Optional[str]:
+        """Get the modification marker of a row"""
+        last_updated = attribute.get("last_updated")
+        if isinstance(last_updated, str):
+            # Trusted loads keep the raw string
+            try:
+                last_updated = datetime.fromisoformat(
+                    last_updated.replace("Z", "+00:00")
+                )
+            except ValueError:
+                return last_updated
+        return last_updated.isoformat() if last_updated else None
+
+    def _is_row_modified(self, attribute: Dict) -> bool:
+        """Check whether a synced row was modified since it was synced"""
+        return self.synced_versions.get(attribute["attr_id"]) != self._get_row_version(
+            attribute
+        )
+
+    def _load_subtrees_from_remote_db(self):
+        """Page the remote database and rebuild only the divergent subtrees"""
+
+        subtrees = self.divergent_subtrees
+        self.logger.info(
+            f"Reloading the divergent subtrees {sorted(subtrees)} from the remote database"
+        )
+        self.needs_full_reload = True
+
+        attributes = yield from self.client.get_all_agent_instance_attributes_parsed(
+            self.client.agent, trusted=self.trusted_load
+        )
+
+        if "users" in subtrees:
+            self.data.users = {}
+            self.user_index.rebuild([])
+            self.next_user_id = 0
+            self.user_interface.clear_synced()
+        if "tweets" in subtrees:
+            self.data.tweets = self._new_data().tweets
+            self.tweet_interface.clear_synced()
+        for subtree in subtrees:
+            self.content_hash.reset(subtree)
+
+        # Rows of the other subtrees are only merged if they are new or modified
+        for attribute in attributes:
+            if (
+                CONTENT_SUBTREES.get(attribute["attr_name"]) in subtrees
+                or attribute["attr_id"] not in self.synced_versions
+                or self._is_row_modified(attribute)
+            ):
+                self._load_attribute(attribute, allow_existing=True)
+
+        # Link every tweet again: either the tweets or their authors are new objects
+        for user in self.data.users.values():
+            user.tweets = {}
+            self._attach_tweets(user)
+        for tweet in self.data.tweets.values():
+            self._link_tweet_to_user(tweet)
+        self.user_metrics.rebuild(self.data.users.values())
 
-                    if user.id in self.data.users:
+        yield from self._refresh_modules()
+
+        self.data.sort()
+        self._check_loaded_data()
+
+        self._set_sync_cursor(0, attributes)
+        self.last_full_check = datetime.now(timezone.utc)
+        self.needs_full_reload = False
+        self.divergent_subtrees = set()
+
+    def _refresh_modules(self):
+        """Fetch the module data and configs again"""
+
+        # Module data and configs can be modified from outside the service,
+        # so they are always refreshed
+        for module in [self.data.module_data, self.data.module_configs]:
+            if module.attribute_instance_id is None:
+                raise ValueError(f"{type(module).__name__} has no attribute instance")
+            attribute_instance = (
+                yield from self.client.get_attribute_instance_by_attribute_id(
+                    module.attribute_instance_id
+                )
+            )
+            if attribute_instance is None:
+                raise ValueError(
+                    f"{type(module).__name__} attribute instance {module.attribute_instance_id} not found"
+                )
+            attribute = yield from self.client.parse_attribute_instance(
+                attribute_instance
+            )
+            self._load_attribute(attribute, allow_existing=True)
+
+    def _load_attribute(self, attribute: Dict, allow_existing: bool):
+        """Build a model from a parsed attribute and merge it into the local data"""
+        attr_name = attribute["attr_name"]
+        attr_data = attribute["attr_value"] | {
+            "attribute_instance_id": attribute["attr_id"]
+        }
+
+        # Hashing every tweet and user dominates trusted loads, so there their
+        # first update is always sent
+        interface = self.interfaces.get(attr_name)
+        if interface and not (
+            self.trusted_load and attr_name in TRUSTED_UNHASHED_ATTRIBUTES
+        ):
+            interface.mark_synced(attribute["attr_id"], attribute["attr_value"])
+        self.synced_versions[attribute["attr_id"]] = self._get_row_version(attribute)
+
+        try:
+            if attr_name == "tweet":
+                tweet = self._build_model(UserTweet, attr_data)
+                self.data.tweets[tweet.tweet_id] = tweet
+                self.content_hash.mark(attr_name, tweet.tweet_id)
+                return tweet
+
+            if attr_name == "user":
+                attr_data["tweets"] = {}
+                user = self._build_model(ContributeUser, attr_data)
+
+                if user.id in self.data.users:
+                    if not allow_existing:
                         raise ValueError(
                             f"User with id {user.id} already exists.\nExisting: {self.data.users[user.id]}\nNew: {user}"
                         )
+                    # Keep the tweets that were already linked to this user
+                    user.tweets = self.data.users[user.id].tweets
+                else:
+                    self._attach_tweets(user)
+
+                self.data.users[user.id] = user
+                self.user_index.add(user)
+                self.user_metrics.add(user)
+                self._track_user_id(user.id)
+                self.content_hash.mark(attr_name, user.id)
+                return user
 
-                    self.data.users[user.id] = user
-                    continue
+            if attr_name == "module_configs":
+                module_configs = ModuleConfigs(**attr_data)
+                self.data.module_configs = module_configs
+                self.content_hash.mark(attr_name, attr_name)
+                return module_configs
+
+            if attr_name == "module_data":
+                module_data = ModuleData(**attr_data)
+                self.data.module_data = module_data
+                self.content_hash.mark(attr_name, attr_name)
+                return module_data
+
+            if attr_name == "module_archive":
+                module_archive = ModuleArchive(**attr_data)
+                self.data.module_archive = module_archive
+                self.content_hash.mark(attr_name, attr_name)
+                return module_archive
+
+            if attr_name == "module_cache":
+                module_cache = ModuleCache(**attr_data)
+                self.data.module_cache = module_cache
+                self.content_hash.mark(attr_name, attr_name)
+                return module_cache
+
+        except ValidationError as e:
+            raise ValueError(
+                f"Failed to load attribute {attr_name} with data {attr_data}. Error: {e}"
+            ) from e
+
+        raise ValueError(f"Unknown attribute name: {attr_name}")
+
+    def _build_model(self, model_class: Any, attr_data: Dict) -> BaseModel:
+        """Build a tweet or user, skipping the Python validators in trusted mode"""
+        if not self.trusted_load:
+            return model_class(**attr_data)
+
+        model = model_class.model_validate(attr_data, context={TRUSTED_CONTEXT: True})
+        self.trusted_rows_loaded += 1
+        if (
+            self.trusted_load_sample_interval
+            and self.trusted_rows_loaded % self.trusted_load_sample_interval == 0
+        ):
+            try:
+                is_valid = model_class(**attr_data) == model
+            except ValidationError:
+                is_valid = False
+            if not is_valid:
+                # Stop trusting the remote data: the retry will validate every row
+                self.trusted_load = False
+                raise ValueError(
+                    f"Sampled validation failed for trusted {model_class.__name__} {attr_data}. Disabling trusted loads."
+                )
+        return model
 
-                if attr_name == "module_configs":
-                    module_configs = ModuleConfigs(**attr_data)
-                    self.data.module_configs = module_configs
-                    continue
+    def _link_tweet_to_user(self, tweet: UserTweet) -> Optional[ContributeUser]:
+        """Add a tweet to its author's tweets and return the author"""
+        user = self.get_user_by_attribute("twitter_id", tweet.twitter_user_id)
+        if not user:
+            self.logger.error(
+                f"User with twitter_id {tweet.twitter_user_id} not found for tweet {tweet}. Skipping this tweet..."
+            )
+            return None
 
-                if attr_name == "module_data":
-                    module_data = ModuleData(**attr_data)
-                    self.data.module_data = module_data
-                    continue
+        # Store views already list every tweet of their author
+        if not isinstance(user.tweets, AuthorTweets):
+            user.add_tweet(tweet)
+        return user
 
-            except ValidationError as e:
-                raise ValueError(
-                    f"Failed to load attribute {attr_name} with data {attr_data}. Error: {e}"
-                ) from e
+    def build_snapshot(self) -> Optional[bytes]:
+        """Serialize the local data and the sync cursor, None if the data cannot be trusted"""
+        content = self._snapshot_content()
+        if content is None:
+            return None
+        return self._pack_snapshot(content)
 
-            raise ValueError(f"Unknown attribute name: {attr_name}")
+    def _snapshot_content(self) -> Optional[Dict[str, Any]]:
+        """Get the local data and the sync cursor, None if the data cannot be trusted"""
+        if self.needs_full_reload or self.last_full_check is None:
+            return None
 
-        self.data.sort()
+        # Stored as attribute rows so that loading replays the same path as AgentDB.
+        # Models without an instance id are newer than the cursor and will be
+        # fetched again by the next delta.
+        models = [("tweet", tweet) for tweet in self.data.tweets.values()] + [
+            ("user", user) for user in self.data.users.values()
+        ]
+        models += [
+            ("module_configs", self.data.module_configs),
+            ("module_data", self.data.module_data),
+            ("module_archive", self.data.module_archive),
+            ("module_cache", self.data.module_cache),
+        ]
+        return {
+            "agent_id": self.client.agent.agent_id if self.client.agent else None,
+            "synced_instance_count": self.synced_instance_count,
+            "last_synced_attribute_id": self.last_synced_attribute_id,
+            "max_attribute_id": self.max_attribute_id,
+            "last_full_check": self.last_full_check.isoformat(),
+            "synced_versions": self.synced_versions,
+            "attributes": [
+                [attr_name, model.attribute_instance_id, model.model_dump(mode="json")]
+                for attr_name, model in models
+                if model is not None and model.attribute_instance_id is not None
+            ],
+        }
+
+    @staticmethod
+    def _pack_snapshot(content: Dict[str, Any]) -> bytes:
+        """Compress a snapshot and prepend its header"""
+        body = zlib.compress(json.dumps(content, separators=(",", ":")).encode())
+        header = SNAPSHOT_HEADER.pack(
+            SNAPSHOT_MAGIC, SNAPSHOT_VERSION, hashlib.sha256(body).digest()
+        )
+        return header + body
+
+    @staticmethod
+    def _unpack_snapshot(snapshot: bytes) -> Dict[str, Any]:
+        """Check the header of a snapshot and decompress it"""
+        magic, version, checksum = SNAPSHOT_HEADER.unpack_from(snapshot)
+        body = snapshot[SNAPSHOT_HEADER.size :]
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+            raise ValueError(f"unsupported snapshot format {magic!r} v{version}")
+        if hashlib.sha256(body).digest() != checksum:
+            raise ValueError("checksum mismatch")
+        return json.loads(zlib.decompress(body))
+
+    def save_snapshot(self):
+        """Write the local data and the sync cursor to the snapshot file"""
+        if not self.snapshot_path:
+            return
 
-        for tweet_id, tweet in self.data.tweets.items():
-            user = self.get_user_by_attribute("twitter_id", tweet.twitter_user_id)
-            if not user:
-                self.logger.error(
-                    f"User with twitter_id {tweet.twitter_user_id} not found for tweet {tweet}. Skipping this tweet..."
+        snapshot = self.build_snapshot()
+        if snapshot is None:
+            return
+
+        tmp_path = f"{self.snapshot_path}.tmp"
+        try:
+            with open(tmp_path, "wb") as file:
+                file.write(snapshot)
+            os.replace(tmp_path, self.snapshot_path)
+        except OSError as e:
+            self.logger.warning(f"Could not write the DB snapshot: {e}")
+
+    def load_snapshot(self) -> bool:
+        """Restore the local data and the sync cursor from the snapshot file"""
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return False
+
+        try:
+            with open(self.snapshot_path, "rb") as file:
+                snapshot = file.read()
+        except OSError as e:
+            self.logger.warning(f"Ignoring the DB snapshot {self.snapshot_path}: {e}")
+            return False
+        return self.restore_snapshot(snapshot, self.snapshot_path)
+
+    def restore_snapshot(self, snapshot: bytes, source: str) -> bool:
+        """Replace the local data and the sync cursor with the ones in a snapshot"""
+        try:
+            content = self._unpack_snapshot(snapshot)
+            agent_id = self.client.agent.agent_id if self.client.agent else None
+            if content["agent_id"] != agent_id:
+                raise ValueError(f"snapshot belongs to agent {content['agent_id']}")
+
+            # Rows modified since an old snapshot are merged by the next full check
+            last_full_check = datetime.fromisoformat(content["last_full_check"])
+
+            self.data = self._new_data()
+            self.user_index.rebuild([])
+            self.user_metrics.rebuild([])
+            self.next_user_id = 0
+            self.content_hash.reset()
+            for interface in self.interfaces.values():
+                interface.clear_synced()
+            for attr_name, attr_id, attr_value in content["attributes"]:
+                self._load_attribute(
+                    {
+                        "attr_name": attr_name,
+                        "attr_id": attr_id,
+                        "attr_value": attr_value,
+                    },
+                    allow_existing=False,
                 )
-                continue
+            self.synced_versions = {
+                int(attr_id): last_updated
+                for attr_id, last_updated in content["synced_versions"].items()
+            }
+            self.data.sort()
+            for tweet in self.data.tweets.values():
+                self._link_tweet_to_user(tweet)
+            self.user_metrics.rebuild(self.data.users.values())
+            self._check_loaded_data()
+        except (
+            OSError,
+            ValueError,
+            KeyError,
+            TypeError,
+            struct.error,
+            zlib.error,
+        ) as e:
+            self.logger.warning(f"Ignoring the DB snapshot {source}: {e}")
+            self.data = self._new_data()
+            self.user_index.rebuild([])
+            self.user_metrics.rebuild([])
+            self.next_user_id = 0
+            self.content_hash.reset()
+            self.force_full_reload()
+            return False
+
+        self.synced_instance_count = content["synced_instance_count"]
+        self.last_synced_attribute_id = content["last_synced_attribute_id"]
+        self.max_attribute_id = content["max_attribute_id"]
+        self.last_full_check = last_full_check
+        self.needs_full_reload = False
+        self.logger.info(
+            f"Loaded the DB snapshot {source}: {len(self.data.users)} users and {len(self.data.tweets)} tweets [skip={self.synced_instance_count}]"
+        )
+        return True
+
+    def export_snapshot_chunks(self) -> Optional[Dict[str, Dict]]:
+        """Split the snapshot into JSON files to be shared through IPFS"""
+        content = self._snapshot_content()
+        if content is None:
+            return None
 
-            user.tweets[tweet_id] = tweet
+        # Base of the next deltas once the snapshot is published
+        self.exported_rows = self._hash_rows(content)
+        return self._split_chunks(self._pack_snapshot(content))
+
+    def mark_snapshot_shared(self, ipfs_hash: str):
+        """Use the last exported snapshot as the base of the next deltas"""
+        self.shared_snapshot = {
+            "ipfs_hash": ipfs_hash,
+            "content_root": self.get_content_hash()["root"],
+            "rows": self.exported_rows,
+        }
+
+    def export_snapshot_delta(self) -> Optional[Dict[str, Dict]]:
+        """Split the rows changed since the shared snapshot into JSON files, None if a full snapshot is due"""
+        if self.shared_snapshot is None:
+            return None
+        content = self._snapshot_content()
+        if content is None:
+            return None
+
+        # Deltas only add or replace rows
+        base_rows = self.shared_snapshot["rows"]
+        rows = self._hash_rows(content)
+        if base_rows.keys() - rows.keys():
+            return None
+
+        changed = [
+            attribute
+            for attribute in content["attributes"]
+            if rows[attribute[1]] != base_rows.get(attribute[1])
+        ]
+        if len(changed) > len(rows) * MAX_SNAPSHOT_DELTA_RATIO:
+            return None
+
+        changed_ids = {attribute[1] for attribute in changed}
+        content["attributes"] = changed
+        content["synced_versions"] = {
+            attr_id: last_updated
+            for attr_id, last_updated in self.synced_versions.items()
+            if attr_id in changed_ids
+        }
+        content["base_root"] = self.shared_snapshot["content_root"]
+        return self._split_chunks(self._pack_snapshot(content))
+
+    @staticmethod
+    def _hash_rows(content: Dict[str, Any]) -> Dict[int, int]:
+        """Hash every row of a snapshot, keyed by attribute instance id"""
+        synced_versions = content["synced_versions"]
+        return {
+            attr_id: int.from_bytes(
+                hashlib.sha256(
+                    json.dumps(
+                        [attr_name, attr_value, synced_versions.get(attr_id)],
+                        sort_keys=True,
+                    ).encode()
+                ).digest()[:8],
+                "big",
+            )
+            for attr_name, attr_id, attr_value in content["attributes"]
+        }
+
+    def _split_chunks(self, snapshot: bytes) -> Dict[str, Dict]:
+        """Split a packed snapshot into JSON files"""
+        size = self.snapshot_chunk_size
+        return {
+            f"chunk_{index:05d}.json": {
+                "index": index,
+                "data": base64.b64encode(snapshot[start : start + size]).decode(),
+            }
+            for index, start in enumerate(range(0, len(snapshot), size))
+        }
+
+    @staticmethod
+    def _join_chunks(chunks: Dict[str, Dict]) -> bytes:
+        """Join the JSON files of a packed snapshot"""
+        # IPFS returns a single file without its name
+        if "index" in chunks:
+            chunks = {"chunk": chunks}
+        parts = sorted(chunks.values(), key=lambda chunk: chunk["index"])
+        if [chunk["index"] for chunk in parts] != list(range(len(parts))):
+            raise ValueError("missing chunks")
+        return b"".join(base64.b64decode(chunk["data"]) for chunk in parts)
+
+    def import_snapshot_chunks(
+        self, chunks: Dict[str, Dict], content_root: str
+    ) -> bool:
+        """Restore a snapshot shared through IPFS and verify it against the loader's content hash"""
+        try:
+            snapshot = self._join_chunks(chunks)
+        except (KeyError, TypeError, ValueError) as e:
+            self.logger.warning(f"Ignoring the shared DB snapshot: {e}")
+            return False
+
+        if not self.restore_snapshot(snapshot, "shared through IPFS"):
+            return False
+        return self._check_shared_root(content_root)
+
+    def import_snapshot_delta(self, chunks: Dict[str, Dict], content_root: str) -> bool:
+        """Merge a delta shared through IPFS into the local data and verify it against the loader's content hash"""
+        if self.needs_full_reload or self.last_full_check is None:
+            return False
+
+        try:
+            content = self._unpack_snapshot(self._join_chunks(chunks))
+            agent_id = self.client.agent.agent_id if self.client.agent else None
+            if content["agent_id"] != agent_id:
+                raise ValueError(f"delta belongs to agent {content['agent_id']}")
+            last_full_check = datetime.fromisoformat(content["last_full_check"])
+        except (KeyError, TypeError, ValueError, struct.error, zlib.error) as e:
+            self.logger.warning(f"Ignoring the shared DB delta: {e}")
+            return False
+
+        try:
+            self._merge_attributes(
+                [
+                    {"attr_name": attr_name, "attr_id": attr_id, "attr_value": value}
+                    for attr_name, attr_id, value in content["attributes"]
+                ]
+            )
+            self.synced_versions.update(
+                {
+                    int(attr_id): last_updated
+                    for attr_id, last_updated in content["synced_versions"].items()
+                }
+            )
+            self.data.sort()
+            self._check_loaded_data()
+        except (KeyError, TypeError, ValueError) as e:
+            self.logger.warning(f"Could not merge the shared DB delta: {e}")
+            self.force_full_reload()
+            return False
+
+        self.synced_instance_count = content["synced_instance_count"]
+        self.last_synced_attribute_id = content["last_synced_attribute_id"]
+        self.max_attribute_id = content["max_attribute_id"]
+        self.last_full_check = last_full_check
+        self.logger.info(
+            f"Merged {len(content['attributes'])} rows from the shared DB delta"
+        )
+        return self._check_shared_root(content_root)
+
+    def _check_shared_root(self, content_root: str) -> bool:
+        """Check the local data against the loader's content hash"""
+        local_root = self.get_content_hash()["root"]
+        if local_root != content_root:
+            self.logger.warning(
+                f"The shared DB snapshot does not match the loader's content hash: {local_root} != {content_root}"
+            )
+            self.force_full_reload()
+            return False
+        return True
+
+    def _check_loaded_data(self):
+        """Verify that the loaded data contains everything the service needs"""
 
         if not self.data.tweets:
             raise ValueError("No tweets found in the database.")
@@ -515,9 +1881,27 @@ class ContributeDatabase(Model):
             if not hasattr(self.data.module_data, i):
                 raise ValueError(f"Module data {i} not found in the database.")
 
-    def get_next_user_id(self):
+    def _track_user_id(self, user_id: int):
+        """Move the next user id past a loaded or created user"""
+        self.next_user_id = max(self.next_user_id, user_id + 1)
+
+    def _sync_next_user_id(self):
+        """Move the next user id past users that were added without being tracked"""
+        if self.next_user_id not in self.data.users and len(self.user_metrics) == len(
+            self.data.users
+        ):
+            return
+        self.reindex_users()
+        self.next_user_id = max(self.next_user_id, max(self.data.users, default=-1) + 1)
+
+    def get_next_user_id(self) -> int:
         """Get next user id"""
-        next_id = 0 if not self.data.users else sorted(self.data.users.keys())[-1] + 1
-        if next_id in self.data.users:
-            raise ValueError(f"Next user ID {next_id} already exists in the database.")
-        return next_id
+        self._sync_next_user_id()
+        return self.next_user_id
+
+    def reserve_user_ids(self, count: int) -> List[int]:
+        """Reserve a block of user ids for a batch of new users"""
+        self._sync_next_user_id()
+        user_ids = list(range(self.next_user_id, self.next_user_id + count))
+        self.next_user_id += count
+        return user_ids
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 # ------------------------------------------------------------------------------
 #
-#   Copyright 2023-2025 Valory AG
+#   Copyright 2023-2026 Valory AG
 #
 #   Licensed under the Apache License, Version 2.0 (the "License");
 #   you may not use this file except in compliance with the License.
@@ -19,14 +19,59 @@
 
 """This module contains definitions for Twitter models."""
 
+import math
 import re
-from datetime import date, datetime
-from typing import Dict, List, Optional
+import weakref
+from array import array
+from collections.abc import MutableMapping
+from datetime import date, datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 from uuid import UUID
 
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, PrivateAttr, field_validator
 from pydantic_core import core_schema
 
+# User fields that identify a user and are indexed for constant-time lookups
+USER_INDEXED_FIELDS = (
+    "twitter_id",
+    "twitter_handle",
+    "wallet_address",
+    "token_id",
+    "discord_id",
+    "discord_handle",
+    "service_id",
+    "service_multisig",
+)
+
+# User fields kept in the UserMetrics table
+USER_METRIC_FIELDS = (
+    "points",
+    "current_period_points",
+    "token_id",
+    "service_multisig",
+)
+
+# Tweet fields that feed the per-user tweet stats
+TWEET_STATS_FIELDS = (
+    "epoch",
+    "points",
+    "campaign",
+    "timestamp",
+    "counted_for_activity",
+)
+
+# Campaign statuses that no longer change
+CLOSED_CAMPAIGN_STATUSES = ("ended", "void")
+
+# Null marker for the integer columns of the TweetStore
+NULL_INT = -(2**63)
+
+# TweetStore keys from this offset on are interned non-numeric tweet ids
+STRING_KEY_OFFSET = 2**63
+
+# Validation context flag for data that was validated before it was stored
+TRUSTED_CONTEXT = "trusted"
+
 
 def parse_optional_int_value(v):
     """Psrse integers"""
@@ -42,6 +87,13 @@ def parse_optional_int_value(v):
     raise TypeError(f"Invalid type for int: {type(v)}")
 
 
+def as_utc_datetime(v):
+    """Read naive datetimes as UTC"""
+    if isinstance(v, datetime) and v.tzinfo is None:
+        return v.replace(tzinfo=timezone.utc)
+    return v
+
+
 class EthereumAddress(str):
     """EthereumAddress"""
 
@@ -54,8 +106,11 @@ class EthereumAddress(str):
         )
 
     @classmethod
-    def validate(cls, value: str, _info) -> str:
+    def validate(cls, value: str, info) -> str:
         """Validate that the value is a valid Ethereum address."""
+        # Addresses we wrote ourselves were already checked
+        if info.context and info.context.get(TRUSTED_CONTEXT):
+            return value
         if not re.fullmatch(r"0x[0-9a-fA-F]{40}", value):
             raise ValueError(f"Invalid Ethereum address: {value}")
         return value
@@ -96,6 +151,467 @@ class UserTweet(BaseModel):
     timestamp: Optional[datetime] = None
     counted_for_activity: bool = False
     attribute_instance_id: Optional[int] = None
+    _stats: Optional[weakref.ReferenceType] = PrivateAttr(default=None)
+    _store: Optional[weakref.ReferenceType] = PrivateAttr(default=None)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Set an attribute, keeping the author's tweet stats and the tweet store up to date."""
+        if name == "timestamp":
+            value = as_utc_datetime(value)
+        stats = self._stats() if self._stats is not None else None
+        store = self._store() if self._store is not None else None
+        super().__setattr__(name, value)
+        if stats is not None and name in TWEET_STATS_FIELDS:
+            stats.update(self)
+        if store is not None and name in UserTweet.model_fields:
+            store.write_back(self)
+
+    def __eq__(self, other: Any) -> bool:
+        """Compare the field values only: the stats and store references are not part of the data."""
+        if not isinstance(other, UserTweet):
+            return NotImplemented
+        return self.model_dump() == other.model_dump()
+
+    @field_validator("timestamp", mode="after")
+    @classmethod
+    def validate_timestamp(cls, v):
+        """Store naive timestamps as UTC."""
+        return as_utc_datetime(v)
+
+
+class EpochTweetStats:
+    """Running totals of a user's tweets in one epoch"""
+
+    def __init__(self) -> None:
+        """Init"""
+        self.tweet_count = 0
+        self.points = 0
+        self.campaign_points = 0
+        # Campaign tweets not yet counted for activity: tweet_id -> points
+        self.not_counted: Dict[str, int] = {}
+        self.not_counted_points = 0
+
+
+class UserTweetStats:
+    """Per-epoch tweet totals for a user, updated as tweets are added or changed"""
+
+    def __init__(self) -> None:
+        """Init"""
+        self.epochs: Dict[Optional[int], EpochTweetStats] = {}
+        self.latest_timestamp: Optional[datetime] = None
+        # Tweets accounted for, with the field values they were counted with
+        self._tweets: Dict[str, Tuple[UserTweet, Tuple]] = {}
+
+    def rebuild(self, tweets: Iterable[UserTweet]) -> None:
+        """Drop all the totals and compute them again from the given tweets"""
+        self.epochs = {}
+        self.latest_timestamp = None
+        self._tweets = {}
+        for tweet in tweets:
+            self.add(tweet)
+
+    def get(self, epoch: Optional[int]) -> EpochTweetStats:
+        """Get the totals for an epoch"""
+        return self.epochs.get(epoch) or EpochTweetStats()
+
+    def add(self, tweet: UserTweet) -> None:
+        """Account for a tweet"""
+        if tweet.tweet_id in self._tweets:
+            self.remove(self._tweets[tweet.tweet_id][0])
+
+        values = tuple(getattr(tweet, field_name) for field_name in TWEET_STATS_FIELDS)
+        self._tweets[tweet.tweet_id] = (tweet, values)
+        tweet._stats = weakref.ref(self)  # pylint: disable=protected-access
+        self._apply(tweet.tweet_id, values, 1)
+
+        if tweet.timestamp is not None and (
+            self.latest_timestamp is None or tweet.timestamp > self.latest_timestamp
+        ):
+            self.latest_timestamp = tweet.timestamp
+
+    def remove(self, tweet: UserTweet) -> None:
+        """Stop accounting for a tweet"""
+        entry = self._tweets.get(tweet.tweet_id)
+        if entry is None or entry[0] is not tweet:
+            return
+
+        del self._tweets[tweet.tweet_id]
+        tweet._stats = None  # pylint: disable=protected-access
+        _, _, _, timestamp, _ = entry[1]
+        self._apply(tweet.tweet_id, entry[1], -1)
+
+        if timestamp is not None and timestamp == self.latest_timestamp:
+            self.latest_timestamp = max(
+                (values[3] for _, values in self._tweets.values() if values[3]),
+                default=None,
+            )
+
+    def update(self, tweet: UserTweet) -> None:
+        """Recount a tweet whose fields changed"""
+        entry = self._tweets.get(tweet.tweet_id)
+        if entry is None or entry[0] is not tweet:
+            return  # stale copy
+        self.remove(tweet)
+        self.add(tweet)
+
+    def _apply(self, tweet_id: str, values: Tuple, sign: int) -> None:
+        """Add (sign=1) or subtract (sign=-1) a tweet's contribution"""
+        epoch, points, campaign, _, counted_for_activity = values
+        points = points or 0
+        epoch_stats = self.epochs.setdefault(epoch, EpochTweetStats())
+        epoch_stats.tweet_count += sign
+        epoch_stats.points += sign * points
+        if campaign:
+            epoch_stats.campaign_points += sign * points
+            if not counted_for_activity:
+                epoch_stats.not_counted_points += sign * points
+                if sign > 0:
+                    epoch_stats.not_counted[tweet_id] = points
+                else:
+                    epoch_stats.not_counted.pop(tweet_id, None)
+        if not epoch_stats.tweet_count:
+            del self.epochs[epoch]
+
+    def __len__(self) -> int:
+        """Number of tweets accounted for"""
+        return len(self._tweets)
+
+
+class TweetStore(MutableMapping):
+    """Columnar tweet storage, used in place of the tweets dict
+
+    Every field is kept in a typed array column and campaign names and authors
+    are interned, so a tweet costs a few dozen bytes instead of a full model.
+    Reading a tweet builds a UserTweet view whose changes are written back.
+    The per-epoch totals of every author are updated as rows are written.
+    """
+
+    def __init__(self) -> None:
+        """Init"""
+        self._tweet_ids = array("Q")
+        self._authors = array("l")
+        self._epochs = array("q")
+        self._points = array("q")
+        self._campaigns = array("l")
+        self._timestamps = array("d")
+        self._counted = array("b")
+        self._attribute_instance_ids = array("q")
+        self._rows: Dict[int, int] = {}  # tweet_id -> row
+        self._author_rows: Dict[int, array] = {}  # author -> rows
+        self._strings: List[str] = []  # interned authors and campaigns
+        self._string_ids: Dict[str, int] = {}
+        self._author_stats: Dict[int, UserTweetStats] = {}  # author -> totals
+        # Authors whose latest tweet was removed or changed
+        self._stale_latest: Set[int] = set()
+
+    def _intern(self, value: Optional[str]) -> int:
+        """Get the id of an interned string, -1 for None"""
+        if value is None:
+            return -1
+        if value not in self._string_ids:
+            self._string_ids[value] = len(self._strings)
+            self._strings.append(value)
+        return self._string_ids[value]
+
+    def _string(self, string_id: int) -> Optional[str]:
+        """Get an interned string by id"""
+        return None if string_id < 0 else self._strings[string_id]
+
+    def _encode(self, tweet: UserTweet) -> Tuple:
+        """Get the column values of a tweet"""
+        timestamp = as_utc_datetime(tweet.timestamp)
+        return (
+            self._intern(tweet.twitter_user_id),
+            NULL_INT if tweet.epoch is None else tweet.epoch,
+            NULL_INT if tweet.points is None else tweet.points,
+            self._intern(tweet.campaign),
+            math.nan if timestamp is None else timestamp.timestamp(),
+            int(tweet.counted_for_activity),
+            (
+                NULL_INT
+                if tweet.attribute_instance_id is None
+                else tweet.attribute_instance_id
+            ),
+        )
+
+    def _columns(self) -> Tuple[array, ...]:
+        """Get the columns in _encode order"""
+        return (
+            self._authors,
+            self._epochs,
+            self._points,
+            self._campaigns,
+            self._timestamps,
+            self._counted,
+            self._attribute_instance_ids,
+        )
+
+    def _key(self, tweet_id: Any, create: bool = False) -> Optional[int]:
+        """Get the column key of a tweet id, None if it is unknown
+
+        Numeric ids are their own key. Other ids are interned and offset by
+        STRING_KEY_OFFSET, so they cannot collide with the numeric ones.
+        """
+        tweet_id = str(tweet_id)
+        if (
+            tweet_id.isascii()
+            and tweet_id.isdigit()
+            and str(int(tweet_id)) == tweet_id
+            and int(tweet_id) < STRING_KEY_OFFSET
+        ):
+            return int(tweet_id)
+        if not create and tweet_id not in self._string_ids:
+            return None
+        return STRING_KEY_OFFSET + self._intern(tweet_id)
+
+    def _tweet_id(self, key: int) -> str:
+        """Get the tweet id of a column key"""
+        if key >= STRING_KEY_OFFSET:
+            return self._strings[key - STRING_KEY_OFFSET]
+        return str(key)
+
+    def write(self, tweet: UserTweet) -> None:
+        """Insert or overwrite a tweet"""
+        tweet_id = self._key(tweet.tweet_id, create=True)
+        values = self._encode(tweet)
+        row = self._rows.get(tweet_id)
+
+        if row is None:
+            row = len(self._tweet_ids)
+            self._rows[tweet_id] = row
+            self._tweet_ids.append(tweet_id)
+            for column, value in zip(self._columns(), values):
+                column.append(value)
+            self._author_rows.setdefault(values[0], array("l")).append(row)
+        else:
+            self._count_row(row, -1)
+            if self._authors[row] != values[0]:
+                self._move_row(row, self._authors[row], values[0])
+            for column, value in zip(self._columns(), values):
+                column[row] = value
+        self._count_row(row, 1)
+
+        # Later changes to the tweet are written back
+        tweet._store = weakref.ref(self)  # pylint: disable=protected-access
+
+    def write_back(self, tweet: UserTweet) -> None:
+        """Write back a change to a stored tweet, detaching it if it was removed"""
+        if tweet.tweet_id not in self:
+            tweet._store = None  # pylint: disable=protected-access
+            return
+        self.write(tweet)
+
+    def _count_row(self, row: int, sign: int) -> None:
+        """Add (sign=1) or subtract (sign=-1) a row from its author's totals"""
+        author = self._authors[row]
+        stats = self._author_stats.setdefault(author, UserTweetStats())
+        epoch = self._epochs[row]
+        points = self._points[row]
+        timestamp = self._timestamps[row]
+        values = (
+            None if epoch == NULL_INT else epoch,
+            0 if points == NULL_INT else points,
+            self._string(self._campaigns[row]),
+            timestamp,
+            bool(self._counted[row]),
+        )
+        # pylint: disable=protected-access
+        stats._apply(self._tweet_id(self._tweet_ids[row]), values, sign)
+
+        if math.isnan(timestamp) or author in self._stale_latest:
+            return
+        latest = stats.latest_timestamp
+        if sign > 0 and (latest is None or timestamp > latest.timestamp()):
+            stats.latest_timestamp = datetime.fromtimestamp(timestamp, tz=timezone.utc)
+        elif sign < 0 and latest is not None and timestamp == latest.timestamp():
+            # Found again from the author's rows on the next read
+            self._stale_latest.add(author)
+
+    def _move_row(self, row: int, old_author: int, new_author: int) -> None:
+        """Move a row from one author to another"""
+        self._author_rows[old_author].remove(row)
+        self._author_rows.setdefault(new_author, array("l")).append(row)
+
+    def _row(self, tweet_id: Any) -> Optional[int]:
+        """Get the row of a tweet id, None if not stored"""
+        key = self._key(tweet_id)
+        return None if key is None else self._rows.get(key)
+
+    def _read(self, row: int) -> UserTweet:
+        """Build a tweet view for a row"""
+        epoch = self._epochs[row]
+        points = self._points[row]
+        timestamp = self._timestamps[row]
+        attribute_instance_id = self._attribute_instance_ids[row]
+        tweet = UserTweet.model_construct(
+            tweet_id=self._tweet_id(self._tweet_ids[row]),
+            twitter_user_id=self._string(self._authors[row]),
+            epoch=None if epoch == NULL_INT else epoch,
+            points=None if points == NULL_INT else points,
+            campaign=self._string(self._campaigns[row]),
+            timestamp=(
+                None
+                if math.isnan(timestamp)
+                else datetime.fromtimestamp(timestamp, tz=timezone.utc)
+            ),
+            counted_for_activity=bool(self._counted[row]),
+            attribute_instance_id=(
+                None if attribute_instance_id == NULL_INT else attribute_instance_id
+            ),
+        )
+        tweet._store = weakref.ref(self)  # pylint: disable=protected-access
+        return tweet
+
+    def __getitem__(self, tweet_id: str) -> UserTweet:
+        """Get a tweet view"""
+        row = self._row(tweet_id)
+        if row is None:
+            raise KeyError(tweet_id)
+        return self._read(row)
+
+    def __setitem__(self, tweet_id: str, tweet: UserTweet) -> None:
+        """Store a tweet"""
+        if tweet_id != tweet.tweet_id:
+            raise ValueError(f"Tweet {tweet.tweet_id} stored under key {tweet_id}")
+        self.write(tweet)
+
+    def __delitem__(self, tweet_id: str) -> None:
+        """Remove a tweet, moving the last row into its place
+
+        Views of the removed tweet are detached on their next change, so they do
+        not bring the row back.
+        """
+        row = self._row(tweet_id)
+        if row is None:
+            raise KeyError(tweet_id)
+
+        self._count_row(row, -1)
+        del self._rows[self._tweet_ids[row]]
+        self._author_rows[self._authors[row]].remove(row)
+        last = len(self._tweet_ids) - 1
+        if row != last:
+            self._author_rows[self._authors[last]].remove(last)
+            self._author_rows[self._authors[last]].append(row)
+            self._rows[self._tweet_ids[last]] = row
+            for column in (self._tweet_ids,) + self._columns():
+                column[row] = column[last]
+        for column in (self._tweet_ids,) + self._columns():
+            column.pop()
+
+    def __contains__(self, tweet_id: object) -> bool:
+        """Check whether a tweet is stored"""
+        return self._row(tweet_id) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the tweet ids in row order"""
+        return (self._tweet_id(tweet_id) for tweet_id in self._tweet_ids)
+
+    def __len__(self) -> int:
+        """Number of tweets"""
+        return len(self._tweet_ids)
+
+    def sort(self) -> None:
+        """Reorder the rows by tweet id"""
+        order = sorted(range(len(self._tweet_ids)), key=self._tweet_ids.__getitem__)
+        for column in (self._tweet_ids,) + self._columns():
+            column[:] = array(column.typecode, (column[row] for row in order))
+        self._rows = {tweet_id: row for row, tweet_id in enumerate(self._tweet_ids)}
+        self._author_rows = {}
+        for row, author in enumerate(self._authors):
+            self._author_rows.setdefault(author, array("l")).append(row)
+
+    def author_view(self, twitter_user_id: str) -> "AuthorTweets":
+        """Get a mapping over the tweets of one author"""
+        return AuthorTweets(self, twitter_user_id)
+
+    def author_stats(self, twitter_user_id: str) -> UserTweetStats:
+        """Get the per-epoch totals of one author"""
+        author = self._string_ids.get(twitter_user_id)
+        stats = self._author_stats.get(author) if author is not None else None
+        if stats is None:
+            return UserTweetStats()
+
+        if author in self._stale_latest:
+            self._stale_latest.discard(author)
+            timestamps = [
+                self._timestamps[row]
+                for row in self._author_rows.get(author, ())
+                if not math.isnan(self._timestamps[row])
+            ]
+            stats.latest_timestamp = (
+                datetime.fromtimestamp(max(timestamps), tz=timezone.utc)
+                if timestamps
+                else None
+            )
+        return stats
+
+
+class AuthorTweets(MutableMapping):
+    """View over the tweets of one author in a TweetStore, used as ContributeUser.tweets"""
+
+    def __init__(self, store: TweetStore, twitter_user_id: str) -> None:
+        """Init"""
+        self.store = store
+        self.twitter_user_id = twitter_user_id
+
+    def _rows(self) -> array:
+        """Get the author's rows"""
+        # pylint: disable=protected-access
+        author = self.store._string_ids.get(self.twitter_user_id)
+        return self.store._author_rows.get(author, array("l"))
+
+    def _row(self, tweet_id: Any) -> Optional[int]:
+        """Get the row of one of the author's tweets, None if not found"""
+        # pylint: disable=protected-access
+        row = self.store._row(tweet_id)
+        if (
+            row is None
+            or self.store._string(self.store._authors[row]) != self.twitter_user_id
+        ):
+            return None
+        return row
+
+    def __getitem__(self, tweet_id: str) -> UserTweet:
+        """Get a tweet view"""
+        row = self._row(tweet_id)
+        if row is None:
+            raise KeyError(tweet_id)
+        return self.store._read(row)  # pylint: disable=protected-access
+
+    def __setitem__(self, tweet_id: str, tweet: UserTweet) -> None:
+        """Store a tweet of this author"""
+        if tweet.twitter_user_id != self.twitter_user_id:
+            raise ValueError(
+                f"Tweet {tweet_id} belongs to {tweet.twitter_user_id}, not {self.twitter_user_id}"
+            )
+        self.store[tweet_id] = tweet
+
+    def __delitem__(self, tweet_id: str) -> None:
+        """Remove a tweet of this author"""
+        if self._row(tweet_id) is None:
+            raise KeyError(tweet_id)
+        del self.store[tweet_id]
+
+    def __contains__(self, tweet_id: object) -> bool:
+        """Check whether the author has a tweet"""
+        return self._row(tweet_id) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the author's tweet ids in row order"""
+        # pylint: disable=protected-access
+        return (
+            self.store._tweet_id(self.store._tweet_ids[row])
+            for row in sorted(self._rows())
+        )
+
+    def __len__(self) -> int:
+        """Number of tweets of the author"""
+        return len(self._rows())
+
+    @property
+    def stats(self) -> UserTweetStats:
+        """Get the per-epoch totals of the author"""
+        return self.store.author_stats(self.twitter_user_id)
 
 
 class ServiceTweet(BaseModel):
@@ -111,6 +627,10 @@ class ServiceTweet(BaseModel):
     createdDate: float
     executionAttempts: List[ExecutionAttempt] = []
 
+    def is_closed(self) -> bool:
+        """Whether the tweet was posted or its proposal was rejected"""
+        return self.posted or self.proposer.verified is False
+
 
 class ContributeUser(BaseModel):
     """ContributeUser"""
@@ -130,12 +650,56 @@ class ContributeUser(BaseModel):
     service_multisig_old: Optional[EthereumAddress] = None
     current_period_points: int = 0
     attribute_instance_id: Optional[int] = None
+    _index: Optional[weakref.ReferenceType] = PrivateAttr(default=None)
+    _metrics: Optional[weakref.ReferenceType] = PrivateAttr(default=None)
+    _tweet_stats: Optional[UserTweetStats] = PrivateAttr(default=None)
+
+    @property
+    def tweet_stats(self) -> UserTweetStats:
+        """Get the per-epoch tweet totals, building them if needed"""
+        if isinstance(self.tweets, AuthorTweets):
+            return self.tweets.stats
+        # Tweets inserted directly into the dict are detected by the size mismatch
+        if self._tweet_stats is None or len(self._tweet_stats) != len(self.tweets):
+            self._tweet_stats = UserTweetStats()
+            self._tweet_stats.rebuild(self.tweets.values())
+        return self._tweet_stats
+
+    def add_tweet(self, tweet: UserTweet) -> None:
+        """Link a tweet to this user, keeping the tweet stats up to date"""
+        self.tweets[tweet.tweet_id] = tweet
+        if self._tweet_stats is not None:
+            self._tweet_stats.add(tweet)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Set an attribute, keeping the user index and metrics up to date."""
+        if name == "tweets":
+            self._tweet_stats = None
+        index = self._index() if self._index is not None else None
+        metrics = self._metrics() if self._metrics is not None else None
+        if index is None or name not in USER_INDEXED_FIELDS:
+            super().__setattr__(name, value)
+        else:
+            old_value = getattr(self, name, None)
+            super().__setattr__(name, value)
+            index.update(self, name, old_value, getattr(self, name, None))
+
+        if metrics is not None and name in USER_METRIC_FIELDS:
+            metrics.update_field(self, name)
+
+    def __eq__(self, other: Any) -> bool:
+        """Compare the field values only: the index and metrics references are not part of the data."""
+        if not isinstance(other, ContributeUser):
+            return NotImplemented
+        return self.model_dump(mode="python") == other.model_dump(
+            mode="python"
+        ) and dict(self.tweets.items()) == dict(other.tweets.items())
 
     def model_dump(self, mode):
         """Dump the user data to a JSON-compatible dictionary."""
-        data = super().model_dump(mode=mode)
-        data["tweets"] = list(data["tweets"].keys())  # We just store the tweet ids
-        return data
+        # Only scalar fields are stored: tweets are linked back to their author
+        # from the tweet records (twitter_user_id) when loading
+        return super().model_dump(mode=mode, exclude={"tweets"})
 
     @field_validator("id", "service_id", "service_id_old", mode="before")
     @classmethod
@@ -144,6 +708,261 @@ class ContributeUser(BaseModel):
         return parse_optional_int_value(v)
 
 
+class UserIndex:
+    """Secondary hash indexes over the ContributeUser identifying fields"""
+
+    def __init__(self) -> None:
+        """Init"""
+        self._users: Dict[int, ContributeUser] = {}
+        self._indexes: Dict[str, Dict[Any, Dict[int, ContributeUser]]] = {
+            field_name: {} for field_name in USER_INDEXED_FIELDS
+        }
+
+    def rebuild(self, users: Iterable[ContributeUser]) -> None:
+        """Drop all the indexes and build them again from the given users"""
+        for user in self._users.values():
+            user._index = None  # pylint: disable=protected-access
+        self._users = {}
+        self._indexes = {field_name: {} for field_name in USER_INDEXED_FIELDS}
+        for user in users:
+            self.add(user)
+
+    def add(self, user: ContributeUser) -> None:
+        """Index a user, replacing any previous entry with the same id"""
+        if user.id in self._users:
+            self.remove(self._users[user.id])
+
+        self._users[user.id] = user
+        for field_name in USER_INDEXED_FIELDS:
+            self._add_value(user, field_name, getattr(user, field_name, None))
+        user._index = weakref.ref(self)  # pylint: disable=protected-access
+
+    def remove(self, user: ContributeUser) -> None:
+        """Remove a user from the indexes"""
+        if self._users.get(user.id) is not user:
+            return
+
+        for field_name in USER_INDEXED_FIELDS:
+            self._remove_value(user, field_name, getattr(user, field_name, None))
+        del self._users[user.id]
+        user._index = None  # pylint: disable=protected-access
+
+    def update(
+        self, user: ContributeUser, field_name: str, old_value: Any, new_value: Any
+    ) -> None:
+        """Move a user from one indexed value to another"""
+        # Ignore stale copies of indexed users
+        if self._users.get(user.id) is not user or old_value == new_value:
+            return
+
+        self._remove_value(user, field_name, old_value)
+        self._add_value(user, field_name, new_value)
+
+    def get(self, field_name: str, value: Any) -> Optional[ContributeUser]:
+        """Get the user with the given value, the one with the lowest id if many"""
+        users = self._indexes[field_name].get(value)
+        if not users:
+            return None
+        if len(users) == 1:
+            return next(iter(users.values()))
+        return users[min(users)]
+
+    def _add_value(self, user: ContributeUser, field_name: str, value: Any) -> None:
+        """Add a user to a value bucket"""
+        if value is None:
+            return
+        self._indexes[field_name].setdefault(value, {})[user.id] = user
+
+    def _remove_value(self, user: ContributeUser, field_name: str, value: Any) -> None:
+        """Remove a user from a value bucket"""
+        if value is None:
+            return
+        users = self._indexes[field_name].get(value)
+        if not users:
+            return
+        users.pop(user.id, None)
+        if not users:
+            del self._indexes[field_name][value]
+
+    def __len__(self) -> int:
+        """Number of indexed users"""
+        return len(self._users)
+
+
+class UserMetrics:
+    """Dense per-user metrics table for queries that scan every user
+
+    One row per user with points, period points, token id, staking flag and
+    latest tweet time, kept in typed array columns. The users with period points,
+    a token or a staked service are also kept in sets, so the queries that filter
+    on them do not go through every row.
+    """
+
+    def __init__(self) -> None:
+        """Init"""
+        self._users: Dict[int, ContributeUser] = {}
+        self._rows: Dict[int, int] = {}  # user id -> row
+        self._user_ids = array("q")
+        self._points = array("q")
+        self._period_points = array("q")
+        self._token_ids = array("q")
+        self._staked = array("b")
+        self._last_tweet = array("d")
+        self._period_points_user_ids: Set[int] = set()
+        self._token_user_ids: Set[int] = set()
+        self._staked_user_ids: Set[int] = set()
+
+    def _columns(self) -> Tuple[array, ...]:
+        """Get the columns"""
+        return (
+            self._user_ids,
+            self._points,
+            self._period_points,
+            self._token_ids,
+            self._staked,
+            self._last_tweet,
+        )
+
+    def _filters(self) -> Tuple[Set[int], ...]:
+        """Get the sets of user ids kept for the filtered queries"""
+        return (
+            self._period_points_user_ids,
+            self._token_user_ids,
+            self._staked_user_ids,
+        )
+
+    @staticmethod
+    def _set_membership(user_ids: Set[int], user_id: int, is_member: bool) -> None:
+        """Add or remove a user id from a filter set"""
+        if is_member:
+            user_ids.add(user_id)
+        else:
+            user_ids.discard(user_id)
+
+    def rebuild(self, users: Iterable[ContributeUser]) -> None:
+        """Drop all the rows and build them again from the given users"""
+        for user in self._users.values():
+            user._metrics = None  # pylint: disable=protected-access
+        self._users = {}
+        self._rows = {}
+        for column in self._columns():
+            del column[:]
+        for user_ids in self._filters():
+            user_ids.clear()
+        for user in users:
+            self.add(user)
+
+    def add(self, user: ContributeUser) -> None:
+        """Add a user, replacing any previous row with the same id"""
+        if user.id in self._users:
+            self._users[user.id]._metrics = None  # pylint: disable=protected-access
+        else:
+            self._rows[user.id] = len(self._user_ids)
+            for column in self._columns():
+                column.append(0)
+        self._users[user.id] = user
+        user._metrics = weakref.ref(self)  # pylint: disable=protected-access
+        self.update(user)
+
+    def remove(self, user: ContributeUser) -> None:
+        """Remove a user, moving the last row into its place"""
+        if self._users.get(user.id) is not user:
+            return
+
+        del self._users[user.id]
+        user._metrics = None  # pylint: disable=protected-access
+        for user_ids in self._filters():
+            user_ids.discard(user.id)
+        row = self._rows.pop(user.id)
+        last = len(self._user_ids) - 1
+        if row != last:
+            self._rows[self._user_ids[last]] = row
+            for column in self._columns():
+                column[row] = column[last]
+        for column in self._columns():
+            column.pop()
+
+    def update(self, user: ContributeUser) -> None:
+        """Refresh the whole row of a user, going through its tweets"""
+        # Ignore stale copies of tracked users
+        if self._users.get(user.id) is not user:
+            return
+
+        row = self._rows[user.id]
+        latest_timestamp = user.tweet_stats.latest_timestamp
+        self._user_ids[row] = user.id
+        for field_name in USER_METRIC_FIELDS:
+            self._set_field(row, user, field_name)
+        self._last_tweet[row] = (
+            math.nan if latest_timestamp is None else latest_timestamp.timestamp()
+        )
+
+    def update_field(self, user: ContributeUser, field_name: str) -> None:
+        """Refresh a single field of a user's row"""
+        if self._users.get(user.id) is not user:
+            return
+        self._set_field(self._rows[user.id], user, field_name)
+
+    def add_tweet(self, user: ContributeUser, tweet: UserTweet) -> None:
+        """Account for a new tweet of a user, without going through its other tweets"""
+        if self._users.get(user.id) is not user or tweet.timestamp is None:
+            return
+        row = self._rows[user.id]
+        timestamp = tweet.timestamp.timestamp()
+        # NaN compares as False
+        if not self._last_tweet[row] >= timestamp:
+            self._last_tweet[row] = timestamp
+
+    def _set_field(self, row: int, user: ContributeUser, field_name: str) -> None:
+        """Write a user field into its column and its filter set"""
+        if field_name == "points":
+            self._points[row] = user.points
+        elif field_name == "current_period_points":
+            self._period_points[row] = user.current_period_points
+            self._set_membership(
+                self._period_points_user_ids,
+                user.id,
+                bool(user.current_period_points),
+            )
+        elif field_name == "token_id":
+            self._token_ids[row] = (
+                int(user.token_id)
+                if user.token_id is not None and str(user.token_id).isdigit()
+                else NULL_INT
+            )
+            self._set_membership(
+                self._token_user_ids, user.id, self._token_ids[row] != NULL_INT
+            )
+        elif field_name == "service_multisig":
+            self._staked[row] = int(bool(user.service_multisig))
+            self._set_membership(
+                self._staked_user_ids, user.id, bool(user.service_multisig)
+            )
+
+    def period_points_user_ids(self) -> List[int]:
+        """Get the ids of the users with period points to reset"""
+        return sorted(self._period_points_user_ids)
+
+    def token_id_to_points(self) -> Dict[str, int]:
+        """Get the points of every user with a token"""
+        rows = [self._rows[user_id] for user_id in self._token_user_ids]
+        return {str(self._token_ids[row]): self._points[row] for row in rows}
+
+    def active_staked_user_ids(self, since: datetime) -> List[int]:
+        """Get the ids of the staked users that tweeted at or after since"""
+        since_ts = since.timestamp()
+        return sorted(
+            user_id
+            for user_id in self._staked_user_ids
+            # NaN compares as False
+            if self._last_tweet[self._rows[user_id]] >= since_ts
+        )
+
+    def __len__(self) -> int:
+        """Number of users"""
+        return len(self._user_ids)
+
+
 class Action(BaseModel):
     """Action"""
 
@@ -164,6 +983,39 @@ class TwitterCampaign(BaseModel):
     proposer: Proposer
     start_ts: int
 
+    def is_closed(self) -> bool:
+        """Whether the campaign has ended or was voided"""
+        return self.status in CLOSED_CAMPAIGN_STATUSES
+
+
+class TwitterPaginationCursor(BaseModel):
+    """A Twitter search pagination that was left unfinished"""
+
+    query: str
+    since_id: str
+    until_id: str
+    next_token: Optional[str] = None
+    token_id: Optional[str] = None
+    # The exact search args of the pages before next_token, which it is bound to
+    query_args: Optional[str] = None
+    max_results: Optional[int] = None
+
+
+class TweetEvaluation(BaseModel):
+    """A cached tweet evaluation"""
+
+    quality: str
+    relationship: str
+    timestamp: float
+
+
+class TweetSignature(BaseModel):
+    """The SimHash signature of a collected tweet"""
+
+    author_id: str
+    simhash: str
+    timestamp: float
+
 
 class TwitterScoringData(BaseModel):
     """TwitterScoringData"""
@@ -171,8 +1023,12 @@ class TwitterScoringData(BaseModel):
     current_period: date = datetime.min
     latest_hashtag_tweet_id: str = "0"
     latest_mention_tweet_id: str = "0"
+    search_since_ids: Dict[str, str] = {}
+    pagination_cursors: List[TwitterPaginationCursor] = []
     last_tweet_pull_window_reset: float = 0
     number_of_tweets_pulled_today: int = 0
+    last_tweet_pull_month_reset: float = 0
+    number_of_tweets_pulled_this_month: int = 0
 
 
 class DynamicNFTData(BaseModel):
@@ -236,6 +1092,68 @@ class ModuleData(BaseModel):
     attribute_instance_id: Optional[int] = None
 
 
+class ModuleArchive(BaseModel):
+    """Closed scheduled tweets and campaigns moved out of ModuleData"""
+
+    scheduled_tweets: List[ServiceTweet] = []
+    campaigns: List[TwitterCampaign] = []
+    attribute_instance_id: Optional[int] = None
+
+
+class ModuleCache(BaseModel):
+    """Cached tweet evaluations and signatures, kept out of ModuleData"""
+
+    evaluation_cache: Dict[str, TweetEvaluation] = {}
+    recent_signatures: Dict[str, TweetSignature] = {}
+    attribute_instance_id: Optional[int] = None
+
+
+class ModuleStatusIndex:
+    """The scheduled tweets and campaigns of a ModuleData that are still open"""
+
+    def __init__(self) -> None:
+        """Init"""
+        self.module_data: Optional[ModuleData] = None
+        self.open_tweets: List[ServiceTweet] = []
+        self.open_campaigns: List[TwitterCampaign] = []
+        self._sizes: Tuple[int, int] = (0, 0)
+
+    @staticmethod
+    def _get_sizes(module_data: ModuleData) -> Tuple[int, int]:
+        """Number of scheduled tweets and campaigns"""
+        return (
+            len(module_data.scheduled_tweet.tweets),
+            len(module_data.twitter_campaigns.campaigns),
+        )
+
+    def rebuild(self, module_data: ModuleData) -> None:
+        """Index the open items of the given module data"""
+        self.module_data = module_data
+        self.open_tweets = [
+            tweet
+            for tweet in module_data.scheduled_tweet.tweets
+            if not tweet.is_closed()
+        ]
+        self.open_campaigns = [
+            campaign
+            for campaign in module_data.twitter_campaigns.campaigns
+            if not campaign.is_closed()
+        ]
+        self._sizes = self._get_sizes(module_data)
+
+    def is_stale(self, module_data: ModuleData) -> bool:
+        """Whether the module data was replaced or items were added since the last rebuild"""
+        return self.module_data is not module_data or self._sizes != self._get_sizes(
+            module_data
+        )
+
+    def get_campaigns(self, *statuses: str) -> List[TwitterCampaign]:
+        """Get the open campaigns with any of the given statuses"""
+        return [
+            campaign for campaign in self.open_campaigns if campaign.status in statuses
+        ]
+
+
 class ContributeData(BaseModel):
     """ContributeData"""
 
@@ -243,12 +1161,17 @@ class ContributeData(BaseModel):
     tweets: Dict[str, UserTweet] = {}
     module_data: ModuleData = ModuleData()
     module_configs: ModuleConfigs = ModuleConfigs()
+    module_archive: Optional[ModuleArchive] = None
+    module_cache: Optional[ModuleCache] = None
 
     def sort(self):
         """Sort users and tweets."""
         self.users = dict(
             sorted(self.users.items(), key=lambda item: int(item[0]), reverse=False)
         )
+        if isinstance(self.tweets, TweetStore):
+            self.tweets.sort()
+            return
         self.tweets = dict(
             sorted(self.tweets.items(), key=lambda item: int(item[0]), reverse=False)
         )
@@ -51,6 +51,9 @@ class Params(BaseParams):
         """Initialize the parameters object."""
 
         self.contribute_db_pkey = self._ensure("contribute_db_pkey", kwargs, str)
+        self.db_snapshot_round_timeout = self._ensure(
+            "db_snapshot_round_timeout", kwargs, float
+        )
 
         super().__init__(*args, **kwargs)
 
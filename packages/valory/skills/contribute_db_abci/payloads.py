@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 # ------------------------------------------------------------------------------
 #
-#   Copyright 2023-2025 Valory AG
+#   Copyright 2023-2026 Valory AG
 #
 #   Licensed under the Apache License, Version 2.0 (the "License");
 #   you may not use this file except in compliance with the License.
@@ -19,8 +19,20 @@
 
 """This module contains the transaction payloads of the ContributeDBAbciApp."""
 
+from dataclasses import dataclass
+
 from packages.valory.skills.abstract_round_abci.base import BaseTxPayload
 
 
+@dataclass(frozen=True)
+class DBSnapshotPayload(BaseTxPayload):
+    """Represent a transaction payload for the DBSnapshotRound."""
+
+    content: str
+
+
+@dataclass(frozen=True)
 class DBLoadPayload(BaseTxPayload):
     """Represent a transaction payload for the DBLoadRound."""
+
+    content_hash: str
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 # ------------------------------------------------------------------------------
 #
-#   Copyright 2023-2025 Valory AG
+#   Copyright 2023-2026 Valory AG
 #
 #   Licensed under the Apache License, Version 2.0 (the "License");
 #   you may not use this file except in compliance with the License.
@@ -19,6 +19,8 @@
 
 """This package contains the rounds of ContributeDBAbciApp."""
 
+import json
+from abc import ABC
 from enum import Enum
 from typing import Dict, FrozenSet, Optional, Set, Tuple, cast
 
@@ -27,11 +29,24 @@ from packages.valory.skills.abstract_round_abci.base import (
     AbciAppTransitionFunction,
     AppState,
     BaseSynchronizedData,
+    BaseTxPayload,
+    CollectDifferentUntilThresholdRound,
     CollectSameUntilThresholdRound,
     DegenerateRound,
     EventToTimeout,
+    get_name,
 )
-from packages.valory.skills.contribute_db_abci.payloads import DBLoadPayload
+from packages.valory.skills.contribute_db_abci.payloads import (
+    DBLoadPayload,
+    DBSnapshotPayload,
+)
+
+# Seconds a writing round waits for the AgentDB writer, counted from the start of
+# the round. It must stay below the ROUND_TIMEOUT of the apps that write.
+WRITER_WAIT_TIMEOUT = 20.0
+
+# Passes of DBLoadRound after a failed agreement
+MAX_DB_LOAD_RETRIES = 3
 
 
 class Event(Enum):
@@ -39,7 +54,10 @@ class Event(Enum):
 
     DONE = "done"
     ROUND_TIMEOUT = "round_timeout"
+    SNAPSHOT_ROUND_TIMEOUT = "snapshot_round_timeout"
     NO_MAJORITY = "no_majority"
+    REPAIR = "repair"
+    MAX_RETRIES_ERROR = "max_retries_error"
 
 
 class SynchronizedData(BaseSynchronizedData):
@@ -54,6 +72,67 @@ class SynchronizedData(BaseSynchronizedData):
         """Get the tx_submitter."""
         return cast(str, self.db.get_strict("db_keeper"))
 
+    @property
+    def db_snapshot(self) -> Optional[Dict]:
+        """Get the DB snapshot shared by the loader."""
+        db_snapshot = self.db.get("db_snapshot", None)
+        return json.loads(db_snapshot) if db_snapshot else None
+
+    @property
+    def db_load_retries(self) -> int:
+        """Get the number of DBLoadRound passes that did not reach an agreement."""
+        return cast(int, self.db.get("db_load_retries", 0))
+
+    @property
+    def db_content_hash(self) -> Optional[Dict[str, str]]:
+        """Get the DB content hash agreed in the last DBLoadRound pass."""
+        db_content_hash = self.db.get("db_content_hash", None)
+        return json.loads(db_content_hash) if db_content_hash else None
+
+    @property
+    def db_repaired(self) -> bool:
+        """Get whether the diverged agents were already repaired in this period."""
+        return cast(bool, self.db.get("db_repaired", False))
+
+    @property
+    def db_loader(self) -> str:
+        """Get the agent that loads AgentDB and shares its snapshot in this period."""
+        participants = sorted(self.participants)
+        return participants[self.period_count % len(participants)]
+
+
+class DBSnapshotRound(CollectDifferentUntilThresholdRound):
+    """A round where the elected loader shares its DB snapshot"""
+
+    payload_class = DBSnapshotPayload
+    synchronized_data_class = SynchronizedData
+    extended_requirements = ()
+
+    def end_block(self) -> Optional[Tuple[BaseSynchronizedData, Event]]:
+        """Process the end of the block."""
+
+        synchronized_data = cast(SynchronizedData, self.synchronized_data)
+        if self.context.contribute_db.snapshot_sharing:
+            if not self.collection_threshold_reached:
+                return None
+            # Wait for the loader: if it never reports, every agent loads on its own
+            loader_payload = self.collection.get(synchronized_data.db_loader)
+            if loader_payload is None:
+                return None
+            db_snapshot = cast(DBSnapshotPayload, loader_payload).content
+        else:
+            # Nothing to share: move on without waiting for payloads
+            db_snapshot = ""
+
+        synchronized_data = cast(
+            SynchronizedData,
+            synchronized_data.update(
+                synchronized_data_class=SynchronizedData,
+                **{get_name(SynchronizedData.db_snapshot): db_snapshot},
+            ),
+        )
+        return synchronized_data, Event.DONE
+
 
 class DBLoadRound(CollectSameUntilThresholdRound):
     """A round for loading the DB"""
@@ -65,50 +144,169 @@ class DBLoadRound(CollectSameUntilThresholdRound):
     def end_block(self) -> Optional[Tuple[BaseSynchronizedData, Event]]:
         """Process the end of the block."""
 
+        synchronized_data = cast(SynchronizedData, self.synchronized_data)
+        db_load_retries = synchronized_data.db_load_retries
+
         if self.threshold_reached:
-            # Get all the agents that have sent, sort them alphabetically and use the period count to determine the db keeper.
+            # Get the agents whose data matches the agreed content hash, sort them alphabetically
+            # and use the period count to determine the db keeper.
             period_count = self.synchronized_data.period_count
-            participants = sorted(list(self.collection.keys()))
+            agreed_content_hash = self.most_voted_payload
+            participants = sorted(
+                sender
+                for sender, payload in self.collection.items()
+                if cast(DBLoadPayload, payload).content_hash == agreed_content_hash
+            )
+            diverged = sorted(set(self.collection.keys()) - set(participants))
+
+            # Diverged agents compare their data with the agreed hash and reload the
+            # subtrees that differ in one more pass, without the shared snapshot
+            if diverged and not synchronized_data.db_repaired:
+                self.context.logger.warning(
+                    f"Agents with diverged DB content: {diverged}. Repairing them..."
+                )
+                synchronized_data = synchronized_data.update(
+                    synchronized_data_class=SynchronizedData,
+                    **{
+                        get_name(SynchronizedData.db_snapshot): "",
+                        get_name(SynchronizedData.db_content_hash): agreed_content_hash,
+                        get_name(SynchronizedData.db_repaired): True,
+                    },
+                )
+                return synchronized_data, Event.REPAIR
+            if diverged:
+                self.context.logger.warning(
+                    f"Agents with diverged DB content: {diverged}"
+                )
+
             db_keeper = participants[period_count % len(participants)]
             self.context.contribute_db.writer_addresses = [db_keeper]
             self.context.logger.info(
                 f"DB keeper for period {period_count} is {db_keeper} [Participants = {participants}]"
             )
 
-            return self.synchronized_data, Event.DONE
+            synchronized_data = synchronized_data.update(
+                synchronized_data_class=SynchronizedData,
+                **{
+                    get_name(SynchronizedData.db_content_hash): agreed_content_hash,
+                    get_name(SynchronizedData.db_load_retries): 0,
+                },
+            )
+            return synchronized_data, Event.DONE
 
         if not self.is_majority_possible(
             self.collection, self.synchronized_data.nb_participants
         ):
-            return self.synchronized_data, Event.NO_MAJORITY
+            # The agents could not agree on the DB content: they reload it from scratch
+            synchronized_data = synchronized_data.update(
+                synchronized_data_class=SynchronizedData,
+                **{
+                    get_name(SynchronizedData.db_snapshot): "",
+                    get_name(SynchronizedData.db_content_hash): "",
+                    get_name(SynchronizedData.db_load_retries): db_load_retries + 1,
+                },
+            )
+            if db_load_retries >= MAX_DB_LOAD_RETRIES:
+                return synchronized_data, Event.MAX_RETRIES_ERROR
+            return synchronized_data, Event.NO_MAJORITY
         return None
 
 
+class AgentDBWriteRound(CollectSameUntilThresholdRound, ABC):
+    """A round whose behaviour writes to AgentDB and reports its write batch hash"""
+
+    def get_write_batch_hash(self, payload: BaseTxPayload) -> Optional[str]:
+        """Get the write batch hash reported in a payload"""
+        return getattr(payload, "write_batch_hash", None)
+
+    def is_writer_pending(self) -> bool:
+        """Check whether we still need to wait for the AgentDB writer to report"""
+        contribute_db = self.context.contribute_db
+        writers = [
+            address
+            for address in contribute_db.writer_addresses
+            if address in self.synchronized_data.participants
+        ]
+        if not writers:
+            return False
+
+        majority_payload = next(
+            payload
+            for payload in self.collection.values()
+            if payload.values == self.most_voted_payload_values
+        )
+        majority_hash = self.get_write_batch_hash(majority_payload)
+        if majority_hash is None:
+            # Nothing was written in this round
+            return False
+
+        writer_hashes = [
+            self.get_write_batch_hash(self.collection[address])
+            for address in writers
+            if address in self.collection
+        ]
+        if not writer_hashes:
+            round_sequence = self.context.state.round_sequence
+            waited = (
+                round_sequence.last_timestamp
+                - round_sequence.last_round_transition_timestamp
+            ).total_seconds()
+            if waited < WRITER_WAIT_TIMEOUT:
+                return True
+            self.context.logger.warning(
+                f"The AgentDB writer {writers} did not report its writes. Forcing a full reload on the next load."
+            )
+            contribute_db.force_full_reload()
+            return False
+
+        if any(writer_hash != majority_hash for writer_hash in writer_hashes):
+            self.context.logger.error(
+                "The AgentDB writer applied a different write batch than the majority. Forcing a full reload on the next load."
+            )
+            contribute_db.force_full_reload()
+        return False
+
+
 class FinishedLoadingRound(DegenerateRound):
     """FinishedLoadingRound"""
 
 
+class FinishedLoadingErrorRound(DegenerateRound):
+    """FinishedLoadingErrorRound"""
+
+
 class ContributeDBAbciApp(AbciApp[Event]):
     """ContributeDBAbciApp"""
 
-    initial_round_cls: AppState = DBLoadRound
-    initial_states: Set[AppState] = {DBLoadRound}
+    initial_round_cls: AppState = DBSnapshotRound
+    initial_states: Set[AppState] = {DBSnapshotRound}
     transition_function: AbciAppTransitionFunction = {
+        DBSnapshotRound: {
+            Event.DONE: DBLoadRound,
+            Event.SNAPSHOT_ROUND_TIMEOUT: DBLoadRound,
+        },
         DBLoadRound: {
             Event.DONE: FinishedLoadingRound,
+            Event.REPAIR: DBLoadRound,
             Event.NO_MAJORITY: DBLoadRound,
+            Event.MAX_RETRIES_ERROR: FinishedLoadingErrorRound,
             Event.ROUND_TIMEOUT: DBLoadRound,
         },
         FinishedLoadingRound: {},
+        FinishedLoadingErrorRound: {},
     }
-    final_states: Set[AppState] = {FinishedLoadingRound}
+    final_states: Set[AppState] = {FinishedLoadingRound, FinishedLoadingErrorRound}
     event_to_timeout: EventToTimeout = {
         Event.ROUND_TIMEOUT: 30.0,
+        # A loader that does not share in time is not waited for: every agent
+        # loads AgentDB on its own in DBLoadRound
+        Event.SNAPSHOT_ROUND_TIMEOUT: 30.0,
     }
     cross_period_persisted_keys: FrozenSet[str] = frozenset()
     db_pre_conditions: Dict[AppState, Set[str]] = {
-        DBLoadRound: set(),
+        DBSnapshotRound: set(),
     }
     db_post_conditions: Dict[AppState, Set[str]] = {
         FinishedLoadingRound: set(),
+        FinishedLoadingErrorRound: set(),
     }
@@ -0,0 +1,639 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2026 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Test the ContributeDatabase"""
+
+import itertools
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Generator, List, Optional, Tuple
+from unittest.mock import MagicMock
+
+import pytest
+
+from packages.valory.skills.agent_db_abci.agent_db_models import (
+    AgentInstance,
+    AttributeDefinition,
+    AttributeInstance,
+)
+from packages.valory.skills.contribute_db_abci.contribute_db import ContributeDatabase
+from packages.valory.skills.contribute_db_abci.contribute_models import (
+    ContributeUser,
+    ModuleCache,
+    ModuleConfigs,
+    ModuleData,
+    TweetEvaluation,
+    TweetSignature,
+    UserTweet,
+)
+
+ATTRIBUTE_NAMES = [
+    "tweet",
+    "user",
+    "module_configs",
+    "module_data",
+    "module_archive",
+    "module_cache",
+]
+DEFINITIONS = {
+    attr_name: AttributeDefinition(
+        attr_def_id=attr_def_id,
+        type_id=1,
+        attr_name=attr_name,
+        data_type="json",
+        is_required=False,
+        default_value="{}",
+    )
+    for attr_def_id, attr_name in enumerate(ATTRIBUTE_NAMES, 1)
+}
+AGENT_ADDRESS = "0x0000000000000000000000000000000000000001"
+N_USERS = 3
+N_TWEETS = 6
+
+
+def run(generator: Generator) -> Any:
+    """Drive a generator to completion and return its value"""
+    with pytest.raises(StopIteration) as exception_info:
+        while True:
+            next(generator)
+    return exception_info.value.value
+
+
+class DummyAgentDBClient:
+    """An AgentDB client that keeps the attribute rows in memory"""
+
+    def __init__(self) -> None:
+        """Init"""
+        self.rows: List[Dict] = []
+        self.attribute_ids = itertools.count(1)
+        self.agent = AgentInstance(
+            agent_id=1,
+            type_id=1,
+            agent_name="contribute",
+            eth_address=AGENT_ADDRESS,
+            created_at=datetime.now(timezone.utc),
+        )
+        self.agent_type = None
+        self.logger = logging.getLogger("contribute_db")
+        self.pages: List[int] = []  # skip of every full page request
+        self.http_request_func: Optional[Callable] = None
+        self.http_requests_func: Optional[Callable] = None
+
+    def add_row(self, attr_name: str, value: Dict) -> AttributeInstance:
+        """Append a row"""
+        row = {
+            "attribute_id": next(self.attribute_ids),
+            "attr_def_id": DEFINITIONS[attr_name].attr_def_id,
+            "agent_id": 1,
+            "last_updated": datetime.now(timezone.utc),
+            "string_value": None,
+            "integer_value": None,
+            "float_value": None,
+            "boolean_value": None,
+            "date_value": None,
+            "json_value": value,
+        }
+        self.rows.append(row)
+        return AttributeInstance(**row)
+
+    def modify_row(self, attribute_id: int, **changes: Any) -> None:
+        """Modify a row in place, like another AgentDB user would"""
+        row = self.get_row(attribute_id)
+        row["json_value"] = row["json_value"] | changes
+        row["last_updated"] += timedelta(seconds=1)
+
+    def get_row(self, attribute_id: int) -> Optional[Dict]:
+        """Get a row by attribute id"""
+        for row in self.rows:
+            if row["attribute_id"] == attribute_id:
+                return row
+        return None
+
+    def ensure_agent_is_loaded(self) -> Generator:
+        """Ensure the agent is loaded"""
+        yield
+
+    def get_attribute_definition_by_name(
+        self, attr_name: str
+    ) -> Generator[None, None, AttributeDefinition]:
+        """Get an attribute definition by name"""
+        yield
+        return DEFINITIONS[attr_name]
+
+    def create_attribute_instance(
+        self,
+        agent_instance: AgentInstance,
+        attribute_def: AttributeDefinition,
+        value: Any,
+        value_type: str,
+    ) -> Generator[None, None, AttributeInstance]:
+        """Create a row"""
+        yield
+        return self.add_row(attribute_def.attr_name, value)
+
+    def update_attribute_instance(
+        self,
+        agent_instance: AgentInstance,
+        attribute_def: AttributeDefinition,
+        attribute_instance_id: int,
+        value: Any,
+        value_type: str,
+    ) -> Generator[None, None, Optional[AttributeInstance]]:
+        """Update a row"""
+        yield
+        row = self.get_row(attribute_instance_id)
+        if row is None:
+            return None
+        row["json_value"] = value
+        row["last_updated"] += timedelta(seconds=1)
+        return AttributeInstance(**row)
+
+    def get_attribute_instance_by_attribute_id(
+        self, attribute_id: int
+    ) -> Generator[None, None, Optional[AttributeInstance]]:
+        """Get a row"""
+        yield
+        row = self.get_row(attribute_id)
+        return AttributeInstance(**row) if row else None
+
+    def parse_attribute_instance(
+        self, attribute_instance: AttributeInstance
+    ) -> Generator[None, None, Dict]:
+        """Parse a row"""
+        yield
+        return {
+            "attr_id": attribute_instance.attribute_id,
+            "attr_name": ATTRIBUTE_NAMES[attribute_instance.attr_def_id - 1],
+            "attr_value": attribute_instance.json_value,
+            "last_updated": attribute_instance.last_updated,
+        }
+
+    def get_all_agent_instance_attributes_parsed(
+        self, agent_instance: AgentInstance, skip: int = 0, trusted: bool = False
+    ) -> Generator[None, None, List[Dict]]:
+        """Get every row after skip"""
+        self.pages.append(skip)
+        parsed = []
+        for row in self.rows[skip:]:
+            attribute = yield from self.parse_attribute_instance(
+                AttributeInstance(**row)
+            )
+            parsed.append(attribute)
+        return parsed
+
+
+class HttpAgentDBClient(DummyAgentDBClient):
+    """An in-memory client whose updates go through the HTTP request functions"""
+
+    def __init__(self, lost_ids: Tuple[int, ...] = ()) -> None:
+        """Init"""
+        super().__init__()
+        self.lost_ids = lost_ids  # attribute ids whose update gets no response
+        self.batches: List[List[int]] = []  # attribute ids of every request batch
+        self.http_request_func = self.http_request
+        self.http_requests_func = self.http_requests
+
+    def http_request(self, **request: Any) -> Generator[None, None, Optional[Any]]:
+        """Send a single request"""
+        responses = yield from self.http_requests([request])
+        return responses[0]
+
+    def http_requests(
+        self, requests: List[Dict]
+    ) -> Generator[None, None, List[Optional[Any]]]:
+        """Send several requests at once"""
+        yield
+        attribute_ids = [int(request["url"].split("/")[-1]) for request in requests]
+        self.batches.append(attribute_ids)
+        return [
+            None if attribute_id in self.lost_ids else MagicMock(status_code=200)
+            for attribute_id in attribute_ids
+        ]
+
+    def update_attribute_instance(
+        self,
+        agent_instance: AgentInstance,
+        attribute_def: AttributeDefinition,
+        attribute_instance_id: int,
+        value: Any,
+        value_type: str,
+    ) -> Generator[None, None, Optional[AttributeInstance]]:
+        """Update a row through an HTTP request"""
+        yield from self.http_request_func(
+            method="PUT",
+            url=f"/api/agent-attributes/{attribute_instance_id}",
+            content=None,
+            headers={},
+            parameters=None,
+        )
+        updated_instance = yield from super().update_attribute_instance(
+            agent_instance, attribute_def, attribute_instance_id, value, value_type
+        )
+        return updated_instance
+
+
+def make_client(client: Optional[DummyAgentDBClient] = None) -> DummyAgentDBClient:
+    """Get a client with a few users, their tweets and the module data"""
+    client = client or DummyAgentDBClient()
+    for user_id in range(N_USERS):
+        client.add_row(
+            "user",
+            {
+                "id": user_id,
+                "points": 100 * user_id,
+                "token_id": str(user_id),
+                "twitter_id": f"{1000 + user_id}",
+                "twitter_handle": f"handle_{user_id}",
+            },
+        )
+    for tweet_id in range(N_TWEETS):
+        client.add_row(
+            "tweet",
+            {
+                "tweet_id": str(2000 + tweet_id),
+                "twitter_user_id": str(1000 + tweet_id % N_USERS),
+                "epoch": 1,
+                "points": 100,
+                "campaign": "olas",
+                "timestamp": datetime(
+                    2026, 1, 1 + tweet_id, tzinfo=timezone.utc
+                ).isoformat(),
+            },
+        )
+    client.add_row("module_configs", ModuleConfigs().model_dump(mode="json"))
+    client.add_row("module_data", ModuleData().model_dump(mode="json"))
+    return client
+
+
+def make_db(
+    client: Optional[DummyAgentDBClient] = None, **kwargs: Any
+) -> Tuple[ContributeDatabase, DummyAgentDBClient]:
+    """Get a ContributeDatabase, loaded from the client, whose agent is the writer"""
+    client = client or make_client()
+    contribute_db = ContributeDatabase(
+        name="contribute_db", skill_context=MagicMock(), **kwargs
+    )
+    contribute_db.initialize(client, AGENT_ADDRESS)
+    contribute_db.writer_addresses = [AGENT_ADDRESS]
+    run(contribute_db.load_from_remote_db())
+    return contribute_db, client
+
+
+class TestDeltaSync:
+    """Test the incremental sync with AgentDB"""
+
+    def test_appended_rows(self) -> None:
+        """Test that appended rows are merged without paging the whole DB"""
+        contribute_db, client = make_db()
+        synced_rows = len(client.rows)
+        client.add_row(
+            "user", {"id": 3, "twitter_id": "1003", "twitter_handle": "handle_3"}
+        )
+        client.add_row(
+            "tweet", {"tweet_id": "3000", "twitter_user_id": "1003", "points": 50}
+        )
+        client.pages = []
+
+        run(contribute_db.load_from_remote_db())
+
+        # The last synced row is fetched again to check the cursor
+        assert client.pages == [synced_rows - 1]
+        assert contribute_db.synced_instance_count == len(client.rows)
+        user = contribute_db.get_user_by_attribute("twitter_id", "1003")
+        assert list(user.tweets) == ["3000"]
+        assert user.tweet_stats.get(None).points == 50
+
+    def test_modified_rows(self) -> None:
+        """Test that rows modified in place are merged by the next full check"""
+        contribute_db, client = make_db()
+        client.modify_row(1, twitter_handle="renamed")
+        client.modify_row(4, points=300)
+
+        run(contribute_db.load_from_remote_db())
+        assert contribute_db.data.users[0].twitter_handle == "handle_0"
+
+        client.pages = []
+        contribute_db.last_full_check -= timedelta(
+            seconds=contribute_db.full_reload_interval
+        )
+        run(contribute_db.load_from_remote_db())
+
+        assert client.pages == [0]
+        assert contribute_db.get_user_by_attribute("twitter_handle", "renamed").id == 0
+        assert contribute_db.user_index.get("twitter_handle", "handle_0") is None
+        assert contribute_db.data.tweets["2000"].points == 300
+        user = contribute_db.data.users[0]
+        assert user.tweets["2000"].points == 300
+        assert user.tweet_stats.get(1).points == 400
+
+    def test_deleted_rows(self) -> None:
+        """Test that a row deleted below the cursor forces a full reload"""
+        contribute_db, client = make_db()
+        del client.rows[N_USERS]
+        client.pages = []
+
+        run(contribute_db.load_from_remote_db())
+
+        assert client.pages == [len(client.rows), 0]
+        assert "2000" not in contribute_db.data.tweets
+        assert contribute_db.synced_instance_count == len(client.rows)
+
+    def test_own_writes_are_not_merged_again(self) -> None:
+        """Test that the writer's updates do not count as modifications"""
+        contribute_db, client = make_db()
+        user = contribute_db.data.users[1]
+        user.points = 1234
+        run(contribute_db.update_user(user))
+
+        modified = [
+            attribute
+            for attribute in run(
+                client.get_all_agent_instance_attributes_parsed(client.agent)
+            )
+            if contribute_db._is_row_modified(attribute)
+        ]
+        assert not modified
+
+    def test_module_cache(self) -> None:
+        """Test that the module cache is stored in its own row, not in the module data"""
+        contribute_db, client = make_db()
+        module_data_row = dict(
+            client.get_row(contribute_db.data.module_data.attribute_instance_id)
+        )
+        cache = ModuleCache(
+            evaluation_cache={
+                "hash": TweetEvaluation(
+                    quality="HIGH", relationship="HIGH", timestamp=1.0
+                )
+            },
+            recent_signatures={
+                "2000": TweetSignature(author_id="1000", simhash="ff", timestamp=1.0)
+            },
+        )
+        run(contribute_db.create_module_cache(cache))
+        cache.recent_signatures = {}
+        run(contribute_db.update_module_cache(cache))
+
+        assert (
+            client.get_row(contribute_db.data.module_data.attribute_instance_id)
+            == module_data_row
+        )
+        assert (
+            client.get_row(cache.attribute_instance_id)["json_value"][
+                "recent_signatures"
+            ]
+            == {}
+        )
+
+        # Other agents load the cache back from its row
+        loaded, _ = make_db(client)
+        assert loaded.data.module_cache == cache
+        assert loaded.get_content_hash() == contribute_db.get_content_hash()
+
+
+class TestSnapshot:
+    """Test the DB snapshots"""
+
+    @pytest.mark.parametrize("columnar_tweets", (False, True))
+    def test_round_trip(self, columnar_tweets: bool) -> None:
+        """Test that restoring a snapshot gives back the same data and cursor"""
+        contribute_db, client = make_db(columnar_tweets=columnar_tweets)
+        snapshot = contribute_db.build_snapshot()
+
+        restored = ContributeDatabase(
+            name="contribute_db",
+            skill_context=MagicMock(),
+            columnar_tweets=columnar_tweets,
+        )
+        restored.initialize(client, AGENT_ADDRESS)
+        assert restored.restore_snapshot(snapshot, "test")
+
+        assert restored.get_content_hash() == contribute_db.get_content_hash()
+        assert restored.synced_instance_count == contribute_db.synced_instance_count
+        assert restored.synced_versions == contribute_db.synced_versions
+        for user_id, user in contribute_db.data.users.items():
+            assert restored.data.users[user_id].model_dump(
+                mode="json"
+            ) == user.model_dump(mode="json")
+            assert sorted(restored.data.users[user_id].tweets) == sorted(user.tweets)
+
+        # The next load only fetches the rows after the snapshot
+        client.pages = []
+        restored.writer_addresses = [AGENT_ADDRESS]
+        run(restored.load_from_remote_db())
+        assert client.pages == [len(client.rows) - 1]
+
+    def test_shared_delta(self) -> None:
+        """Test that a delta on top of the shared snapshot gives back the loader's data"""
+        loader, client = make_db()
+        follower, _ = make_db(client)
+        base = loader.export_snapshot_chunks()
+        loader.mark_snapshot_shared("base")
+        base_root = loader.shared_snapshot["content_root"]
+
+        client.add_row(
+            "user", {"id": 3, "twitter_id": "1003", "twitter_handle": "handle_3"}
+        )
+        client.add_row(
+            "tweet", {"tweet_id": "3000", "twitter_user_id": "1003", "points": 50}
+        )
+        run(loader.load_from_remote_db())
+        delta = loader.export_snapshot_delta()
+        content_root = loader.get_content_hash()["root"]
+
+        assert follower.import_snapshot_delta(delta, content_root)
+        assert follower.get_content_hash() == loader.get_content_hash()
+        assert follower.synced_instance_count == loader.synced_instance_count
+        assert list(follower.get_user_by_attribute("twitter_id", "1003").tweets) == [
+            "3000"
+        ]
+
+        # An agent without trusted data starts from the base snapshot
+        restored = ContributeDatabase(name="contribute_db", skill_context=MagicMock())
+        restored.initialize(client, AGENT_ADDRESS)
+        assert not restored.import_snapshot_delta(delta, content_root)
+        assert restored.import_snapshot_chunks(base, base_root)
+        assert restored.import_snapshot_delta(delta, content_root)
+        assert restored.synced_versions == loader.synced_versions
+
+    def test_corrupted_snapshot(self) -> None:
+        """Test that a corrupted snapshot is ignored"""
+        contribute_db, client = make_db()
+        snapshot = bytearray(contribute_db.build_snapshot())
+        snapshot[-1] ^= 0xFF
+
+        restored = ContributeDatabase(name="contribute_db", skill_context=MagicMock())
+        restored.initialize(client, AGENT_ADDRESS)
+        assert not restored.restore_snapshot(bytes(snapshot), "test")
+        assert restored.is_full_reload_needed()
+        assert not restored.data.users
+
+
+class TestContentHash:
+    """Test the DB content hash"""
+
+    def test_stable(self) -> None:
+        """Test that the hash only depends on the data"""
+        client = make_client()
+        contribute_db, _ = make_db(client)
+        columnar_db, _ = make_db(client, columnar_tweets=True)
+
+        # Rows in a different order
+        reordered_client = make_client()
+        reordered_client.rows.reverse()
+        reordered_db, _ = make_db(reordered_client)
+
+        content_hash = contribute_db.get_content_hash()
+        assert columnar_db.get_content_hash() == content_hash
+        assert reordered_db.get_content_hash() == content_hash
+        assert contribute_db.get_content_hash() == content_hash
+
+    def test_changes(self) -> None:
+        """Test that only the changed subtree hash changes and reverting restores it"""
+        contribute_db, _ = make_db()
+        content_hash = contribute_db.get_content_hash()
+
+        tweet = contribute_db.data.tweets["2001"]
+        tweet.points = 5
+        run(contribute_db.update_tweet(tweet))
+        changed_hash = contribute_db.get_content_hash()
+        assert changed_hash["tweets"] != content_hash["tweets"]
+        assert changed_hash["users"] == content_hash["users"]
+        assert changed_hash["root"] != content_hash["root"]
+
+        tweet.points = 100
+        run(contribute_db.update_tweet(tweet))
+        assert contribute_db.get_content_hash() == content_hash
+
+
+class TestUserIndexAndMetrics:
+    """Test that the user index and metrics follow the users"""
+
+    def test_updates(self) -> None:
+        """Test lookups and metrics after updates"""
+        contribute_db, _ = make_db()
+        user = contribute_db.data.users[2]
+
+        user.twitter_handle = "new_handle"
+        user.token_id = "42"
+        user.points = 7
+        run(contribute_db.update_user(user))
+
+        assert contribute_db.get_user_by_attribute("twitter_handle", "new_handle") is (
+            user
+        )
+        assert contribute_db.get_user_by_attribute("twitter_handle", "handle_2") is None
+        assert contribute_db.get_user_by_attribute("token_id", "42") is user
+        assert contribute_db.get_user_metrics().token_id_to_points() == {
+            "0": 0,
+            "1": 100,
+            "42": 7,
+        }
+
+    def test_new_users_and_tweets(self) -> None:
+        """Test lookups and metrics after creating tweets of new users"""
+        contribute_db, _ = make_db()
+        run(
+            contribute_db.create_user(
+                ContributeUser(
+                    id=contribute_db.get_next_user_id(),
+                    twitter_id="1003",
+                    twitter_handle="handle_3",
+                    service_multisig="0x0000000000000000000000000000000000000003",
+                )
+            )
+        )
+        tweet = UserTweet(
+            tweet_id="3000",
+            twitter_user_id="1003",
+            timestamp=datetime(2026, 2, 1, tzinfo=timezone.utc),
+        )
+        run(contribute_db.create_tweet(tweet))
+
+        user = contribute_db.get_user_by_attribute("twitter_id", "1003")
+        assert user.id == N_USERS
+        assert list(user.tweets) == ["3000"]
+        metrics = contribute_db.get_user_metrics()
+        assert len(metrics) == N_USERS + 1
+        assert metrics.active_staked_user_ids(
+            datetime(2026, 1, 15, tzinfo=timezone.utc)
+        ) == [N_USERS]
+
+    def test_deletes(self) -> None:
+        """Test that removed users are no longer found"""
+        contribute_db, _ = make_db()
+        user = contribute_db.data.users.pop(1)
+
+        # Users removed without going through the DB are detected by the size mismatch
+        assert contribute_db.get_user_by_attribute("twitter_id", "1001") is None
+        assert "1" not in contribute_db.get_user_metrics().token_id_to_points()
+
+        contribute_db.user_index.remove(user)
+        contribute_db.user_metrics.remove(user)
+        user.twitter_id = "9999"
+        assert contribute_db.user_index.get("twitter_id", "9999") is None
+        assert len(contribute_db.user_metrics) == N_USERS - 1
+
+
+class TestUnitOfWork:
+    """Test the queued writer uploads"""
+
+    def test_flush_stats(self) -> None:
+        """Test that only the requests that reach AgentDB count as sent"""
+        contribute_db, client = make_db()
+        unchanged = contribute_db.data.users[2]
+        run(contribute_db.update_user(unchanged))
+        contribute_db.begin_unit_of_work()
+
+        changed = contribute_db.data.users[1]
+        changed.points = 1
+        run(contribute_db.update_user(changed))
+        changed.points = 2
+        run(contribute_db.update_user(changed))
+        run(contribute_db.update_user(unchanged))
+
+        stats = run(contribute_db.flush())
+
+        assert stats["writes_requested"] == 3
+        assert stats["writes_coalesced"] == 1
+        assert stats["writes_sent"] == 1
+        assert stats["writes_skipped"] == 1
+        assert stats["writes_failed"] == 0
+        assert (
+            client.get_row(changed.attribute_instance_id)["json_value"]["points"] == 2
+        )
+
+    def test_concurrent_flush(self) -> None:
+        """Test that the flush sends its writes in batches and counts failures per response"""
+        client = make_client(HttpAgentDBClient(lost_ids=(2,)))
+        contribute_db, _ = make_db(client, max_concurrent_writes=2)
+        contribute_db.begin_unit_of_work()
+        users = [contribute_db.data.users[user_id] for user_id in range(N_USERS)]
+        for user in users:
+            user.points += 1
+            run(contribute_db.update_user(user))
+
+        stats = run(contribute_db.flush())
+
+        assert client.batches == [[1, 2], [3]]
+        assert stats["writes_sent"] == N_USERS
+        assert stats["writes_failed"] == 1
+        assert client.get_row(2)["json_value"]["points"] == 100
+        assert client.get_row(3)["json_value"]["points"] == 201
+        assert contribute_db.needs_full_reload
@@ -0,0 +1,303 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2026 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Test the Contribute models"""
+
+from datetime import datetime, timezone
+from typing import List
+
+import pytest
+
+from packages.valory.skills.contribute_db_abci.contribute_models import (
+    ContributeUser,
+    TweetStore,
+    UserIndex,
+    UserMetrics,
+    UserTweet,
+)
+
+MULTISIG = "0x0000000000000000000000000000000000000001"
+
+
+def make_tweets() -> List[UserTweet]:
+    """Get a few tweets of two authors"""
+    return [
+        UserTweet(
+            tweet_id=str(tweet_id),
+            twitter_user_id=str(tweet_id % 2),
+            epoch=tweet_id % 3,
+            points=100,
+            campaign="olas" if tweet_id % 2 else None,
+            timestamp=datetime(2026, 1, 1 + tweet_id, tzinfo=timezone.utc),
+        )
+        for tweet_id in range(6)
+    ]
+
+
+class TestUserIndex:
+    """Test the UserIndex"""
+
+    def test_follows_updates(self) -> None:
+        """Test that the indexes follow the changes to the users"""
+        index = UserIndex()
+        users = [
+            ContributeUser(id=user_id, twitter_id=str(user_id), token_id="1")
+            for user_id in range(3)
+        ]
+        index.rebuild(users)
+
+        assert index.get("twitter_id", "1") is users[1]
+        # Duplicated values resolve to the lowest id
+        assert index.get("token_id", "1") is users[0]
+
+        users[0].token_id = None
+        users[1].twitter_id = "10"
+        assert index.get("token_id", "1") is users[1]
+        assert index.get("twitter_id", "1") is None
+        assert index.get("twitter_id", "10") is users[1]
+
+        index.remove(users[1])
+        assert index.get("twitter_id", "10") is None
+        assert index.get("token_id", "1") is users[2]
+        assert len(index) == 2
+
+        # A stale copy does not change the index
+        copy = users[2].model_copy()
+        copy.twitter_id = "20"
+        assert index.get("twitter_id", "2") is users[2]
+
+
+class TestUserMetrics:
+    """Test the UserMetrics table"""
+
+    def test_follows_updates(self) -> None:
+        """Test that the rows follow the changes to the users"""
+        metrics = UserMetrics()
+        users = [
+            ContributeUser(id=user_id, points=10 * user_id, token_id=str(user_id))
+            for user_id in range(4)
+        ]
+        metrics.rebuild(users)
+
+        users[1].current_period_points = 5
+        users[3].points = 100
+        users[2].token_id = None
+        assert metrics.period_points_user_ids() == [1]
+        assert metrics.token_id_to_points() == {"0": 0, "1": 10, "3": 100}
+
+        metrics.remove(users[0])
+        users[0].points = 1000
+        assert metrics.token_id_to_points() == {"1": 10, "3": 100}
+        assert len(metrics) == 3
+
+    def test_filters_follow_updates(self) -> None:
+        """Test that the filtered users follow resets, unstaking and removals"""
+        metrics = UserMetrics()
+        users = [
+            ContributeUser(
+                id=user_id,
+                current_period_points=user_id,
+                service_multisig=MULTISIG,
+            )
+            for user_id in range(3)
+        ]
+        metrics.rebuild(users)
+        assert metrics.period_points_user_ids() == [1, 2]
+
+        users[1].current_period_points = 0
+        users[2].service_multisig = None
+        metrics.remove(users[0])
+        assert metrics.period_points_user_ids() == [2]
+        assert metrics.token_id_to_points() == {}
+        assert metrics._staked_user_ids == {1}  # pylint: disable=protected-access
+
+    def test_active_staked_users(self) -> None:
+        """Test the staked users that tweeted recently"""
+        metrics = UserMetrics()
+        staked = ContributeUser(id=0, twitter_id="0", service_multisig=MULTISIG)
+        not_staked = ContributeUser(id=1, twitter_id="1")
+        tweets = make_tweets()
+        for tweet in tweets:
+            (staked if tweet.twitter_user_id == "0" else not_staked).add_tweet(tweet)
+        metrics.rebuild([staked, not_staked])
+
+        since = datetime(2026, 1, 6, tzinfo=timezone.utc)
+        assert metrics.active_staked_user_ids(since) == []
+
+        staked.add_tweet(
+            UserTweet(
+                tweet_id="100",
+                twitter_user_id="0",
+                timestamp=datetime(2026, 2, 1, tzinfo=timezone.utc),
+            )
+        )
+        metrics.update(staked)
+        assert metrics.active_staked_user_ids(since) == [0]
+
+    def test_writes_do_not_scan_tweets(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that field writes and new tweets update the row incrementally"""
+        metrics = UserMetrics()
+        user = ContributeUser(id=0, twitter_id="0", service_multisig=MULTISIG)
+        metrics.rebuild([user])
+
+        def fail(_user: ContributeUser) -> None:
+            """Fail if the tweets are scanned"""
+            pytest.fail("The user's tweets were scanned")
+
+        monkeypatch.setattr(ContributeUser, "tweet_stats", property(fail))
+        user.points = 5
+        user.token_id = "3"
+        tweet = UserTweet(
+            tweet_id="1",
+            twitter_user_id="0",
+            timestamp=datetime(2026, 2, 1, tzinfo=timezone.utc),
+        )
+        user.add_tweet(tweet)
+        metrics.add_tweet(user, tweet)
+
+        assert metrics.token_id_to_points() == {"3": 5}
+        assert metrics.active_staked_user_ids(
+            datetime(2026, 1, 1, tzinfo=timezone.utc)
+        ) == [0]
+
+
+class TestUserTweetStats:
+    """Test the per-epoch tweet totals"""
+
+    def test_follows_updates(self) -> None:
+        """Test that the totals follow the changes to the tweets"""
+        user = ContributeUser(id=0, twitter_id="1")
+        tweets = [tweet for tweet in make_tweets() if tweet.twitter_user_id == "1"]
+        for tweet in tweets:
+            user.add_tweet(tweet)
+
+        stats = user.tweet_stats
+        assert {epoch: stats.get(epoch).points for epoch in stats.epochs} == {
+            0: 100,
+            1: 100,
+            2: 100,
+        }
+        assert stats.get(1).not_counted == {"1": 100}
+
+        tweets[0].points = 300
+        tweets[0].counted_for_activity = True
+        assert stats.get(1).points == 300
+        assert stats.get(1).campaign_points == 300
+        assert stats.get(1).not_counted == {}
+        assert stats.latest_timestamp == datetime(2026, 1, 6, tzinfo=timezone.utc)
+
+        tweets[2].epoch = 1
+        assert stats.get(1).tweet_count == 2
+        assert stats.get(2).tweet_count == 0
+
+
+class TestTweetStore:
+    """Test the columnar TweetStore"""
+
+    def test_read_write(self) -> None:
+        """Test that the store gives back the stored tweets"""
+        store = TweetStore()
+        tweets = make_tweets()
+        for tweet in tweets:
+            store[tweet.tweet_id] = tweet
+
+        assert len(store) == len(tweets)
+        for tweet in tweets:
+            assert store[tweet.tweet_id].model_dump() == tweet.model_dump()
+
+        # Changes to a view are written back
+        view = store["3"]
+        view.points = 7
+        assert store["3"].points == 7
+
+        del store["0"]
+        assert "0" not in store
+        assert sorted(store) == ["1", "2", "3", "4", "5"]
+        assert sorted(store.author_view("0")) == ["2", "4"]
+
+    def test_author_stats(self) -> None:
+        """Test that the author stats match the ones of a dict of tweets"""
+        store = TweetStore()
+        user = ContributeUser(id=0, twitter_id="1")
+        for tweet in make_tweets():
+            store[tweet.tweet_id] = tweet
+            if tweet.twitter_user_id == "1":
+                user.add_tweet(tweet.model_copy())
+
+        expected = user.tweet_stats
+        stats = store.author_stats("1")
+        assert stats.latest_timestamp == expected.latest_timestamp
+        for epoch, epoch_stats in expected.epochs.items():
+            assert vars(stats.get(epoch)) == vars(epoch_stats)
+
+    def test_author_stats_follow_writes(self) -> None:
+        """Test that the author totals are kept up to date instead of recomputed"""
+        store = TweetStore()
+        for tweet in make_tweets():
+            store[tweet.tweet_id] = tweet
+        stats = store.author_stats("1")
+
+        store["1"].counted_for_activity = True
+        store["3"].points = 300
+        del store["5"]
+
+        assert store.author_stats("1") is stats
+        assert stats.get(1).not_counted == {}
+        assert stats.get(0).points == 300
+        assert stats.get(2).tweet_count == 0
+        assert stats.latest_timestamp == datetime(2026, 1, 4, tzinfo=timezone.utc)
+
+    def test_removed_views_are_detached(self) -> None:
+        """Test that changing a view of a removed tweet does not store it again"""
+        store = TweetStore()
+        for tweet in make_tweets():
+            store[tweet.tweet_id] = tweet
+        view = store["3"]
+
+        del store["3"]
+        view.points = 7
+
+        assert "3" not in store
+        assert len(store) == 5
+
+    def test_non_numeric_ids(self) -> None:
+        """Test that tweet ids that are not plain integers are kept as they are"""
+        store = TweetStore()
+        tweet_ids = ["12", "012", "abc", str(2**64)]
+        for tweet_id in tweet_ids:
+            store[tweet_id] = UserTweet(tweet_id=tweet_id, twitter_user_id="1")
+
+        assert list(store) == tweet_ids
+        assert sorted(store.author_view("1")) == sorted(tweet_ids)
+        assert store["abc"].tweet_id == "abc"
+        assert "0012" not in store
+
+        del store["012"]
+        assert list(store) == ["12", str(2**64), "abc"]
+
+    def test_views_equal_their_tweet(self) -> None:
+        """Test that a view compares equal to a tweet with a naive timestamp"""
+        store = TweetStore()
+        tweet = UserTweet(
+            tweet_id="1", twitter_user_id="1", timestamp=datetime(2026, 1, 1)
+        )
+        store["1"] = tweet
+
+        assert tweet.timestamp.tzinfo == timezone.utc
+        assert store["1"] == tweet
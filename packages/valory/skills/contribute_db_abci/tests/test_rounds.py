@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2026 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This package contains the tests for the ContributeDB rounds."""
+
+import json
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple, cast
+from unittest.mock import MagicMock
+
+from packages.valory.skills.abstract_round_abci.base import (
+    BaseSynchronizedData,
+    BaseTxPayload,
+)
+from packages.valory.skills.abstract_round_abci.test_tools.rounds import (
+    BaseRoundTestClass,
+)
+from packages.valory.skills.contribute_db_abci.payloads import DBLoadPayload
+from packages.valory.skills.contribute_db_abci.rounds import (
+    AgentDBWriteRound,
+    DBLoadRound,
+    Event,
+    MAX_DB_LOAD_RETRIES,
+    SynchronizedData,
+    WRITER_WAIT_TIMEOUT,
+)
+
+AGREED_HASH = json.dumps({"root": "agreed", "users": "users"}, sort_keys=True)
+DIVERGED_HASH = json.dumps({"root": "diverged", "users": "other"}, sort_keys=True)
+WRITER = "agent_0"
+ROUND_START = datetime(2026, 1, 1)
+
+
+@dataclass(frozen=True)
+class DummyWritePayload(BaseTxPayload):
+    """A payload of a round that writes to AgentDB"""
+
+    write_batch_hash: Optional[str] = None
+
+
+class DummyWriteRound(AgentDBWriteRound):
+    """A round that writes to AgentDB"""
+
+    payload_class = DummyWritePayload
+    synchronized_data_class = SynchronizedData
+
+    def end_block(self) -> Optional[Tuple[BaseSynchronizedData, Event]]:
+        """Process the end of the block."""
+        if self.threshold_reached and not self.is_writer_pending():
+            return self.synchronized_data, Event.DONE
+        return None
+
+
+class TestDBLoadRound(BaseRoundTestClass):
+    """Tests for DBLoadRound."""
+
+    _synchronized_data_class = SynchronizedData
+    _event_class = Event
+
+    def run_round(
+        self, content_hashes: List[str], **initial_data: Any
+    ) -> Tuple[SynchronizedData, Event, MagicMock]:
+        """Send one content hash per participant and end the block"""
+        self.synchronized_data.update(**initial_data)
+        context = MagicMock()
+        test_round = DBLoadRound(
+            synchronized_data=self.synchronized_data, context=context
+        )
+        for participant, content_hash in zip(sorted(self.participants), content_hashes):
+            test_round.process_payload(DBLoadPayload(participant, content_hash))
+        result = test_round.end_block()
+        assert result is not None
+        synchronized_data, event = result
+        return cast(SynchronizedData, synchronized_data), event, context
+
+    def test_agreement(self) -> None:
+        """Test that the agreed content hash is stored for the behaviours to compare"""
+        synchronized_data, event, context = self.run_round([AGREED_HASH] * 4)
+        assert event == Event.DONE
+        assert synchronized_data.db_content_hash == json.loads(AGREED_HASH)
+        assert context.contribute_db.writer_addresses == [sorted(self.participants)[0]]
+        # Rounds do not compare or reload the local data
+        context.contribute_db.set_agreed_content_hash.assert_not_called()
+        context.contribute_db.force_full_reload.assert_not_called()
+
+    def test_repair(self) -> None:
+        """Test that diverged agents get a single repair pass per period"""
+        content_hashes = [AGREED_HASH] * 3 + [DIVERGED_HASH]
+        synchronized_data, event, _ = self.run_round(
+            content_hashes, db_snapshot=json.dumps({"loader": "agent_0"})
+        )
+        assert event == Event.REPAIR
+        assert synchronized_data.db_repaired
+        assert synchronized_data.db_snapshot is None
+        assert synchronized_data.db_content_hash == json.loads(AGREED_HASH)
+
+        synchronized_data, event, context = self.run_round(
+            content_hashes, db_repaired=True
+        )
+        assert event == Event.DONE
+        # The diverged agent is not elected as the DB keeper
+        assert (
+            context.contribute_db.writer_addresses[0] in sorted(self.participants)[:3]
+        )
+
+    def test_no_majority(self) -> None:
+        """Test that a failed agreement is retried until MAX_DB_LOAD_RETRIES"""
+        content_hashes = [AGREED_HASH] * 2 + [DIVERGED_HASH] * 2
+        synchronized_data, event, context = self.run_round(content_hashes)
+        assert event == Event.NO_MAJORITY
+        assert synchronized_data.db_load_retries == 1
+        assert synchronized_data.db_content_hash is None
+        context.contribute_db.force_full_reload.assert_not_called()
+
+        _, event, _ = self.run_round(
+            content_hashes, db_load_retries=MAX_DB_LOAD_RETRIES
+        )
+        assert event == Event.MAX_RETRIES_ERROR
+
+
+class TestAgentDBWriteRound(BaseRoundTestClass):
+    """Tests for the AgentDB writer barrier."""
+
+    _synchronized_data_class = SynchronizedData
+    _event_class = Event
+
+    def make_round(self, waited: float = 0.0) -> DummyWriteRound:
+        """Get a round that has been running for some seconds"""
+        context = MagicMock()
+        context.contribute_db.writer_addresses = [WRITER]
+        round_sequence = context.state.round_sequence
+        round_sequence.last_round_transition_timestamp = ROUND_START
+        round_sequence.last_timestamp = ROUND_START + timedelta(seconds=waited)
+        return DummyWriteRound(
+            synchronized_data=self.synchronized_data, context=context
+        )
+
+    @staticmethod
+    def send(
+        test_round: DummyWriteRound, write_batch_hashes: Dict[str, Optional[str]]
+    ) -> None:
+        """Send one write batch hash per participant"""
+        for participant, write_batch_hash in write_batch_hashes.items():
+            test_round.process_payload(
+                DummyWritePayload(participant, write_batch_hash=write_batch_hash)
+            )
+
+    def test_writer_reported(self) -> None:
+        """Test that the round ends once the writer reports the majority's writes"""
+        test_round = self.make_round()
+        self.send(
+            test_round, {"agent_1": "batch", "agent_2": "batch", "agent_3": "batch"}
+        )
+        assert test_round.end_block() is None
+
+        self.send(test_round, {WRITER: "batch"})
+        result = test_round.end_block()
+        assert result is not None
+        assert result[1] == Event.DONE
+        test_round.context.contribute_db.force_full_reload.assert_not_called()
+
+    def test_nothing_written(self) -> None:
+        """Test that rounds that wrote nothing do not wait for the writer"""
+        test_round = self.make_round()
+        self.send(test_round, {"agent_1": None, "agent_2": None, "agent_3": None})
+        result = test_round.end_block()
+        assert result is not None
+        assert result[1] == Event.DONE
+
+    def test_writer_missing(self) -> None:
+        """Test that a writer that never reports forces a full reload"""
+        test_round = self.make_round(waited=WRITER_WAIT_TIMEOUT)
+        self.send(
+            test_round, {"agent_1": "batch", "agent_2": "batch", "agent_3": "batch"}
+        )
+        result = test_round.end_block()
+        assert result is not None
+        assert result[1] == Event.DONE
+        test_round.context.contribute_db.force_full_reload.assert_called_once()
+
+    def test_writer_diverged(self) -> None:
+        """Test that a writer that applied other writes forces a full reload"""
+        test_round = self.make_round()
+        self.send(
+            test_round,
+            {
+                WRITER: "other",
+                "agent_1": "batch",
+                "agent_2": "batch",
+                "agent_3": "batch",
+            },
+        )
+        result = test_round.end_block()
+        assert result is not None
+        assert result[1] == Event.DONE
+        test_round.context.contribute_db.force_full_reload.assert_called_once()
@@ -133,9 +133,22 @@ class DecisionMakingBehaviour(DecisionMakingBaseBehaviour):
         """Do the act, supporting asynchronous execution."""
 
         with self.context.benchmark_tool.measure(self.behaviour_id).local():
+            contribute_db = self.context.contribute_db
+            contribute_db.reset_write_batch()
             updates, event = yield from self.get_updates_and_event()
+            # Lets the round wait until the AgentDB writer has stored the task writes
+            write_batch_hash = (
+                contribute_db.get_write_batch_hash()
+                if contribute_db.write_batch
+                else None
+            )
             payload_content = json.dumps(
-                {"updates": updates, "event": event}, sort_keys=True
+                {
+                    "updates": updates,
+                    "event": event,
+                    "write_batch_hash": write_batch_hash,
+                },
+                sort_keys=True,
             )
             sender = self.context.agent_address
             payload = DecisionMakingPayload(sender=sender, content=payload_content)
@@ -154,6 +167,10 @@ class DecisionMakingBehaviour(DecisionMakingBaseBehaviour):
         # Get the previous and next task preparations
         previous_decision_event = self.synchronized_data.previous_decision_event
 
+        # Keep the scheduled tweets and campaigns small before the tasks go through them
+        if previous_decision_event is None:
+            yield from self.context.contribute_db.compact_module_data(now_utc)
+
         event_list = list(
             previous_event_to_task_preparation_cls.keys()
         )  # since python 3.7, dict keys preserve order
@@ -28,10 +28,12 @@ from packages.valory.skills.abstract_round_abci.base import (
     AbciAppTransitionFunction,
     AppState,
     BaseSynchronizedData,
+    BaseTxPayload,
     CollectSameUntilThresholdRound,
     DegenerateRound,
     EventToTimeout,
 )
+from packages.valory.skills.contribute_db_abci.rounds import AgentDBWriteRound
 from packages.valory.skills.decision_making_abci.payloads import (
     DecisionMakingPayload,
     PostTxDecisionPayload,
@@ -114,16 +116,25 @@ class SynchronizedData(BaseSynchronizedData):
         return cast(str, self.db.get("tx_submitter"))
 
 
-class DecisionMakingRound(CollectSameUntilThresholdRound):
+class DecisionMakingRound(AgentDBWriteRound):
     """DecisionMakingRound"""
 
     payload_class = DecisionMakingPayload
     synchronized_data_class = SynchronizedData
     extended_requirements = ()
 
+    def get_write_batch_hash(self, payload: BaseTxPayload) -> Optional[str]:
+        """Get the write batch hash reported in a payload"""
+        return json.loads(cast(DecisionMakingPayload, payload).content).get(
+            "write_batch_hash"
+        )
+
     def end_block(self) -> Optional[Tuple[BaseSynchronizedData, Event]]:
         """Process the end of the block."""
         if self.threshold_reached:
+            if self.is_writer_pending():
+                return None
+
             # We reference all the events here to prevent the check-abciapp-specs tool from complaining
             # since this round receives the event via payload
             # Event.NO_MAJORITY, Event.DONE,
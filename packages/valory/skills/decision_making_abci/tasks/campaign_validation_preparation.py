@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 # ------------------------------------------------------------------------------
 #
-#   Copyright 2023-2025 Valory AG
+#   Copyright 2023-2026 Valory AG
 #
 #   Licensed under the Apache License, Version 2.0 (the "License");
 #   you may not use this file except in compliance with the License.
@@ -51,7 +51,8 @@ class CampaignValidationPreparation(TaskPreparation, SignatureValidationMixin):
         """Preparations before running the task"""
         yield
         updates = {}
-        for campaign in self.module_data.twitter_campaigns.campaigns:
+        # Ended and void campaigns are not listed
+        for campaign in self.context.contribute_db.get_module_index().open_campaigns:
             self.logger.info(
                 f"Checking campaign proposal {campaign.id} {campaign.hashtag} [{campaign.status}]"
             )
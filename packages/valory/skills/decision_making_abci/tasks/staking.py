@@ -320,21 +320,11 @@ class StakingActivityPreparation(StakingPreparation):
 
             this_epoch = staking_contract_to_epoch[staking_contract]
 
-            # Get this epoch's tweets and points
-            # Also filter out tweets that do not belong to a campaign
-            this_epoch_tweets = {
-                k: v
-                for k, v in user.tweets.items()
-                if v.epoch == this_epoch and v.campaign
-            }
-            this_epoch_not_counted_tweets = {
-                k: v for k, v in this_epoch_tweets.items() if not v.counted_for_activity
-            }
-
-            this_epoch_points = sum(t.points for t in this_epoch_tweets.values())
-            this_epoch_not_counted_points = sum(
-                t.points for t in this_epoch_not_counted_tweets.values()
-            )
+            # Get this epoch's campaign points from the user's running totals
+            # Tweets that do not belong to a campaign are not accounted here
+            epoch_stats = user.tweet_stats.get(this_epoch)
+            this_epoch_points = epoch_stats.campaign_points
+            this_epoch_not_counted_points = epoch_stats.not_counted_points
 
             # Since we count each POINTS_PER_ACTIVITY_UPDATE as one update, it can be the case
             # that some partial points are pending from the previous activity update, i.e
@@ -354,9 +344,7 @@ class StakingActivityPreparation(StakingPreparation):
 
             # Group tweets to build new updates. This is not evident and requires
             # an algorithm that optimizes how to group them in order to maximize the number of updates for the user
-            not_counted_tweet_id_to_points = {
-                k: v.points for k, v in this_epoch_not_counted_tweets.items()
-            }
+            not_counted_tweet_id_to_points = dict(epoch_stats.not_counted)
 
             updates, selected_tweets = group_tweets(
                 not_counted_tweet_id_to_points, points_pending_from_previous_run
@@ -55,7 +55,8 @@ class TweetValidationPreparation(TaskPreparation, SignatureValidationMixin):
         """Preparations before running the task"""
         updates = {}
 
-        for tweet in self.module_data.scheduled_tweet.tweets:
+        # Posted tweets and rejected proposals are not listed
+        for tweet in self.context.contribute_db.get_module_index().open_tweets:
             tweet_text = tweet.text if isinstance(tweet.text, str) else tweet.text[0]
 
             self.logger.info(f"Checking tweet proposal: {tweet_text}")
@@ -181,7 +181,7 @@ class ScheduledTweetPreparation(TwitterPreparation, SignatureValidationMixin):
         """Get not yet posted tweets that need to be posted"""
 
         pending_tweets = []
-        for tweet in self.module_data.scheduled_tweet.tweets:
+        for tweet in self.context.contribute_db.get_module_index().open_tweets:
             self.logger.info(f"Checking tweet: text={tweet.text}")
 
             # Ignore posted tweets
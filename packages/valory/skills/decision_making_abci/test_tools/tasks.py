@@ -34,6 +34,7 @@ from packages.valory.skills.abstract_round_abci.test_tools.base import (
 from packages.valory.skills.contribute_db_abci.contribute_models import (
     ContributeUser,
     ModuleData,
+    ModuleStatusIndex,
 )
 from packages.valory.skills.decision_making_abci.behaviours import (
     DecisionMakingBehaviour,
@@ -186,6 +187,9 @@ class BaseTaskTest(FSMBehaviourBaseCase):
                     "plugins_data"
                 ]
             )
+            module_index = ModuleStatusIndex()
+            module_index.rebuild(self.mock_task_preparation_object.module_data)
+            self.context.contribute_db.get_module_index.return_value = module_index
         self.mock_task_preparation_object.logger.info = MagicMock()
 
     def mock_params(self, test_case) -> None:
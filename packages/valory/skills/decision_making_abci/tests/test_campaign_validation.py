@@ -27,7 +27,10 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
-from packages.valory.skills.contribute_db_abci.contribute_models import TwitterCampaign
+from packages.valory.skills.contribute_db_abci.contribute_models import (
+    ModuleStatusIndex,
+    TwitterCampaign,
+)
 from packages.valory.skills.decision_making_abci.rounds import Event
 from packages.valory.skills.decision_making_abci.tasks.campaign_validation_preparation import (
     CampaignValidationPreparation,
@@ -77,6 +80,9 @@ class BaseCampaignValidationPreparationTest:
         self.context.contribute_db.data.module_data.twitter_campaigns.campaigns = [
             TwitterCampaign(**campaign)
         ]
+        module_index = ModuleStatusIndex()
+        module_index.rebuild(self.context.contribute_db.data.module_data)
+        self.context.contribute_db.get_module_index.return_value = module_index
 
         # Modify the consensus veolas power to force consensus
         self.behaviour.params.tweet_consensus_veolas = 0
@@ -2,7 +2,7 @@
 # -*- coding: utf-8 -*-
 # ------------------------------------------------------------------------------
 #
-#   Copyright 2021-2025 Valory AG
+#   Copyright 2021-2026 Valory AG
 #
 #   Licensed under the Apache License, Version 2.0 (the "License");
 #   you may not use this file except in compliance with the License.
@@ -26,7 +26,10 @@ from unittest.mock import MagicMock, call, patch
 
 import pytest
 
-from packages.valory.skills.contribute_db_abci.contribute_models import ServiceTweet
+from packages.valory.skills.contribute_db_abci.contribute_models import (
+    ModuleStatusIndex,
+    ServiceTweet,
+)
 from packages.valory.skills.decision_making_abci.rounds import Event
 from packages.valory.skills.decision_making_abci.tasks.tweet_validation_preparation import (
     TweetValidationPreparation,
@@ -349,7 +352,6 @@ class TestTweetValidationPreparation(BaseTweetValidationPreparationTest):
                 ),
                 logger_message=[
                     call("Checking tweet proposal: My agreed tweet: dummy"),
-                    call("The tweet has been posted already"),
                     call("The proposal has been already verified"),
                 ],
             )
@@ -373,6 +375,9 @@ class TestTweetValidationPreparation(BaseTweetValidationPreparationTest):
         self.mock_tweet_validation_preparation.module_data.scheduled_tweet.tweets = [
             ServiceTweet(**tweet) for tweet in SCHEDULED_TWEETS
         ]
+        module_index = ModuleStatusIndex()
+        module_index.rebuild(self.mock_tweet_validation_preparation.module_data)
+        self.context.contribute_db.get_module_index.return_value = module_index
         gen = self.mock_tweet_validation_preparation._pre_task()
         next(gen)
         calls = test_case.logger_message
@@ -145,6 +145,15 @@ class TokenTrackBehaviour(DynamicNFTBaseBehaviour):
         token_id_to_points = self.synchronized_data.token_id_to_points
 
         contribute_db = self.context.contribute_db
+        contribute_db.reset_write_batch()
+
+        # Reserve the ids of the users created in this batch
+        new_addresses = {
+            address
+            for address in new_token_id_to_address.values()
+            if not contribute_db.get_user_by_attribute("wallet_address", address)
+        }
+        new_user_ids = iter(contribute_db.reserve_user_ids(len(new_addresses)))
 
         # Update token_ids in the contribut_db
         for token_id, address in new_token_id_to_address.items():
@@ -155,8 +164,7 @@ class TokenTrackBehaviour(DynamicNFTBaseBehaviour):
             # - User exists and its current token_id is None
             # - User exists and its current token_id is greater than the one in this iteration (only the first minted token is assigned to the user)
             if not user:
-                user_id = contribute_db.get_next_user_id()
-                user = ContributeUser(id=user_id)
+                user = ContributeUser(id=next(new_user_ids))
 
             if user.token_id is None or int(token_id) < int(user.token_id):
                 user.token_id = token_id
@@ -165,11 +173,7 @@ class TokenTrackBehaviour(DynamicNFTBaseBehaviour):
                 )
 
         # Rebuild token_to_points
-        new_token_id_to_points = {
-            user.token_id: user.points
-            for user in contribute_db.data.users.values()
-            if user.token_id
-        }
+        new_token_id_to_points = contribute_db.get_user_metrics().token_id_to_points()
 
         # contribute_db only stores the first minted token for each user
         # We add the extra tokens to new_token_id_to_points and assing a score of 0
@@ -194,6 +198,7 @@ class TokenTrackBehaviour(DynamicNFTBaseBehaviour):
         data = {
             "last_update_time": last_update_time,
             "token_id_to_points": token_id_to_points,
+            "write_batch_hash": contribute_db.get_write_batch_hash(),
         }
 
         self.context.logger.info("Token data updated")
@@ -29,11 +29,12 @@ from packages.valory.skills.abstract_round_abci.base import (
     AbciAppTransitionFunction,
     AppState,
     BaseSynchronizedData,
-    CollectSameUntilThresholdRound,
+    BaseTxPayload,
     DegenerateRound,
     EventToTimeout,
     get_name,
 )
+from packages.valory.skills.contribute_db_abci.rounds import AgentDBWriteRound
 from packages.valory.skills.dynamic_nft_abci.payloads import TokenTrackPayload
 
 MAX_TOKEN_EVENT_RETRIES = 3
@@ -71,7 +72,7 @@ class SynchronizedData(BaseSynchronizedData):
         return cast(int, self.db.get("token_event_retries", 0))
 
 
-class TokenTrackRound(CollectSameUntilThresholdRound):
+class TokenTrackRound(AgentDBWriteRound):
     """TokenTrackRound"""
 
     payload_class = TokenTrackPayload
@@ -80,9 +81,18 @@ class TokenTrackRound(CollectSameUntilThresholdRound):
 
     ERROR_PAYLOAD = {"error": True}
 
+    def get_write_batch_hash(self, payload: BaseTxPayload) -> Optional[str]:
+        """Get the write batch hash reported in a payload"""
+        return json.loads(cast(TokenTrackPayload, payload).content).get(
+            "write_batch_hash"
+        )
+
     def end_block(self) -> Optional[Tuple[BaseSynchronizedData, Event]]:
         """Process the end of the block."""
         if self.threshold_reached:
+            if self.is_writer_pending():
+                return None
+
             payload = json.loads(self.most_voted_payload)
 
             if payload == TokenTrackRound.ERROR_PAYLOAD:
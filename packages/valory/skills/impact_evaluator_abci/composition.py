@@ -48,8 +48,9 @@ from packages.valory.skills.termination_abci.rounds import (
 # Here we define how the transition between the FSMs should happen
 # more information here: https://open-autonomy.docs.autonolas.tech/open-autonomy/key_concepts/fsm_app_introduction/?h=composition#composition-of-fsm-apps
 abci_app_transition_mapping: AbciAppTransitionMapping = {
-    RegistrationAbci.FinishedRegistrationRound: ContributeDBAbci.DBLoadRound,
+    RegistrationAbci.FinishedRegistrationRound: ContributeDBAbci.DBSnapshotRound,
     ContributeDBAbci.FinishedLoadingRound: DecisionMakingAbci.DecisionMakingRound,
+    ContributeDBAbci.FinishedLoadingErrorRound: ResetAndPauseAbci.ResetAndPauseRound,
     DecisionMakingAbci.FinishedDecisionMakingWriteTwitterRound: TwitterWriteAbciApp.RandomnessTwitterRound,
     DecisionMakingAbci.FinishedDecisionMakingDoneRound: ResetAndPauseAbci.ResetAndPauseRound,
     DecisionMakingAbci.FinishedDecisionMakingWeekInOlasRound: WeekInOlasAbciApp.OlasWeekDecisionMakingRound,
@@ -79,7 +80,7 @@ abci_app_transition_mapping: AbciAppTransitionMapping = {
     WeekInOlasAbciApp.FinishedWeekInOlasRound: DecisionMakingAbci.DecisionMakingRound,
     DynamicNFTAbci.FinishedTokenTrackRound: DecisionMakingAbci.DecisionMakingRound,
     TwitterWriteAbciApp.FinishedTwitterWriteRound: DecisionMakingAbci.DecisionMakingRound,
-    ResetAndPauseAbci.FinishedResetAndPauseRound: ContributeDBAbci.DBLoadRound,
+    ResetAndPauseAbci.FinishedResetAndPauseRound: ContributeDBAbci.DBSnapshotRound,
     ResetAndPauseAbci.FinishedResetAndPauseErrorRound: RegistrationAbci.RegistrationRound,
 }
 
@@ -112,6 +112,9 @@ class SharedState(BaseSharedState):
         ImpactEvaluatorSkillAbciApp.event_to_timeout[
             ContributeDBEvent.ROUND_TIMEOUT
         ] = (self.context.params.round_timeout_seconds * MULTIPLIER_DB)
+        ImpactEvaluatorSkillAbciApp.event_to_timeout[
+            ContributeDBEvent.SNAPSHOT_ROUND_TIMEOUT
+        ] = self.context.params.db_snapshot_round_timeout
         ImpactEvaluatorSkillAbciApp.event_to_timeout[
             TwitterScoringEvent.ROUND_TIMEOUT
         ] = (self.context.params.round_timeout_seconds * MULTIPLIER)
@@ -69,6 +69,11 @@ from packages.valory.skills.olas_week_abci.rounds import (
     SynchronizedData,
     WeekInOlasAbciApp,
 )
+from packages.valory.skills.twitter_scoring_abci.twitter_rate_limiter import (
+    TwitterRateLimiter,
+    get_token_id,
+    get_tweets_pulled_this_month,
+)
 
 ONE_DAY = 86400.0
 HTTP_TOO_MANY_REQUESTS = 429
@@ -158,6 +163,11 @@ class OlasWeekBaseBehaviour(ContributeDBBehaviour, ABC):
         """Return the params."""
         return self.params.openai_calls
 
+    @property
+    def twitter_rate_limiter(self) -> TwitterRateLimiter:
+        """Return the Twitter rate limiter."""
+        return self.params.twitter_rate_limiter
+
     def _check_twitter_limits(self) -> Tuple:
         """Check if the daily limit has exceeded or not"""
 
@@ -455,6 +465,22 @@ class OlasWeekTweetCollectionBehaviour(OlasWeekBaseBehaviour):
             SharedState, self.context.state
         ).round_sequence.last_round_transition_timestamp.timestamp()
 
+        # The monthly read cap is shared with the other Twitter collections
+        module_data = self.context.contribute_db.data.module_data.twitter
+        tweet_budget = self.twitter_rate_limiter.get_tweet_budget(
+            get_tweets_pulled_this_month(
+                module_data.number_of_tweets_pulled_this_month,
+                module_data.last_tweet_pull_month_reset,
+                now_ts,
+            ),
+            number_of_tweets_pulled_today,
+            now_ts,
+        )
+        if tweet_budget is not None:
+            number_of_tweets_remaining_today = min(
+                number_of_tweets_remaining_today, tweet_budget
+            )
+
         start_time = datetime.fromtimestamp(now_ts) - timedelta(days=7)
 
         start_time_str = start_time.strftime("%Y-%m-%dT%H:%M:%SZ")
@@ -467,18 +493,56 @@ class OlasWeekTweetCollectionBehaviour(OlasWeekBaseBehaviour):
             "{max_results}", str(number_of_tweets_remaining_today)
         )
         api_url = api_base + api_endpoint + api_args
-        headers = dict(Authorization=f"Bearer {self.params.twitter_api_bearer_token}")
+
+        # The whole pagination is pinned to the least loaded bearer token
+        bearer_token = self.twitter_rate_limiter.pick_token(api_endpoint, now_ts)
+        if bearer_token is None:
+            sleep_until = self.twitter_rate_limiter.get_sleep_until(
+                api_endpoint, now_ts
+            )
+            self.context.logger.info(
+                f"Cannot retrieve tweets, the request windows of all bearer tokens are almost exhausted. Sleeping until {sleep_until}"
+            )
+            return {
+                "tweets": None,
+                "error": ERROR_API_LIMITS,
+                "number_of_tweets_pulled_today": number_of_tweets_pulled_today,
+                "sleep_until": sleep_until,
+            }
+        headers = dict(Authorization=f"Bearer {bearer_token}")
 
         self.context.logger.info(
-            f"Retrieving tweets from Twitter API [{api_url}]\nBearer token {self.params.twitter_api_bearer_token[:5]}*******{self.params.twitter_api_bearer_token[-5:]}"
+            f"Retrieving tweets from Twitter API [{api_url}]\nBearer token {get_token_id(bearer_token)}"
         )
 
         tweets = {}
         next_token = None
+        sleep_until = None
 
         # Pagination loop: we read a max of <twitter_max_pages> pages each period
         # Each page contains 100 tweets. The default value for twitter_max_pages is 10
         for _ in range(self.params.twitter_max_pages):
+            if len(tweets) >= number_of_tweets_remaining_today:
+                self.context.logger.info(
+                    "Stopping the tweet retrieval, max number of tweets reached for today"
+                )
+                break
+
+            # Stop before the request window is exhausted instead of getting a 429
+            if (
+                self.twitter_rate_limiter.get_request_budget(
+                    api_endpoint, now_ts, bearer_token
+                )
+                == 0
+            ):
+                sleep_until = self.twitter_rate_limiter.get_sleep_until(
+                    api_endpoint, now_ts, bearer_token
+                )
+                self.context.logger.info(
+                    f"Stopping the tweet retrieval, the request window is almost exhausted. Sleeping until {sleep_until}"
+                )
+                break
+
             self.context.logger.info(
                 f"Retrieving a new page. max_pages={self.params.twitter_max_pages}"
             )
@@ -491,11 +555,13 @@ class OlasWeekTweetCollectionBehaviour(OlasWeekBaseBehaviour):
             response = yield from self.get_http_response(
                 method="GET", url=url, headers=headers
             )
+            header_dict = extract_headers(response.headers)
+            self.twitter_rate_limiter.update_from_headers(
+                api_endpoint, header_dict, bearer_token
+            )
 
             # Check response status
             if response.status_code != 200:
-                header_dict = extract_headers(response.headers)
-
                 remaining, limit, reset_ts = [
                     header_dict.get(header, "?")
                     for header in [
@@ -575,6 +641,7 @@ class OlasWeekTweetCollectionBehaviour(OlasWeekBaseBehaviour):
                 }
 
             # Add the retrieved tweets
+            self.twitter_rate_limiter.record_tweets(bearer_token, len(api_data["data"]))
             for tweet in api_data["data"]:
                 tweets[tweet["id"]] = tweet
 
@@ -591,12 +658,23 @@ class OlasWeekTweetCollectionBehaviour(OlasWeekBaseBehaviour):
 
             break
 
+        if not tweets and (sleep_until or number_of_tweets_remaining_today <= 0):
+            return {
+                "tweets": None,
+                "error": ERROR_API_LIMITS,
+                "number_of_tweets_pulled_today": number_of_tweets_pulled_today,
+                "sleep_until": sleep_until or self.synchronized_data.sleep_until,
+            }
+
         self.context.logger.info(f"Got {len(tweets)} new tweets: {tweets.keys()}")
+        self.context.logger.info(
+            f"Twitter bearer token usage: {self.twitter_rate_limiter.get_usage(api_endpoint, now_ts)}"
+        )
 
         return {
             "tweets": list(tweets.values()),
             "number_of_tweets_pulled_today": number_of_tweets_pulled_today,
-            "sleep_until": None,  # we reset this on a successful request
+            "sleep_until": sleep_until,  # only set when the request window is exhausted
         }
 
 
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 # ------------------------------------------------------------------------------
 #
-#   Copyright 2023-2025 Valory AG
+#   Copyright 2023-2026 Valory AG
 #
 #   Licensed under the Apache License, Version 2.0 (the "License");
 #   you may not use this file except in compliance with the License.
@@ -31,6 +31,9 @@ from packages.valory.skills.decision_making_abci.models import (
     SharedState as BaseSharedState,
 )
 from packages.valory.skills.olas_week_abci.rounds import WeekInOlasAbciApp
+from packages.valory.skills.twitter_scoring_abci.twitter_rate_limiter import (
+    TwitterRateLimiter,
+)
 
 
 class SharedState(BaseSharedState):
@@ -84,6 +87,10 @@ class Params(BaseParams):
         """Initialize the parameters object."""
         self.twitter_api_base = kwargs.get("twitter_api_base")
         self.twitter_api_bearer_token = kwargs.get("twitter_api_bearer_token")
+        # Reads are spread over a pool of tokens, defaulting to the single one
+        self.twitter_api_bearer_tokens = kwargs.get("twitter_api_bearer_tokens") or [
+            self.twitter_api_bearer_token
+        ]
         self.twitter_tweets_endpoint = kwargs.get("twitter_tweets_endpoint")
         self.twitter_tweets_args = kwargs.get("twitter_tweets_args")
         self.twitter_max_pages = kwargs.get("twitter_max_pages")
@@ -99,6 +106,13 @@ class Params(BaseParams):
             openai_call_window_size=self.openai_call_window_size,
             openai_calls_allowed_in_window=self.openai_calls_allowed_in_window,
         )
+        self.twitter_monthly_read_cap = kwargs.get("twitter_monthly_read_cap")
+        self.twitter_request_headroom = kwargs.get("twitter_request_headroom", 1)
+        self.twitter_rate_limiter = TwitterRateLimiter(
+            bearer_tokens=self.twitter_api_bearer_tokens,
+            monthly_read_cap=self.twitter_monthly_read_cap,
+            request_headroom=self.twitter_request_headroom,
+        )
         super().__init__(*args, **kwargs)
 
 
@@ -20,7 +20,7 @@
 """This package contains round behaviours of StakingMakingAbciApp."""
 
 from abc import ABC
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from typing import Generator, List, Optional, Set, Type, cast
 
 from packages.valory.contracts.gnosis_safe.contract import (
@@ -240,6 +240,7 @@ class ActivityScoreBehaviour(StakingBaseBehaviour):
 
             sender = self.context.agent_address
             finished_update = False
+            write_batch_hash = None
 
             # Check whether we just came back from settling an update
             if (
@@ -249,6 +250,7 @@ class ActivityScoreBehaviour(StakingBaseBehaviour):
                 staking_user_to_counted_tweets = (
                     self.synchronized_data.staking_user_to_counted_tweets
                 )
+                self.context.contribute_db.reset_write_batch()
 
                 # For each user, update the last processed tweet on the model, and mark for data reset
                 for user_id, counter_tweets in staking_user_to_counted_tweets.items():
@@ -261,6 +263,7 @@ class ActivityScoreBehaviour(StakingBaseBehaviour):
                         yield from self.context.contribute_db.update_tweet(tweet)
 
                 finished_update = True
+                write_batch_hash = self.context.contribute_db.get_write_batch_hash()
                 self.context.logger.info(
                     f"Tweets counted for activity: {staking_user_to_counted_tweets}."
                 )
@@ -270,7 +273,9 @@ class ActivityScoreBehaviour(StakingBaseBehaviour):
                 self.context.logger.info("Processing activity updates")
 
             payload = ActivityScorePayload(
-                sender=sender, finished_update=finished_update
+                sender=sender,
+                finished_update=finished_update,
+                write_batch_hash=write_batch_hash,
             )
 
         with self.context.benchmark_tool.measure(self.behaviour_id).consensus():
@@ -509,24 +514,12 @@ class DAAPreparationBehaviour(StakingBaseBehaviour):
 
         # Get the staked and active service multisigs
         # If the user has not tweeted in the last 24 hours, they're not a DAA
-        for user in self.context.contribute_db.data.users.values():
-
-            if not user.service_multisig:
-                continue
-
-            if not user.tweets:
-                continue
-
-            # Check the latest tweet time
-            tweet_time = list(user.tweets.values())[-1].timestamp
-
-            if not tweet_time:
-                continue
-
-            if (now_utc - tweet_time).total_seconds() > SECONDS_IN_DAY:
-                continue
-
-            active_multisigs.append(user.service_multisig)
+        contribute_db = self.context.contribute_db
+        user_metrics = contribute_db.get_user_metrics()
+        for user_id in user_metrics.active_staked_user_ids(
+            now_utc - timedelta(seconds=SECONDS_IN_DAY)
+        ):
+            active_multisigs.append(contribute_db.data.users[user_id].service_multisig)
 
         self.context.logger.info(f"Safes marked as DAAs: {active_multisigs}")
 
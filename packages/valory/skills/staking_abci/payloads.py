@@ -30,6 +30,7 @@ class ActivityScorePayload(BaseTxPayload):
     """Represent a transaction payload for the ActivityScoreRound."""
 
     finished_update: bool
+    write_batch_hash: Optional[str] = None
 
 
 @dataclass(frozen=True)
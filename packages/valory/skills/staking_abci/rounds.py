@@ -34,6 +34,7 @@ from packages.valory.skills.abstract_round_abci.base import (
     EventToTimeout,
     get_name,
 )
+from packages.valory.skills.contribute_db_abci.rounds import AgentDBWriteRound
 from packages.valory.skills.staking_abci.payloads import (
     ActivityScorePayload,
     ActivityUpdatePreparationPayload,
@@ -93,7 +94,8 @@ class SynchronizedData(BaseSynchronizedData):
         """Get the staking_user_to_counted_tweets."""
         return self.db.get("staking_user_to_counted_tweets")
 
-class ActivityScoreRound(CollectSameUntilThresholdRound):
+
+class ActivityScoreRound(AgentDBWriteRound):
     """ActivityScoreRound"""
 
     payload_class = ActivityScorePayload
@@ -103,9 +105,13 @@ class ActivityScoreRound(CollectSameUntilThresholdRound):
     def end_block(self) -> Optional[Tuple[BaseSynchronizedData, Event]]:
         """Process the end of the block."""
         if self.threshold_reached:
+            if self.is_writer_pending():
+                return None
 
             # Instantiate the payload using the most voted values
-            payload = ActivityScorePayload(*(("dummy_sender",) + self.most_voted_payload_values))
+            payload = ActivityScorePayload(
+                *(("dummy_sender",) + self.most_voted_payload_values)
+            )
 
             # We have finished with the activity update
             if payload.finished_update:
@@ -214,45 +220,54 @@ class StakingAbciApp(AbciApp[Event]):
     """StakingAbciApp"""
 
     initial_round_cls: AppState = ActivityScoreRound
-    initial_states: Set[AppState] = {CheckpointPreparationRound, ActivityScoreRound, DAAPreparationRound}
+    initial_states: Set[AppState] = {
+        CheckpointPreparationRound,
+        ActivityScoreRound,
+        DAAPreparationRound,
+    }
     transition_function: AbciAppTransitionFunction = {
         ActivityScoreRound: {
             Event.DONE: FinishedActivityRound,
             Event.PROCESS_UPDATES: ActivityUpdatePreparationRound,
             Event.NO_MAJORITY: ActivityScoreRound,
-            Event.ROUND_TIMEOUT: ActivityScoreRound
+            Event.ROUND_TIMEOUT: ActivityScoreRound,
         },
         ActivityUpdatePreparationRound: {
             Event.DONE: FinishedActivityUpdatePreparationRound,
             Event.NO_MAJORITY: ActivityUpdatePreparationRound,
-            Event.ROUND_TIMEOUT: ActivityUpdatePreparationRound
+            Event.ROUND_TIMEOUT: ActivityUpdatePreparationRound,
         },
         CheckpointPreparationRound: {
             Event.DONE: FinishedCheckpointPreparationRound,
             Event.NO_MAJORITY: CheckpointPreparationRound,
-            Event.ROUND_TIMEOUT: CheckpointPreparationRound
+            Event.ROUND_TIMEOUT: CheckpointPreparationRound,
         },
         DAAPreparationRound: {
             Event.DONE: FinishedDAAPreparationRound,
             Event.NO_MAJORITY: DAAPreparationRound,
-            Event.ROUND_TIMEOUT: DAAPreparationRound
+            Event.ROUND_TIMEOUT: DAAPreparationRound,
         },
         FinishedActivityUpdatePreparationRound: {},
         FinishedActivityRound: {},
         FinishedCheckpointPreparationRound: {},
         FinishedDAAPreparationRound: {},
     }
-    final_states: Set[AppState] = {FinishedCheckpointPreparationRound, FinishedActivityUpdatePreparationRound, FinishedActivityRound, FinishedDAAPreparationRound}
+    final_states: Set[AppState] = {
+        FinishedCheckpointPreparationRound,
+        FinishedActivityUpdatePreparationRound,
+        FinishedActivityRound,
+        FinishedDAAPreparationRound,
+    }
     event_to_timeout: EventToTimeout = {}
     cross_period_persisted_keys: FrozenSet[str] = frozenset()
     db_pre_conditions: Dict[AppState, Set[str]] = {
         CheckpointPreparationRound: set(),
-    	ActivityScoreRound: set(),
+        ActivityScoreRound: set(),
         DAAPreparationRound: set(),
     }
     db_post_conditions: Dict[AppState, Set[str]] = {
         FinishedCheckpointPreparationRound: {"most_voted_tx_hash"},
-    	FinishedActivityUpdatePreparationRound: {"most_voted_tx_hash"},
+        FinishedActivityUpdatePreparationRound: {"most_voted_tx_hash"},
         FinishedActivityRound: set(),
         FinishedDAAPreparationRound: {"most_voted_tx_hash"},
     }
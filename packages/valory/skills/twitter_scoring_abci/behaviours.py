@@ -19,14 +19,15 @@
 
 """This package contains round behaviours of TwitterScoringAbciApp."""
 
+import hashlib
 import json
 import math
 import random
 import re
 from abc import ABC
-from dataclasses import asdict
+from dataclasses import asdict, dataclass
 from datetime import datetime
-from typing import Dict, Generator, List, Optional, Set, Tuple, Type, Union, cast
+from typing import Any, Dict, Generator, List, Optional, Set, Tuple, Type, Union, cast
 
 from web3 import Web3
 
@@ -41,6 +42,10 @@ from packages.valory.skills.abstract_round_abci.common import RandomnessBehaviou
 from packages.valory.skills.contribute_db_abci.behaviours import ContributeDBBehaviour
 from packages.valory.skills.contribute_db_abci.contribute_models import (
     ContributeUser,
+    ModuleCache,
+    TweetEvaluation,
+    TweetSignature,
+    TwitterPaginationCursor,
     UserTweet,
 )
 from packages.valory.skills.twitter_scoring_abci.models import (
@@ -52,13 +57,15 @@ from packages.valory.skills.twitter_scoring_abci.payloads import (
     DBUpdatePayload,
     PostMechRequestPayload,
     PreMechRequestPayload,
-    TwitterCampaignsCollectionPayload,
+    TwitterCollectionPayload,
     TwitterDecisionMakingPayload,
-    TwitterMentionsCollectionPayload,
     TwitterRandomnessPayload,
     TwitterSelectKeepersPayload,
 )
-from packages.valory.skills.twitter_scoring_abci.prompts import tweet_evaluation_prompt
+from packages.valory.skills.twitter_scoring_abci.prompts import (
+    tweet_batch_evaluation_prompt,
+    tweet_evaluation_prompt,
+)
 from packages.valory.skills.twitter_scoring_abci.rounds import (
     DBUpdateRound,
     ERROR_API_LIMITS,
@@ -68,17 +75,25 @@ from packages.valory.skills.twitter_scoring_abci.rounds import (
     PostMechRequestRound,
     PreMechRequestRound,
     SynchronizedData,
-    TwitterCampaignsCollectionRound,
+    TwitterCollectionRound,
     TwitterDecisionMakingRound,
-    TwitterMentionsCollectionRound,
     TwitterRandomnessRound,
     TwitterScoringAbciApp,
     TwitterSelectKeepersRound,
 )
+from packages.valory.skills.twitter_scoring_abci.twitter_rate_limiter import (
+    TwitterRateLimiter,
+    get_month_start,
+    get_token_id,
+    get_tweets_pulled_this_month,
+)
 
 ONE_DAY = 86400.0
+RECENT_SEARCH_WINDOW = 7 * ONE_DAY
+TWITTER_EPOCH_MS = 1288834974657
 ADDRESS_REGEX = r"0x[a-fA-F0-9]{40}"
 MENTION_OR_HASHTAG_REGEX = r"(?:#\w+|@\w+)"
+URL_REGEX = r"https?://\S+"
 TAGLINE = "I'm linking my wallet to @Autonolas Contribute:"
 DEFAULT_TWEET_POINTS = 100
 TWEET_QUALITY_TO_POINTS = {"LOW": 1, "AVERAGE": 2, "HIGH": 3}
@@ -88,6 +103,10 @@ HTTP_TOO_MANY_REQUESTS = 429
 RETWEET_START = "RT @"
 BASE_CHAIN_ID = "base"
 MAX_TWEETS_PER_CALL = 100
+AUTONOLAS_MENTION = "@autonolas"
+SEARCH_QUERY_SEPARATOR = " OR "
+BATCH_NONCE_SEPARATOR = ","
+SIMHASH_BITS = 64
 
 
 def is_minimal_effort_tweet(tweet: str, campaigns: Optional[List[str]] = None) -> bool:
@@ -100,6 +119,46 @@ def is_minimal_effort_tweet(tweet: str, campaigns: Optional[List[str]] = None) -
     return len(cleaned_tweet) < 10
 
 
+def normalize_tweet_text(text: str) -> str:
+    """Strip the mentions, hashtags, urls and extra whitespace from a tweet"""
+    text = re.sub(URL_REGEX, " ", text)
+    text = re.sub(MENTION_OR_HASHTAG_REGEX, " ", text)
+    return " ".join(text.lower().split())
+
+
+def get_tweet_text_hash(text: str) -> str:
+    """Get the hash of the normalized text of a tweet"""
+    return hashlib.sha256(normalize_tweet_text(text).encode()).hexdigest()
+
+
+def get_simhash(text: str) -> int:
+    """Get the SimHash of the normalized words and word bigrams of a tweet"""
+    words = re.findall(r"\w+", normalize_tweet_text(text))
+    features = words + [" ".join(bigram) for bigram in zip(words, words[1:])]
+    weights = [0] * SIMHASH_BITS
+    for feature in features:
+        feature_hash = int.from_bytes(
+            hashlib.sha256(feature.encode()).digest()[: SIMHASH_BITS // 8], "big"
+        )
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += 1 if feature_hash >> bit & 1 else -1
+    return sum(1 << bit for bit in range(SIMHASH_BITS) if weights[bit] > 0)
+
+
+def get_hamming_distance(simhash_a: int, simhash_b: int) -> int:
+    """Get the number of different bits between two SimHashes"""
+    return bin(simhash_a ^ simhash_b).count("1")
+
+
+def is_valid_evaluation(evaluation: Any) -> bool:
+    """Check whether an evaluation has a valid quality and relationship"""
+    return (
+        isinstance(evaluation, dict)
+        and str(evaluation.get("quality", None)) in TWEET_QUALITY_TO_POINTS
+        and str(evaluation.get("relationship", None)) in TWEET_RELATIONSHIP_TO_POINTS
+    )
+
+
 def get_engagement(impressions: int) -> int:
     """Engagement calculation"""
     if impressions < 1e3:
@@ -118,6 +177,48 @@ def extract_headers(header_str: str) -> dict:
     return {key: value for key, value in headers}
 
 
+def get_tweet_timestamp(tweet_id: int) -> float:
+    """Get the creation timestamp encoded in a tweet id"""
+    return ((tweet_id >> 22) + TWITTER_EPOCH_MS) / 1000
+
+
+def build_query_shards(terms: List[str], max_length: int) -> List[List[str]]:
+    """Pack the search terms into OR queries that fit under the query length limit"""
+    shards: List[List[str]] = []
+    shard_terms: List[str] = []
+    for term in terms:
+        if (
+            shard_terms
+            and len(SEARCH_QUERY_SEPARATOR.join([*shard_terms, term])) > max_length
+        ):
+            shards.append(shard_terms)
+            shard_terms = []
+        shard_terms.append(term)
+    if shard_terms:
+        shards.append(shard_terms)
+    return shards
+
+
+@dataclass
+class QueryShard:
+    """A search query covering a subset of the search terms"""
+
+    terms: List[str]
+    since_id: int
+    until_id: Optional[int] = None
+    next_token: Optional[str] = None
+    newest_id: Optional[int] = None
+    resumed: bool = False
+    bearer_token: Optional[str] = None
+    query_args: Optional[str] = None
+    max_results: Optional[int] = None
+
+    @property
+    def query(self) -> str:
+        """Get the url encoded query"""
+        return SEARCH_QUERY_SEPARATOR.join(self.terms).replace(" ", "%20")
+
+
 def parse_evaluation(data: str) -> Dict:
     """Parse the data from the LLM"""
     start = data.find("{")
@@ -126,6 +227,22 @@ def parse_evaluation(data: str) -> Dict:
     return json.loads(sub_string)
 
 
+def get_batch_evaluations(data: str) -> Dict[str, Dict]:
+    """Parse the evaluations of a batch of tweets from the LLM, by tweet id"""
+    start = data.find("[")
+    end = data.rfind("]")
+    if start == -1:
+        raise ValueError(f"Expected a list of evaluations, got {data!r}")
+    evaluations = json.loads(data[start : end + 1])
+    if not isinstance(evaluations, list):
+        raise ValueError(f"Expected a list of evaluations, got {evaluations!r}")
+    return {
+        str(evaluation["id"]): evaluation
+        for evaluation in evaluations
+        if isinstance(evaluation, dict) and "id" in evaluation
+    }
+
+
 class TwitterScoringBaseBehaviour(ContributeDBBehaviour, ABC):
     """Base behaviour for the common apps' skill."""
 
@@ -144,6 +261,11 @@ class TwitterScoringBaseBehaviour(ContributeDBBehaviour, ABC):
         """Return the params."""
         return self.params.openai_calls
 
+    @property
+    def twitter_rate_limiter(self) -> TwitterRateLimiter:
+        """Return the Twitter rate limiter."""
+        return self.params.twitter_rate_limiter
+
     def _check_twitter_limits(self) -> Tuple:
         """Check if the daily limit has exceeded or not"""
         module_data = self.context.contribute_db.data.module_data.twitter
@@ -171,13 +293,72 @@ class TwitterScoringBaseBehaviour(ContributeDBBehaviour, ABC):
         # Window has not expired and we have not reached the max number of tweets
         return False, number_of_tweets_pulled_today, last_tweet_pull_window_reset
 
+    def get_tweet_points(self, tweet: Dict, evaluation: Optional[Dict]) -> int:
+        """Get the points of a tweet from its evaluation, or the default ones if it is not valid"""
+        engagement = get_engagement(
+            tweet.get("public_metrics", {}).get("impression_count", 0)
+        )
+        self.context.logger.info(f"Tweet engagement is {engagement}.")
+
+        if not is_valid_evaluation(evaluation):
+            self.context.logger.error(f"Evaluation data is not valid: {evaluation!r}")
+            return DEFAULT_TWEET_POINTS
+
+        # Tweet quality, relationship and engagement go from 1 to 3.
+        # When we add the three of them, the total value goes from 3 to 9.
+        # We want to scale that value up so it goes from 1 to 10.
+        # (S - 3) / (9 - 3) = (X - 1) / (10 - 1) -> X = (3S - 7) / 2
+        S = (
+            TWEET_QUALITY_TO_POINTS[str(evaluation["quality"])]
+            + TWEET_RELATIONSHIP_TO_POINTS[str(evaluation["relationship"])]
+            + engagement
+        )
+        return int(100 * (1.5 * S - 3.5))
+
+    def get_evaluation_cache(self) -> Dict[str, Dict]:
+        """Get the unexpired cached evaluations, including the ones not yet stored in the DB"""
+        now = cast(
+            SharedState, self.context.state
+        ).round_sequence.last_round_transition_timestamp.timestamp()
+        module_cache = self.context.contribute_db.data.module_cache or ModuleCache()
+        evaluation_cache = {
+            **{
+                text_hash: evaluation.model_dump()
+                for text_hash, evaluation in module_cache.evaluation_cache.items()
+            },
+            **self.synchronized_data.evaluation_cache_updates,
+        }
+        return {
+            text_hash: evaluation
+            for text_hash, evaluation in evaluation_cache.items()
+            if now - evaluation["timestamp"] < self.params.tweet_evaluation_cache_ttl
+        }
+
+    def get_recent_signatures(self) -> Dict[str, Dict]:
+        """Get the signatures of the tweets collected within the near-duplicate window, by tweet id"""
+        now = cast(
+            SharedState, self.context.state
+        ).round_sequence.last_round_transition_timestamp.timestamp()
+        module_cache = self.context.contribute_db.data.module_cache or ModuleCache()
+        signatures = {
+            **{
+                tweet_id: signature.model_dump()
+                for tweet_id, signature in module_cache.recent_signatures.items()
+            },
+            **self.synchronized_data.tweet_signatures,
+        }
+        return {
+            tweet_id: signature
+            for tweet_id, signature in signatures.items()
+            if now - signature["timestamp"] < self.params.near_duplicate_window
+        }
+
     def get_active_campaigns(self) -> List[str]:
         """Get the active campaigns"""
-        module_data = self.context.contribute_db.data.module_data
+        module_index = self.context.contribute_db.get_module_index()
         active_campaigns = [
             f"{campaign.hashtag.replace('#', '').strip()}"  # No longer using #
-            for campaign in module_data.twitter_campaigns.campaigns
-            if campaign.status == "live"
+            for campaign in module_index.get_campaigns("live")
         ]
         return active_campaigns
 
@@ -367,11 +548,8 @@ class TwitterDecisionMakingBehaviour(TwitterScoringBaseBehaviour):
         if Event.SELECT_KEEPERS.value not in performed_tasks:
             return Event.SELECT_KEEPERS.value
 
-        if Event.RETRIEVE_CAMPAIGNS.value not in performed_tasks:
-            return Event.RETRIEVE_CAMPAIGNS.value
-
-        if Event.RETRIEVE_MENTIONS.value not in performed_tasks:
-            return Event.RETRIEVE_MENTIONS.value
+        if Event.RETRIEVE_TWEETS.value not in performed_tasks:
+            return Event.RETRIEVE_TWEETS.value
 
         if Event.PRE_MECH.value not in performed_tasks:
             return Event.PRE_MECH.value
@@ -385,10 +563,10 @@ class TwitterDecisionMakingBehaviour(TwitterScoringBaseBehaviour):
         return Event.DONE.value
 
 
-class TwitterMentionsCollectionBehaviour(TwitterScoringBaseBehaviour):
-    """TwitterMentionsCollectionBehaviour"""
+class TwitterCollectionBehaviour(TwitterScoringBaseBehaviour):
+    """TwitterCollectionBehaviour"""
 
-    matching_round: Type[AbstractRound] = TwitterMentionsCollectionRound
+    matching_round: Type[AbstractRound] = TwitterCollectionRound
 
     def _i_am_not_sending(self) -> bool:
         """Indicates if the current agent is one of the sender or not."""
@@ -436,23 +614,21 @@ class TwitterMentionsCollectionBehaviour(TwitterScoringBaseBehaviour):
                 self.context.logger.info(
                     "Cannot retrieve tweets, max number of tweets reached for today or 15-min request amount reached"
                 )
-                payload_data = {
-                    "tweets": None,
-                    "error": ERROR_API_LIMITS,
-                    "latest_mention_tweet_id": None,
-                    "number_of_tweets_pulled_today": number_of_tweets_pulled_today,
-                    "sleep_until": self.synchronized_data.sleep_until,
-                }
+                payload_data = self._get_error_payload(
+                    ERROR_API_LIMITS,
+                    number_of_tweets_pulled_today,
+                    self.synchronized_data.sleep_until,
+                )
 
             else:
-                # Get mentions from Twitter
-                payload_data = yield from self._get_twitter_mentions(
+                # Get mentions and campaign tweets from Twitter
+                payload_data = yield from self._get_twitter_search(
                     number_of_tweets_pulled_today=number_of_tweets_pulled_today
                 )
 
             payload_data["last_tweet_pull_window_reset"] = last_tweet_pull_window_reset
             sender = self.context.agent_address
-            payload = TwitterMentionsCollectionPayload(
+            payload = TwitterCollectionPayload(
                 sender=sender, content=json.dumps(payload_data, sort_keys=True)
             )
 
@@ -462,491 +638,504 @@ class TwitterMentionsCollectionBehaviour(TwitterScoringBaseBehaviour):
 
         self.set_done()
 
-    def _get_twitter_mentions(
-        self,
-        number_of_tweets_pulled_today: int,
-    ) -> Generator[None, None, Dict]:
-        """Get Twitter mentions"""
+    @staticmethod
+    def _get_error_payload(
+        error: str, number_of_tweets_pulled_today: int, sleep_until: Optional[int]
+    ) -> Dict:
+        """Get the payload for a failed collection"""
+        return {
+            "tweets": None,
+            "error": error,
+            "number_of_tweets_pulled_today": number_of_tweets_pulled_today,
+            "sleep_until": sleep_until,
+        }
 
-        api_base = self.params.twitter_api_base
+    def _get_search_cursors(self, active_campaigns: List[str]) -> Dict[str, int]:
+        """Get the since_id cursor of the mention and every active campaign"""
+        module_data = self.context.contribute_db.data.module_data.twitter
 
-        # This is a workaround as the mentions endpoint seems to be broken
-        # and not returning some tweets.
-        # https://github.com/valory-xyz/IEKit/issues/307
-        # api_endpoint = self.params.twitter_mentions_endpoint # noqa: E800
-        api_endpoint = self.params.twitter_search_endpoint
+        cursors = {}
+        for term in [AUTONOLAS_MENTION, *active_campaigns]:
+            # Terms without a cursor yet start from the legacy ones
+            default_cursor = (
+                module_data.latest_mention_tweet_id
+                if term == AUTONOLAS_MENTION
+                else module_data.latest_hashtag_tweet_id
+            )
+            cursors[term] = int(module_data.search_since_ids.get(term, default_cursor))
+        return cursors
 
+    def _get_resumed_shards(self) -> List[QueryShard]:
+        """Get the shards for the paginations left unfinished in previous periods"""
         module_data = self.context.contribute_db.data.module_data.twitter
-        latest_mention_tweet_id = module_data.latest_mention_tweet_id
+        current_time = cast(
+            SharedState, self.context.state
+        ).round_sequence.last_round_transition_timestamp.timestamp()
 
-        number_of_tweets_remaining_today = (
-            self.params.max_tweet_pulls_allowed - number_of_tweets_pulled_today
-        )
-        if number_of_tweets_remaining_today <= 0:
-            self.context.logger.info(
-                "Cannot retrieve twitter mentions, max number of tweets reached for today"
+        shards = []
+        for cursor in module_data.pagination_cursors:
+            # The recent search endpoint only covers the last days
+            until_id = int(cursor.until_id)
+            if get_tweet_timestamp(until_id) < current_time - RECENT_SEARCH_WINDOW:
+                self.context.logger.warning(
+                    f"Dropping pagination cursor {cursor} as it is out of the search window"
+                )
+                continue
+
+            # Pagination tokens can only be used with the bearer token that started them
+            next_token = cursor.next_token
+            bearer_token = (
+                self.twitter_rate_limiter.get_token(cursor.token_id)
+                if cursor.token_id
+                else None
             )
-            return {
-                "tweets": None,
-                "error": ERROR_API_LIMITS,
-                "latest_mention_tweet_id": None,
-                "number_of_tweets_pulled_today": number_of_tweets_pulled_today,
-                "sleep_until": self.synchronized_data.sleep_until,
-            }
+            if cursor.token_id and bearer_token is None:
+                self.context.logger.warning(
+                    f"The bearer token {cursor.token_id} is no longer in the pool. Resuming {cursor.query} without the pagination token."
+                )
+                next_token = None
+            if next_token and cursor.query_args is None:
+                self.context.logger.warning(
+                    f"The search args of {cursor.query} were not stored. Resuming it without the pagination token."
+                )
+                next_token = None
+
+            shards.append(
+                QueryShard(
+                    terms=cursor.query.split(SEARCH_QUERY_SEPARATOR),
+                    since_id=int(cursor.since_id),
+                    until_id=until_id,
+                    next_token=next_token,
+                    resumed=True,
+                    bearer_token=bearer_token,
+                    query_args=cursor.query_args if next_token else None,
+                    max_results=cursor.max_results if next_token else None,
+                )
+            )
+        return shards
 
-        next_tweet_id = (
-            int(latest_mention_tweet_id) + 1 if int(latest_mention_tweet_id) != 0 else 0
-        )
-        api_args = self.params.twitter_mentions_args.replace(
-            "{since_id}", str(next_tweet_id)
-        )
-        number_of_tweets_remaining_today = min(
-            MAX_TWEETS_PER_CALL, number_of_tweets_remaining_today
+    def _get_shard_args(self, shard: QueryShard, max_results: int) -> str:
+        """Get the search args for the first page of a shard"""
+        next_tweet_id = shard.since_id + 1 if shard.since_id != 0 else 0
+        api_args = self.params.twitter_search_args.replace(
+            "{search_query}", shard.query
         )
-        api_args = api_args.replace(
-            "{max_results}", str(number_of_tweets_remaining_today)
+        api_args = api_args.replace("{since_id}", str(next_tweet_id))
+        api_args = api_args.replace("{max_results}", str(max_results))
+        if shard.until_id:
+            api_args += f"&until_id={shard.until_id}"
+        return api_args
+
+    def _get_shard_url(self, shard: QueryShard) -> str:
+        """Get the search url for the next page of a shard"""
+        url = (
+            self.params.twitter_api_base
+            + self.params.twitter_search_endpoint
+            + shard.query_args
         )
 
-        # WORKAROUND. Refer to the comment above about using the search endpoint
-        api_args = "query=@autonolas" + "&" + api_args
+        # Add the pagination token if it exists
+        if shard.next_token:
+            url += f"&pagination_token={shard.next_token}"
+        return url
+
+    def _get_twitter_search(
+        self,
+        number_of_tweets_pulled_today: int,
+    ) -> Generator[None, None, Dict]:
+        """Get the mentions and campaign tweets from Twitter"""
+
+        # Dynamicaly build the search terms using the active campaigns
+        active_campaigns = self.get_active_campaigns()
+        self.context.logger.info(f"Active campaigns: {active_campaigns}")
+
+        # Terms are sorted by cursor so that each shard groups terms that are
+        # at a similar point in the timeline
+        cursors = self._get_search_cursors(active_campaigns)
+        terms = sorted(cursors, key=lambda term: cursors[term])
+        live_shards = [
+            QueryShard(
+                terms=shard_terms,
+                since_id=min(cursors[term] for term in shard_terms),
+            )
+            for shard_terms in build_query_shards(
+                terms, self.params.twitter_search_query_max_length
+            )
+        ]
+
+        # Unfinished paginations from previous periods are drained alongside the new tweets
+        shards = self._get_resumed_shards() + live_shards
+        endpoint = self.params.twitter_search_endpoint
+        current_time = cast(
+            SharedState, self.context.state
+        ).round_sequence.last_round_transition_timestamp.timestamp()
 
-        api_url = api_base + api_endpoint + api_args
-        headers = dict(Authorization=f"Bearer {self.params.twitter_api_bearer_token}")
+        # The monthly read cap is shared with the other Twitter collections
+        module_data = self.context.contribute_db.data.module_data.twitter
+        number_of_tweets_pulled_this_month = get_tweets_pulled_this_month(
+            module_data.number_of_tweets_pulled_this_month,
+            module_data.last_tweet_pull_month_reset,
+            current_time,
+        )
 
         self.context.logger.info(
-            f"Retrieving mentions from Twitter API [{api_url}]\nBearer token {self.params.twitter_api_bearer_token[:5]}*******{self.params.twitter_api_bearer_token[-5:]}"
+            f"Retrieving tweets from Twitter API using {len(shards)} query shards: {[shard.query for shard in shards]}"
         )
 
-        tweets = {}
-        next_token = None
-        latest_tweet_id = None
+        tweets: Dict[str, Dict] = {}
+        retrieved_tweets = 0
+        pending_shards = list(shards)
+        sleep_until = None
 
-        # Pagination loop: we read a max of <twitter_max_pages> pages each period
-        # Each page contains 100 tweets. The default value for twitter_max_pages is 10
+        # Pagination loop: we read a max of <twitter_max_pages> pages per shard each period.
+        # Each iteration fetches the next page of every pending shard at once.
         for _ in range(self.params.twitter_max_pages):
-            self.context.logger.info(
-                f"Retrieving a new page. max_pages={self.params.twitter_max_pages}"
-            )
-            url = api_url
-            # Add the pagination token if it exists
-            if next_token:
-                url += f"&pagination_token={next_token}"
-
-            # Make the request
-            response = yield from self.get_http_response(
-                method="GET", url=url, headers=headers
-            )
+            batch: List[QueryShard] = []
+            planned_tweets = 0
+            for shard in pending_shards:
+                # The pages already planned can use up to their max_results tweets
+                number_of_tweets_remaining_today = (
+                    self.params.max_tweet_pulls_allowed
+                    - number_of_tweets_pulled_today
+                    - planned_tweets
+                )
+                tweet_budget = self.twitter_rate_limiter.get_tweet_budget(
+                    number_of_tweets_pulled_this_month,
+                    number_of_tweets_pulled_today,
+                    current_time,
+                )
+                if tweet_budget is not None:
+                    number_of_tweets_remaining_today = min(
+                        number_of_tweets_remaining_today, tweet_budget - planned_tweets
+                    )
+                if number_of_tweets_remaining_today <= 0:
+                    if not batch:
+                        self.context.logger.info(
+                            "Stopping the tweet retrieval, max number of tweets reached for today"
+                        )
+                    break
+
+                # Paginations stay pinned to their token, new ones use the least loaded one
+                if shard.next_token and shard.bearer_token:
+                    bearer_token = shard.bearer_token
+                    if (
+                        self.twitter_rate_limiter.get_request_budget(
+                            endpoint, current_time, bearer_token
+                        )
+                        == 0
+                    ):
+                        self.context.logger.info(
+                            f"Skipping {shard.query}, the request window of its bearer token {get_token_id(bearer_token)} is almost exhausted"
+                        )
+                        continue
+                else:
+                    bearer_token = self.twitter_rate_limiter.pick_token(
+                        endpoint, current_time
+                    )
 
-            # Check response status
-            if response.status_code != 200:
-                header_dict = extract_headers(response.headers)
+                # Stop before the request windows are exhausted instead of getting a 429
+                if bearer_token is None:
+                    if not batch:
+                        sleep_until = self.twitter_rate_limiter.get_sleep_until(
+                            endpoint, current_time
+                        )
+                        self.context.logger.info(
+                            f"Stopping the tweet retrieval, the request windows of all bearer tokens are almost exhausted. Sleeping until {sleep_until}"
+                        )
+                    break
+                # Twitter rejects a pagination token used with different search args
+                if shard.next_token and shard.query_args:
+                    if shard.max_results > number_of_tweets_remaining_today:
+                        self.context.logger.info(
+                            f"Skipping {shard.query}, its pages of {shard.max_results} tweets exceed the remaining tweet budget"
+                        )
+                        continue
+                else:
+                    shard.max_results = min(
+                        MAX_TWEETS_PER_CALL, number_of_tweets_remaining_today
+                    )
+                    shard.query_args = self._get_shard_args(shard, shard.max_results)
+                shard.bearer_token = bearer_token
+                self.twitter_rate_limiter.reserve_request(endpoint, bearer_token)
+                planned_tweets += shard.max_results
+                batch.append(shard)
 
-                remaining, limit, reset_ts = [
-                    header_dict.get(header, "?")
-                    for header in [
-                        "x-rate-limit-remaining",
-                        "x-rate-limit-limit",
-                        "x-rate-limit-reset",
-                    ]
-                ]
-                reset = (
-                    datetime.fromtimestamp(int(reset_ts)).strftime("%Y-%m-%d %H:%M:%S")
-                    if reset_ts != "?"
-                    else None
-                )
+            if not batch:
+                break
 
-                self.context.logger.error(
-                    f"Error retrieving mentions from Twitter [{response.status_code}]: {response.body}"
-                    f"API limits: {remaining}/{limit}. Window reset: {reset}"
+            # Make the requests
+            requests = []
+            for shard in batch:
+                url = self._get_shard_url(shard)
+                self.context.logger.info(
+                    f"Retrieving a new page [{url}] with bearer token {get_token_id(shard.bearer_token)}. max_pages={self.params.twitter_max_pages}"
                 )
-
-                return {
-                    "tweets": None,
-                    "error": (
-                        ERROR_API_LIMITS
-                        if response.status_code == HTTP_TOO_MANY_REQUESTS
-                        else ERROR_GENERIC
-                    ),
-                    "latest_mention_tweet_id": None,
-                    "number_of_tweets_pulled_today": number_of_tweets_pulled_today,
-                    "sleep_until": (
-                        reset_ts
-                        if response.status_code == HTTP_TOO_MANY_REQUESTS
-                        else self.synchronized_data.sleep_until
-                    ),
-                }
-
-            api_data = json.loads(response.body)
-
-            # Check the meta field
-            if "meta" not in api_data:
-                self.context.logger.error(
-                    f"Twitter API response does not contain the required 'meta' field: {api_data!r}"
+                requests.append(
+                    dict(
+                        method="GET",
+                        url=url,
+                        headers=dict(Authorization=f"Bearer {shard.bearer_token}"),
+                    )
                 )
-                return {
-                    "tweets": None,
-                    "error": ERROR_GENERIC,
-                    "latest_mention_tweet_id": None,
-                    "number_of_tweets_pulled_today": number_of_tweets_pulled_today,
-                    "sleep_until": None,  # we reset this on a successful request
-                }
-
-            # Check if there are no more results
-            if (
-                "result_count" in api_data["meta"]
-                and int(api_data["meta"]["result_count"]) == 0
-            ):
-                break
+            responses = yield from self.get_http_responses(requests)
 
-            # Check that the data exists
-            if "data" not in api_data or "newest_id" not in api_data["meta"]:
-                self.context.logger.error(
-                    f"Twitter API response does not contain the required 'meta' field: {api_data!r}"
+            # Every response goes through the rate limiter, even if an earlier one failed
+            headers = []
+            for shard, response in zip(batch, responses):
+                header_dict = (
+                    extract_headers(response.headers) if response is not None else {}
                 )
-                return {
-                    "tweets": None,
-                    "error": ERROR_GENERIC,
-                    "latest_mention_tweet_id": None,
-                    "number_of_tweets_pulled_today": number_of_tweets_pulled_today,
-                    "sleep_until": None,  # we reset this on a successful request
-                }
-
-            if "includes" not in api_data or "users" not in api_data["includes"]:
-                self.context.logger.error(
-                    f"Twitter API response does not contain the required 'includes/users' field: {api_data!r}"
+                self.twitter_rate_limiter.update_from_headers(
+                    endpoint, header_dict, shard.bearer_token
                 )
-                return {
-                    "tweets": None,
-                    "error": ERROR_GENERIC,
-                    "latest_mention_tweet_id": None,
-                    "number_of_tweets_pulled_today": number_of_tweets_pulled_today,
-                    "sleep_until": None,  # we reset this on a successful request
-                }
-
-            # Add the retrieved tweets
-            for tweet in api_data["data"]:
-                # Skip retweets
-                if tweet["text"].startswith(RETWEET_START):
-                    continue
+                headers.append(header_dict)
 
-                # Skip minimal effort tweets
-                if is_minimal_effort_tweet(tweet["text"]):
+            for shard, response, header_dict in zip(batch, responses, headers):
+                # The shard stays pending and is retried with the next pages
+                if response is None:
+                    self.context.logger.warning(
+                        f"No response was received for {shard.query}. Retrying it with the next pages."
+                    )
                     continue
 
-                tweets[tweet["id"]] = tweet
+                # Check response status
+                if response.status_code != HTTP_OK:
+                    # Pagination tokens can expire, resume from the cursor window instead
+                    if (
+                        shard.resumed
+                        and shard.next_token
+                        and response.status_code != HTTP_TOO_MANY_REQUESTS
+                    ):
+                        self.context.logger.warning(
+                            f"Could not resume the pagination for {shard.query} [{response.status_code}]: {response.body}. Retrying without the pagination token."
+                        )
+                        shard.next_token = None
+                        continue
+
+                    remaining, limit, reset_ts = [
+                        header_dict.get(header, "?")
+                        for header in [
+                            "x-rate-limit-remaining",
+                            "x-rate-limit-limit",
+                            "x-rate-limit-reset",
+                        ]
+                    ]
+                    reset = (
+                        datetime.fromtimestamp(int(reset_ts)).strftime(
+                            "%Y-%m-%d %H:%M:%S"
+                        )
+                        if reset_ts != "?"
+                        else None
+                    )
 
-                # Set the author handle
-                for user in api_data["includes"]["users"]:
-                    if user["id"] == tweet["author_id"]:
-                        tweets[tweet["id"]]["username"] = user["username"]
-                        break
-                number_of_tweets_pulled_today += 1
-            latest_tweet_id = int(api_data["meta"]["newest_id"])
+                    self.context.logger.error(
+                        f"Error retrieving tweets from Twitter [{response.status_code}]: {response.body}"
+                        f"API limits: {remaining}/{limit}. Window reset: {reset}"
+                    )
 
-            if "next_token" in api_data["meta"]:
-                next_token = api_data["meta"]["next_token"]
-                continue
+                    is_rate_limited = response.status_code == HTTP_TOO_MANY_REQUESTS
+                    return self._get_error_payload(
+                        ERROR_API_LIMITS if is_rate_limited else ERROR_GENERIC,
+                        number_of_tweets_pulled_today,
+                        (
+                            reset_ts
+                            if is_rate_limited
+                            else self.synchronized_data.sleep_until
+                        ),
+                    )
 
-            break
+                api_data = json.loads(response.body)
 
-        self.context.logger.info(
-            f"Got {len(tweets)} new mentions until tweet_id={latest_tweet_id}:\n{tweets}"
-        )
+                # Check the meta field
+                if "meta" not in api_data:
+                    self.context.logger.error(
+                        f"Twitter API response does not contain the required 'meta' field: {api_data!r}"
+                    )
+                    return self._get_error_payload(
+                        ERROR_GENERIC,
+                        number_of_tweets_pulled_today,
+                        None,  # we reset this on a successful request
+                    )
 
-        return {
-            "tweets": tweets,
-            "latest_mention_tweet_id": latest_tweet_id,
-            "number_of_tweets_pulled_today": number_of_tweets_pulled_today,
-            "sleep_until": None,  # we reset this on a successful request
-        }
+                # Check if there are no more results
+                if (
+                    "result_count" in api_data["meta"]
+                    and int(api_data["meta"]["result_count"]) == 0
+                ):
+                    pending_shards.remove(shard)
+                    continue
 
+                # Check that the data exists
+                if "data" not in api_data or "newest_id" not in api_data["meta"]:
+                    self.context.logger.error(
+                        f"Twitter API response does not contain the required 'meta' field: {api_data!r}"
+                    )
+                    return self._get_error_payload(
+                        ERROR_GENERIC,
+                        number_of_tweets_pulled_today,
+                        None,  # we reset this on a successful request
+                    )
 
-class TwitterCampaignsCollectionBehaviour(TwitterScoringBaseBehaviour):
-    """TwitterCampaignsCollectionBehaviour"""
+                if "includes" not in api_data or "users" not in api_data["includes"]:
+                    self.context.logger.error(
+                        f"Twitter API response does not contain the required 'includes/users' field: {api_data!r}"
+                    )
+                    return self._get_error_payload(
+                        ERROR_GENERIC,
+                        number_of_tweets_pulled_today,
+                        None,  # we reset this on a successful request
+                    )
 
-    matching_round: Type[AbstractRound] = TwitterCampaignsCollectionRound
+                # Every returned tweet counts towards the monthly read cap
+                number_of_tweets_pulled_this_month += len(api_data["data"])
+                self.twitter_rate_limiter.record_tweets(
+                    shard.bearer_token, len(api_data["data"])
+                )
 
-    def _i_am_not_sending(self) -> bool:
-        """Indicates if the current agent is one of the sender or not."""
-        return (
-            self.context.agent_address
-            not in self.synchronized_data.most_voted_keeper_addresses
-        )
+                # Add the retrieved tweets
+                for tweet in api_data["data"]:
+                    # Skip retweets
+                    if tweet["text"].startswith(RETWEET_START):
+                        continue
 
-    def async_act(self) -> Generator[None, None, None]:
-        """
-        Do the action.
+                    # Skip minimal effort tweets
+                    if is_minimal_effort_tweet(tweet["text"], active_campaigns):
+                        continue
 
-        Steps:
-        - If the agent is the keeper, then prepare the transaction and send it.
-        - Otherwise, wait until the next round.
-        - If a timeout is hit, set exit A event, otherwise set done event.
-        """
-        if self._i_am_not_sending():
-            yield from self._not_sender_act()
-        else:
-            yield from self._sender_act()
+                    retrieved_tweets += 1
+                    number_of_tweets_pulled_today += 1
 
-    def _not_sender_act(self) -> Generator:
-        """Do the non-sender action."""
-        with self.context.benchmark_tool.measure(self.behaviour_id).consensus():
-            self.context.logger.info(
-                f"Waiting for the keeper to do its keeping: keepers={self.synchronized_data.most_voted_keeper_addresses}, me={self.context.agent_address}"
-            )
-            yield from self.wait_until_round_end()
-        self.set_done()
+                    # Shards can overlap when a tweet matches terms from several of them
+                    if tweet["id"] in tweets:
+                        continue
 
-    def _sender_act(self) -> Generator:
-        """Do the act, supporting asynchronous execution."""
-        with self.context.benchmark_tool.measure(self.behaviour_id).local():
-            self.context.logger.info("I am a keeper")
-
-            (
-                has_limit_reached,
-                number_of_tweets_pulled_today,
-                last_tweet_pull_window_reset,
-            ) = self._check_twitter_limits()
+                    tweets[tweet["id"]] = tweet
 
-            if has_limit_reached:
-                self.context.logger.info(
-                    "Cannot retrieve tweets, max number of tweets reached for today or 15-min request amount reached"
-                )
-                payload_data = {
-                    "tweets": None,
-                    "error": ERROR_API_LIMITS,
-                    "latest_mention_tweet_id": None,
-                    "number_of_tweets_pulled_today": number_of_tweets_pulled_today,
-                    "sleep_until": self.synchronized_data.sleep_until,
-                }
+                    # Set the author handle
+                    for user in api_data["includes"]["users"]:
+                        if user["id"] == tweet["author_id"]:
+                            tweets[tweet["id"]]["username"] = user["username"]
+                            break
 
-            else:
-                # Get campaigns from Twitter
-                payload_data = yield from self._get_twitter_campaign_search(
-                    number_of_tweets_pulled_today=number_of_tweets_pulled_today
+                shard.newest_id = max(
+                    shard.newest_id or 0, int(api_data["meta"]["newest_id"])
                 )
 
-            payload_data["last_tweet_pull_window_reset"] = last_tweet_pull_window_reset
-            sender = self.context.agent_address
-            payload = TwitterCampaignsCollectionPayload(
-                sender=sender, content=json.dumps(payload_data, sort_keys=True)
-            )
-
-        with self.context.benchmark_tool.measure(self.behaviour_id).consensus():
-            yield from self.send_a2a_transaction(payload)
-            yield from self.wait_until_round_end()
+                if "next_token" in api_data["meta"]:
+                    shard.next_token = api_data["meta"]["next_token"]
+                    continue
 
-        self.set_done()
+                pending_shards.remove(shard)
 
-    def _get_twitter_campaign_search(
-        self,
-        number_of_tweets_pulled_today: int,
-    ) -> Generator[None, None, Dict]:
-        """Get registrations from Twitter"""
+            if not pending_shards:
+                break
 
-        api_base = self.params.twitter_api_base
-        api_endpoint = self.params.twitter_search_endpoint
-        module_data = self.context.contribute_db.data.module_data.twitter
-        latest_campaign_tweet_id = module_data.latest_hashtag_tweet_id
+        # Every term in a shard has now been read up to the shard's newest tweet.
+        # Whatever was not read is kept as a pagination cursor for the next period.
+        pagination_cursors = [
+            TwitterPaginationCursor(
+                query=SEARCH_QUERY_SEPARATOR.join(shard.terms),
+                since_id=str(shard.since_id),
+                until_id=str(shard.until_id or shard.newest_id),
+                next_token=shard.next_token,
+                token_id=(
+                    get_token_id(shard.bearer_token)
+                    if shard.next_token and shard.bearer_token
+                    else None
+                ),
+                query_args=shard.query_args if shard.next_token else None,
+                max_results=shard.max_results if shard.next_token else None,
+            ).model_dump()
+            for shard in pending_shards
+            if shard.resumed or shard.newest_id is not None
+        ]
+        for shard in live_shards:
+            if shard.newest_id is None:
+                continue
+            for term in shard.terms:
+                cursors[term] = max(cursors[term], shard.newest_id)
 
-        number_of_tweets_remaining_today = (
-            self.params.max_tweet_pulls_allowed - number_of_tweets_pulled_today
+        self.context.logger.info(
+            f"Got {retrieved_tweets} new tweets ({len(tweets)} unique). Cursors: {cursors}. Unfinished paginations: {pagination_cursors}:\n{tweets}"
         )
-        if number_of_tweets_remaining_today <= 0:
-            self.context.logger.info(
-                "Cannot retrieve campaign mentions, max number of tweets reached for today"
-            )
-            return {
-                "tweets": None,
-                "error": ERROR_API_LIMITS,
-                "latest_mention_tweet_id": None,
-                "number_of_tweets_pulled_today": number_of_tweets_pulled_today,
-                "sleep_until": self.synchronized_data.sleep_until,
-            }
-
-        next_tweet_id = (
-            int(latest_campaign_tweet_id) + 1
-            if int(latest_campaign_tweet_id) != 0
-            else 0
+        self.context.logger.info(
+            f"Twitter bearer token usage: {self.twitter_rate_limiter.get_usage(endpoint, current_time)}"
         )
 
-        # Dynamicaly build the search query using the campaigns in the centaurs stream
-        active_campaigns = self.get_active_campaigns()
-        self.context.logger.info(f"Active campaigns: {active_campaigns}")
-
-        # TODO: If there are no active campaigns, skip this
-        # If we do this, we also need to handle the case where we've been a lot of
-        # time without pulling tweets -> pagination, API limits, etc...
-        # if not active_campaigns: # noqa:E800
-        #     return {  # noqa:E800
-        #         "tweets": {},  # noqa:E800
-        #         "latest_hashtag_tweet_id": int(latest_hashtag_tweet_id),  # noqa:E800
-        #         "number_of_tweets_pulled_today": number_of_tweets_pulled_today,  # noqa:E800
-        #         "sleep_until": None,  # we reset this on a successful request  # noqa:E800
-        #     }  # noqa:E800
-
-        search_query = "%20OR%20".join(active_campaigns)  # %20 = space
+        tweet_signatures = self._mark_near_duplicates(tweets, current_time)
 
-        api_args = self.params.twitter_search_args.replace(
-            "{search_query}", str(search_query)
+        latest_campaign_tweet_id = max(
+            (cursors[campaign] for campaign in active_campaigns), default=None
         )
-        api_args = api_args.replace("{since_id}", str(next_tweet_id))
-        number_of_tweets_remaining_today = min(
-            MAX_TWEETS_PER_CALL, number_of_tweets_remaining_today
-        )
-        api_args = api_args.replace(
-            "{max_results}", str(number_of_tweets_remaining_today)
-        )
-        api_url = api_base + api_endpoint + api_args
-        headers = dict(Authorization=f"Bearer {self.params.twitter_api_bearer_token}")
-
-        self.context.logger.info(f"Retrieving campaigns from Twitter API [{api_url}]")
+        return {
+            "tweets": tweets,
+            "search_since_ids": {term: str(cursor) for term, cursor in cursors.items()},
+            "pagination_cursors": pagination_cursors,
+            "tweet_signatures": tweet_signatures,
+            "latest_mention_tweet_id": cursors[AUTONOLAS_MENTION],
+            "latest_campaign_tweet_id": latest_campaign_tweet_id,
+            "number_of_tweets_pulled_today": number_of_tweets_pulled_today,
+            "number_of_tweets_pulled_this_month": number_of_tweets_pulled_this_month,
+            "last_tweet_pull_month_reset": get_month_start(current_time),
+            "sleep_until": sleep_until,  # only set when the request window is exhausted
+        }
 
-        next_token = None
-        latest_tweet_id = None
-        retrieved_tweets = 0
-        tweets = {}
-        # Pagination loop: we read a max of <twitter_max_pages> pages each period
-        # Each page contains 100 tweets. The default value for twitter_max_pages is 10
-        for _ in range(self.params.twitter_max_pages):
-            self.context.logger.info(
-                f"Retrieving a new page. max_pages={self.params.twitter_max_pages}"
+    def _mark_near_duplicates(
+        self, tweets: Dict[str, Dict], current_time: float
+    ) -> Dict[str, Dict]:
+        """Mark the near-duplicates of recent tweets by the same author, so they are not evaluated again"""
+        # Near-duplicates are only looked for among the tweets of the same author
+        author_simhashes: Dict[str, List[Tuple[int, str]]] = {}
+        for tweet_id, signature in self.get_recent_signatures().items():
+            author_simhashes.setdefault(signature["author_id"], []).append(
+                (int(signature["simhash"], 16), tweet_id)
             )
 
-            url = api_url
-
-            # Add the pagination token if it exists
-            if next_token:
-                url += f"&pagination_token={next_token}"
-
-            # Make the request
-            response = yield from self.get_http_response(
-                method="GET", url=url, headers=headers
+        tweet_signatures = {}
+        near_duplicates = 0
+        for tweet_id, tweet in tweets.items():
+            simhash = get_simhash(tweet["text"])
+            simhashes = author_simhashes.setdefault(tweet["author_id"], [])
+            original_id = next(
+                (
+                    other_tweet_id
+                    for other_simhash, other_tweet_id in simhashes
+                    if get_hamming_distance(simhash, other_simhash)
+                    <= self.params.near_duplicate_max_distance
+                ),
+                None,
             )
-
-            # Check response status
-            if response.status_code != 200:
-                header_dict = extract_headers(response.headers)
-
-                remaining, limit, reset_ts = [
-                    header_dict.get(header, "?")
-                    for header in [
-                        "x-rate-limit-remaining",
-                        "x-rate-limit-limit",
-                        "x-rate-limit-reset",
-                    ]
-                ]
-                reset = (
-                    datetime.fromtimestamp(int(reset_ts)).strftime("%Y-%m-%d %H:%M:%S")
-                    if reset_ts != "?"
-                    else None
-                )
-
-                self.context.logger.error(
-                    f"Error retrieving campaigns from Twitter [{response.status_code}]: {response.body}"
-                    f"API limits: {remaining}/{limit}. Window reset: {reset}"
-                )
-
-                return {
-                    "tweets": None,
-                    "error": (
-                        ERROR_API_LIMITS
-                        if response.status_code == HTTP_TOO_MANY_REQUESTS
-                        else ERROR_GENERIC
-                    ),
-                    "latest_mention_tweet_id": None,
-                    "number_of_tweets_pulled_today": number_of_tweets_pulled_today,
-                    "sleep_until": (
-                        reset_ts
-                        if response.status_code == HTTP_TOO_MANY_REQUESTS
-                        else self.synchronized_data.sleep_until
-                    ),
-                }
-
-            api_data = json.loads(response.body)
-
-            # Check the meta field
-            if "meta" not in api_data:
-                self.context.logger.error(
-                    f"Twitter API response does not contain the required 'meta' field: {api_data!r}"
-                )
-                return {
-                    "tweets": None,
-                    "error": ERROR_GENERIC,
-                    "latest_mention_tweet_id": None,
-                    "number_of_tweets_pulled_today": number_of_tweets_pulled_today,
-                    "sleep_until": None,  # we reset this on a successful request
-                }
-
-            # Check if there are no more results
-            if (
-                "result_count" in api_data["meta"]
-                and int(api_data["meta"]["result_count"]) == 0
-            ):
-                break
-
-            # Check that the data exists
-            if "data" not in api_data or "newest_id" not in api_data["meta"]:
-                self.context.logger.error(
-                    f"Twitter API response does not contain the required 'meta' field: {api_data!r}"
-                )
-                return {
-                    "tweets": None,
-                    "error": ERROR_GENERIC,
-                    "latest_mention_tweet_id": None,
-                    "number_of_tweets_pulled_today": number_of_tweets_pulled_today,
-                    "sleep_until": None,  # we reset this on a successful request
-                }
-
-            if "includes" not in api_data or "users" not in api_data["includes"]:
-                self.context.logger.error(
-                    f"Twitter API response does not contain the required 'includes/users' field: {api_data!r}"
+            if original_id is not None:
+                self.context.logger.info(
+                    f"Tweet {tweet_id} is a near-duplicate of tweet {original_id} by the same author"
                 )
-                return {
-                    "tweets": None,
-                    "error": ERROR_GENERIC,
-                    "latest_mention_tweet_id": None,
-                    "number_of_tweets_pulled_today": number_of_tweets_pulled_today,
-                    "sleep_until": None,  # we reset this on a successful request
-                }
-
-            # Add the retrieved tweets
-            for tweet in api_data["data"]:
-                # Skip retweets
-                if tweet["text"].startswith(RETWEET_START):
-                    continue
-
-                # Skip minimal effort tweets
-                if is_minimal_effort_tweet(tweet["text"], active_campaigns):
-                    continue
-
-                retrieved_tweets += 1
-                if tweet["id"] not in tweets:  # avoids duplicated tweets
-                    tweets[tweet["id"]] = tweet
-
-                    # Set the author handle
-                    for user in api_data["includes"]["users"]:
-                        if user["id"] == tweet["author_id"]:
-                            tweets[tweet["id"]]["username"] = user["username"]
-                            break
-                number_of_tweets_pulled_today += 1
-            latest_tweet_id = int(api_data["meta"]["newest_id"])
-
-            if "next_token" in api_data["meta"]:
-                next_token = api_data["meta"]["next_token"]
+                tweet["near_duplicate_of"] = original_id
+                near_duplicates += 1
                 continue
 
-            break
+            simhashes.append((simhash, tweet_id))
+            tweet_signatures[tweet_id] = TweetSignature(
+                author_id=tweet["author_id"],
+                simhash=f"{simhash:016x}",
+                timestamp=current_time,
+            ).model_dump()
 
         self.context.logger.info(
-            f"Got {retrieved_tweets} new campaign tweets until tweet_id={latest_tweet_id}:\n{tweets}"
+            f"Found {near_duplicates} near-duplicates out of {len(tweets)} tweets"
         )
+        return tweet_signatures
 
-        return {
-            "tweets": tweets,
-            "latest_campaign_tweet_id": latest_tweet_id,
-            "number_of_tweets_pulled_today": number_of_tweets_pulled_today,
-            "sleep_until": None,  # we reset this on a successful request
-        }
+    def get_near_duplicate_points(
+        self, tweet: Dict, tweets: Dict[str, Dict]
+    ) -> Optional[int]:
+        """Get the points of a near-duplicate's original tweet, zero if it is unknown and None while it waits for its evaluation"""
+        original_id = tweet["near_duplicate_of"]
+        if original_id in tweets:
+            return tweets[original_id].get("points", None)
+        original = self.context.contribute_db.data.tweets.get(original_id, None)
+        if original is None or original.points is None:
+            return 0
+        return original.points
 
 
 class PreMechRequestBehaviour(TwitterScoringBaseBehaviour):
@@ -961,12 +1150,28 @@ class PreMechRequestBehaviour(TwitterScoringBaseBehaviour):
             new_mech_requests = []
 
             mech_responses = self.synchronized_data.mech_responses
-            pending_tweet_ids = [r.nonce for r in mech_responses]
+            # Batched requests carry the ids of all their tweets in the nonce
+            pending_tweet_ids = [
+                tweet_id
+                for r in mech_responses
+                for tweet_id in r.nonce.split(BATCH_NONCE_SEPARATOR)
+            ]
 
             self.context.logger.info(f"PreMech: mech_responses = {mech_responses}")
             self.context.logger.info(f"pending_tweet_ids = {pending_tweet_ids}")
 
-            for tweet_id, tweet in self.synchronized_data.tweets.items():
+            tweets = self.synchronized_data.tweets
+            evaluation_cache = self.get_evaluation_cache()
+            # Duplicates of requested tweets get their evaluation in PostMech
+            requested_hashes = {
+                get_tweet_text_hash(tweets[tweet_id]["text"])
+                for tweet_id in pending_tweet_ids
+                if tweet_id in tweets
+            }
+            cache_hits = 0
+            cache_misses = 0
+            tweet_ids_to_score = []
+            for tweet_id, tweet in tweets.items():
                 if "points" in tweet:
                     # Already scored previously
                     continue
@@ -975,16 +1180,48 @@ class PreMechRequestBehaviour(TwitterScoringBaseBehaviour):
                     # Score already requested
                     continue
 
+                # Near-duplicates are never evaluated: they share their original's points
+                if "near_duplicate_of" in tweet:
+                    points = self.get_near_duplicate_points(tweet, tweets)
+                    if points is not None:
+                        tweet["points"] = points
+                        self.context.logger.info(
+                            f"Tweet {tweet_id} awarded {points} points as a near-duplicate"
+                        )
+                    continue
+
+                text_hash = get_tweet_text_hash(tweet["text"])
+                if text_hash in evaluation_cache:
+                    cache_hits += 1
+                    tweet["points"] = self.get_tweet_points(
+                        tweet, evaluation_cache[text_hash]
+                    )
+                    self.context.logger.info(
+                        f"Tweet {tweet_id} awarded {tweet['points']} points from the evaluation cache"
+                    )
+                    continue
+
+                cache_misses += 1
+                if text_hash in requested_hashes:
+                    continue
+
                 self.context.logger.info(f"Adding tweet {tweet_id} to mech requests")
+                requested_hashes.add(text_hash)
+                tweet_ids_to_score.append(tweet_id)
+
+            self.context.logger.info(
+                f"Evaluation cache: {cache_hits} hits, {cache_misses} misses"
+            )
 
+            batch_size = max(1, self.params.tweet_evaluation_batch_size)
+            for i in range(0, len(tweet_ids_to_score), batch_size):
+                batch = tweet_ids_to_score[i : i + batch_size]
                 new_mech_requests.append(
                     asdict(
                         MechMetadata(
-                            nonce=tweet_id,
+                            nonce=BATCH_NONCE_SEPARATOR.join(batch),
                             tool="openai-gpt-3.5-turbo",
-                            prompt=tweet_evaluation_prompt.replace(
-                                "{user_text}", tweet["text"]
-                            ),
+                            prompt=self.get_evaluation_prompt(batch, tweets),
                         )
                     )
                 )
@@ -996,7 +1233,8 @@ class PreMechRequestBehaviour(TwitterScoringBaseBehaviour):
             payload = PreMechRequestPayload(
                 sender=sender,
                 content=json.dumps(
-                    {"new_mech_requests": new_mech_requests}, sort_keys=True
+                    {"new_mech_requests": new_mech_requests, "tweets": tweets},
+                    sort_keys=True,
                 ),
             )
 
@@ -1006,6 +1244,22 @@ class PreMechRequestBehaviour(TwitterScoringBaseBehaviour):
 
         self.set_done()
 
+    @staticmethod
+    def get_evaluation_prompt(tweet_ids: List[str], tweets: Dict) -> str:
+        """Get the prompt to evaluate a tweet or a batch of them"""
+        if len(tweet_ids) == 1:
+            return tweet_evaluation_prompt.replace(
+                "{user_text}", tweets[tweet_ids[0]]["text"]
+            )
+        user_texts = json.dumps(
+            [
+                {"id": tweet_id, "text": tweets[tweet_id]["text"]}
+                for tweet_id in tweet_ids
+            ],
+            indent=4,
+        )
+        return tweet_batch_evaluation_prompt.replace("{user_texts}", user_texts)
+
 
 class PostMechRequestBehaviour(TwitterScoringBaseBehaviour):
     """PostMechRequestBehaviour"""
@@ -1018,64 +1272,95 @@ class PostMechRequestBehaviour(TwitterScoringBaseBehaviour):
         with self.context.benchmark_tool.measure(self.behaviour_id).local():
             tweets = self.synchronized_data.tweets
             responses_to_remove = []
+            evaluation_cache_updates = {}
+            now = cast(
+                SharedState, self.context.state
+            ).round_sequence.last_round_transition_timestamp.timestamp()
 
             self.context.logger.info(
                 f"PostMech: mech_responses = {self.synchronized_data.mech_responses}"
             )
 
             for response in self.synchronized_data.mech_responses:
+                tweet_ids = [
+                    tweet_id
+                    for tweet_id in response.nonce.split(BATCH_NONCE_SEPARATOR)
+                    if tweet_id in tweets
+                ]
+
                 # The request has been responded
-                if response.nonce in tweets and response.result:
-                    engagement = get_engagement(
-                        tweets[response.nonce]
-                        .get("public_metrics", {})
-                        .get("impression_count", 0)
+                if not tweet_ids or not response.result:
+                    continue
+
+                self.context.logger.info(
+                    f"Received tweet evaluation response: {response.nonce} {response.result}"
+                )
+                responses_to_remove.append(response.nonce)
+
+                # Batched responses are fanned back out to their tweets
+                try:
+                    evaluations = (
+                        get_batch_evaluations(response.result)
+                        if BATCH_NONCE_SEPARATOR in response.nonce
+                        else {tweet_ids[0]: parse_evaluation(response.result)}
                     )
+                except Exception as e:
+                    self.context.logger.error(
+                        f"Evaluation data is not valid: exception {e}"
+                    )
+                    evaluations = {}
 
+                for tweet_id in tweet_ids:
+                    evaluation = evaluations.get(tweet_id, None)
+                    points = self.get_tweet_points(tweets[tweet_id], evaluation)
+                    tweets[tweet_id]["points"] = points
                     self.context.logger.info(
-                        f"Received tweet evaluation response: {response.nonce} {response.result}.\nTweet engagement is {engagement}."
+                        f"Tweet {tweet_id} awarded {points} points"
                     )
 
-                    responses_to_remove.append(response.nonce)
-
-                    points = DEFAULT_TWEET_POINTS
-                    try:
-                        data = parse_evaluation(response.result)
-                        quality = data["quality"]
-                        relationship = data["relationship"]
-                        if (
-                            quality not in TWEET_QUALITY_TO_POINTS
-                            or relationship not in TWEET_RELATIONSHIP_TO_POINTS
-                        ):
-                            self.context.logger.error(
-                                "Evaluation data is not valid: key not valid"
-                            )
-                        else:
-                            # Tweet quality, relationship and engagement go from 1 to 3.
-                            # When we add the three of them, the total value goes from 3 to 9.
-                            # We want to scale that value up so it goes from 1 to 10.
-                            # (S - 3) / (9 - 3) = (X - 1) / (10 - 1) -> X = (3S - 7) / 2
-                            S = (
-                                TWEET_QUALITY_TO_POINTS[quality]
-                                + TWEET_RELATIONSHIP_TO_POINTS[relationship]
-                                + engagement
-                            )
-                            points = int(100 * (1.5 * S - 3.5))
-                    except Exception as e:
-                        self.context.logger.error(
-                            f"Evaluation data is not valid: exception {e}"
-                        )
+                    if is_valid_evaluation(evaluation):
+                        text_hash = get_tweet_text_hash(tweets[tweet_id]["text"])
+                        evaluation_cache_updates[text_hash] = TweetEvaluation(
+                            quality=str(evaluation["quality"]),
+                            relationship=str(evaluation["relationship"]),
+                            timestamp=now,
+                        ).model_dump()
 
-                    tweets[response.nonce]["points"] = points
-                    self.context.logger.info(
-                        f"Tweet {response.nonce} awarded {points} points"
-                    )
+            # Duplicates that were not requested share the new evaluations
+            for tweet_id, tweet in tweets.items():
+                if "points" in tweet:
+                    continue
+                text_hash = get_tweet_text_hash(tweet["text"])
+                if text_hash not in evaluation_cache_updates:
+                    continue
+                tweet["points"] = self.get_tweet_points(
+                    tweet, evaluation_cache_updates[text_hash]
+                )
+                self.context.logger.info(
+                    f"Tweet {tweet_id} awarded {tweet['points']} points as a duplicate"
+                )
+
+            # Near-duplicates get the points of their newly evaluated originals
+            for tweet_id, tweet in tweets.items():
+                if "points" in tweet or "near_duplicate_of" not in tweet:
+                    continue
+                points = self.get_near_duplicate_points(tweet, tweets)
+                if points is None:
+                    continue
+                tweet["points"] = points
+                self.context.logger.info(
+                    f"Tweet {tweet_id} awarded {points} points as a near-duplicate"
+                )
 
             sender = self.context.agent_address
             payload = PostMechRequestPayload(
                 sender=sender,
                 content=json.dumps(
-                    {"tweets": tweets, "responses_to_remove": responses_to_remove},
+                    {
+                        "tweets": tweets,
+                        "responses_to_remove": responses_to_remove,
+                        "evaluation_cache_updates": evaluation_cache_updates,
+                    },
                     sort_keys=True,
                 ),
             )
@@ -1097,10 +1382,15 @@ class DBUpdateBehaviour(TwitterScoringBaseBehaviour):
 
         with self.context.benchmark_tool.measure(self.behaviour_id).local():
             sender = self.context.agent_address
+            contribute_db = self.context.contribute_db
+            contribute_db.begin_unit_of_work()
             yield from self.update_db()
+            yield from contribute_db.flush()
+            # Every agent applies the same mutations, so the batch hash lets the
+            # round check that non-writers agree with what the writer stored
             payload = DBUpdatePayload(
                 sender=sender,
-                content="",
+                content=contribute_db.get_write_batch_hash(),
             )
 
         with self.context.benchmark_tool.measure(self.behaviour_id).consensus():
@@ -1109,6 +1399,56 @@ class DBUpdateBehaviour(TwitterScoringBaseBehaviour):
 
         self.set_done()
 
+    def update_module_cache(self) -> Generator[None, None, None]:
+        """Store the new evaluations and signatures and evict the expired and oldest ones"""
+        contribute_db = self.context.contribute_db
+        evaluation_cache = dict(
+            sorted(
+                self.get_evaluation_cache().items(),
+                key=lambda item: (item[1]["timestamp"], item[0]),
+                reverse=True,
+            )[: self.params.tweet_evaluation_cache_max_size]
+        )
+        recent_signatures = dict(
+            sorted(
+                self.get_recent_signatures().items(),
+                key=lambda item: (item[1]["timestamp"], item[0]),
+                reverse=True,
+            )[: self.params.near_duplicate_max_signatures]
+        )
+
+        # The cache has its own attribute instance so that module data updates stay small
+        module_cache = contribute_db.data.module_cache
+        is_new = module_cache is None
+        if is_new:
+            if not evaluation_cache and not recent_signatures:
+                return
+            module_cache = ModuleCache()
+        elif evaluation_cache == {
+            text_hash: evaluation.model_dump()
+            for text_hash, evaluation in module_cache.evaluation_cache.items()
+        } and recent_signatures == {
+            tweet_id: signature.model_dump()
+            for tweet_id, signature in module_cache.recent_signatures.items()
+        }:
+            return
+
+        module_cache.evaluation_cache = {
+            text_hash: TweetEvaluation(**evaluation)
+            for text_hash, evaluation in evaluation_cache.items()
+        }
+        module_cache.recent_signatures = {
+            tweet_id: TweetSignature(**signature)
+            for tweet_id, signature in recent_signatures.items()
+        }
+        self.context.logger.info(
+            f"Updating the module cache: {len(evaluation_cache)} evaluations  |  {len(recent_signatures)} signatures"
+        )
+        if is_new:
+            yield from contribute_db.create_module_cache(module_cache)
+        else:
+            yield from contribute_db.update_module_cache(module_cache)
+
     def update_db(self) -> Generator[None, None, None]:
         """Calculate the new content of the DB"""
 
@@ -1116,6 +1456,7 @@ class DBUpdateBehaviour(TwitterScoringBaseBehaviour):
         contribute_db = self.context.contribute_db
         module_data = contribute_db.data.module_data.twitter
         users = contribute_db.data.users
+        contribute_db.reset_write_batch()
 
         self.context.logger.info(f"Updating DB with tweets: {tweets}.")
 
@@ -1131,13 +1472,15 @@ class DBUpdateBehaviour(TwitterScoringBaseBehaviour):
             self.context.logger.info(
                 f"Scoring period has changed from {current_period} to {today}. Resetting user period points..."
             )
-            for user in users.values():
-                if user.current_period_points != 0:
-                    self.context.logger.info(
-                        f"Resetting user {user.twitter_handle} ({user.twitter_id}) current_period_points from {user.current_period_points} to 0"
-                    )
-                    user.current_period_points = 0
-                    yield from contribute_db.update_user(user)
+            # Only the users with period points are touched
+            user_metrics = contribute_db.get_user_metrics()
+            for user_id in user_metrics.period_points_user_ids():
+                user = users[user_id]
+                self.context.logger.info(
+                    f"Resetting user {user.twitter_handle} ({user.twitter_id}) current_period_points from {user.current_period_points} to 0"
+                )
+                user.current_period_points = 0
+                yield from contribute_db.update_user(user)
 
         active_campaigns = self.get_active_campaigns()
 
@@ -1285,6 +1628,22 @@ class DBUpdateBehaviour(TwitterScoringBaseBehaviour):
             module_data.twitter.latest_mention_tweet_id = str(latest_mention_tweet_id)
             update_needed = True
 
+        # Update the per-term search cursors. Terms that are no longer searched are dropped.
+        search_since_ids = self.synchronized_data.search_since_ids
+        if search_since_ids is not None:
+            module_data.twitter.search_since_ids = search_since_ids
+            update_needed = True
+
+        # Update the unfinished search paginations
+        pagination_cursors = self.synchronized_data.pagination_cursors
+        if pagination_cursors is not None:
+            module_data.twitter.pagination_cursors = [
+                TwitterPaginationCursor(**cursor) for cursor in pagination_cursors
+            ]
+            update_needed = True
+
+        yield from self.update_module_cache()
+
         # Update the number of tweets made today
         number_of_tweets_pulled_today = (
             self.synchronized_data.number_of_tweets_pulled_today
@@ -1304,6 +1663,19 @@ class DBUpdateBehaviour(TwitterScoringBaseBehaviour):
             )
             update_needed = True
 
+        # Update the number of tweets read this month
+        number_of_tweets_pulled_this_month = (
+            self.synchronized_data.number_of_tweets_pulled_this_month
+        )
+        if number_of_tweets_pulled_this_month is not None:
+            module_data.twitter.number_of_tweets_pulled_this_month = (
+                number_of_tweets_pulled_this_month
+            )
+            module_data.twitter.last_tweet_pull_month_reset = (
+                self.synchronized_data.last_tweet_pull_month_reset
+            )
+            update_needed = True
+
         # Update the current_period
         if module_data.twitter.current_period != today:
             module_data.twitter.current_period = today
@@ -1352,12 +1724,11 @@ class DBUpdateBehaviour(TwitterScoringBaseBehaviour):
 class TwitterScoringRoundBehaviour(AbstractRoundBehaviour):
     """TwitterScoringRoundBehaviour"""
 
-    initial_behaviour_cls = TwitterMentionsCollectionBehaviour
+    initial_behaviour_cls = TwitterCollectionBehaviour
     abci_app_cls = TwitterScoringAbciApp  # type: ignore
     behaviours: Set[Type[BaseBehaviour]] = [
         TwitterDecisionMakingBehaviour,
-        TwitterMentionsCollectionBehaviour,
-        TwitterCampaignsCollectionBehaviour,
+        TwitterCollectionBehaviour,
         DBUpdateBehaviour,
         TwitterRandomnessBehaviour,
         TwitterSelectKeepersBehaviour,
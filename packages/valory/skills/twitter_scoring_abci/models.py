@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 # ------------------------------------------------------------------------------
 #
-#   Copyright 2023-2025 Valory AG
+#   Copyright 2023-2026 Valory AG
 #
 #   Licensed under the Apache License, Version 2.0 (the "License");
 #   you may not use this file except in compliance with the License.
@@ -31,6 +31,9 @@ from packages.valory.skills.decision_making_abci.models import (
     SharedState as BaseSharedState,
 )
 from packages.valory.skills.twitter_scoring_abci.rounds import TwitterScoringAbciApp
+from packages.valory.skills.twitter_scoring_abci.twitter_rate_limiter import (
+    TwitterRateLimiter,
+)
 
 
 class SharedState(BaseSharedState):
@@ -84,15 +87,38 @@ class Params(BaseParams):
         """Initialize the parameters object."""
         self.twitter_api_base = kwargs.get("twitter_api_base")
         self.twitter_api_bearer_token = kwargs.get("twitter_api_bearer_token")
+        # Reads are spread over a pool of tokens, defaulting to the single one
+        self.twitter_api_bearer_tokens = kwargs.get("twitter_api_bearer_tokens") or [
+            self.twitter_api_bearer_token
+        ]
         self.twitter_mentions_endpoint = kwargs.get("twitter_mentions_endpoint")
         self.twitter_mentions_args = kwargs.get("twitter_mentions_args")
         self.twitter_max_pages = kwargs.get("twitter_max_pages")
         self.twitter_search_endpoint = kwargs.get("twitter_search_endpoint")
         self.twitter_search_args = kwargs.get("twitter_search_args")
+        self.twitter_search_query_max_length = kwargs.get(
+            "twitter_search_query_max_length", 512
+        )
         self.max_points_per_period = kwargs.get("max_points_per_period")
         self.tweet_evaluation_round_timeout = kwargs.get(
             "tweet_evaluation_round_timeout"
         )
+        self.tweet_evaluation_batch_size = self._ensure(
+            "tweet_evaluation_batch_size", kwargs, int
+        )
+        self.tweet_evaluation_cache_ttl = self._ensure(
+            "tweet_evaluation_cache_ttl", kwargs, int
+        )
+        self.tweet_evaluation_cache_max_size = self._ensure(
+            "tweet_evaluation_cache_max_size", kwargs, int
+        )
+        self.near_duplicate_max_distance = self._ensure(
+            "near_duplicate_max_distance", kwargs, int
+        )
+        self.near_duplicate_window = self._ensure("near_duplicate_window", kwargs, int)
+        self.near_duplicate_max_signatures = self._ensure(
+            "near_duplicate_max_signatures", kwargs, int
+        )
         self.max_tweet_pulls_allowed = kwargs.get("max_tweet_pulls_allowed")
         self.openai_call_window_size = kwargs.get("openai_call_window_size")
         self.openai_calls_allowed_in_window = kwargs.get(
@@ -102,6 +128,13 @@ class Params(BaseParams):
             openai_call_window_size=self.openai_call_window_size,
             openai_calls_allowed_in_window=self.openai_calls_allowed_in_window,
         )
+        self.twitter_monthly_read_cap = kwargs.get("twitter_monthly_read_cap")
+        self.twitter_request_headroom = kwargs.get("twitter_request_headroom", 1)
+        self.twitter_rate_limiter = TwitterRateLimiter(
+            bearer_tokens=self.twitter_api_bearer_tokens,
+            monthly_read_cap=self.twitter_monthly_read_cap,
+            request_headroom=self.twitter_request_headroom,
+        )
         self.staking_contract_addresses = kwargs.get("staking_contract_addresses", [])
         self.contributors_contract_address = kwargs.get("contributors_contract_address")
         self.safe_contract_address_gnosis = kwargs.get("safe_contract_address_gnosis")
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 # ------------------------------------------------------------------------------
 #
-#   Copyright 2023-2024 Valory AG
+#   Copyright 2023-2026 Valory AG
 #
 #   Licensed under the Apache License, Version 2.0 (the "License");
 #   you may not use this file except in compliance with the License.
@@ -50,3 +50,39 @@ Ensure the response can be parsed by Python json.loads
 User text:
 {user_text}
 """
+
+tweet_batch_evaluation_prompt = """
+You are an AI text evaluator that needs to assess the quality of different texts sent by your users.
+These users will write about Olas (aka Autonolas), a web3 protocol focused on building decentralized autonomous services and agent economies.
+Your task is to evaluate whether each text sent by the users is related to Olas and to which degree, as well as the quality of writing.
+You will be given a text about Olas as well as a list of user texts, each one with its own id.
+
+For reference, here are some topics related to Olas:
+* Blockchain
+* Web3
+* AI agents
+* Co-own AI
+* Agent economies
+
+GOALS:
+
+1. Determine the degree of relationship between each user text and the Olas text
+2. Determine the quality of each user writing
+
+For the given goals, only respond with the LOW, AVERAGE or HIGH tags.
+Evaluate every user text independently of the others.
+
+You should only respond in JSON format as described below, with one item per user text and the same ids
+Response Format:
+[
+    {
+        "id": "id",
+        "quality": "quality",
+        "relationship": "relationship"
+    }
+]
+Ensure the response can be parsed by Python json.loads
+
+User texts:
+{user_texts}
+"""
@@ -31,11 +31,13 @@ from packages.valory.skills.abstract_round_abci.base import (
     AbciAppTransitionFunction,
     AppState,
     BaseSynchronizedData,
+    BaseTxPayload,
     CollectSameUntilThresholdRound,
     DegenerateRound,
     EventToTimeout,
     get_name,
 )
+from packages.valory.skills.contribute_db_abci.rounds import AgentDBWriteRound
 from packages.valory.skills.mech_interact_abci.states.base import (
     SynchronizedData as MechInteractionSynchronizedData,
 )
@@ -43,9 +45,8 @@ from packages.valory.skills.twitter_scoring_abci.payloads import (
     DBUpdatePayload,
     PostMechRequestPayload,
     PreMechRequestPayload,
-    TwitterCampaignsCollectionPayload,
+    TwitterCollectionPayload,
     TwitterDecisionMakingPayload,
-    TwitterMentionsCollectionPayload,
     TwitterRandomnessPayload,
     TwitterSelectKeepersPayload,
 )
@@ -109,8 +110,7 @@ class Event(Enum):
     ROUND_TIMEOUT = "round_timeout"
     TWEET_EVALUATION_ROUND_TIMEOUT = "tweet_evaluation_round_timeout"
     API_ERROR = "api_error"
-    RETRIEVE_CAMPAIGNS = "retrieve_campaigns"
-    RETRIEVE_MENTIONS = "retrieve_mentions"
+    RETRIEVE_TWEETS = "retrieve_tweets"
     PRE_MECH = "pre_mech"
     POST_MECH = "post_mech"
     DB_UPDATE = "db_update"
@@ -150,6 +150,16 @@ class SynchronizedData(MechInteractionSynchronizedData):
         """Get the latest_campaign_tweet_id."""
         return cast(dict, self.db.get("latest_campaign_tweet_id", None))
 
+    @property
+    def search_since_ids(self) -> Optional[dict]:
+        """Get the since_id cursor of every search term."""
+        return cast(Optional[dict], self.db.get("search_since_ids", None))
+
+    @property
+    def pagination_cursors(self) -> Optional[list]:
+        """Get the unfinished search paginations."""
+        return cast(Optional[list], self.db.get("pagination_cursors", None))
+
     @property
     def number_of_tweets_pulled_today(self) -> dict:
         """Get the number_of_tweets_pulled_today."""
@@ -160,6 +170,28 @@ class SynchronizedData(MechInteractionSynchronizedData):
         """Get the last_tweet_pull_window_reset."""
         return cast(dict, self.db.get("last_tweet_pull_window_reset", None))
 
+    @property
+    def number_of_tweets_pulled_this_month(self) -> Optional[int]:
+        """Get the number of tweets read this month."""
+        return cast(
+            Optional[int], self.db.get("number_of_tweets_pulled_this_month", None)
+        )
+
+    @property
+    def last_tweet_pull_month_reset(self) -> Optional[float]:
+        """Get the start of the month the monthly tweet count refers to."""
+        return cast(Optional[float], self.db.get("last_tweet_pull_month_reset", None))
+
+    @property
+    def tweet_signatures(self) -> dict:
+        """Get the signatures of the tweets collected in this period."""
+        return cast(dict, self.db.get("tweet_signatures", {}))
+
+    @property
+    def evaluation_cache_updates(self) -> dict:
+        """Get the tweet evaluations not yet stored in the cache."""
+        return cast(dict, self.db.get("evaluation_cache_updates", {}))
+
     @property
     def performed_twitter_tasks(self) -> dict:
         """Get the twitter_tasks."""
@@ -188,7 +220,7 @@ class TwitterDecisionMakingRound(CollectSameUntilThresholdRound):
         if self.threshold_reached:
             event = Event(self.most_voted_payload)
             # Reference events to avoid tox -e check-abciapp-specs failures
-            # Event.DONE, Event.DB_UPDATE, Event.RETRIEVE_MENTIONS, Event.RETRIEVE_CAMPAIGNS, Event.SELECT_KEEPERS
+            # Event.DONE, Event.DB_UPDATE, Event.RETRIEVE_TWEETS, Event.SELECT_KEEPERS
             # Event.POST_MECH, Event.PRE_MECH
             return self.synchronized_data, event
         if not self.is_majority_possible(
@@ -198,10 +230,10 @@ class TwitterDecisionMakingRound(CollectSameUntilThresholdRound):
         return None
 
 
-class TwitterMentionsCollectionRound(CollectSameUntilThresholdRound):
-    """TwitterMentionsCollectionRound"""
+class TwitterCollectionRound(CollectSameUntilThresholdRound):
+    """TwitterCollectionRound"""
 
-    payload_class = TwitterMentionsCollectionPayload
+    payload_class = TwitterCollectionPayload
     synchronized_data_class = SynchronizedData
     extended_requirements = ()
 
@@ -243,7 +275,7 @@ class TwitterMentionsCollectionRound(CollectSameUntilThresholdRound):
             if "error" in payload:
                 # API limits
                 if payload["error"] == ERROR_API_LIMITS:
-                    performed_twitter_tasks["retrieve_mentions"] = (
+                    performed_twitter_tasks["retrieve_tweets"] = (
                         Event.DONE_MAX_RETRIES.value
                     )
 
@@ -266,7 +298,7 @@ class TwitterMentionsCollectionRound(CollectSameUntilThresholdRound):
 
                 # Other API errors
                 if api_retries >= MAX_API_RETRIES:
-                    performed_twitter_tasks["retrieve_mentions"] = (
+                    performed_twitter_tasks["retrieve_tweets"] = (
                         Event.DONE_MAX_RETRIES.value
                     )
                     synchronized_data = self.synchronized_data.update(
@@ -294,7 +326,7 @@ class TwitterMentionsCollectionRound(CollectSameUntilThresholdRound):
 
             # Happy path
             previous_tweets = cast(SynchronizedData, self.synchronized_data).tweets
-            performed_twitter_tasks["retrieve_mentions"] = Event.DONE.value
+            performed_twitter_tasks["retrieve_tweets"] = Event.DONE.value
             new_tweets = payload["tweets"]
 
             updates = {
@@ -308,157 +340,39 @@ class TwitterMentionsCollectionRound(CollectSameUntilThresholdRound):
                 get_name(SynchronizedData.last_tweet_pull_window_reset): payload[
                     "last_tweet_pull_window_reset"
                 ],
+                get_name(SynchronizedData.number_of_tweets_pulled_this_month): payload[
+                    "number_of_tweets_pulled_this_month"
+                ],
+                get_name(SynchronizedData.last_tweet_pull_month_reset): payload[
+                    "last_tweet_pull_month_reset"
+                ],
                 get_name(
                     SynchronizedData.performed_twitter_tasks
                 ): performed_twitter_tasks,
                 get_name(SynchronizedData.sleep_until): payload["sleep_until"],
             }
 
-            if payload["latest_mention_tweet_id"]:
-                updates[get_name(SynchronizedData.latest_mention_tweet_id)] = payload[
-                    "latest_mention_tweet_id"
-                ]
-            else:
-                updates[get_name(SynchronizedData.latest_mention_tweet_id)] = (
-                    self.context.contribute_db.data.module_data.twitter.latest_mention_tweet_id
-                )
-
-            synchronized_data = self.synchronized_data.update(
-                synchronized_data_class=SynchronizedData,
-                **updates,
+            # The legacy cursors track the mention and campaign search terms
+            twitter_data = self.context.contribute_db.data.module_data.twitter
+            updates[get_name(SynchronizedData.latest_mention_tweet_id)] = (
+                payload["latest_mention_tweet_id"]
+                or twitter_data.latest_mention_tweet_id
             )
-            return synchronized_data, Event.DONE
-        if not self.is_majority_possible(
-            self.collection, self.synchronized_data.nb_participants
-        ):
-            return self.synchronized_data, Event.NO_MAJORITY
-        return None
-
-
-class TwitterCampaignsCollectionRound(CollectSameUntilThresholdRound):
-    """TwitterCampaignsCollectionRound"""
-
-    payload_class = TwitterCampaignsCollectionPayload
-    synchronized_data_class = SynchronizedData
-    extended_requirements = ()
-
-    @property
-    def consensus_threshold(self):
-        """Consensus threshold"""
-        return math.ceil(self.synchronized_data.nb_participants / 2)  # half or 1
-
-    @property
-    def threshold_reached(
-        self,
-    ) -> bool:
-        """Check if the threshold has been reached."""
-        counts = self.payload_values_count.values()
-        return any(count >= self.consensus_threshold for count in counts)
-
-    @property
-    def most_voted_payload_values(
-        self,
-    ) -> Tuple[Any, ...]:
-        """Get the most voted payload values."""
-        most_voted_payload_values, max_votes = self.payload_values_count.most_common()[
-            0
-        ]
-        if max_votes < self.consensus_threshold:
-            raise ABCIAppInternalError("not enough votes")
-        return most_voted_payload_values
-
-    def end_block(self) -> Optional[Tuple[BaseSynchronizedData, Event]]:
-        """Process the end of the block."""
-        if self.threshold_reached:
-            performed_twitter_tasks = cast(
-                SynchronizedData, self.synchronized_data
-            ).performed_twitter_tasks
-
-            payload = json.loads(self.most_voted_payload)
-
-            # Api error
-            if "error" in payload:
-                # API limits
-                if payload["error"] == ERROR_API_LIMITS:
-                    performed_twitter_tasks["retrieve_campaigns"] = (
-                        Event.DONE_MAX_RETRIES.value
-                    )
-
-                    synchronized_data = self.synchronized_data.update(
-                        synchronized_data_class=SynchronizedData,
-                        **{
-                            get_name(SynchronizedData.sleep_until): payload[
-                                "sleep_until"
-                            ],
-                            get_name(
-                                SynchronizedData.performed_twitter_tasks
-                            ): performed_twitter_tasks,
-                        },
-                    )
-                    return synchronized_data, Event.DONE_API_LIMITS
-
-                api_retries = (
-                    cast(SynchronizedData, self.synchronized_data).api_retries + 1
-                )
-
-                # Other API errors
-                if api_retries >= MAX_API_RETRIES:
-                    performed_twitter_tasks["retrieve_campaigns"] = (
-                        Event.DONE_MAX_RETRIES.value
-                    )
-                    synchronized_data = self.synchronized_data.update(
-                        synchronized_data_class=SynchronizedData,
-                        **{
-                            get_name(SynchronizedData.api_retries): 0,  # reset retries
-                            get_name(
-                                SynchronizedData.performed_twitter_tasks
-                            ): performed_twitter_tasks,
-                            get_name(SynchronizedData.sleep_until): payload[
-                                "sleep_until"
-                            ],
-                        },
-                    )
-                    return synchronized_data, Event.DONE_MAX_RETRIES
-
-                synchronized_data = self.synchronized_data.update(
-                    synchronized_data_class=SynchronizedData,
-                    **{
-                        get_name(SynchronizedData.api_retries): api_retries,
-                        get_name(SynchronizedData.sleep_until): payload["sleep_until"],
-                    },
-                )
-                return synchronized_data, Event.API_ERROR
-
-            # Happy path
-            previous_tweets = cast(SynchronizedData, self.synchronized_data).tweets
-            performed_twitter_tasks["retrieve_campaigns"] = Event.DONE.value
-            new_tweets = payload["tweets"]
-
-            updates = {
-                get_name(SynchronizedData.tweets): {
-                    **new_tweets,
-                    **previous_tweets,
-                },  # order matters here: if there is duplication, keep old tweets
-                get_name(SynchronizedData.number_of_tweets_pulled_today): payload[
-                    "number_of_tweets_pulled_today"
-                ],
-                get_name(SynchronizedData.last_tweet_pull_window_reset): payload[
-                    "last_tweet_pull_window_reset"
-                ],
-                get_name(
-                    SynchronizedData.performed_twitter_tasks
-                ): performed_twitter_tasks,
-                get_name(SynchronizedData.sleep_until): payload["sleep_until"],
+            updates[get_name(SynchronizedData.latest_campaign_tweet_id)] = (
+                payload["latest_campaign_tweet_id"]
+                or twitter_data.latest_hashtag_tweet_id
+            )
+            updates[get_name(SynchronizedData.search_since_ids)] = payload[
+                "search_since_ids"
+            ]
+            updates[get_name(SynchronizedData.pagination_cursors)] = payload[
+                "pagination_cursors"
+            ]
+            updates[get_name(SynchronizedData.tweet_signatures)] = {
+                **cast(SynchronizedData, self.synchronized_data).tweet_signatures,
+                **payload["tweet_signatures"],
             }
 
-            if payload["latest_campaign_tweet_id"]:
-                updates[get_name(SynchronizedData.latest_campaign_tweet_id)] = payload[
-                    "latest_campaign_tweet_id"
-                ]
-            else:
-                updates[get_name(SynchronizedData.latest_campaign_tweet_id)] = (
-                    self.context.contribute_db.data.module_data.twitter.latest_hashtag_tweet_id
-                )
             synchronized_data = self.synchronized_data.update(
                 synchronized_data_class=SynchronizedData,
                 **updates,
@@ -488,10 +402,11 @@ class PreMechRequestRound(CollectSameUntilThresholdRound):
                 SynchronizedData, self.synchronized_data
             ).mech_responses
 
+            # Tweets can be scored from the evaluation cache
+            tweets = payload["tweets"]
+
             # Nothing to evaluate (no new tweets) nor responses to retrieve
             if not new_mech_requests and not mech_responses:
-                tweets = cast(SynchronizedData, self.synchronized_data).tweets
-
                 synchronized_data = self.synchronized_data.update(
                     synchronized_data_class=SynchronizedData,
                     **{
@@ -515,6 +430,7 @@ class PreMechRequestRound(CollectSameUntilThresholdRound):
             synchronized_data = self.synchronized_data.update(
                 synchronized_data_class=SynchronizedData,
                 **{
+                    get_name(SynchronizedData.tweets): tweets,
                     get_name(SynchronizedData.mech_requests): json.dumps(
                         new_mech_requests
                     ),  # delete previous requests
@@ -565,6 +481,12 @@ class PostMechRequestRound(CollectSameUntilThresholdRound):
             ]
 
             serialized_responses = json.dumps(mech_responses, cls=DataclassEncoder)
+            evaluation_cache_updates = {
+                **cast(
+                    SynchronizedData, self.synchronized_data
+                ).evaluation_cache_updates,
+                **payload["evaluation_cache_updates"],
+            }
 
             synchronized_data = self.synchronized_data.update(
                 synchronized_data_class=SynchronizedData,
@@ -574,6 +496,9 @@ class PostMechRequestRound(CollectSameUntilThresholdRound):
                         SynchronizedData.performed_twitter_tasks
                     ): performed_twitter_tasks,
                     get_name(SynchronizedData.mech_responses): serialized_responses,
+                    get_name(
+                        SynchronizedData.evaluation_cache_updates
+                    ): evaluation_cache_updates,
                 },
             )
             return synchronized_data, Event.DONE
@@ -585,16 +510,23 @@ class PostMechRequestRound(CollectSameUntilThresholdRound):
         return None
 
 
-class DBUpdateRound(CollectSameUntilThresholdRound):
+class DBUpdateRound(AgentDBWriteRound):
     """DBUpdateRound"""
 
     payload_class = DBUpdatePayload
     synchronized_data_class = SynchronizedData
     extended_requirements = ()
 
+    def get_write_batch_hash(self, payload: BaseTxPayload) -> Optional[str]:
+        """Get the write batch hash reported in a payload"""
+        return cast(DBUpdatePayload, payload).content
+
     def end_block(self) -> Optional[Tuple[BaseSynchronizedData, Event]]:
         """Process the end of the block."""
         if self.threshold_reached:
+            if self.is_writer_pending():
+                return None
+
             performed_twitter_tasks = cast(
                 SynchronizedData, self.synchronized_data
             ).performed_twitter_tasks
@@ -691,8 +623,7 @@ class TwitterScoringAbciApp(AbciApp[Event]):
     transition_function: AbciAppTransitionFunction = {
         TwitterDecisionMakingRound: {
             Event.SELECT_KEEPERS: TwitterRandomnessRound,
-            Event.RETRIEVE_CAMPAIGNS: TwitterCampaignsCollectionRound,
-            Event.RETRIEVE_MENTIONS: TwitterMentionsCollectionRound,
+            Event.RETRIEVE_TWEETS: TwitterCollectionRound,
             Event.PRE_MECH: PreMechRequestRound,
             Event.POST_MECH: PostMechRequestRound,
             Event.DB_UPDATE: DBUpdateRound,
@@ -710,19 +641,11 @@ class TwitterScoringAbciApp(AbciApp[Event]):
             Event.NO_MAJORITY: TwitterRandomnessRound,
             Event.ROUND_TIMEOUT: TwitterRandomnessRound,
         },
-        TwitterMentionsCollectionRound: {
-            Event.DONE: TwitterDecisionMakingRound,
-            Event.DONE_MAX_RETRIES: TwitterDecisionMakingRound,
-            Event.DONE_API_LIMITS: TwitterDecisionMakingRound,
-            Event.API_ERROR: TwitterMentionsCollectionRound,
-            Event.NO_MAJORITY: TwitterRandomnessRound,
-            Event.ROUND_TIMEOUT: TwitterRandomnessRound,
-        },
-        TwitterCampaignsCollectionRound: {
+        TwitterCollectionRound: {
             Event.DONE: TwitterDecisionMakingRound,
             Event.DONE_MAX_RETRIES: TwitterDecisionMakingRound,
             Event.DONE_API_LIMITS: TwitterDecisionMakingRound,
-            Event.API_ERROR: TwitterCampaignsCollectionRound,
+            Event.API_ERROR: TwitterCollectionRound,
             Event.NO_MAJORITY: TwitterRandomnessRound,
             Event.ROUND_TIMEOUT: TwitterRandomnessRound,
         },
@@ -23,8 +23,8 @@ import json
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Optional, Type, cast
-from unittest.mock import MagicMock
+from typing import Any, Dict, List, Optional, Type, cast
+from unittest.mock import MagicMock, patch
 
 import pytest
 from aea.exceptions import AEAActException
@@ -43,19 +43,31 @@ from packages.valory.skills.abstract_round_abci.test_tools.base import (
 from packages.valory.skills.abstract_round_abci.test_tools.common import (
     BaseRandomnessBehaviourTest,
 )
-from packages.valory.skills.contribute_db_abci.contribute_models import ContributeUser
+from packages.valory.skills.contribute_db_abci.contribute_models import (
+    ContributeUser,
+    TweetEvaluation,
+    TweetSignature,
+    TwitterPaginationCursor,
+)
+from packages.valory.skills.twitter_scoring_abci import behaviours
 from packages.valory.skills.twitter_scoring_abci.behaviours import (
     DBUpdateBehaviour,
     PostMechRequestBehaviour,
     PreMechRequestBehaviour,
-    TAGLINE,
-    TwitterCampaignsCollectionBehaviour,
+    TWITTER_EPOCH_MS,
+    TwitterCollectionBehaviour,
     TwitterDecisionMakingBehaviour,
-    TwitterMentionsCollectionBehaviour,
     TwitterRandomnessBehaviour,
     TwitterScoringBaseBehaviour,
     TwitterScoringRoundBehaviour,
     TwitterSelectKeepersBehaviour,
+    build_query_shards,
+    get_batch_evaluations,
+    get_hamming_distance,
+    get_simhash,
+    get_tweet_text_hash,
+    normalize_tweet_text,
+    parse_evaluation,
 )
 from packages.valory.skills.twitter_scoring_abci.rounds import (
     DataclassEncoder,
@@ -65,12 +77,27 @@ from packages.valory.skills.twitter_scoring_abci.rounds import (
     SynchronizedData,
     TwitterScoringAbciApp,
 )
+from packages.valory.skills.twitter_scoring_abci.twitter_rate_limiter import (
+    TwitterRateLimiter,
+    get_month_start,
+    get_token_id,
+)
 
 PACKAGE_DIR = Path(__file__).parent.parent
 ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
-
-TWITTER_MENTIONS_URL = "https://api.twitter.com/2/tweets/search/recent?query=@autonolas&tweet.fields=author_id,created_at,public_metrics&user.fields=name&expansions=author_id&max_results={max_results}&since_id=2"  # Workaround. Refer to issue #307
-TWITTER_SEARCH_URL = "https://api.twitter.com/2/tweets/search/recent?query=Olas%20AI%20Agents&tweet.fields=author_id,created_at,conversation_id,public_metrics&user.fields=name&expansions=author_id&max_results={max_results}&since_id=0"
+RECENT_TWEET_ID = (int(datetime.now().timestamp() * 1000) - TWITTER_EPOCH_MS) << 22
+OLD_TWEET_ID = 1
+
+TWITTER_SEARCH_URL = "https://api.twitter.com/2/tweets/search/recent?query={query}&tweet.fields=author_id,created_at,conversation_id,public_metrics&user.fields=name&expansions=author_id&max_results={max_results}&since_id={since_id}"
+TWITTER_MENTIONS_URL = TWITTER_SEARCH_URL.replace("{query}", "@autonolas")
+# Search args of a pagination started with smaller pages and no until_id
+TWITTER_RESUMED_ARGS = TWITTER_MENTIONS_URL.split("?", 1)[1].format(
+    max_results=50, since_id=0
+)
+TWITTER_RESUMED_URL = (
+    TWITTER_MENTIONS_URL.split("?", 1)[0]
+    + f"?{TWITTER_RESUMED_ARGS}&pagination_token=dummy_resume_token"
+)
 
 
 PARAM_OVERRIDES = {
@@ -81,7 +108,7 @@ PARAM_OVERRIDES = {
         "0x28877FFc6583170a4C9eD0121fc3195d06fd3A26",
     ],
     "contribute_db_pkey": "0x1111111111111111111111111111111111111111111111111111111111111111",
-    "twitter_search_args": "query=Olas%20AI%20Agents&tweet.fields=author_id,created_at,conversation_id,public_metrics&user.fields=name&expansions=author_id&max_results=120&since_id=0",
+    "twitter_search_args": "query={search_query}&tweet.fields=author_id,created_at,conversation_id,public_metrics&user.fields=name&expansions=author_id&max_results={max_results}&since_id={since_id}",
     "contributors_contract_address": "0x343F2B005cF6D70bA610CD9F1F1927049414B582",
 }
 
@@ -174,68 +201,6 @@ DUMMY_MOST_VOTED_MENTIONS_DATA = {
     "latest_mention_tweet_id": DUMMY_MENTIONS_RESPONSE["meta"]["newest_id"],
 }
 
-DUMMY_REGISTRATIONS_RESPONSE = {
-    "data": [
-        {
-            "author_id": "1286010187325812739",
-            "text": f"{TAGLINE} {ZERO_ADDRESS}",
-            "id": "10",
-        },
-    ],
-    "includes": {
-        "users": [
-            {"id": "1286010187325812739", "username": "username_a"},
-            {"id": "1286010187325812739", "username": "username_b"},
-            {"id": "1286010187325812738", "username": "username_c"},
-            {"id": "1286010187325812737", "username": "username_d"},
-        ]
-    },
-    "meta": {"result_count": 1, "newest_id": "1", "oldest_id": "0"},
-}
-
-DUMMY_REGISTRATIONS_RESPONSE_MULTIPAGE = {
-    "data": [
-        {
-            "author_id": "1286010187325812739",
-            "text": f"dummy_text #olas {ZERO_ADDRESS}",
-            "id": "10",
-        },
-    ],
-    "includes": {
-        "users": [
-            {"id": "1286010187325812739", "username": "username_a"},
-            {"id": "1286010187325812739", "username": "username_b"},
-            {"id": "1286010187325812738", "username": "username_c"},
-            {"id": "1286010187325812737", "username": "username_d"},
-        ]
-    },
-    "meta": {
-        "result_count": 1,
-        "newest_id": "1",
-        "oldest_id": "0",
-        "next_token": "dummy_next_token",
-    },
-}
-
-DUMMY_REGISTRATIONS_RESPONSE_MULTIPAGE_2 = {
-    "data": [
-        {
-            "author_id": "1286010187325812739",
-            "text": f"{TAGLINE} {ZERO_ADDRESS}",
-            "id": "10",
-        },
-    ],
-    "includes": {
-        "users": [
-            {"id": "1286010187325812739", "username": "username_a"},
-            {"id": "1286010187325812739", "username": "username_b"},
-            {"id": "1286010187325812738", "username": "username_c"},
-            {"id": "1286010187325812737", "username": "username_d"},
-        ]
-    },
-    "meta": {"result_count": 1, "newest_id": "1", "oldest_id": "0"},
-}
-
 DUMMY_REGISTRATIONS_RESPONSE_COUNT_ZERO = {
     "data": [
         {
@@ -247,49 +212,6 @@ DUMMY_REGISTRATIONS_RESPONSE_COUNT_ZERO = {
     "meta": {"result_count": 0, "newest_id": "1", "oldest_id": "0"},
 }
 
-DUMMY_REGISTRATIONS_RESPONSE_MISSING_META = {
-    "data": [
-        {
-            "author_id": "1286010187325812739",
-            "text": f"dummy_text #olas {ZERO_ADDRESS}",
-            "id": "10",
-        },
-    ]
-}
-
-DUMMY_REGISTRATIONS_RESPONSE_MISSING_DATA = {
-    "meta": {"result_count": 1, "newest_id": "1", "oldest_id": "0"},
-}
-
-DUMMY_REGISTRATIONS_RESPONSE_MISSING_INCLUDES = {
-    "data": [
-        {
-            "author_id": "1286010187325812739",
-            "text": f"{TAGLINE} {ZERO_ADDRESS}",
-            "id": "10",
-        },
-    ],
-    "meta": {"result_count": 1, "newest_id": "1", "oldest_id": "0"},
-}
-
-DUMMY_CAMPAIGNS_RESPONSE = {
-    "data": [
-        {"author_id": "1286010187325812739", "text": "dummy_text", "id": "1"},
-        {"author_id": "1286010187325812739", "text": "dummy_text", "id": "2"},
-        {"author_id": "1286010187325812738", "text": "dummy_text", "id": "3"},
-        {"author_id": "1286010187325812737", "text": "dummy_text", "id": "4"},
-    ],
-    "includes": {
-        "users": [
-            {"id": "1286010187325812739", "username": "username_a"},
-            {"id": "1286010187325812739", "username": "username_b"},
-            {"id": "1286010187325812738", "username": "username_c"},
-            {"id": "1286010187325812737", "username": "username_d"},
-        ]
-    },
-    "meta": {"result_count": 4, "newest_id": "1", "oldest_id": "0"},
-}
-
 
 def get_mocked_contribute_db():
     """Factory to create a fresh mocked contribute DB per test with full control over parameters."""
@@ -337,13 +259,21 @@ def get_mocked_contribute_db():
         return users.get(value, None)
 
     contribute_db.get_user_by_attribute.side_effect = _get_user_by_attribute
+    contribute_db.get_write_batch_hash.return_value = ""
     return contribute_db
 
 
 def get_mocked_agent_db(
     number_of_tweets_pulled_today: int = 1,
     last_tweet_pull_window_reset: int = 1993903085,
+    number_of_tweets_pulled_this_month: int = 0,
+    last_tweet_pull_month_reset: float = 0,
+    evaluation_cache: Optional[Dict[str, TweetEvaluation]] = None,
+    recent_signatures: Optional[Dict[str, TweetSignature]] = None,
     latest_hashtag_tweet_id: int = 0,
+    latest_mention_tweet_id: int = 0,
+    search_since_ids: Optional[Dict[str, str]] = None,
+    pagination_cursors: Optional[List[TwitterPaginationCursor]] = None,
     campaigns: list = None,
     current_scoring_period=None,
 ):
@@ -351,6 +281,18 @@ def get_mocked_agent_db(
     if campaigns is None:
         campaigns = []
 
+    if search_since_ids is None:
+        search_since_ids = {}
+
+    if pagination_cursors is None:
+        pagination_cursors = []
+
+    if evaluation_cache is None:
+        evaluation_cache = {}
+
+    if recent_signatures is None:
+        recent_signatures = {}
+
     if current_scoring_period is None:
         current_scoring_period = datetime.now().date()
     return MagicMock(
@@ -358,11 +300,20 @@ def get_mocked_agent_db(
             twitter=MagicMock(
                 number_of_tweets_pulled_today=number_of_tweets_pulled_today,
                 last_tweet_pull_window_reset=last_tweet_pull_window_reset,
+                number_of_tweets_pulled_this_month=number_of_tweets_pulled_this_month,
+                last_tweet_pull_month_reset=last_tweet_pull_month_reset,
                 latest_hashtag_tweet_id=latest_hashtag_tweet_id,
+                latest_mention_tweet_id=latest_mention_tweet_id,
+                search_since_ids=search_since_ids,
+                pagination_cursors=pagination_cursors,
                 current_period=current_scoring_period,
             ),
             twitter_campaigns=MagicMock(campaigns=campaigns),
-        )
+        ),
+        module_cache=MagicMock(
+            evaluation_cache=evaluation_cache,
+            recent_signatures=recent_signatures,
+        ),
     )
 
 
@@ -432,10 +383,58 @@ class BaseBehaviourTest(FSMBehaviourBaseCase):
         )
 
 
-class TestMentionsCollectionBehaviour(BaseBehaviourTest):
-    """Tests TestMentionsCollectionBehaviour"""
+def mock_http_requests(test: BaseBehaviourTest, kwargs: Dict) -> None:
+    """Mock the Twitter API requests of a test case, which are sent in batches of batch_sizes."""
+    request_urls = kwargs.get("request_urls")
+    bearer_tokens = kwargs.get(
+        "bearer_tokens", ["<default_bearer_token>"] * len(request_urls)
+    )
+    batch_sizes = kwargs.get("batch_sizes", [1] * len(request_urls))
+    i = 0
+    for batch_size in batch_sizes:
+        test.assert_quantity_in_outbox(batch_size)
+        http_messages = []
+        for j in range(i, i + batch_size):
+            http_message = test.get_message_from_outbox()
+            has_attributes, error_str = test.message_has_attributes(
+                actual_message=http_message,
+                message_type=type(http_message),
+                performative=type(http_message).Performative.REQUEST,
+                sender=str(test.skill.skill_context.skill_id),
+                method="GET",
+                headers=f"Authorization: Bearer {bearer_tokens[j]}\r\n",
+                version="",
+                url=request_urls[j],
+            )
+            assert has_attributes, error_str
+            http_messages.append(http_message)
+        test.behaviour.act_wrapper()
+        test.assert_quantity_in_outbox(0)
+
+        for j, http_message in enumerate(http_messages, i):
+            incoming_message = test.build_incoming_message(
+                message_type=type(http_message),
+                dialogue_reference=(http_message.dialogue_reference[0], "stub"),
+                performative=type(http_message).Performative.RESPONSE,
+                target=http_message.message_id,
+                message_id=-1,
+                to=str(test.skill.skill_context.skill_id),
+                sender=http_message.to,
+                version="",
+                status_code=kwargs.get("status_codes")[j],
+                status_text="",
+                body=kwargs.get("response_bodies")[j].encode(),
+                headers=kwargs.get("response_headers", [""] * len(request_urls))[j],
+            )
+            test.http_handler.handle(incoming_message)
+        test.behaviour.act_wrapper()
+        i += batch_size
+
+
+class TestCollectionBehaviour(BaseBehaviourTest):
+    """Tests TwitterCollectionBehaviour"""
 
-    behaviour_class = TwitterMentionsCollectionBehaviour
+    behaviour_class = TwitterCollectionBehaviour
     next_behaviour_class = TwitterDecisionMakingBehaviour
 
     @pytest.mark.parametrize(
@@ -455,20 +454,14 @@ class TestMentionsCollectionBehaviour(BaseBehaviourTest):
                 ),
                 {
                     "request_urls": [
-                        TWITTER_MENTIONS_URL.format(max_results=100),
-                    ],
-                    "request_headers": [
-                        "Authorization: Bearer <default_bearer_token>\r\n",
-                    ],
-                    "response_urls": [
-                        "",
+                        TWITTER_MENTIONS_URL.format(max_results=100, since_id=0),
                     ],
                     "response_bodies": [
                         json.dumps(
                             DUMMY_MENTIONS_RESPONSE,
                         ),
                     ],
-                    "status_code": 200,
+                    "status_codes": [200],
                 },
             ),
             (
@@ -480,20 +473,15 @@ class TestMentionsCollectionBehaviour(BaseBehaviourTest):
                             "test_agent_address",
                         ],
                     ),
-                    agent_db=get_mocked_agent_db(),
+                    agent_db=get_mocked_agent_db(latest_mention_tweet_id=1),
                     event=Event.DONE,
                 ),
                 {
                     "request_urls": [
-                        TWITTER_MENTIONS_URL.format(max_results=100),
-                        TWITTER_MENTIONS_URL.format(max_results=100)
+                        TWITTER_MENTIONS_URL.format(max_results=100, since_id=2),
+                        TWITTER_MENTIONS_URL.format(max_results=100, since_id=2)
                         + "&pagination_token=dummy_next_token",
                     ],
-                    "request_headers": [
-                        "Authorization: Bearer <default_bearer_token>\r\n",
-                        "Authorization: Bearer <default_bearer_token>\r\n",
-                    ],
-                    "response_urls": ["", ""],
                     "response_bodies": [
                         json.dumps(
                             DUMMY_MENTIONS_RESPONSE_MULTIPAGE,
@@ -502,7 +490,7 @@ class TestMentionsCollectionBehaviour(BaseBehaviourTest):
                             DUMMY_MENTIONS_RESPONSE,
                         ),
                     ],
-                    "status_code": 200,
+                    "status_codes": [200, 200],
                 },
             ),
             (
@@ -519,18 +507,14 @@ class TestMentionsCollectionBehaviour(BaseBehaviourTest):
                 ),
                 {
                     "request_urls": [
-                        TWITTER_MENTIONS_URL.format(max_results=100),
-                    ],
-                    "request_headers": [
-                        "Authorization: Bearer <default_bearer_token>\r\n",
+                        TWITTER_MENTIONS_URL.format(max_results=100, since_id=0),
                     ],
-                    "response_urls": [""],
                     "response_bodies": [
                         json.dumps(
                             DUMMY_MENTIONS_RESPONSE_COUNT_ZERO,
                         ),
                     ],
-                    "status_code": 200,
+                    "status_codes": [200],
                 },
             ),
         ],
@@ -540,98 +524,73 @@ class TestMentionsCollectionBehaviour(BaseBehaviourTest):
         """Run tests."""
         self.fast_forward(test_case.initial_data, test_case.agent_db)
         self.behaviour.act_wrapper()
-        for i in range(len(kwargs.get("request_urls"))):
-            self.mock_http_request(
-                request_kwargs=dict(
-                    method="GET",
-                    headers=kwargs.get("request_headers")[i],
-                    version="",
-                    url=kwargs.get("request_urls")[i],
-                ),
-                response_kwargs=dict(
-                    version="",
-                    status_code=kwargs.get("status_code"),
-                    status_text="",
-                    body=kwargs.get("response_bodies")[i].encode(),
-                    url=kwargs.get("response_urls")[i],
-                ),
-            )
+        mock_http_requests(self, kwargs)
         self.complete(test_case.event)
 
 
-class TestMentionsCollectionBehaviourSerial(BaseBehaviourTest):
-    """Tests BinanceObservationBehaviour"""
+class TestCollectionBehaviourShards(BaseBehaviourTest):
+    """Tests TwitterCollectionBehaviour with several query shards"""
 
-    behaviour_class = TwitterMentionsCollectionBehaviour
+    behaviour_class = TwitterCollectionBehaviour
     next_behaviour_class = TwitterDecisionMakingBehaviour
 
-    @pytest.mark.parametrize(
-        "test_case, kwargs",
-        [
-            (
-                BehaviourTestCase(
-                    "API daily limit reached",
-                    initial_data=dict(
-                        most_voted_keeper_addresses=[
-                            "test_agent_address",
-                            "test_agent_address",
-                        ],
-                    ),
-                    event=Event.DONE,
-                    agent_db=get_mocked_agent_db(number_of_tweets_pulled_today=10000),
-                ),
-                {
-                    "request_urls": [],
-                },
-            ),
-            (
-                BehaviourTestCase(
-                    "15 minute window limit",
-                    initial_data=dict(
-                        most_voted_keeper_addresses=[
-                            "test_agent_address",
-                            "test_agent_address",
-                        ],
-                        sleep_until=datetime.now().timestamp() + 200.00,
-                    ),
-                    event=Event.DONE,
-                    agent_db=get_mocked_agent_db(number_of_tweets_pulled_today=10000),
+    def test_run(self) -> None:
+        """Run tests."""
+        contribute_db = self.skill.skill_context.contribute_db
+        module_index = contribute_db.get_module_index.return_value
+        module_index.get_campaigns.return_value = [
+            MagicMock(hashtag="#olas"),
+            MagicMock(hashtag="#OlasAgents"),
+        ]
+        params = self.skill.skill_context.params
+        query_max_length = params.twitter_search_query_max_length
+        # Only the two campaigns fit in a single query
+        params.twitter_search_query_max_length = 20
+
+        try:
+            self.fast_forward(
+                dict(
+                    most_voted_keeper_addresses=[
+                        "test_agent_address",
+                        "test_agent_address",
+                    ],
                 ),
+                get_mocked_agent_db(search_since_ids={"@autonolas": "5"}),
+            )
+            self.behaviour.act_wrapper()
+            mock_http_requests(
+                self,
                 {
-                    "request_urls": [],
+                    # The pages of every shard are fetched together
+                    "request_urls": [
+                        TWITTER_SEARCH_URL.format(
+                            query="olas%20OR%20OlasAgents", max_results=100, since_id=0
+                        ),
+                        TWITTER_MENTIONS_URL.format(max_results=100, since_id=6),
+                        TWITTER_SEARCH_URL.format(
+                            query="olas%20OR%20OlasAgents", max_results=100, since_id=0
+                        )
+                        + "&pagination_token=dummy_next_token",
+                    ],
+                    "response_bodies": [
+                        json.dumps(DUMMY_MENTIONS_RESPONSE_MULTIPAGE),
+                        json.dumps(DUMMY_MENTIONS_RESPONSE),
+                        json.dumps(DUMMY_REGISTRATIONS_RESPONSE_COUNT_ZERO),
+                    ],
+                    "status_codes": [200, 200, 200],
+                    "batch_sizes": [2, 1],
                 },
-            ),
-        ],
-        ids=["API daily limit reached", "15 minute window limit"],
-    )
-    def test_run(self, test_case: BehaviourTestCase, kwargs: Any) -> None:
-        """Run tests."""
-
-        self.fast_forward(test_case.initial_data, test_case.agent_db)
-        self.behaviour.act_wrapper()
-        for i in range(len(kwargs.get("request_urls"))):
-            self.mock_http_request(
-                request_kwargs=dict(
-                    method="GET",
-                    headers=kwargs.get("request_headers")[i],
-                    version="",
-                    url=kwargs.get("request_urls")[i],
-                ),
-                response_kwargs=dict(
-                    version="",
-                    status_code=kwargs.get("status_code"),
-                    status_text="",
-                    body=kwargs.get("response_bodies")[i].encode(),
-                    url=kwargs.get("response_urls")[i],
-                ),
             )
-        self.complete(test_case.event)
+            self.complete(Event.DONE)
+        finally:
+            params.twitter_search_query_max_length = query_max_length
+            module_index.get_campaigns.return_value = []
 
 
-class TestCampaignsCollectionBehaviour(BaseBehaviourTest):
-    """Tests BinanceObservationBehaviour"""
+class TestCollectionBehaviourResume(BaseBehaviourTest):
+    """Tests TwitterCollectionBehaviour resuming unfinished paginations"""
 
-    behaviour_class = TwitterCampaignsCollectionBehaviour
+    behaviour_class = TwitterCollectionBehaviour
     next_behaviour_class = TwitterDecisionMakingBehaviour
 
     @pytest.mark.parametrize(
@@ -639,127 +598,189 @@ class TestCampaignsCollectionBehaviour(BaseBehaviourTest):
         [
             (
                 BehaviourTestCase(
-                    "Happy path",
+                    "Resume pagination",
                     initial_data=dict(
                         most_voted_keeper_addresses=[
                             "test_agent_address",
                             "test_agent_address",
                         ],
                     ),
-                    event=Event.DONE,
-                    agent_db=get_mocked_agent_db(),
-                ),
-                {
-                    "request_urls": [
-                        TWITTER_SEARCH_URL.format(max_results=120),
-                    ],
-                    "request_headers": [
-                        "Authorization: Bearer <default_bearer_token>\r\n",
-                        "",
-                    ],
-                    "response_urls": [
-                        "",
-                    ],
-                    "response_bodies": [
-                        json.dumps(
-                            DUMMY_REGISTRATIONS_RESPONSE,
-                        ),
-                    ],
-                    "status_code": 200,
-                },
-            ),
-            (
-                BehaviourTestCase(
-                    "Happy path, multi-page",
-                    initial_data=dict(
-                        most_voted_keeper_addresses=[
-                            "test_agent_address",
-                            "test_agent_address",
+                    agent_db=get_mocked_agent_db(
+                        latest_mention_tweet_id=10,
+                        pagination_cursors=[
+                            TwitterPaginationCursor(
+                                query="@autonolas",
+                                since_id="0",
+                                until_id=str(RECENT_TWEET_ID),
+                                next_token="dummy_resume_token",
+                                query_args=TWITTER_RESUMED_ARGS,
+                                max_results=50,
+                            ),
+                            # Out of the search window
+                            TwitterPaginationCursor(
+                                query="@autonolas",
+                                since_id="0",
+                                until_id=str(OLD_TWEET_ID),
+                                next_token="dummy_old_token",
+                            ),
                         ],
                     ),
                     event=Event.DONE,
-                    agent_db=get_mocked_agent_db(),
                 ),
                 {
                     "request_urls": [
-                        TWITTER_SEARCH_URL.format(max_results=120),
-                        TWITTER_SEARCH_URL.format(max_results=120)
-                        + "&pagination_token=dummy_next_token",
+                        TWITTER_RESUMED_URL,
+                        TWITTER_MENTIONS_URL.format(max_results=100, since_id=11),
                     ],
-                    "request_headers": [
-                        "Authorization: Bearer <default_bearer_token>\r\n",
-                        "Authorization: Bearer <default_bearer_token>\r\n",
-                    ],
-                    "response_urls": ["", ""],
                     "response_bodies": [
-                        json.dumps(
-                            DUMMY_REGISTRATIONS_RESPONSE_MULTIPAGE,
-                        ),
-                        json.dumps(
-                            DUMMY_REGISTRATIONS_RESPONSE_MULTIPAGE_2,
-                        ),
+                        json.dumps(DUMMY_MENTIONS_RESPONSE),
+                        json.dumps(DUMMY_MENTIONS_RESPONSE),
                     ],
-                    "status_code": 200,
+                    "status_codes": [200, 200],
+                    "batch_sizes": [2],
                 },
             ),
             (
                 BehaviourTestCase(
-                    "Happy path, result_count=0",
+                    "Resume pagination, expired token",
                     initial_data=dict(
                         most_voted_keeper_addresses=[
                             "test_agent_address",
                             "test_agent_address",
                         ],
                     ),
+                    agent_db=get_mocked_agent_db(
+                        latest_mention_tweet_id=10,
+                        pagination_cursors=[
+                            TwitterPaginationCursor(
+                                query="@autonolas",
+                                since_id="0",
+                                until_id=str(RECENT_TWEET_ID),
+                                next_token="dummy_resume_token",
+                                query_args=TWITTER_RESUMED_ARGS,
+                                max_results=50,
+                            ),
+                        ],
+                    ),
                     event=Event.DONE,
-                    agent_db=get_mocked_agent_db(),
                 ),
                 {
                     "request_urls": [
-                        TWITTER_SEARCH_URL.format(max_results=120),
+                        TWITTER_RESUMED_URL,
+                        TWITTER_MENTIONS_URL.format(max_results=100, since_id=11),
+                        TWITTER_MENTIONS_URL.format(max_results=100, since_id=0)
+                        + f"&until_id={RECENT_TWEET_ID}",
                     ],
-                    "request_headers": [
-                        "Authorization: Bearer <default_bearer_token>\r\n",
-                    ],
-                    "response_urls": ["", ""],
                     "response_bodies": [
-                        json.dumps(
-                            DUMMY_REGISTRATIONS_RESPONSE_COUNT_ZERO,
-                        ),
+                        json.dumps({}),
+                        json.dumps(DUMMY_MENTIONS_RESPONSE),
+                        json.dumps(DUMMY_MENTIONS_RESPONSE),
                     ],
-                    "status_code": 200,
+                    "status_codes": [400, 200, 200],
+                    "batch_sizes": [2, 1],
                 },
             ),
         ],
-        ids=["Happy path", "Happy path, multi-page", "Happy path, result_count=0"],
+        ids=["Resume pagination", "Resume pagination, expired token"],
     )
     def test_run(self, test_case: BehaviourTestCase, kwargs: Any) -> None:
         """Run tests."""
         self.fast_forward(test_case.initial_data, test_case.agent_db)
         self.behaviour.act_wrapper()
-        for i in range(len(kwargs.get("request_urls"))):
-            self.mock_http_request(
-                request_kwargs=dict(
-                    method="GET",
-                    headers=kwargs.get("request_headers")[i],
-                    version="",
-                    url=kwargs.get("request_urls")[i],
+        mock_http_requests(self, kwargs)
+        self.complete(test_case.event)
+
+
+class TestCollectionBehaviourTokenPool(BaseBehaviourTest):
+    """Tests TwitterCollectionBehaviour with a pool of bearer tokens"""
+
+    behaviour_class = TwitterCollectionBehaviour
+    next_behaviour_class = TwitterDecisionMakingBehaviour
+
+    def test_run(self) -> None:
+        """Run tests."""
+        params = self.skill.skill_context.params
+        twitter_rate_limiter = params.twitter_rate_limiter
+        params.twitter_rate_limiter = TwitterRateLimiter(
+            bearer_tokens=["token_a", "token_b"]
+        )
+
+        try:
+            self.fast_forward(
+                dict(
+                    most_voted_keeper_addresses=[
+                        "test_agent_address",
+                        "test_agent_address",
+                    ],
                 ),
-                response_kwargs=dict(
-                    version="",
-                    status_code=kwargs.get("status_code"),
-                    status_text="",
-                    body=kwargs.get("response_bodies")[i].encode(),
-                    url=kwargs.get("response_urls")[i],
+                get_mocked_agent_db(
+                    latest_mention_tweet_id=10,
+                    pagination_cursors=[
+                        TwitterPaginationCursor(
+                            query="@autonolas",
+                            since_id="0",
+                            until_id=str(RECENT_TWEET_ID),
+                            next_token="dummy_resume_token",
+                            token_id=get_token_id("token_b"),
+                            query_args=TWITTER_RESUMED_ARGS,
+                            max_results=50,
+                        ),
+                    ],
                 ),
             )
-        self.complete(test_case.event)
+            self.behaviour.act_wrapper()
+            # The resumed pagination keeps its token while the new search uses the other one
+            mock_http_requests(
+                self,
+                {
+                    "request_urls": [
+                        TWITTER_RESUMED_URL,
+                        TWITTER_MENTIONS_URL.format(max_results=100, since_id=11),
+                    ],
+                    "bearer_tokens": ["token_b", "token_a"],
+                    "response_bodies": [
+                        json.dumps(DUMMY_MENTIONS_RESPONSE),
+                        json.dumps(DUMMY_MENTIONS_RESPONSE),
+                    ],
+                    "status_codes": [200, 200],
+                    "batch_sizes": [2],
+                },
+            )
+            self.complete(Event.DONE)
+            assert params.twitter_rate_limiter.get_usage(
+                params.twitter_search_endpoint, 0
+            ) == {
+                get_token_id("token_a"): {
+                    "requests": 1,
+                    "tweets": 4,
+                    "remaining": None,
+                },
+                get_token_id("token_b"): {
+                    "requests": 1,
+                    "tweets": 4,
+                    "remaining": None,
+                },
+            }
+        finally:
+            params.twitter_rate_limiter = twitter_rate_limiter
+
+
+def test_build_query_shards() -> None:
+    """Test build_query_shards"""
+    assert build_query_shards([], 20) == []
+    assert build_query_shards(["@autonolas", "olas"], 20) == [["@autonolas", "olas"]]
+    assert build_query_shards(["@autonolas", "olas", "OlasAgents"], 20) == [
+        ["@autonolas", "olas"],
+        ["OlasAgents"],
+    ]
+    # Terms longer than the limit get their own shard
+    assert build_query_shards(["a" * 30, "olas"], 20) == [["a" * 30], ["olas"]]
 
 
-class TestCampaignsCollectionBehaviourSerial(BaseBehaviourTest):
-    """TestCampaignsCollectionBehaviourSerial"""
+class TestCollectionBehaviourSerial(BaseBehaviourTest):
+    """Tests TwitterCollectionBehaviour"""
 
-    behaviour_class = TwitterCampaignsCollectionBehaviour
+    behaviour_class = TwitterCollectionBehaviour
     next_behaviour_class = TwitterDecisionMakingBehaviour
 
     @pytest.mark.parametrize(
@@ -781,186 +802,155 @@ class TestCampaignsCollectionBehaviourSerial(BaseBehaviourTest):
                     "request_urls": [],
                 },
             ),
+            (
+                BehaviourTestCase(
+                    "15 minute window limit",
+                    initial_data=dict(
+                        most_voted_keeper_addresses=[
+                            "test_agent_address",
+                            "test_agent_address",
+                        ],
+                        sleep_until=datetime.now().timestamp() + 200.00,
+                    ),
+                    event=Event.DONE,
+                    agent_db=get_mocked_agent_db(number_of_tweets_pulled_today=10000),
+                ),
+                {
+                    "request_urls": [],
+                },
+            ),
         ],
-        ids=["API daily limit reached"],
+        ids=["API daily limit reached", "15 minute window limit"],
     )
     def test_run(self, test_case: BehaviourTestCase, kwargs: Any) -> None:
         """Run tests."""
+
         self.fast_forward(test_case.initial_data, test_case.agent_db)
         self.behaviour.act_wrapper()
-        for i in range(len(kwargs.get("request_urls"))):
-            self.mock_http_request(
-                request_kwargs=dict(
-                    method="GET",
-                    headers=kwargs.get("request_headers")[i],
-                    version="",
-                    url=kwargs.get("request_urls")[i],
-                ),
-                response_kwargs=dict(
-                    version="",
-                    status_code=kwargs.get("status_code"),
-                    status_text="",
-                    body=kwargs.get("response_bodies")[i].encode(),
-                    url=kwargs.get("response_urls")[i],
-                ),
-            )
+        mock_http_requests(self, kwargs)
         self.complete(test_case.event)
 
 
-class TestMentionsCollectionBehaviourAPIError(BaseBehaviourTest):
-    """Tests BinanceObservationBehaviour"""
+class TestCollectionBehaviourRateLimiter(BaseBehaviourTest):
+    """Tests TwitterCollectionBehaviour"""
 
-    behaviour_class = TwitterMentionsCollectionBehaviour
-    next_behaviour_class = TwitterMentionsCollectionBehaviour
+    behaviour_class = TwitterCollectionBehaviour
+    next_behaviour_class = TwitterDecisionMakingBehaviour
 
     @pytest.mark.parametrize(
         "test_case, kwargs",
         [
             (
                 BehaviourTestCase(
-                    "API error mentions: 404",
+                    "Monthly read cap reached",
                     initial_data=dict(
                         most_voted_keeper_addresses=[
                             "test_agent_address",
                             "test_agent_address",
                         ],
                     ),
-                    event=Event.API_ERROR,
-                    agent_db=get_mocked_agent_db(),
-                ),
-                {
-                    "urls": [TWITTER_MENTIONS_URL.format(max_results=100)],
-                    "bodies": [
-                        json.dumps(
-                            DUMMY_MENTIONS_RESPONSE,
+                    event=Event.DONE,
+                    agent_db=get_mocked_agent_db(
+                        number_of_tweets_pulled_this_month=15000,
+                        last_tweet_pull_month_reset=get_month_start(
+                            datetime.now().timestamp()
                         ),
-                        json.dumps(DUMMY_CAMPAIGNS_RESPONSE),
-                    ],
-                    "headers": [""],
-                    "status_codes": [404],
-                },
-            ),
-            (
-                BehaviourTestCase(
-                    "API error mentions: missing data",
-                    initial_data=dict(
-                        most_voted_keeper_addresses=[
-                            "test_agent_address",
-                            "test_agent_address",
-                        ],
                     ),
-                    event=Event.API_ERROR,
-                    agent_db=get_mocked_agent_db(),
                 ),
                 {
-                    "urls": [TWITTER_MENTIONS_URL.format(max_results=100)],
-                    "bodies": [
-                        json.dumps(
-                            DUMMY_MENTIONS_RESPONSE_MISSING_DATA,
-                        ),
-                        json.dumps(DUMMY_CAMPAIGNS_RESPONSE),
-                    ],
-                    "status_codes": [200],
+                    "request_urls": [],
                 },
             ),
             (
                 BehaviourTestCase(
-                    "API error mentions: missing meta",
+                    "Request window almost exhausted",
                     initial_data=dict(
                         most_voted_keeper_addresses=[
                             "test_agent_address",
                             "test_agent_address",
                         ],
                     ),
-                    event=Event.API_ERROR,
-                    agent_db=get_mocked_agent_db(),
+                    event=Event.DONE,
+                    agent_db=get_mocked_agent_db(latest_mention_tweet_id=1),
                 ),
                 {
-                    "urls": [TWITTER_MENTIONS_URL.format(max_results=100)],
-                    "bodies": [
-                        json.dumps(
-                            DUMMY_MENTIONS_RESPONSE_MISSING_META,
-                        ),
-                        json.dumps(DUMMY_CAMPAIGNS_RESPONSE),
+                    "request_urls": [
+                        TWITTER_MENTIONS_URL.format(max_results=100, since_id=2),
                     ],
-                    "status_codes": [200],
-                },
-            ),
-            (
-                BehaviourTestCase(
-                    "API error mentions: missing includes",
-                    initial_data=dict(
-                        most_voted_keeper_addresses=[
-                            "test_agent_address",
-                            "test_agent_address",
-                        ],
-                    ),
-                    event=Event.API_ERROR,
-                    agent_db=get_mocked_agent_db(),
-                ),
-                {
-                    "urls": [TWITTER_MENTIONS_URL.format(max_results=100)],
-                    "bodies": [
-                        json.dumps(
-                            DUMMY_MENTIONS_RESPONSE_MISSING_INCLUDES,
-                        ),
-                        json.dumps({}),
+                    "response_bodies": [
+                        json.dumps(DUMMY_MENTIONS_RESPONSE_MULTIPAGE),
+                    ],
+                    "response_headers": [
+                        "x-rate-limit-limit: 450\r\nx-rate-limit-remaining: 1\r\n"
+                        f"x-rate-limit-reset: {int(datetime.now().timestamp()) + 900}\r\n"
                     ],
                     "status_codes": [200],
                 },
             ),
         ],
-        ids=[
-            "API error mentions: 404",
-            "API error mentions: missing data",
-            "API error mentions: missing meta",
-            "API error mentions: missing includes",
-        ],
+        ids=["Monthly read cap reached", "Request window almost exhausted"],
     )
     def test_run(self, test_case: BehaviourTestCase, kwargs: Any) -> None:
         """Run tests."""
-        self.fast_forward(test_case.initial_data, agent_db=test_case.agent_db)
+
+        self.fast_forward(test_case.initial_data, test_case.agent_db)
         self.behaviour.act_wrapper()
-        for i in range(len(kwargs.get("urls"))):
-            self.mock_http_request(
-                request_kwargs=dict(
-                    method="GET",
-                    headers="Authorization: Bearer <default_bearer_token>\r\n",
-                    version="",
-                    url=kwargs.get("urls")[i],
-                ),
-                response_kwargs=dict(
-                    version="",
-                    status_code=kwargs.get("status_codes")[i],
-                    status_text="",
-                    body=kwargs.get("bodies")[i].encode(),
-                    headers=kwargs.get("headers", [""])[i],
-                ),
-            )
+        mock_http_requests(self, kwargs)
         self.complete(test_case.event)
 
-    def test_not_sender(self):
-        """Test the not sender act."""
-
-        assert not self.fast_forward(
-            {"most_voted_keeper_addresses": ["not_my_address", "not_my_address"]}
-        )
-        self.behaviour.act_wrapper()
-        self._test_done_flag_set()
 
+class TestCollectionBehaviourNearDuplicates(BaseBehaviourTest):
+    """Tests the near-duplicate detection of TwitterCollectionBehaviour"""
 
-class TestCampaignsCollectionBehaviourAPIError(BaseBehaviourTest):
-    """Tests BinanceObservationBehaviour"""
+    behaviour_class = TwitterCollectionBehaviour
 
-    behaviour_class = TwitterCampaignsCollectionBehaviour
-    next_behaviour_class = TwitterCampaignsCollectionBehaviour
+    def test_mark_near_duplicates(self) -> None:
+        """Test that near-duplicates of recent tweets by the same author are marked"""
+        now = datetime.now().timestamp()
+        promo = (
+            "Join the Olas agent economy today and earn rewards with your AI agents!"
+        )
+        recent_signatures = {
+            "10": TweetSignature(
+                author_id="1", simhash=f"{get_simhash(promo):016x}", timestamp=now
+            )
+        }
+        self.fast_forward({}, get_mocked_agent_db(recent_signatures=recent_signatures))
+        tweets = {
+            "1": {"text": f"{promo} #olas", "author_id": "1"},
+            "2": {"text": promo, "author_id": "2"},
+            "3": {"text": f"{promo}!!", "author_id": "2"},
+            "4": {
+                "text": "Today I deployed my first prediction agent with Olas Pearl",
+                "author_id": "1",
+            },
+        }
+
+        behaviour = cast(TwitterCollectionBehaviour, self.behaviour.current_behaviour)
+        # pylint: disable=protected-access
+        signatures = behaviour._mark_near_duplicates(tweets, now)
+
+        assert tweets["1"]["near_duplicate_of"] == "10"
+        # Tweets of this period are compared too, but only with their author's
+        assert tweets["3"]["near_duplicate_of"] == "2"
+        assert "near_duplicate_of" not in tweets["2"]
+        assert "near_duplicate_of" not in tweets["4"]
+        assert sorted(signatures) == ["2", "4"]
+        assert signatures["2"]["simhash"] == f"{get_simhash(promo):016x}"
+
+
+class TestCollectionBehaviourAPIError(BaseBehaviourTest):
+    """Tests TwitterCollectionBehaviour"""
+
+    behaviour_class = TwitterCollectionBehaviour
+    next_behaviour_class = TwitterCollectionBehaviour
 
     @pytest.mark.parametrize(
         "test_case, kwargs",
         [
             (
                 BehaviourTestCase(
-                    "API error registrations: 404",
+                    "API error: 404",
                     initial_data=dict(
                         most_voted_keeper_addresses=[
                             "test_agent_address",
@@ -971,19 +961,20 @@ class TestCampaignsCollectionBehaviourAPIError(BaseBehaviourTest):
                     agent_db=get_mocked_agent_db(),
                 ),
                 {
-                    "urls": [
-                        TWITTER_SEARCH_URL.format(max_results=120),
+                    "request_urls": [
+                        TWITTER_MENTIONS_URL.format(max_results=100, since_id=0)
                     ],
-                    "bodies": [
-                        json.dumps(DUMMY_CAMPAIGNS_RESPONSE),
+                    "response_bodies": [
+                        json.dumps(
+                            DUMMY_MENTIONS_RESPONSE,
+                        ),
                     ],
-                    "headers": [""],
                     "status_codes": [404],
                 },
             ),
             (
                 BehaviourTestCase(
-                    "API error registrations: missing data",
+                    "API error: missing data",
                     initial_data=dict(
                         most_voted_keeper_addresses=[
                             "test_agent_address",
@@ -994,12 +985,12 @@ class TestCampaignsCollectionBehaviourAPIError(BaseBehaviourTest):
                     agent_db=get_mocked_agent_db(),
                 ),
                 {
-                    "urls": [
-                        TWITTER_SEARCH_URL.format(max_results=120),
+                    "request_urls": [
+                        TWITTER_MENTIONS_URL.format(max_results=100, since_id=0)
                     ],
-                    "bodies": [
+                    "response_bodies": [
                         json.dumps(
-                            DUMMY_REGISTRATIONS_RESPONSE_MISSING_DATA,
+                            DUMMY_MENTIONS_RESPONSE_MISSING_DATA,
                         ),
                     ],
                     "status_codes": [200],
@@ -1007,7 +998,7 @@ class TestCampaignsCollectionBehaviourAPIError(BaseBehaviourTest):
             ),
             (
                 BehaviourTestCase(
-                    "API error registrations: missing meta",
+                    "API error: missing meta",
                     initial_data=dict(
                         most_voted_keeper_addresses=[
                             "test_agent_address",
@@ -1018,18 +1009,20 @@ class TestCampaignsCollectionBehaviourAPIError(BaseBehaviourTest):
                     agent_db=get_mocked_agent_db(),
                 ),
                 {
-                    "urls": [
-                        TWITTER_SEARCH_URL.format(max_results=120),
+                    "request_urls": [
+                        TWITTER_MENTIONS_URL.format(max_results=100, since_id=0)
                     ],
-                    "bodies": [
-                        json.dumps(DUMMY_REGISTRATIONS_RESPONSE_MISSING_META),
+                    "response_bodies": [
+                        json.dumps(
+                            DUMMY_MENTIONS_RESPONSE_MISSING_META,
+                        ),
                     ],
                     "status_codes": [200],
                 },
             ),
             (
                 BehaviourTestCase(
-                    "API error mentions: missing includes",
+                    "API error: missing includes",
                     initial_data=dict(
                         most_voted_keeper_addresses=[
                             "test_agent_address",
@@ -1040,46 +1033,41 @@ class TestCampaignsCollectionBehaviourAPIError(BaseBehaviourTest):
                     agent_db=get_mocked_agent_db(),
                 ),
                 {
-                    "urls": [TWITTER_SEARCH_URL.format(max_results=120)],
-                    "bodies": [
+                    "request_urls": [
+                        TWITTER_MENTIONS_URL.format(max_results=100, since_id=0)
+                    ],
+                    "response_bodies": [
                         json.dumps(
-                            DUMMY_REGISTRATIONS_RESPONSE_MISSING_INCLUDES,
+                            DUMMY_MENTIONS_RESPONSE_MISSING_INCLUDES,
                         ),
-                        json.dumps({}),
                     ],
                     "status_codes": [200],
                 },
             ),
         ],
         ids=[
-            "API error registrations: 404",
-            "API error registrations: missing data",
-            "API error registrations: missing meta",
-            "API error registrations: missing includes",
+            "API error: 404",
+            "API error: missing data",
+            "API error: missing meta",
+            "API error: missing includes",
         ],
     )
     def test_run(self, test_case: BehaviourTestCase, kwargs: Any) -> None:
         """Run tests."""
-        self.fast_forward(test_case.initial_data, test_case.agent_db)
+        self.fast_forward(test_case.initial_data, agent_db=test_case.agent_db)
         self.behaviour.act_wrapper()
-        for i in range(len(kwargs.get("urls"))):
-            self.mock_http_request(
-                request_kwargs=dict(
-                    method="GET",
-                    headers="Authorization: Bearer <default_bearer_token>\r\n",
-                    version="",
-                    url=kwargs.get("urls")[i],
-                ),
-                response_kwargs=dict(
-                    version="",
-                    status_code=kwargs.get("status_codes")[i],
-                    status_text="",
-                    body=kwargs.get("bodies")[i].encode(),
-                    headers=kwargs.get("headers", [""])[i],
-                ),
-            )
+        mock_http_requests(self, kwargs)
         self.complete(test_case.event)
 
+    def test_not_sender(self):
+        """Test the not sender act."""
+
+        assert not self.fast_forward(
+            {"most_voted_keeper_addresses": ["not_my_address", "not_my_address"]}
+        )
+        self.behaviour.act_wrapper()
+        self._test_done_flag_set()
+
 
 class TestTwitterDecisionMakingBehaviour(BaseBehaviourTest):
     """Tests BinanceObservationBehaviour"""
@@ -1101,22 +1089,9 @@ class TestTwitterDecisionMakingBehaviour(BaseBehaviourTest):
                 BehaviourTestCase(
                     "Happy path",
                     initial_data=dict(performed_twitter_tasks={"select_keepers": None}),
-                    event=Event.RETRIEVE_CAMPAIGNS,
-                ),
-                TwitterCampaignsCollectionBehaviour,
-            ),
-            (
-                BehaviourTestCase(
-                    "Happy path",
-                    initial_data=dict(
-                        performed_twitter_tasks={
-                            "select_keepers": None,
-                            "retrieve_campaigns": None,
-                        }
-                    ),
-                    event=Event.RETRIEVE_MENTIONS,
+                    event=Event.RETRIEVE_TWEETS,
                 ),
-                TwitterMentionsCollectionBehaviour,
+                TwitterCollectionBehaviour,
             ),
             (
                 BehaviourTestCase(
@@ -1124,8 +1099,7 @@ class TestTwitterDecisionMakingBehaviour(BaseBehaviourTest):
                     initial_data=dict(
                         performed_twitter_tasks={
                             "select_keepers": None,
-                            "retrieve_campaigns": None,
-                            "retrieve_mentions": None,
+                            "retrieve_tweets": None,
                         }
                     ),
                     event=Event.PRE_MECH,
@@ -1138,8 +1112,7 @@ class TestTwitterDecisionMakingBehaviour(BaseBehaviourTest):
                     initial_data=dict(
                         performed_twitter_tasks={
                             "select_keepers": None,
-                            "retrieve_campaigns": None,
-                            "retrieve_mentions": None,
+                            "retrieve_tweets": None,
                             "pre_mech": None,
                         }
                     ),
@@ -1153,8 +1126,7 @@ class TestTwitterDecisionMakingBehaviour(BaseBehaviourTest):
                     initial_data=dict(
                         performed_twitter_tasks={
                             "select_keepers": None,
-                            "retrieve_campaigns": None,
-                            "retrieve_mentions": None,
+                            "retrieve_tweets": None,
                             "pre_mech": None,
                             "post_mech": None,
                         }
@@ -1169,8 +1141,7 @@ class TestTwitterDecisionMakingBehaviour(BaseBehaviourTest):
                     initial_data=dict(
                         performed_twitter_tasks={
                             "select_keepers": None,
-                            "retrieve_campaigns": None,
-                            "retrieve_mentions": None,
+                            "retrieve_tweets": None,
                             "pre_mech": None,
                             "post_mech": None,
                             "db_update": None,
@@ -1190,6 +1161,110 @@ class TestTwitterDecisionMakingBehaviour(BaseBehaviourTest):
         self.complete(test_case.event)
 
 
+class TestPreMechRequestBehaviour(BaseBehaviourTest):
+    """Tests PreMechRequestBehaviour"""
+
+    behaviour_class = PreMechRequestBehaviour
+
+    def get_payload_content(
+        self, tweets: Dict[str, Dict], agent_db: Any, batch_size: int = 1
+    ) -> Dict:
+        """Run the behaviour until it sends its payload and get the payload content"""
+        self.fast_forward(dict(tweets=tweets), agent_db)
+        with (
+            patch.object(
+                self.skill.skill_context.params,
+                "tweet_evaluation_batch_size",
+                batch_size,
+            ),
+            patch.object(
+                behaviours,
+                "PreMechRequestPayload",
+                wraps=behaviours.PreMechRequestPayload,
+            ) as payload_class,
+        ):
+            self.behaviour.act_wrapper()
+        return json.loads(payload_class.call_args.kwargs["content"])
+
+    def test_batches(self) -> None:
+        """Test that the tweets to evaluate are sent in batches of tweet_evaluation_batch_size"""
+        tweets = {
+            "1": {"text": "first tweet about Olas"},
+            "2": {"text": "second tweet about Olas"},
+            "3": {"text": "third tweet about Olas"},
+        }
+        content = self.get_payload_content(tweets, get_mocked_agent_db(), batch_size=2)
+
+        requests = content["new_mech_requests"]
+        assert [request["nonce"] for request in requests] == ["1,2", "3"]
+        assert requests[0]["prompt"] == PreMechRequestBehaviour.get_evaluation_prompt(
+            ["1", "2"], tweets
+        )
+        assert requests[1]["prompt"] == PreMechRequestBehaviour.get_evaluation_prompt(
+            ["3"], tweets
+        )
+
+    def test_evaluation_cache(self) -> None:
+        """Test that cached texts are scored without a request, and duplicated texts are requested once"""
+        evaluation_cache = {
+            get_tweet_text_hash("Olas agents are great"): TweetEvaluation(
+                quality="HIGH",
+                relationship="HIGH",
+                timestamp=datetime.now().timestamp(),
+            ),
+            get_tweet_text_hash("An expired evaluation"): TweetEvaluation(
+                quality="HIGH", relationship="HIGH", timestamp=0
+            ),
+        }
+        tweets = {
+            "1": {"text": "olas agents are GREAT @autonolas"},
+            "2": {"text": "An expired evaluation"},
+            "3": {"text": "an expired evaluation #olas"},
+        }
+        content = self.get_payload_content(
+            tweets, get_mocked_agent_db(evaluation_cache=evaluation_cache)
+        )
+
+        assert content["tweets"]["1"]["points"] == 700
+        assert "points" not in content["tweets"]["2"]
+        assert [request["nonce"] for request in content["new_mech_requests"]] == ["2"]
+
+    def test_near_duplicates(self) -> None:
+        """Test that near-duplicates get their original's points and are never requested"""
+        agent_db = get_mocked_agent_db()
+        agent_db.tweets = {"10": MagicMock(points=500)}
+        tweets = {
+            "1": {"text": "a scored original", "points": 700},
+            "2": {"text": "a scored original!", "near_duplicate_of": "1"},
+            "3": {"text": "a pending original"},
+            "4": {"text": "a pending original!", "near_duplicate_of": "3"},
+            "5": {"text": "a stored original", "near_duplicate_of": "10"},
+            "6": {"text": "an unknown original", "near_duplicate_of": "11"},
+        }
+        content = self.get_payload_content(tweets, agent_db)
+
+        assert content["tweets"]["2"]["points"] == 700
+        # Near-duplicates of pending tweets wait for their original's evaluation
+        assert "points" not in content["tweets"]["4"]
+        assert content["tweets"]["5"]["points"] == 500
+        assert content["tweets"]["6"]["points"] == 0
+        assert [request["nonce"] for request in content["new_mech_requests"]] == ["3"]
+
+
+def test_get_evaluation_prompt() -> None:
+    """Test get_evaluation_prompt"""
+    tweets = {"1": {"text": "first tweet"}, "2": {"text": "second tweet"}}
+    single_prompt = PreMechRequestBehaviour.get_evaluation_prompt(["1"], tweets)
+    assert "first tweet" in single_prompt
+    assert "second tweet" not in single_prompt
+
+    batch_prompt = PreMechRequestBehaviour.get_evaluation_prompt(["1", "2"], tweets)
+    assert '"id": "1"' in batch_prompt
+    assert '"id": "2"' in batch_prompt
+    assert "second tweet" in batch_prompt
+    assert "{user_texts}" not in batch_prompt
+
+
 @pytest.fixture(scope="class")
 def add_mech_responses_to_cross_period(request):
     """Fixture which adds the mech responses to the `cross_period_persisted_keys` of the abci app."""
@@ -1224,6 +1299,50 @@ class TestPostMechRequestBehaviour(BaseBehaviourTest):
                 ),
                 {},
             ),
+            (
+                BehaviourTestCase(
+                    "Duplicate tweets share the evaluation",
+                    initial_data=dict(
+                        tweets={
+                            "1": {"text": "Olas agents @autonolas https://t.co/a"},
+                            "2": {"text": "olas  agents #olas https://t.co/b"},
+                        },
+                        mech_responses=json.dumps(
+                            [
+                                MechInteractionResponse(
+                                    nonce="1",
+                                    result='{"quality":"HIGH","relationship":"HIGH"}',
+                                )
+                            ],
+                            cls=DataclassEncoder,
+                        ),
+                    ),
+                    event=Event.DONE,
+                ),
+                {},
+            ),
+            (
+                BehaviourTestCase(
+                    "Batch with a missing evaluation",
+                    initial_data=dict(
+                        tweets={
+                            "1": {"text": "dummy text"},
+                            "2": {"text": "dummy text"},
+                        },
+                        mech_responses=json.dumps(
+                            [
+                                MechInteractionResponse(
+                                    nonce="1,2",
+                                    result='[{"id":"1","quality":"HIGH","relationship":"HIGH"}]',
+                                )
+                            ],
+                            cls=DataclassEncoder,
+                        ),
+                    ),
+                    event=Event.DONE,
+                ),
+                {},
+            ),
         ],
     )
     def test_run(self, test_case: BehaviourTestCase, kwargs: Any) -> None:
@@ -1241,6 +1360,62 @@ class TestPostMechRequestBehaviour(BaseBehaviourTest):
         self.complete(Event.DONE)
 
 
+def test_parse_evaluation() -> None:
+    """Test parse_evaluation and get_batch_evaluations"""
+    assert parse_evaluation('Result: {"quality": "LOW", "relationship": "HIGH"}') == {
+        "quality": "LOW",
+        "relationship": "HIGH",
+    }
+    # Single evaluations are parsed as an object even after a bracket
+    assert parse_evaluation(
+        '[Evaluation] {"quality": "LOW", "relationship": "HIGH"}'
+    ) == {"quality": "LOW", "relationship": "HIGH"}
+    batch_result = '```json\n[{"id": "1", "quality": "LOW", "relationship": "HIGH"}, {"id": 2}, "invalid"]\n```'
+    assert get_batch_evaluations(batch_result) == {
+        "1": {"id": "1", "quality": "LOW", "relationship": "HIGH"},
+        "2": {"id": 2},
+    }
+    with pytest.raises(ValueError):
+        get_batch_evaluations('{"quality": "LOW", "relationship": "HIGH"}')
+
+
+def test_normalize_tweet_text() -> None:
+    """Test normalize_tweet_text and get_tweet_text_hash"""
+    assert (
+        normalize_tweet_text("Check  #Olas by @autonolas:\nhttps://t.co/a1 now!")
+        == "check by : now!"
+    )
+    assert get_tweet_text_hash("Olas agents @autonolas") == get_tweet_text_hash(
+        "olas agents https://t.co/b #olas"
+    )
+    assert get_tweet_text_hash("Olas agents") != get_tweet_text_hash("Olas agent")
+
+
+def test_get_simhash() -> None:
+    """Test get_simhash and get_hamming_distance"""
+    promo = "Join the Olas agent economy today and earn rewards with your AI agents! @autonolas https://t.co/a"
+    assert get_simhash(promo) == get_simhash(
+        "join the Olas agent economy today and earn rewards with your AI agents!! #olas"
+    )
+    assert (
+        get_hamming_distance(
+            get_simhash(promo),
+            get_simhash(
+                "Join the Olas agent economy now and earn rewards with your AI agents!"
+            ),
+        )
+        <= 10
+    )
+    assert (
+        get_hamming_distance(
+            get_simhash(promo),
+            get_simhash("Today I deployed my first prediction agent with Olas Pearl"),
+        )
+        > 10
+    )
+    assert get_hamming_distance(0b1011, 0b0110) == 3
+
+
 class TestDBUpdateBehaviour(BaseBehaviourTest):
     """Tests DBUpdateBehaviour"""
 
@@ -1325,6 +1500,37 @@ class TestDBUpdateBehaviour(BaseBehaviourTest):
 
         self.complete(test_case.event)
 
+    def test_update_module_cache(self) -> None:
+        """Test that the new evaluations are stored in the module cache, without the expired ones"""
+        now = datetime.now().timestamp()
+        evaluation = TweetEvaluation(quality="HIGH", relationship="LOW", timestamp=now)
+        expired = TweetEvaluation(quality="LOW", relationship="LOW", timestamp=0)
+        agent_db = get_mocked_agent_db()
+        agent_db.module_cache = None
+        self.fast_forward(
+            dict(
+                evaluation_cache_updates={
+                    "new": evaluation.model_dump(),
+                    "expired": expired.model_dump(),
+                }
+            ),
+            agent_db,
+        )
+        contribute_db = self.skill.skill_context.contribute_db
+        contribute_db.create_module_cache.reset_mock()
+        contribute_db.update_module_cache.reset_mock()
+
+        list(self.behaviour.current_behaviour.update_module_cache())
+        module_cache = contribute_db.create_module_cache.call_args.args[0]
+        assert module_cache.evaluation_cache == {"new": evaluation}
+        assert module_cache.recent_signatures == {}
+
+        # An unchanged cache is not written again
+        agent_db.module_cache = module_cache
+        list(self.behaviour.current_behaviour.update_module_cache())
+        contribute_db.create_module_cache.assert_called_once()
+        contribute_db.update_module_cache.assert_not_called()
+
 
 class TestRandomnessBehaviour(BaseRandomnessBehaviourTest):
     """Test randomness in operation."""
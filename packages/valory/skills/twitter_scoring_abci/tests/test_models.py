@@ -33,6 +33,17 @@ from packages.valory.skills.twitter_scoring_abci.models import (
     SharedState,
 )
 
+# Params without a default in the skill
+DUMMY_PARAMS = {
+    **BASE_DUMMY_PARAMS,
+    "tweet_evaluation_batch_size": 1,
+    "tweet_evaluation_cache_ttl": 604800,
+    "tweet_evaluation_cache_max_size": 2000,
+    "near_duplicate_max_distance": 10,
+    "near_duplicate_window": 604800,
+    "near_duplicate_max_signatures": 5000,
+}
+
 
 class TestSharedState:
     """Test SharedState of ScoreRead."""
@@ -102,4 +113,4 @@ class TestParams:
 
     def test_initialization(self) -> None:
         """Test initialization."""
-        Params(**BASE_DUMMY_PARAMS)
+        Params(**DUMMY_PARAMS)
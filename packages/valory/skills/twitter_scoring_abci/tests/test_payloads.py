@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 # ------------------------------------------------------------------------------
 #
-#   Copyright 2023-2025 Valory AG
+#   Copyright 2023-2026 Valory AG
 #
 #   Licensed under the Apache License, Version 2.0 (the "License");
 #   you may not use this file except in compliance with the License.
@@ -28,9 +28,8 @@ from packages.valory.skills.abstract_round_abci.base import BaseTxPayload
 from packages.valory.skills.twitter_scoring_abci.payloads import (
     DBUpdatePayload,
     PreMechRequestPayload,
-    TwitterCampaignsCollectionPayload,
+    TwitterCollectionPayload,
     TwitterDecisionMakingPayload,
-    TwitterMentionsCollectionPayload,
     TwitterRandomnessPayload,
     TwitterSelectKeepersPayload,
 )
@@ -48,11 +47,7 @@ class PayloadTestCase:
     "test_case",
     [
         PayloadTestCase(
-            payload_cls=TwitterMentionsCollectionPayload,
-            content="payload_test_content",
-        ),
-        PayloadTestCase(
-            payload_cls=TwitterCampaignsCollectionPayload,
+            payload_cls=TwitterCollectionPayload,
             content="payload_test_content",
         ),
         PayloadTestCase(
@@ -48,9 +48,8 @@ from packages.valory.skills.abstract_round_abci.test_tools.rounds import (
 from packages.valory.skills.twitter_scoring_abci.payloads import (
     DBUpdatePayload,
     PreMechRequestPayload,
-    TwitterCampaignsCollectionPayload,
+    TwitterCollectionPayload,
     TwitterDecisionMakingPayload,
-    TwitterMentionsCollectionPayload,
     TwitterRandomnessPayload,
     TwitterSelectKeepersPayload,
 )
@@ -59,9 +58,8 @@ from packages.valory.skills.twitter_scoring_abci.rounds import (
     Event,
     PreMechRequestRound,
     SynchronizedData,
-    TwitterCampaignsCollectionRound,
+    TwitterCollectionRound,
     TwitterDecisionMakingRound,
-    TwitterMentionsCollectionRound,
     TwitterRandomnessRound,
     TwitterSelectKeepersRound,
 )
@@ -101,32 +99,22 @@ def get_payloads(
     }
 
 
-def get_dummy_mentions_collection_payload_serialized(api_error: bool = False) -> str:
+def get_dummy_collection_payload_serialized(api_error: bool = False) -> str:
     """Dummy twitter observation payload"""
     if api_error:
         return json.dumps({"error": "generic", "sleep_until": None})
     return json.dumps(
         {
             "tweets": {"my_tweet": {}},
+            "search_since_ids": {"@autonolas": "1", "olas": "1"},
+            "pagination_cursors": [],
+            "tweet_signatures": {},
             "latest_mention_tweet_id": 1,
-            "number_of_tweets_pulled_today": 0,
-            "last_tweet_pull_window_reset": 0,
-            "sleep_until": None,
-        },
-        sort_keys=True,
-    )
-
-
-def get_dummy_campaigns_collection_payload_serialized(api_error: bool = False) -> str:
-    """Dummy twitter observation payload"""
-    if api_error:
-        return json.dumps({"error": "generic", "sleep_until": None})
-    return json.dumps(
-        {
-            "tweets": {"my_tweet": {}},
             "latest_campaign_tweet_id": 1,
             "number_of_tweets_pulled_today": 0,
             "last_tweet_pull_window_reset": 0,
+            "number_of_tweets_pulled_this_month": 0,
+            "last_tweet_pull_month_reset": 0,
             "sleep_until": None,
         },
         sort_keys=True,
@@ -166,10 +154,10 @@ class BaseTwitterScoringRoundTest(BaseCollectSameUntilThresholdRoundTest):
         )
 
 
-class TestMentionsCollectionRound(BaseTwitterScoringRoundTest):
-    """Tests for TwitterMentionsCollectionRound."""
+class TestCollectionRound(BaseTwitterScoringRoundTest):
+    """Tests for TwitterCollectionRound."""
 
-    round_class = TwitterMentionsCollectionRound
+    round_class = TwitterCollectionRound
 
     @pytest.mark.parametrize(
         "test_case",
@@ -178,16 +166,19 @@ class TestMentionsCollectionRound(BaseTwitterScoringRoundTest):
                 name="Happy path",
                 initial_data={},
                 payloads=get_payloads(
-                    payload_cls=TwitterMentionsCollectionPayload,
-                    data=get_dummy_mentions_collection_payload_serialized(),
+                    payload_cls=TwitterCollectionPayload,
+                    data=get_dummy_collection_payload_serialized(),
                 ),
                 final_data={
-                    "tweets": json.loads(
-                        get_dummy_mentions_collection_payload_serialized()
-                    )["tweets"],
+                    "tweets": json.loads(get_dummy_collection_payload_serialized())[
+                        "tweets"
+                    ],
+                    "search_since_ids": json.loads(
+                        get_dummy_collection_payload_serialized()
+                    )["search_since_ids"],
                 },
                 event=Event.DONE,
-                most_voted_payload=get_dummy_mentions_collection_payload_serialized(),
+                most_voted_payload=get_dummy_collection_payload_serialized(),
                 synchronized_data_attr_checks=[],
                 ceramic_db={
                     "module_data": {
@@ -202,14 +193,12 @@ class TestMentionsCollectionRound(BaseTwitterScoringRoundTest):
                 name="API error",
                 initial_data={},
                 payloads=get_payloads(
-                    payload_cls=TwitterMentionsCollectionPayload,
-                    data=get_dummy_mentions_collection_payload_serialized(
-                        api_error=True
-                    ),
+                    payload_cls=TwitterCollectionPayload,
+                    data=get_dummy_collection_payload_serialized(api_error=True),
                 ),
                 final_data={},
                 event=Event.API_ERROR,
-                most_voted_payload=get_dummy_mentions_collection_payload_serialized(
+                most_voted_payload=get_dummy_collection_payload_serialized(
                     api_error=True
                 ),
                 synchronized_data_attr_checks=[],
@@ -220,14 +209,12 @@ class TestMentionsCollectionRound(BaseTwitterScoringRoundTest):
                     "api_retries": 1,
                 },
                 payloads=get_payloads(
-                    payload_cls=TwitterMentionsCollectionPayload,
-                    data=get_dummy_mentions_collection_payload_serialized(
-                        api_error=True
-                    ),
+                    payload_cls=TwitterCollectionPayload,
+                    data=get_dummy_collection_payload_serialized(api_error=True),
                 ),
                 final_data={},
                 event=Event.DONE_MAX_RETRIES,
-                most_voted_payload=get_dummy_mentions_collection_payload_serialized(
+                most_voted_payload=get_dummy_collection_payload_serialized(
                     api_error=True
                 ),
                 synchronized_data_attr_checks=[],
@@ -236,14 +223,14 @@ class TestMentionsCollectionRound(BaseTwitterScoringRoundTest):
                 name="API error: api limits",
                 initial_data={},
                 payloads=get_payloads(
-                    payload_cls=TwitterMentionsCollectionPayload,
-                    data=get_dummy_mentions_collection_payload_serialized(
+                    payload_cls=TwitterCollectionPayload,
+                    data=get_dummy_collection_payload_serialized(
                         api_error=True
                     ).replace('"error": "generic"', '"error": "too many requests"'),
                 ),
                 final_data={},
                 event=Event.DONE_API_LIMITS,
-                most_voted_payload=get_dummy_mentions_collection_payload_serialized(
+                most_voted_payload=get_dummy_collection_payload_serialized(
                     api_error=True
                 ).replace('"error": "generic"', '"error": "too many requests"'),
                 synchronized_data_attr_checks=[],
@@ -255,72 +242,6 @@ class TestMentionsCollectionRound(BaseTwitterScoringRoundTest):
         self.run_test(test_case)
 
 
-class TestCampaignsCollectionRound(BaseTwitterScoringRoundTest):
-    """Tests for TwitterMentionsCollectionRound."""
-
-    round_class = TwitterCampaignsCollectionRound
-
-    @pytest.mark.parametrize(
-        "test_case",
-        (
-            RoundTestCase(
-                name="Happy path",
-                initial_data={},
-                payloads=get_payloads(
-                    payload_cls=TwitterCampaignsCollectionPayload,
-                    data=get_dummy_campaigns_collection_payload_serialized(),
-                ),
-                final_data={
-                    "tweets": json.loads(
-                        get_dummy_campaigns_collection_payload_serialized()
-                    )["tweets"],
-                },
-                event=Event.DONE,
-                most_voted_payload=get_dummy_campaigns_collection_payload_serialized(),
-                synchronized_data_attr_checks=[],
-                ceramic_db={"module_data": {"twitter": {"latest_hashtag_tweet_id": 0}}},
-            ),
-            RoundTestCase(
-                name="API error",
-                initial_data={},
-                payloads=get_payloads(
-                    payload_cls=TwitterCampaignsCollectionPayload,
-                    data=get_dummy_campaigns_collection_payload_serialized(
-                        api_error=True
-                    ),
-                ),
-                final_data={},
-                event=Event.API_ERROR,
-                most_voted_payload=get_dummy_campaigns_collection_payload_serialized(
-                    api_error=True
-                ),
-                synchronized_data_attr_checks=[],
-            ),
-            RoundTestCase(
-                name="API error: max retries",
-                initial_data={
-                    "api_retries": 1,
-                },
-                payloads=get_payloads(
-                    payload_cls=TwitterCampaignsCollectionPayload,
-                    data=get_dummy_campaigns_collection_payload_serialized(
-                        api_error=True
-                    ),
-                ),
-                final_data={},
-                event=Event.DONE_MAX_RETRIES,
-                most_voted_payload=get_dummy_campaigns_collection_payload_serialized(
-                    api_error=True
-                ),
-                synchronized_data_attr_checks=[],
-            ),
-        ),
-    )
-    def test_run(self, test_case: RoundTestCase) -> None:
-        """Run tests."""
-        self.run_test(test_case)
-
-
 class TestDecisionMakingRound(BaseTwitterScoringRoundTest):
     """Tests for TwitterDecisionMakingRound."""
 
@@ -334,11 +255,11 @@ class TestDecisionMakingRound(BaseTwitterScoringRoundTest):
                 initial_data={},
                 payloads=get_payloads(
                     payload_cls=TwitterDecisionMakingPayload,
-                    data=Event.RETRIEVE_CAMPAIGNS.value,
+                    data=Event.RETRIEVE_TWEETS.value,
                 ),
                 final_data={},
-                event=Event.RETRIEVE_CAMPAIGNS,
-                most_voted_payload=Event.RETRIEVE_CAMPAIGNS.value,
+                event=Event.RETRIEVE_TWEETS,
+                most_voted_payload=Event.RETRIEVE_TWEETS.value,
                 synchronized_data_attr_checks=[],
             ),
         ),
@@ -388,11 +309,11 @@ class TestPreMechRequestRound(BaseTwitterScoringRoundTest):
                 initial_data={},
                 payloads=get_payloads(
                     payload_cls=PreMechRequestPayload,
-                    data='{"new_mech_requests":[]}',
+                    data='{"new_mech_requests":[],"tweets":{}}',
                 ),
                 final_data={},
                 event=Event.SKIP_EVALUATION,
-                most_voted_payload='{"new_mech_requests":[]}',
+                most_voted_payload='{"new_mech_requests":[],"tweets":{}}',
                 synchronized_data_attr_checks=[],
             ),
             RoundTestCase(
@@ -400,11 +321,11 @@ class TestPreMechRequestRound(BaseTwitterScoringRoundTest):
                 initial_data={},
                 payloads=get_payloads(
                     payload_cls=PreMechRequestPayload,
-                    data='{"new_mech_requests":["dummy_request"]}',
+                    data='{"new_mech_requests":["dummy_request"],"tweets":{}}',
                 ),
                 final_data={},
                 event=Event.DONE,
-                most_voted_payload='{"new_mech_requests":["dummy_request"]}',
+                most_voted_payload='{"new_mech_requests":["dummy_request"],"tweets":{}}',
                 synchronized_data_attr_checks=[],
             ),
         ),
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2026 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Test the Twitter rate limiter"""
+
+from datetime import datetime, timezone
+from typing import Dict
+
+from packages.valory.skills.twitter_scoring_abci.twitter_rate_limiter import (
+    TwitterRateLimiter,
+    get_month_start,
+    get_token_id,
+    get_tweets_pulled_this_month,
+)
+
+ENDPOINT = "2/tweets/search/recent?"
+NOW = datetime(2026, 1, 10, tzinfo=timezone.utc).timestamp()
+RESET_TS = NOW + 900
+
+
+def get_headers(remaining: int, limit: int = 450) -> Dict[str, str]:
+    """Get the rate limit headers of a response"""
+    return {
+        "x-rate-limit-limit": str(limit),
+        "x-rate-limit-remaining": str(remaining),
+        "x-rate-limit-reset": str(int(RESET_TS)),
+    }
+
+
+class TestTwitterRateLimiter:
+    """Test the TwitterRateLimiter"""
+
+    def test_request_budget(self) -> None:
+        """Test that the budget follows the headers, keeping the headroom"""
+        limiter = TwitterRateLimiter(["token"], request_headroom=2)
+        assert limiter.get_request_budget(ENDPOINT, NOW, "token") is None
+
+        limiter.update_from_headers(ENDPOINT, get_headers(10), "token")
+        assert limiter.get_request_budget(ENDPOINT, NOW, "token") == 8
+
+        limiter.update_from_headers(ENDPOINT, get_headers(1), "token")
+        assert limiter.get_request_budget(ENDPOINT, NOW, "token") == 0
+
+        # The window is forgotten once it resets
+        assert limiter.get_request_budget(ENDPOINT, RESET_TS, "token") is None
+
+    def test_missing_headers(self) -> None:
+        """Test that responses without rate limit headers only count the request"""
+        limiter = TwitterRateLimiter(["token"])
+        limiter.update_from_headers(ENDPOINT, {}, "token")
+        limiter.update_from_headers(
+            ENDPOINT, {**get_headers(10), "x-rate-limit-reset": "soon"}, "token"
+        )
+
+        assert limiter.get_request_budget(ENDPOINT, NOW, "token") is None
+        assert limiter.usage[get_token_id("token")].requests == 2
+
+    def test_in_flight_requests(self) -> None:
+        """Test that reserved requests are not spent twice before their responses arrive"""
+        limiter = TwitterRateLimiter(["token"], request_headroom=0)
+        limiter.update_from_headers(ENDPOINT, get_headers(3), "token")
+
+        limiter.reserve_request(ENDPOINT, "token")
+        limiter.reserve_request(ENDPOINT, "token")
+        assert limiter.get_request_budget(ENDPOINT, NOW, "token") == 1
+
+        limiter.update_from_headers(ENDPOINT, get_headers(2), "token")
+        assert limiter.get_request_budget(ENDPOINT, NOW, "token") == 1
+
+        limiter.update_from_headers(ENDPOINT, get_headers(1), "token")
+        limiter.update_from_headers(ENDPOINT, get_headers(1), "token")
+        assert limiter.in_flight[(get_token_id("token"), ENDPOINT)] == 0
+        assert limiter.get_request_budget(ENDPOINT, NOW, "token") == 1
+
+    def test_pick_token(self) -> None:
+        """Test that the token with the most budget is picked, and the least used on ties"""
+        limiter = TwitterRateLimiter(["first", "second"], request_headroom=0)
+        limiter.update_from_headers(ENDPOINT, get_headers(5), "first")
+        # Unused tokens have the whole window left
+        assert limiter.pick_token(ENDPOINT, NOW) == "second"
+
+        limiter.update_from_headers(ENDPOINT, get_headers(5), "second")
+        limiter.reserve_request(ENDPOINT, "first")
+        assert limiter.pick_token(ENDPOINT, NOW) == "second"
+
+        limiter.update_from_headers(ENDPOINT, get_headers(0), "first")
+        limiter.update_from_headers(ENDPOINT, get_headers(0), "second")
+        assert limiter.pick_token(ENDPOINT, NOW) is None
+
+    def test_sleep_until(self) -> None:
+        """Test that the pool only sleeps when every token is exhausted"""
+        limiter = TwitterRateLimiter(["first", "second"], request_headroom=0)
+        limiter.update_from_headers(ENDPOINT, get_headers(0), "first")
+        assert limiter.get_sleep_until(ENDPOINT, NOW, "first") == RESET_TS
+        assert limiter.get_sleep_until(ENDPOINT, NOW) is None
+
+        limiter.update_from_headers(ENDPOINT, get_headers(0), "second")
+        assert limiter.get_sleep_until(ENDPOINT, NOW) == RESET_TS
+        assert limiter.get_sleep_until(ENDPOINT, RESET_TS) is None
+
+    def test_get_token(self) -> None:
+        """Test that tokens are found by their identifier, which does not reveal them"""
+        limiter = TwitterRateLimiter(["token"])
+        token_id = get_token_id("token")
+
+        assert "token" not in token_id
+        assert limiter.get_token(token_id) == "token"
+        assert limiter.get_token(get_token_id("removed")) is None
+
+    def test_tweet_budget(self) -> None:
+        """Test that the monthly cap is spread over the days left in the month"""
+        assert TwitterRateLimiter(["token"]).get_tweet_budget(100, 10, NOW) is None
+
+        # 22 days are left in January, counting the 10th
+        limiter = TwitterRateLimiter(["token"], monthly_read_cap=2300)
+        assert limiter.get_tweet_budget(100, 0, NOW) == 100
+        assert limiter.get_tweet_budget(100, 40, NOW) == 61
+        assert limiter.get_tweet_budget(2400, 0, NOW) == 0
+
+    def test_month_reset(self) -> None:
+        """Test that the tweets pulled are only counted within their month"""
+        month_start = get_month_start(NOW)
+        assert month_start == datetime(2026, 1, 1, tzinfo=timezone.utc).timestamp()
+        assert get_tweets_pulled_this_month(100, month_start, NOW) == 100
+        assert get_tweets_pulled_this_month(100, month_start - 1, NOW) == 0
@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2026 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains a scheduler for the Twitter API rate limits."""
+
+import hashlib
+import math
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+ONE_DAY = 86400.0
+TOKEN_ID_LENGTH = 8
+RATE_LIMIT_HEADERS = (
+    "x-rate-limit-limit",
+    "x-rate-limit-remaining",
+    "x-rate-limit-reset",
+)
+
+
+def get_month_start(timestamp: float) -> float:
+    """Get the start of the (UTC) month of a timestamp"""
+    date = datetime.fromtimestamp(timestamp, tz=timezone.utc)
+    return date.replace(day=1, hour=0, minute=0, second=0, microsecond=0).timestamp()
+
+
+def get_next_month_start(timestamp: float) -> float:
+    """Get the start of the (UTC) month that follows a timestamp"""
+    date = datetime.fromtimestamp(get_month_start(timestamp), tz=timezone.utc)
+    if date.month == 12:
+        return date.replace(year=date.year + 1, month=1).timestamp()
+    return date.replace(month=date.month + 1).timestamp()
+
+
+def get_tweets_pulled_this_month(
+    number_of_tweets_pulled_this_month: int,
+    last_tweet_pull_month_reset: float,
+    now: float,
+) -> int:
+    """Get the number of tweets pulled in the current month, which is zero once a new month starts"""
+    if last_tweet_pull_month_reset != get_month_start(now):
+        return 0
+    return number_of_tweets_pulled_this_month
+
+
+@dataclass
+class RateLimitWindow:
+    """The rate limit window of a Twitter API endpoint"""
+
+    limit: int
+    remaining: int
+    reset_ts: float
+
+
+@dataclass
+class TokenUsage:
+    """The Twitter API usage of a bearer token"""
+
+    requests: int = 0
+    tweets: int = 0
+
+
+def get_token_id(bearer_token: str) -> str:
+    """Get a non-secret identifier for a bearer token"""
+    return hashlib.sha256(bearer_token.encode()).hexdigest()[:TOKEN_ID_LENGTH]
+
+
+class TwitterRateLimiter:
+    """Schedules Twitter API requests over a pool of bearer tokens, within the endpoint windows and the monthly read cap"""
+
+    def __init__(
+        self,
+        bearer_tokens: List[str],
+        monthly_read_cap: Optional[int] = None,
+        request_headroom: int = 1,
+    ) -> None:
+        """Initialize the rate limiter"""
+        self.bearer_tokens = {get_token_id(token): token for token in bearer_tokens}
+        self.monthly_read_cap = monthly_read_cap
+        self.request_headroom = request_headroom
+        self.windows: Dict[Tuple[str, str], RateLimitWindow] = {}
+        # Requests sent whose response headers have not been tracked yet
+        self.in_flight: Dict[Tuple[str, str], int] = {}
+        self.usage: Dict[str, TokenUsage] = {
+            token_id: TokenUsage() for token_id in self.bearer_tokens
+        }
+
+    def get_token(self, token_id: str) -> Optional[str]:
+        """Get the bearer token with the given identifier, if it is still in the pool"""
+        return self.bearer_tokens.get(token_id, None)
+
+    def update_from_headers(
+        self, endpoint: str, headers: Dict[str, str], bearer_token: str
+    ) -> None:
+        """Track the window of a token on an endpoint from the x-rate-limit headers of a response"""
+        token_id = get_token_id(bearer_token)
+        self.usage.setdefault(token_id, TokenUsage()).requests += 1
+        if self.in_flight.get((token_id, endpoint), 0) > 0:
+            self.in_flight[(token_id, endpoint)] -= 1
+        try:
+            limit, remaining, reset_ts = (
+                int(headers[header]) for header in RATE_LIMIT_HEADERS
+            )
+        except (KeyError, ValueError):
+            return
+        self.windows[(token_id, endpoint)] = RateLimitWindow(
+            limit=limit, remaining=remaining, reset_ts=float(reset_ts)
+        )
+
+    def reserve_request(self, endpoint: str, bearer_token: str) -> None:
+        """Count a request to an endpoint before it is sent, until its response headers are tracked"""
+        key = (get_token_id(bearer_token), endpoint)
+        self.in_flight[key] = self.in_flight.get(key, 0) + 1
+
+    def record_tweets(self, bearer_token: str, number_of_tweets: int) -> None:
+        """Record the tweets read with a token"""
+        token_id = get_token_id(bearer_token)
+        self.usage.setdefault(token_id, TokenUsage()).tweets += number_of_tweets
+
+    def get_request_budget(
+        self, endpoint: str, now: float, bearer_token: str
+    ) -> Optional[int]:
+        """Get the number of requests a token can still make in the current window, if known"""
+        key = (get_token_id(bearer_token), endpoint)
+        window = self.windows.get(key, None)
+        if window is None or now >= window.reset_ts:
+            return None
+        return max(
+            0, window.remaining - self.request_headroom - self.in_flight.get(key, 0)
+        )
+
+    def pick_token(self, endpoint: str, now: float) -> Optional[str]:
+        """Get the token with the most remaining budget on an endpoint, or None if all of them are exhausted"""
+        budgets = {}
+        for token in self.bearer_tokens.values():
+            budget = self.get_request_budget(endpoint, now, token)
+            # Tokens without a known window have not been used yet in it
+            budgets[token] = math.inf if budget is None else budget
+        if not budgets or max(budgets.values()) == 0:
+            return None
+        # Ties go to the least used token so that the load is spread over the pool
+        return max(
+            budgets,
+            key=lambda token: (
+                budgets[token],
+                -self.usage[get_token_id(token)].requests
+                - self.in_flight.get((get_token_id(token), endpoint), 0),
+            ),
+        )
+
+    def get_sleep_until(
+        self, endpoint: str, now: float, bearer_token: Optional[str] = None
+    ) -> Optional[float]:
+        """Get when requests can be made again to an endpoint, with the given token or with any of the pool"""
+        bearer_tokens = (
+            [bearer_token] if bearer_token else list(self.bearer_tokens.values())
+        )
+        reset_timestamps = []
+        for token in bearer_tokens:
+            if self.get_request_budget(endpoint, now, token) != 0:
+                return None
+            reset_timestamps.append(
+                self.windows[(get_token_id(token), endpoint)].reset_ts
+            )
+        return min(reset_timestamps, default=None)
+
+    def get_usage(self, endpoint: str, now: float) -> Dict[str, Dict]:
+        """Get the usage and the remaining budget of every token in the pool"""
+        return {
+            token_id: {
+                **asdict(self.usage[token_id]),
+                "remaining": self.get_request_budget(endpoint, now, token),
+            }
+            for token_id, token in self.bearer_tokens.items()
+        }
+
+    def get_tweet_budget(
+        self,
+        number_of_tweets_pulled_this_month: int,
+        number_of_tweets_pulled_today: int,
+        now: float,
+    ) -> Optional[int]:
+        """Get the number of tweets that can still be read today, spreading the monthly cap over the remaining days"""
+        if not self.monthly_read_cap:
+            return None
+        days_left = max(1, math.ceil((get_next_month_start(now) - now) / ONE_DAY))
+        pulled_before_today = max(
+            0, number_of_tweets_pulled_this_month - number_of_tweets_pulled_today
+        )
+        daily_allowance = (self.monthly_read_cap - pulled_before_today) // days_left
+        return max(0, daily_allowance - number_of_tweets_pulled_today)
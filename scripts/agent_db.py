@@ -22,13 +22,16 @@
 
 # pylint: disable=unused-variable,too-many-arguments,too-many-instance-attributes,wrong-import-position,redefined-outer-name
 
+import argparse
 import os
 import sys
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set
 
 import dotenv
 import requests
@@ -45,6 +48,7 @@ from packages.valory.skills.agent_db_abci.agent_db_models import (
 from packages.valory.skills.contribute_db_abci.contribute_models import (
     ContributeData,
     ContributeUser,
+    ModuleArchive,
     ModuleConfigs,
     ModuleData,
     UserTweet,
@@ -82,11 +86,22 @@ def are_models_different(model1: BaseModel, model2: BaseModel) -> bool:
 class AgentDBClient:
     """AgentDBClient"""
 
-    def __init__(self, base_url, eth_address, private_key):
+    def __init__(  # pylint: disable=too-many-positional-arguments
+        self,
+        base_url,
+        eth_address,
+        private_key,
+        page_size: int = 100,
+        max_concurrent_pages: int = 8,
+        max_page_retries: int = 3,
+    ):
         """Constructor"""
         self.base_url = base_url.rstrip("/")
         self.eth_address = eth_address
         self.private_key = private_key
+        self.page_size = page_size
+        self.max_concurrent_pages = max_concurrent_pages
+        self.max_page_retries = max_page_retries
         self._attribute_definition_cache: Dict[int, AttributeDefinition] = {}
         self.agent = self.get_agent_instance_by_address(self.eth_address)
         self.agent_type = (
@@ -336,37 +351,60 @@ class AgentDBClient:
 
     def get_all_agent_instance_attributes_raw(self, agent_instance: AgentInstance):
         """Get all attributes of an agent by agent ID"""
+        raw_attributes = []
+        skip = 0
+        with ThreadPoolExecutor(max_workers=self.max_concurrent_pages) as executor:
+            while True:
+                # Request a window of pages at once. map() keeps them in order.
+                skips = [
+                    skip + i * self.page_size for i in range(self.max_concurrent_pages)
+                ]
+                pages = executor.map(
+                    lambda page_skip: self._get_agent_instance_attributes_page(
+                        agent_instance, page_skip
+                    ),
+                    skips,
+                )
+                for page in pages:
+                    raw_attributes += page
+                    if len(page) < self.page_size:
+                        return raw_attributes
+                skip = len(raw_attributes)
+
+    def _get_agent_instance_attributes_page(
+        self, agent_instance: AgentInstance, skip: int
+    ):
+        """Get a page of attributes, retrying with exponential backoff"""
         endpoint = f"/api/agents/{agent_instance.agent_id}/attributes/"
         payload = {
             "agent_id": agent_instance.agent_id,
         }
-        raw_attributes = []
-        skip = 0
-        while True:
-            params = {
-                "skip": skip,
-                "limit": 100,
-            }
-            # print(f"Reading agent attributes from {skip} to {skip + 100}... ", end="")
-            result = self._request(
-                method="GET",
-                endpoint=endpoint,
-                payload={"agent_attr": payload},
-                params=params,
-                auth=True,
-            )
-
-            if result is None:
-                print("Error fetching agent attributes")
-                continue
+        params = {
+            "skip": skip,
+            "limit": self.page_size,
+        }
+        for attempt in range(self.max_page_retries + 1):
+            try:
+                result = self._request(
+                    method="GET",
+                    endpoint=endpoint,
+                    payload={"agent_attr": payload},
+                    params=params,
+                    auth=True,
+                )
+            except Exception as e:  # pylint: disable=broad-except
+                print(f"Error fetching agent attributes: {e}")
+                result = None
 
-            # print(f"got {len(result)} attributes")
+            if result is not None:
+                return result
 
-            raw_attributes += result
-            skip = len(raw_attributes)
+            if attempt < self.max_page_retries:
+                time.sleep(2**attempt)
 
-            if len(result) < 100:
-                return raw_attributes
+        raise ValueError(
+            f"Could not fetch agent attributes at skip={skip} after {self.max_page_retries + 1} attempts"
+        )
 
     def parse_attribute_instance(self, attribute_instance: AttributeInstance):
         """Parse attribute instance"""
@@ -498,6 +536,7 @@ class ContributeDatabase:
         self.module_configs_interface = ModuleConfigsAttributeInterface(self.client)
         self.module_data_interface = ModuleDataAttributeInterface(self.client)
         self.data = ContributeData()
+        self.legacy_user_ids: Set[int] = set()  # users that still store tweet ids
 
     def register(self):
         """Register agent and all definitions"""
@@ -574,12 +613,8 @@ class ContributeDatabase:
         )
         self.data.tweets[tweet.tweet_id] = tweet
 
-        # Update the user
-        print(f"Updating user {tweet.twitter_user_id} with new tweet")
-
-        user.tweets[tweet.tweet_id] = tweet
-
-        self.user_interface.update_instance(user)
+        # Link the tweet to the user. The user record does not store its tweets.
+        user.add_tweet(tweet)
 
         return tweet_instance
 
@@ -662,6 +697,9 @@ class ContributeDatabase:
                 continue
 
             if attr_name == "user":
+                # Records written before the scalar-only layout still hold tweet ids
+                if "tweets" in attr_data:
+                    self.legacy_user_ids.add(attr_data["id"])
                 attr_data["tweets"] = {}
                 user = ContributeUser(**attr_data)
 
@@ -683,6 +721,11 @@ class ContributeDatabase:
                 self.data.module_data = module_data
                 continue
 
+            if attr_name == "module_archive":
+                module_archive = ModuleArchive(**attr_data)
+                self.data.module_archive = module_archive
+                continue
+
             raise ValueError(f"Unknown attribute name: {attr_name}")
 
         self.data.sort()
@@ -696,7 +739,7 @@ class ContributeDatabase:
                 )
                 continue
 
-            user.tweets[tweet_id] = tweet
+            user.add_tweet(tweet)
 
     def get_next_user_id(self):
         """Get next user id"""
@@ -798,6 +841,21 @@ def sync_remote_db(local_data, remote_db):
     remote_db.update_module_data(local_data.module_data)
 
 
+def migrate_user_records(remote_db):
+    """Rewrite the user records that still store their tweet ids."""
+
+    print(f"Migrating {len(remote_db.legacy_user_ids)} user records...")
+
+    for user_id in sorted(remote_db.legacy_user_ids):
+        user = remote_db.data.users[user_id]
+        if remote_db.update_user(user):
+            remote_db.legacy_user_ids.discard(user_id)
+        else:
+            print(f"Could not migrate user {user_id}")
+
+    print("User records migrated")
+
+
 def clear_remote_db(remote_db):
     """Remove all data from the remote database."""
 
@@ -837,6 +895,17 @@ def clear_remote_db(remote_db):
 def main():
     """Main"""
 
+    parser = argparse.ArgumentParser(description="Manage the Contribute AgentDB data")
+    parser.add_argument(
+        "command",
+        nargs="?",
+        default="dump",
+        choices=["dump", "migrate-user-records"],
+        help="dump: store the remote database in contribute_db.json. "
+        "migrate-user-records: rewrite the user records that still store their tweet ids, then dump.",
+    )
+    args = parser.parse_args()
+
     # Initialize the client
     client = AgentDBClient(
         base_url=os.getenv("AGENT_DB_BASE_URL"),
@@ -859,6 +928,10 @@ def main():
     # Sync both databases
     # sync_remote_db(local_data, remote_db)
 
+    # Drop the tweet ids from the user records
+    if args.command == "migrate-user-records":
+        migrate_user_records(remote_db)
+
     # Clear the remote database
     # clear_remote_db(remote_db)
 
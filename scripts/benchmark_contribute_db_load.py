@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2026 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""Benchmark ContributeDatabase loads with and without trusted model construction."""
+
+# pylint: disable=wrong-import-position
+
+import logging
+import os
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Dict, List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from aea.skills.base import SkillContext
+from pydantic import TypeAdapter
+
+from packages.valory.skills.agent_db_abci.agent_db_client import AgentDBClient
+from packages.valory.skills.agent_db_abci.agent_db_models import (
+    AgentInstance,
+    AttributeDefinition,
+)
+from packages.valory.skills.contribute_db_abci.contribute_db import ContributeDatabase
+from packages.valory.skills.contribute_db_abci.contribute_models import (
+    ModuleConfigs,
+    ModuleData,
+    UserTweet,
+)
+
+SIZES = [10_000, 100_000, 1_000_000]  # number of tweets
+TWEETS_PER_USER = 10
+ATTRIBUTE_NAMES = ["tweet", "user", "module_configs", "module_data"]
+
+
+class OfflineAgentDBClient(AgentDBClient):
+    """AgentDBClient that serves pre-generated attribute rows from memory"""
+
+    def __init__(self, rows: List[Dict]):
+        """Constructor"""
+        super().__init__(
+            base_url="http://localhost",
+            name="agent_db_client",
+            skill_context=SkillContext(),
+        )
+        self.rows = rows
+        self.logger = logging.getLogger("benchmark")
+        self.agent = AgentInstance(
+            agent_id=1,
+            type_id=1,
+            agent_name="contribute",
+            eth_address="0x" + "0" * 40,
+            created_at=datetime.now(timezone.utc),
+        )
+        definitions = [
+            AttributeDefinition(
+                attr_def_id=attr_def_id,
+                type_id=1,
+                attr_name=attr_name,
+                data_type="json",
+                is_required=False,
+                default_value="{}",
+            )
+            for attr_def_id, attr_name in enumerate(ATTRIBUTE_NAMES, 1)
+        ]
+        self._cache_attribute_definitions(definitions, persist=False)
+
+    def get_all_agent_instance_attributes_raw(self, agent_instance, skip: int = 0):
+        """Get all the rows after skip"""
+        yield
+        return self.rows[skip:]
+
+
+def make_rows(n_tweets: int) -> List[Dict]:
+    """Generate the raw AgentDB rows for a database with n_tweets tweets"""
+    now = datetime.now(timezone.utc).isoformat()
+    n_users = max(1, n_tweets // TWEETS_PER_USER)
+    values = [
+        (
+            "user",
+            {
+                "id": user_id,
+                "points": 1000,
+                "twitter_id": str(user_id),
+                "twitter_handle": f"user_{user_id}",
+                "wallet_address": f"0x{user_id:040x}",
+                "service_multisig": f"0x{user_id + 1:040x}",
+                "service_id": str(user_id),
+                "current_period_points": 0,
+            },
+        )
+        for user_id in range(n_users)
+    ]
+    values += [
+        (
+            "tweet",
+            {
+                "tweet_id": str(10**18 + tweet_id),
+                "twitter_user_id": str(tweet_id % n_users),
+                "epoch": tweet_id % 50,
+                "points": 200,
+                "campaign": "olas",
+                "timestamp": now,
+                "counted_for_activity": True,
+            },
+        )
+        for tweet_id in range(n_tweets)
+    ]
+    values += [
+        ("module_configs", ModuleConfigs().model_dump(mode="json")),
+        ("module_data", ModuleData().model_dump(mode="json")),
+    ]
+    return [
+        {
+            "attribute_id": attribute_id,
+            "attr_def_id": ATTRIBUTE_NAMES.index(attr_name) + 1,
+            "agent_id": 1,
+            "last_updated": now,
+            "string_value": None,
+            "integer_value": None,
+            "float_value": None,
+            "boolean_value": None,
+            "date_value": None,
+            "json_value": value,
+        }
+        for attribute_id, (attr_name, value) in enumerate(values, 1)
+    ]
+
+
+def run(generator):
+    """Drive a skill generator to completion"""
+    try:
+        while True:
+            next(generator)
+    except StopIteration as e:
+        return e.value
+
+
+def time_load(rows: List[Dict], trusted: bool) -> float:
+    """Time a full load of the given rows"""
+    client = OfflineAgentDBClient(rows)
+    contribute_db = ContributeDatabase(
+        name="contribute_db", skill_context=SkillContext(), trusted_load=trusted
+    )
+    contribute_db.initialize(client, client.agent.eth_address)
+    start = time.perf_counter()
+    run(contribute_db.load_from_remote_db())
+    return time.perf_counter() - start
+
+
+def time_type_adapter(rows: List[Dict]) -> float:
+    """Time a batch TypeAdapter validation of the tweets, for reference"""
+    adapter = TypeAdapter(List[UserTweet])
+    tweets = [
+        row["json_value"] | {"attribute_instance_id": row["attribute_id"]}
+        for row in rows
+        if row["attr_def_id"] == 1
+    ]
+    start = time.perf_counter()
+    adapter.validate_python(tweets)
+    return time.perf_counter() - start
+
+
+def main():
+    """Main"""
+    sizes = [int(size) for size in sys.argv[1:]] or SIZES
+    print(
+        f"{'tweets':>10} {'validated (s)':>14} {'trusted (s)':>12} {'speedup':>8} {'TypeAdapter tweets (s)':>23}"
+    )
+    for size in sizes:
+        rows = make_rows(size)
+        validated = time_load(rows, trusted=False)
+        trusted = time_load(rows, trusted=True)
+        type_adapter = time_type_adapter(rows)
+        print(
+            f"{size:>10} {validated:>14.2f} {trusted:>12.2f} {validated / trusted:>7.1f}x {type_adapter:>23.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
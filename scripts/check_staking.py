@@ -18,6 +18,7 @@
 # ------------------------------------------------------------------------------
 
 """This package contains code to read Contribute streams on Ceramic."""
+
 # pylint: disable=import-error
 
 import json
@@ -209,8 +210,8 @@ def get_user_info(  # pylint: disable=too-many-locals
     # this_epoch_rewards = staking_token_contract.functions.calculateStakingLastReward(service_id).call()   # needs fixing
     this_epoch = contract_info[staking_contract_name]["epoch"]
 
-    this_epoch_tweets = [t for t in user_data.tweets.values() if t.epoch == this_epoch]
-    this_epoch_points = sum(t.points for t in this_epoch_tweets)
+    this_epoch_stats = user_data.tweet_stats.get(this_epoch)
+    this_epoch_points = this_epoch_stats.points
 
     required_points = (
         POINTS_PER_UPDATE * contract_info[staking_contract_name]["required_updates"]
@@ -224,7 +225,7 @@ def get_user_info(  # pylint: disable=too-many-locals
         "evicted": is_evicted,
         "staking_contract_name": staking_contract_name,
         "epoch": str(this_epoch),
-        "this_epoch_tweets": str(len(this_epoch_tweets)),
+        "this_epoch_tweets": str(this_epoch_stats.tweet_count),
         "required_points": f"{required_points:4d}",
         "this_epoch_points": f"{this_epoch_points:4d}",
         "next_epoch_start": contract_info[staking_contract_name]["next_epoch_start"],